@@ -57,6 +57,10 @@ class BoundaryConditionEditor(QWidget):
         self.save_button.clicked.connect(self._save_changes)
         self.reload_button.clicked.connect(self._reload)
         
+        # Resumo do cabeçalho do campo (classe, dimensões, internalField)
+        self.header_label = QLabel("")
+        self.toolbar_layout.addWidget(self.header_label)
+
         self.toolbar_layout.addStretch()
         self.toolbar_layout.addWidget(self.reload_button)
         self.toolbar_layout.addWidget(self.save_button)
@@ -87,6 +91,7 @@ class BoundaryConditionEditor(QWidget):
 
     def _apply_styles(self):
         self.setStyleSheet("background-color: #f4f4f4;")
+        self.header_label.setStyleSheet("color: #525252; font-size: 11px;")
         
         self.save_button.setStyleSheet("""
             QPushButton {
@@ -158,6 +163,7 @@ class BoundaryConditionEditor(QWidget):
         self.current_field = None
         self.field_list.clear()
         self.bc_table.setRowCount(0)
+        self.header_label.setText("")
         
         if not self.current_case:
             return
@@ -182,10 +188,19 @@ class BoundaryConditionEditor(QWidget):
         
         file_path = os.path.join(self.current_case, "0", field_name)
         try:
+            # Lê apenas cabeçalho e boundaryField: o internalField é pulado.
+            header = foamdict.read_field_header(file_path)
             boundaries = foamdict.read_boundary_field(file_path)
+            # Valores como escritos no arquivo, para preservar `$macros` ao salvar.
+            raw_boundaries = foamdict.read_boundary_field(file_path, expand=False)
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Failed to read field {field_name}: {e}")
             return
+
+        summary = [header.get("class", ""), header.get("dimensions", "")]
+        if header.get("internalField"):
+            summary.append(f"internalField {header['internalField']}")
+        self.header_label.setText("  ·  ".join(part for part in summary if part))
             
         self.bc_table.setRowCount(len(boundaries))
         for row, (patch, data) in enumerate(boundaries.items()):
@@ -224,6 +239,11 @@ class BoundaryConditionEditor(QWidget):
             bc_value = data.get("value", "")
             if bc_value:
                 value_edit.setText(bc_value)
+            raw_value = raw_boundaries.get(patch, {}).get("value", "")
+            if raw_value and raw_value != bc_value:
+                value_edit.setToolTip(raw_value)
+                value_edit.setProperty("raw_value", raw_value)
+                value_edit.setProperty("expanded_value", bc_value)
             self.bc_table.setCellWidget(row, 2, value_edit)
 
 
@@ -249,6 +269,9 @@ class BoundaryConditionEditor(QWidget):
                 data["type"] = type_combo.currentText()
             if value_edit and value_edit.text():
                 data["value"] = value_edit.text()
+                # Valor não editado: grava a macro original (`$internalField`).
+                if value_edit.property("raw_value") and value_edit.text() == value_edit.property("expanded_value"):
+                    data["value"] = value_edit.property("raw_value")
                 
             boundaries[patch] = data
             
@@ -0,0 +1,180 @@
+"""Monitoramento do caso com um número fixo de diretórios observados.
+
+Em vez de uma observação por subdiretório (que esgota os `inotify` watches
+em casos com milhares de tempos e `processor*`), só são observados a raiz do
+caso, `0/`, `constant/` (com `polyMesh/` e os diretórios de geometria),
+`system/` e a raiz de `processor0`. Os eventos do `QFileSystemWatcher` são
+acumulados por `DEBOUNCE_MS` e convertidos em eventos tipados (`CaseEvent`),
+entregues aos assinantes de uma só vez.
+"""
+
+import os
+from collections import namedtuple
+
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+
+from gafoam.timeindex import RE_PROCESSOR, time_value
+
+# Tipos de evento.
+TIMES_CHANGED = "times"        # diretórios de tempo criados ou apagados; `path` é a raiz ou o `processor*`
+FIELDS_CHANGED = "fields"      # campos criados, apagados ou reescritos; `path` é o diretório de tempo
+GEOMETRY_CHANGED = "geometry"  # STL/OBJ do caso podem ter mudado; `path` é o diretório afetado
+MESH_CHANGED = "mesh"          # `constant/polyMesh` foi reescrito
+CASE_CHANGED = "case"          # outras mudanças (`system/`, arquivos soltos na raiz)
+
+CaseEvent = namedtuple("CaseEvent", ["kind", "path"])
+
+# Janela de coalescência: rajadas de escrita do solver viram um único lote.
+DEBOUNCE_MS = 300
+
+# Diretórios observados, relativos à raiz do caso (a própria raiz é sempre observada).
+WATCHED_DIRS = (
+    "0",
+    "constant",
+    os.path.join("constant", "polyMesh"),
+    os.path.join("constant", "triSurface"),
+    os.path.join("constant", "geometry"),
+    "system",
+    "processor0",
+)
+
+
+def _snapshot(path):
+    """`(tempos, outras entradas)` de um diretório.
+
+    Os `processor*` contam com os tempos, pois criá-los ou apagá-los muda a
+    lista de tempos do caso; do resto guarda-se `{nome: mtime}`.
+    """
+    times, others = set(), {}
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name.startswith("."):
+                    continue
+                try:
+                    is_dir = entry.is_dir()
+                    if is_dir and (time_value(entry.name) is not None or RE_PROCESSOR.match(entry.name)):
+                        times.add(entry.name)
+                    else:
+                        others[entry.name] = None if is_dir else entry.stat().st_mtime_ns
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return times, others
+
+
+class CaseWatcher(QObject):
+    """Observa os diretórios do caso que a interface usa e despacha eventos tipados.
+
+    Assinantes se registram com `subscribe(callback, kinds)` e recebem cada
+    `CaseEvent` do lote; o sinal `events` entrega o lote inteiro.
+    """
+
+    events = Signal(list)
+
+    def __init__(self, parent=None, debounce_ms=DEBOUNCE_MS):
+        super().__init__(parent)
+        self.case_path = None
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self.notify)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self.flush)
+        self._pending = set()
+        self._snapshots = {}
+        self._subscribers = []
+
+    def subscribe(self, callback, kinds=None):
+        """Chama `callback(evento)` para os eventos dos tipos `kinds` (todos, se None)."""
+        self._subscribers.append((callback, set(kinds) if kinds else None))
+
+    def watch(self, case_path):
+        """Passa a observar o caso `case_path`, descartando o anterior."""
+        self._timer.stop()
+        self._pending.clear()
+        self._snapshots = {}
+        paths = self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
+        self.case_path = os.path.normpath(case_path) if case_path else None
+        self._sync_watches()
+
+    def watched(self):
+        return sorted(self._watcher.directories())
+
+    def _targets(self):
+        if not self.case_path or not os.path.isdir(self.case_path):
+            return []
+        candidates = [self.case_path] + [os.path.join(self.case_path, rel) for rel in WATCHED_DIRS]
+        return [path for path in candidates if os.path.isdir(path)]
+
+    def _sync_watches(self):
+        """Acompanha a criação e a remoção dos diretórios observados."""
+        targets = self._targets()
+        current = set(self._watcher.directories())
+        gone = [path for path in current if path not in targets]
+        if gone:
+            self._watcher.removePaths(gone)
+        for path in targets:
+            if path not in current:
+                self._watcher.addPath(path)
+            if path not in self._snapshots and self._is_time_parent(path):
+                self._snapshots[path] = _snapshot(path)
+
+    def _is_time_parent(self, path):
+        """Indica se `path` guarda diretórios de tempo: a raiz do caso ou `processor0`."""
+        return path in (self.case_path, os.path.join(self.case_path, "processor0"))
+
+    def notify(self, dir_path):
+        """Registra uma mudança em `dir_path`; o lote sai quando a janela de coalescência fecha."""
+        if not self.case_path:
+            return
+        self._pending.add(os.path.normpath(dir_path))
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        """Converte as mudanças acumuladas em eventos e os entrega agora."""
+        self._timer.stop()
+        pending, self._pending = self._pending, set()
+        events = []
+        for dir_path in sorted(pending):
+            for event in self._classify(dir_path):
+                if event not in events:
+                    events.append(event)
+        self._sync_watches()
+        if not events:
+            return
+        for event in events:
+            for callback, kinds in self._subscribers:
+                if kinds is None or event.kind in kinds:
+                    callback(event)
+        self.events.emit(events)
+
+    def _classify(self, dir_path):
+        rel = os.path.relpath(dir_path, self.case_path)
+        if rel.startswith(".."):
+            return []
+        if self._is_time_parent(dir_path):
+            before = self._snapshots.get(dir_path, (set(), {}))
+            after = _snapshot(dir_path)
+            self._snapshots[dir_path] = after
+            events = []
+            if after[0] != before[0]:
+                events.append(CaseEvent(TIMES_CHANGED, dir_path))
+            if rel == "." and after[1] != before[1]:
+                # Arquivos soltos na raiz podem ser geometrias; diretórios novos são observados no próximo `_sync_watches`.
+                events.append(CaseEvent(GEOMETRY_CHANGED, dir_path))
+                events.append(CaseEvent(CASE_CHANGED, dir_path))
+            return events
+
+        parts = rel.split(os.sep)
+        if time_value(parts[0]) is not None:
+            return [CaseEvent(FIELDS_CHANGED, dir_path)]
+        if parts[0] == "constant":
+            if len(parts) > 1 and parts[1] == "polyMesh":
+                return [CaseEvent(MESH_CHANGED, dir_path)]
+            return [CaseEvent(GEOMETRY_CHANGED, dir_path)]
+        return [CaseEvent(CASE_CHANGED, dir_path)]
@@ -0,0 +1,221 @@
+"""Visualização de casos decompostos sem `reconstructPar`.
+
+Módulo sem dependência de Qt nem de VTK. Cada `processor*` é lido num
+processo separado (`ProcessPoolExecutor`): a malha local, os endereçamentos
+`faceProcAddressing`/`pointProcAddressing`. De cada subdomínio só voltam as
+faces dos patches reais (os `processor` são descartados) já com rótulos
+globais; a costura em memória ordena as faces pelo rótulo global e unifica
+os pontos compartilhados entre subdomínios. O resultado é o mesmo de
+`polymesh.patch_surface` sobre a malha reconstruída. A costura é guardada
+(`DecomposedMesh`): colorir por um campo depois só lê os arquivos do campo,
+um por subdomínio, num pool de threads.
+"""
+
+import multiprocessing
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from gafoam import fieldio, foamdict, polymesh
+from gafoam.timeindex import RE_PROCESSOR
+
+# Tipos de patch que só existem entre subdomínios.
+PROCESSOR_PATCH_TYPES = {"processor", "processorCyclic"}
+
+# Endereçamentos local → global escritos pelo `decomposePar`.
+ADDRESSING_FILES = ("faceProcAddressing", "pointProcAddressing")
+
+
+def processor_dirs(case_path):
+    """Diretórios `processor*` do caso, em ordem numérica."""
+    try:
+        names = [name for name in os.listdir(case_path) if RE_PROCESSOR.match(name)]
+    except OSError:
+        return []
+    names.sort(key=lambda name: int(RE_PROCESSOR.match(name).group(1)))
+    return [os.path.join(case_path, name) for name in names]
+
+
+def is_decomposed(case_path):
+    """Indica se o caso tem subdomínios com malha e endereçamento legíveis."""
+    dirs = processor_dirs(case_path) if case_path else []
+    return bool(dirs) and all(
+        polymesh.has_polymesh(proc_dir)
+        and all(foamdict.resolve_foam_file(os.path.join(polymesh.polymesh_dir(proc_dir), name))
+                for name in ADDRESSING_FILES)
+        for proc_dir in dirs
+    )
+
+
+def read_processor_patches(proc_dir):
+    """Faces dos patches reais de um subdomínio, com rótulos globais.
+
+    Devolve `{patch: {"type", "faces", "sizes", "labels", "point_ids",
+    "points", "owners"}}`: os rótulos globais das faces, o número de
+    vértices de cada uma, os rótulos globais dos vértices em sequência, os
+    pontos usados (rótulo global e coordenadas) e as células donas locais,
+    usadas para colorir pelos campos do subdomínio.
+    """
+    mesh = polymesh.read_polymesh(proc_dir)
+    directory = polymesh.polymesh_dir(proc_dir)
+    face_addr = np.abs(polymesh.read_labels(os.path.join(directory, "faceProcAddressing")).astype(np.int64)) - 1
+    point_addr = polymesh.read_labels(os.path.join(directory, "pointProcAddressing")).astype(np.int64)
+
+    result = {}
+    for patch in mesh.patches:
+        if patch["type"] in PROCESSOR_PATCH_TYPES:
+            continue
+        start, n_faces = patch["startFace"], patch["nFaces"]
+        offsets = np.asarray(mesh.face_offsets[start:start + n_faces + 1], dtype=np.int64)
+        local = np.asarray(mesh.face_labels[offsets[0]:offsets[-1]], dtype=np.int64) if n_faces else np.empty(0, dtype=np.int64)
+        used = np.unique(local)
+        result[patch["name"]] = {
+            "type": patch["type"],
+            "faces": face_addr[start:start + n_faces],
+            "sizes": np.diff(offsets),
+            "labels": point_addr[local],
+            "point_ids": point_addr[used],
+            "points": np.asarray(mesh.points[used], dtype=np.float64),
+            "owners": np.asarray(mesh.owner[start:start + n_faces], dtype=np.int64),
+        }
+    return result
+
+
+def stitch_patches(parts):
+    """Costura as faces de patch devolvidas por `read_processor_patches`.
+
+    Devolve uma lista, na ordem de patches do primeiro subdomínio, de
+    `(patch, pontos, células no formato do VTK)`, com `patch` no formato de
+    `polymesh.PolyMesh.patches` (numeração global).
+    """
+    names = []
+    for part in parts:
+        names.extend(name for name in part if name not in names)
+
+    stitched = []
+    for name in names:
+        pieces = [part[name] for part in parts if name in part and len(part[name]["faces"])]
+        if not pieces:
+            continue
+        faces = np.concatenate([p["faces"] for p in pieces])
+        sizes = np.concatenate([p["sizes"] for p in pieces])
+        labels = np.concatenate([p["labels"] for p in pieces])
+        starts = np.cumsum(sizes) - sizes
+
+        order = np.argsort(faces, kind="stable")
+        sizes, starts = sizes[order], starts[order]
+        gather = np.repeat(starts - (np.cumsum(sizes) - sizes), sizes) + np.arange(int(sizes.sum()))
+        labels = labels[gather]
+
+        point_ids = np.concatenate([p["point_ids"] for p in pieces])
+        coords = np.concatenate([p["points"] for p in pieces])
+        used, first = np.unique(point_ids, return_index=True)
+        local = np.searchsorted(used, labels)
+
+        count_pos = (np.cumsum(sizes) - sizes) + np.arange(len(sizes))
+        cells = np.empty(len(labels) + len(sizes), dtype=np.int64)
+        is_label = np.ones(len(cells), dtype=bool)
+        is_label[count_pos] = False
+        cells[count_pos] = sizes
+        cells[is_label] = local
+
+        patch = {"name": name, "type": pieces[0]["type"], "startFace": int(faces.min()), "nFaces": len(faces)}
+        stitched.append((patch, coords[first], cells))
+    return stitched
+
+
+class DecomposedMesh:
+    """Patches costurados de um caso decomposto, lidos uma vez por caso.
+
+    `surfaces` é a saída de `stitch_patches`. Para cada patch guarda-se, por
+    subdomínio, as células donas locais e a permutação para a ordem global
+    das faces: colorir por um campo só lê os arquivos do campo em cada
+    `processor*` (ver `field_values`).
+    """
+
+    def __init__(self, case_path, proc_dirs, parts):
+        self.case_path = case_path
+        self.proc_dirs = proc_dirs
+        self.surfaces = stitch_patches(parts)
+        self._pieces = {}
+        for patch, _, _ in self.surfaces:
+            name = patch["name"]
+            pieces = [(i, part[name]["owners"]) for i, part in enumerate(parts)
+                      if name in part and len(part[name]["faces"])]
+            faces = np.concatenate([parts[i][name]["faces"] for i, _ in pieces])
+            self._pieces[name] = (pieces, np.argsort(faces, kind="stable"))
+
+    def field_values(self, time_name, field_name, source="patch", which="magnitude", read_field=None,
+                     max_workers=None):
+        """`{patch: escalar por face}` na ordem global, lendo o campo de cada subdomínio.
+
+        `read_field(caminho)` lê um campo (por exemplo `fieldio.FieldCache.get`)
+        e precisa ser seguro entre threads: os subdomínios são lidos em
+        paralelo, com até `max_workers` threads. Por padrão, `fieldio.read_field`
+        sobre o arquivo resolvido.
+        """
+        read_field = read_field or _read_field
+        needed = sorted({i for pieces, _ in self._pieces.values() for i, _ in pieces})
+        paths = [os.path.join(self.proc_dirs[i], time_name, field_name) for i in needed]
+        workers = min(len(paths), max_workers or os.cpu_count() or 1)
+        if workers <= 1:
+            loaded = [read_field(path) for path in paths]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                loaded = list(pool.map(read_field, paths))
+        fields = dict(zip(needed, loaded))
+
+        values = {}
+        for name, (pieces, order) in self._pieces.items():
+            chunks = []
+            for i, owners in pieces:
+                patch = {"name": name, "startFace": 0, "nFaces": len(owners)}
+                chunks.append(fieldio.component(
+                    fieldio.patch_face_values(_PatchOwners(owners), fields[i], patch, source), which))
+            values[name] = np.concatenate(chunks)[order]
+        return values
+
+
+# Basta o `owner` das faces do patch para `fieldio.patch_face_values`.
+_PatchOwners = namedtuple("_PatchOwners", ["owner"])
+
+
+def _read_field(path):
+    real = foamdict.resolve_foam_file(path)
+    if real is None:
+        raise FileNotFoundError(path)
+    return fieldio.read_field(real)
+
+
+def read_decomposed_mesh(case_path, max_workers=None):
+    """Lê os subdomínios em paralelo e devolve o `DecomposedMesh` costurado.
+
+    Os subdomínios são lidos num pool de processos (`spawn`, seguro a partir
+    de uma aplicação com threads). Levanta ValueError se o caso não for
+    decomposto e OSError/ValueError se algum subdomínio não puder ser lido.
+    """
+    dirs = processor_dirs(case_path)
+    if not dirs:
+        raise ValueError(f"No processor directories in {case_path}")
+    workers = min(len(dirs), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        parts = [read_processor_patches(d) for d in dirs]
+    else:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            parts = list(pool.map(read_processor_patches, dirs))
+    return DecomposedMesh(case_path, dirs, parts)
+
+
+def read_decomposed_patches(case_path, time_name=None, field_name=None, source="patch", which="magnitude",
+                            max_workers=None):
+    """Superfícies dos patches do caso decomposto, com os valores do campo se pedido.
+
+    Devolve `[(patch, pontos, células, valores ou None)]`; para colorir várias
+    vezes o mesmo caso, guarde o resultado de `read_decomposed_mesh`.
+    """
+    mesh = read_decomposed_mesh(case_path, max_workers)
+    values = mesh.field_values(time_name, field_name, source, which, max_workers=max_workers) if field_name else {}
+    return [(patch, points, cells, values.get(patch["name"])) for patch, points, cells in mesh.surfaces]
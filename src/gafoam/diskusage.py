@@ -0,0 +1,251 @@
+"""Ocupação em disco dos diretórios de tempo de um caso.
+
+Módulo sem dependência de Qt. Mede, com `os.scandir` num pool de threads,
+cada diretório de tempo da raiz e de cada `processor*`, separando os bytes
+por campo, e os `constant/` (malha) de cada local. A partir do `controlDict`
+(`writeControl`, `writeInterval`, `endTime`, `purgeWrite`) projeta quanto a
+simulação ainda vai gravar. As ações de limpeza apagam diretórios de tempo
+inteiros (em todos os locais) ou comprimem os campos com gzip, como o
+`writeCompression on;` faria.
+"""
+
+import gzip
+import math
+import os
+import shutil
+import tempfile
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from gafoam import foamdict
+from gafoam.timeindex import TimeIndex
+
+# Ocupação de um diretório de tempo em um local ("" para a raiz do caso,
+# "processorN" para um subdomínio). `fields` é `{campo: bytes}`, com arquivos
+# comprimidos pelo nome original e subdiretórios (`uniform/`) com barra final.
+TimeUsage = namedtuple("TimeUsage", ["name", "value", "location", "bytes", "fields"])
+
+# `times` em ordem numérica; `other` é `{local: bytes}` do `constant/` de cada local.
+CaseUsage = namedtuple("CaseUsage", ["case_path", "times", "other"])
+
+# Campos menores que isto não compensam a compressão.
+MIN_COMPRESS_BYTES = 4096
+
+# Controles de gravação que permitem projetar a saída em tempo simulado.
+_SIM_TIME_CONTROLS = {"runTime", "adjustableRunTime", "timeStep"}
+
+
+def tree_size(path):
+    """`(bytes, arquivos)` de tudo abaixo de `path`, sem seguir links simbólicos."""
+    total = files = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            total += entry.stat(follow_symlinks=False).st_size
+                            files += 1
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total, files
+
+
+def time_dir_usage(time_dir):
+    """`{campo: bytes}` de um diretório de tempo."""
+    fields = {}
+    try:
+        with os.scandir(time_dir) as it:
+            entries = list(it)
+    except OSError:
+        return fields
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                fields[entry.name + "/"] = tree_size(entry.path)[0]
+            else:
+                name = foamdict.strip_compressed_suffix(entry.name)
+                fields[name] = fields.get(name, 0) + entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
+    return fields
+
+
+def _location_path(case_path, location):
+    return os.path.join(case_path, location) if location else case_path
+
+
+def scan_usage(case_path, max_workers=None):
+    """Mede todos os diretórios de tempo e os `constant/` do caso em paralelo."""
+    index = TimeIndex(case_path)
+    jobs = [(entry, location) for entry in index.times() for location in entry.locations]
+    locations = [""] + index.processors
+
+    def measure(job):
+        entry, location = job
+        fields = time_dir_usage(os.path.join(_location_path(case_path, location), entry.name))
+        return TimeUsage(entry.name, entry.value, location, sum(fields.values()), fields)
+
+    def measure_constant(location):
+        return tree_size(os.path.join(_location_path(case_path, location), "constant"))[0]
+
+    with ThreadPoolExecutor(max_workers=max_workers or min(16, (os.cpu_count() or 2) * 2)) as pool:
+        constant = pool.map(measure_constant, locations)
+        times = list(pool.map(measure, jobs))
+        other = dict(zip(locations, constant))
+    return CaseUsage(case_path, times, other)
+
+
+def bytes_per_time(usage):
+    """`{tempo: bytes}` somando todos os locais, em ordem numérica."""
+    totals = {}
+    for time in usage.times:
+        totals[time.name] = totals.get(time.name, 0) + time.bytes
+    return totals
+
+
+def bytes_per_field(usage):
+    """`{campo: bytes}` somando todos os tempos e locais, do maior para o menor."""
+    totals = {}
+    for time in usage.times:
+        for field, size in time.fields.items():
+            totals[field] = totals.get(field, 0) + size
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+def bytes_per_location(usage):
+    """`{local: bytes}` dos tempos mais o `constant/` de cada local ("" é a raiz)."""
+    totals = dict(usage.other)
+    for time in usage.times:
+        totals[time.location] = totals.get(time.location, 0) + time.bytes
+    return totals
+
+
+def total_bytes(usage):
+    return sum(time.bytes for time in usage.times) + sum(usage.other.values())
+
+
+def _number(control, key):
+    try:
+        return float(control[key])
+    except (KeyError, ValueError):
+        return None
+
+
+def project_output(usage, control):
+    """Projeção da saída até o `endTime`, ou None se não der para estimar.
+
+    Devolve `{"interval", "remaining_writes", "bytes_per_write",
+    "projected_bytes"}`: o intervalo de gravação em tempo simulado, quantos
+    diretórios de tempo ainda serão gravados, o tamanho de um deles (o do
+    último tempo gravado, que já tem todos os campos) e o total projetado
+    para os diretórios de tempo ao fim da simulação, respeitando `purgeWrite`.
+    Controles por tempo de relógio (`clockTime`, `cpuTime`) não são projetáveis.
+    """
+    per_time = bytes_per_time(usage)
+    write_control = control.get("writeControl", "timeStep")
+    interval = _number(control, "writeInterval")
+    end_time = _number(control, "endTime")
+    if not per_time or write_control not in _SIM_TIME_CONTROLS or not interval or end_time is None:
+        return None
+    if write_control == "timeStep":
+        delta_t = _number(control, "deltaT")
+        if not delta_t:
+            return None
+        interval *= delta_t
+
+    values = sorted({time.value: time.name for time in usage.times}.items())
+    latest_value, latest_name = values[-1]
+    remaining = max(0, math.floor((end_time - latest_value) / interval + 1e-6))
+    per_write = per_time[latest_name]
+
+    # O primeiro tempo (condições iniciais) nunca é apagado pelo `purgeWrite`.
+    written = [per_time[name] for _, name in values[1:]]
+    purge = int(_number(control, "purgeWrite") or 0)
+    if purge > 0:
+        kept = min(len(written) + remaining, purge)
+        projected = per_time[values[0][1]] + kept * per_write
+    else:
+        projected = sum(per_time.values()) + remaining * per_write
+    return {
+        "interval": interval,
+        "remaining_writes": remaining,
+        "bytes_per_write": per_write,
+        "projected_bytes": projected,
+    }
+
+
+def purge_candidates(usage, keep_latest):
+    """Tempos que uma limpeza apagaria: todos menos o primeiro e os `keep_latest` mais recentes."""
+    names = list(bytes_per_time(usage))
+    middle = names[1:]
+    return middle[:max(0, len(middle) - max(0, keep_latest))]
+
+
+def purge_times(case_path, names):
+    """Apaga os diretórios de tempo `names` da raiz e de todos os `processor*`.
+
+    Devolve os bytes liberados. Levanta OSError se algum não puder ser apagado.
+    """
+    index = TimeIndex(case_path)
+    freed = 0
+    for name in names:
+        for time_dir in index.time_dirs(name):
+            freed += tree_size(time_dir)[0]
+            shutil.rmtree(time_dir)
+    return freed
+
+
+def compress_file(path):
+    """Comprime `path` para `path.gz` e apaga o original. Devolve os bytes economizados.
+
+    O `.gz` é escrito num temporário e só então renomeado, para que uma falha
+    no meio do caminho não deixe o campo truncado.
+    """
+    size = os.path.getsize(path)
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(prefix=".gafoam-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as raw, open(path, "rb") as src:
+            with gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path + foamdict.COMPRESSED_SUFFIX)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    compressed = os.path.getsize(path + foamdict.COMPRESSED_SUFFIX)
+    os.unlink(path)
+    return size - compressed
+
+
+def compressible_files(case_path, names):
+    """Campos ainda sem compressão dos tempos `names`, em todos os locais."""
+    index = TimeIndex(case_path)
+    paths = []
+    for name in names:
+        for time_dir in index.time_dirs(name):
+            try:
+                with os.scandir(time_dir) as it:
+                    for entry in it:
+                        if (entry.is_file(follow_symlinks=False) and not entry.name.startswith(".")
+                                and not foamdict.is_compressed(entry.name)
+                                and not os.path.exists(entry.path + foamdict.COMPRESSED_SUFFIX)
+                                and entry.stat().st_size >= MIN_COMPRESS_BYTES):
+                            paths.append(entry.path)
+            except OSError:
+                continue
+    return paths
+
+
+def compress_times(case_path, names, max_workers=None):
+    """Comprime os campos dos tempos `names` em paralelo. Devolve os bytes economizados."""
+    paths = compressible_files(case_path, names)
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 2) as pool:
+        return sum(pool.map(compress_file, paths))
@@ -0,0 +1,172 @@
+"""Navegador de campos por diretório de tempo, sobre `timeindex.TimeIndex`."""
+
+import bisect
+
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTreeWidget,
+    QTreeWidgetItem, QHeaderView,
+)
+
+from gafoam import foamdict
+from gafoam.timeindex import TimeIndex
+
+TIME_ROLE = Qt.UserRole
+FIELD_ROLE = Qt.UserRole + 1
+VALUE_ROLE = Qt.UserRole + 2
+
+
+class FieldBrowserWidget(QWidget):
+    """Lista os tempos do caso em ordem numérica e os campos de cada um.
+
+    Os campos de um tempo só são listados quando o item é expandido, e o
+    resumo do cabeçalho só é lido quando o campo é selecionado; casos com
+    milhares de tempos abrem sem varrer os diretórios de cada um.
+    """
+
+    field_activated = Signal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.index = TimeIndex()
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(2)
+
+        toolbar = QHBoxLayout()
+        toolbar.setContentsMargins(6, 4, 6, 4)
+        self.summary_label = QLabel("No case loaded.")
+        toolbar.addWidget(self.summary_label)
+        toolbar.addStretch()
+        self.reload_button = QPushButton("Reload")
+        self.reload_button.clicked.connect(self.reload)
+        toolbar.addWidget(self.reload_button)
+        layout.addLayout(toolbar)
+
+        self.tree = QTreeWidget()
+        self.tree.setColumnCount(2)
+        self.tree.setHeaderLabels(["Time / Field", "Location"])
+        self.tree.header().setSectionResizeMode(0, QHeaderView.Interactive)
+        self.tree.header().resizeSection(0, 220)
+        self.tree.setUniformRowHeights(True)
+        self.tree.itemExpanded.connect(self._populate_fields)
+        self.tree.currentItemChanged.connect(self._on_current_changed)
+        self.tree.itemDoubleClicked.connect(self._on_double_clicked)
+        layout.addWidget(self.tree)
+
+        self.details_label = QLabel("")
+        self.details_label.setWordWrap(True)
+        self.details_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self.details_label.setContentsMargins(6, 2, 6, 4)
+        layout.addWidget(self.details_label)
+
+    def load_case(self, case_path):
+        self.index.scan(case_path)
+        self.tree.clear()
+        self.details_label.setText("")
+        self._sync_times()
+
+    def reload(self):
+        if self.index.case_path:
+            self.load_case(self.index.case_path)
+
+    def on_directory_changed(self, dir_path):
+        """Atualiza só a parte da árvore afetada pela mudança em `dir_path`."""
+        times_changed, names = self.index.update(dir_path)
+        if times_changed:
+            self._sync_times()
+            # Um tempo novo costuma fechar a escrita do anterior, que não é observado.
+            names = names | {self.tree.topLevelItem(row).data(0, TIME_ROLE)
+                             for row in range(self.tree.topLevelItemCount())
+                             if self.tree.topLevelItem(row).isExpanded()}
+        for name in names:
+            item = self._time_item(name)
+            if item is not None and item.isExpanded():
+                self._populate_fields(item, force=True)
+
+    def _location_text(self, entry):
+        processors = [loc for loc in entry.locations if loc]
+        parts = ["case"] if "" in entry.locations else []
+        if processors:
+            parts.append(f"{len(processors)} processor{'s' if len(processors) != 1 else ''}")
+        return " + ".join(parts)
+
+    def _time_item(self, name):
+        for row in range(self.tree.topLevelItemCount()):
+            item = self.tree.topLevelItem(row)
+            if item.data(0, TIME_ROLE) == name:
+                return item
+        return None
+
+    def _sync_times(self):
+        """Insere e remove itens de tempo sem reconstruir os que continuam existindo."""
+        entries = self.index.times()
+        wanted = {entry.name: entry for entry in entries}
+        for row in reversed(range(self.tree.topLevelItemCount())):
+            if self.tree.topLevelItem(row).data(0, TIME_ROLE) not in wanted:
+                self.tree.takeTopLevelItem(row)
+
+        values = [self.tree.topLevelItem(row).data(0, VALUE_ROLE)
+                  for row in range(self.tree.topLevelItemCount())]
+        present = {self.tree.topLevelItem(row).data(0, TIME_ROLE): self.tree.topLevelItem(row)
+                   for row in range(self.tree.topLevelItemCount())}
+        for entry in entries:
+            item = present.get(entry.name)
+            if item is None:
+                item = QTreeWidgetItem([entry.name, ""])
+                item.setData(0, TIME_ROLE, entry.name)
+                item.setData(0, VALUE_ROLE, entry.value)
+                item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+                row = bisect.bisect_right(values, entry.value)
+                values.insert(row, entry.value)
+                self.tree.insertTopLevelItem(row, item)
+            item.setText(1, self._location_text(entry))
+
+        latest = entries[-1].name if entries else "-"
+        processors = len(self.index.processors)
+        self.summary_label.setText(
+            f"{len(entries)} time directories, latest {latest}"
+            + (f", {processors} processors" if processors else "")
+        )
+
+    def _populate_fields(self, item, force=False):
+        if item.parent() is not None:
+            return
+        name = item.data(0, TIME_ROLE)
+        fields = self.index.fields(name)
+        if item.childCount() and not force and fields == [item.child(i).data(0, FIELD_ROLE)
+                                                          for i in range(item.childCount())]:
+            return
+        item.takeChildren()
+        for field in fields:
+            paths = self.index.field_paths(name, field)
+            child = QTreeWidgetItem([field, f"{len(paths)} file{'s' if len(paths) != 1 else ''}"])
+            child.setData(0, TIME_ROLE, name)
+            child.setData(0, FIELD_ROLE, field)
+            item.addChild(child)
+        if not item.childCount():
+            item.setChildIndicatorPolicy(QTreeWidgetItem.DontShowIndicatorWhenChildless)
+
+    def _on_current_changed(self, item, _previous):
+        if item is None or item.data(0, FIELD_ROLE) is None:
+            self.details_label.setText("")
+            return
+        paths = self.index.field_paths(item.data(0, TIME_ROLE), item.data(0, FIELD_ROLE))
+        if not paths:
+            self.details_label.setText("")
+            return
+        header = foamdict.read_field_header(paths[0])
+        details = [header.get("class", "?")]
+        if header.get("dimensions"):
+            details.append(header["dimensions"])
+        if header.get("internalField"):
+            details.append(f"internalField {header['internalField']}")
+        self.details_label.setText(" · ".join(str(d) for d in details) + f"\n{paths[0]}")
+
+    def _on_double_clicked(self, item, _column):
+        if item.data(0, FIELD_ROLE) is None:
+            return
+        paths = self.index.field_paths(item.data(0, TIME_ROLE), item.data(0, FIELD_ROLE))
+        if paths:
+            self.field_activated.emit(paths[0])
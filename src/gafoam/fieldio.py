@@ -0,0 +1,309 @@
+"""Leitura de campos do OpenFOAM (`p`, `U`, `k`...) para arrays numpy.
+
+Módulo sem dependência de Qt nem de VTK. Lê o `internalField` e os valores
+`value` de cada patch do `boundaryField`, em ASCII ou binário (e comprimidos
+com gzip). Os arquivos sem compressão são mapeados em memória; as listas
+binárias são copiadas para fora do mapeamento, que é fechado ao fim da
+leitura: o solver pode reescrever (e truncar) o arquivo enquanto o campo
+ainda está no cache ou no visualizador.
+
+`FieldCache` guarda os campos já lidos com despejo LRU por tamanho, para que
+alternar entre tempos e campos não releia os arquivos; uma entrada vale
+enquanto o tamanho e a data de modificação do arquivo forem os mesmos.
+"""
+
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from gafoam import foamdict
+from gafoam.foamdict import LIST_COMPONENTS
+from gafoam.polymesh import open_buffer, read_header
+
+# Valor uniforme (`uniform 0` ou `uniform (1 0 0)`), aplicado a todos os elementos.
+Uniform = namedtuple("Uniform", ["value"])
+
+# `internal` é um array `(N,)`/`(N, k)` ou `Uniform`; `boundary` é
+# `{patch: {"type": ..., "value": array, Uniform ou None}}`, com as chaves
+# como escritas no arquivo (podem ser expressões regulares entre aspas).
+FoamField = namedtuple("FoamField", ["cls", "dimensions", "internal", "boundary"])
+
+# Orçamento padrão do cache de campos.
+DEFAULT_CACHE_BYTES = 512 * 1024 * 1024
+
+RE_SPACE = re.compile(rb"(?:\s+|//[^\n]*|/\*.*?\*/)*", re.DOTALL)
+RE_WORD = re.compile(rb"[^\s(){};]+")
+RE_PATCH_NAME = re.compile(rb'"[^"]*"|[^\s{};]+')
+RE_LIST_SIZE = re.compile(rb"(\d+)\s*([({])")
+RE_DIMENSIONS = re.compile(rb"\bdimensions\s+(\[[^\]]*\])\s*;")
+
+
+def _skip(buffer, pos):
+    return RE_SPACE.match(buffer, pos).end()
+
+
+def _numbers(text):
+    return np.fromstring(bytes(text).translate(None, b"()"), dtype=np.float64, sep=" ")
+
+
+def _uniform(text):
+    values = _numbers(text)
+    return Uniform(float(values[0]) if len(values) == 1 else values)
+
+
+def _end_of_entry(buffer, pos):
+    end = buffer.find(b";", pos)
+    if end < 0:
+        raise ValueError("Unterminated entry")
+    return end + 1
+
+
+def _parse_value(buffer, pos, fmt, label, scalar):
+    """Valor de uma entrada a partir de `pos`. Devolve `(valor, fim da entrada)`.
+
+    Listas `nonuniform` viram arrays, `uniform` vira `Uniform` e qualquer
+    outra coisa (`zeroGradient`, `$internalField`...) volta como texto.
+    """
+    pos = _skip(buffer, pos)
+    m = RE_WORD.match(buffer, pos)
+    word = m.group(0) if m else b""
+    if word == b"uniform":
+        end = _end_of_entry(buffer, m.end())
+        return _uniform(buffer[m.end():end - 1]), end
+    if word != b"nonuniform":
+        end = _end_of_entry(buffer, pos)
+        return bytes(buffer[pos:end - 1]).decode("utf-8", errors="replace").strip(), end
+
+    pos = _skip(buffer, m.end())
+    m = RE_WORD.match(buffer, pos)
+    list_type = m.group(0).decode() if m else ""
+    elem = list_type[list_type.find("<") + 1:list_type.rfind(">")] if "<" in list_type else "scalar"
+    size = RE_LIST_SIZE.match(buffer, _skip(buffer, m.end() if m else pos))
+    if size is None:
+        raise ValueError(f"Malformed nonuniform {list_type}")
+    count, start = int(size.group(1)), size.end()
+    if size.group(2) == b"{":
+        end = buffer.find(b"}", start)
+        return _uniform(buffer[start:end]), _end_of_entry(buffer, end)
+
+    n_comp = LIST_COMPONENTS.get(elem, 1)
+    if fmt == "binary":
+        dtype = label if elem == "label" else scalar
+        # Cópia: uma visão sobre o mapeamento não sobrevive ao arquivo truncado.
+        values = np.array(np.frombuffer(buffer, dtype=dtype, count=count * n_comp, offset=start))
+        end = _end_of_entry(buffer, start + values.nbytes)
+    else:
+        end = _end_of_entry(buffer, start)
+        close = buffer.rfind(b")", start, end)
+        values = _numbers(buffer[start:close]) if count else np.empty(0)
+        if len(values) != count * n_comp:
+            raise ValueError(f"Expected {count} {elem} values, found {len(values) / n_comp:g}")
+    return (values.reshape(count, n_comp) if n_comp > 1 else values), end
+
+
+def _skip_block(buffer, pos):
+    """Posição logo após o `}` que fecha o bloco aberto em `pos`."""
+    depth = 0
+    while True:
+        opening = buffer.find(b"{", pos)
+        closing = buffer.find(b"}", pos)
+        if closing < 0:
+            raise ValueError("Unterminated block")
+        if 0 <= opening < closing:
+            depth += 1
+            pos = opening + 1
+        else:
+            depth -= 1
+            pos = closing + 1
+            if depth == 0:
+                return pos
+
+
+def _parse_boundary(buffer, pos, fmt, label, scalar):
+    boundary = {}
+    pos = buffer.find(b"{", pos) + 1
+    while True:
+        pos = _skip(buffer, pos)
+        head = buffer[pos:pos + 1]
+        if head in (b"}", b""):
+            return boundary
+        if head == b"#":
+            # Diretivas (`#includeEtc`) não trazem valores lidos aqui.
+            pos = buffer.find(b"\n", pos)
+            pos = len(buffer) if pos < 0 else pos
+            continue
+        m = RE_PATCH_NAME.match(buffer, pos)
+        if m is None:
+            raise ValueError("Malformed boundaryField")
+        name = m.group(0).decode("utf-8", errors="replace")
+        pos = _skip(buffer, m.end())
+        if buffer[pos:pos + 1] != b"{":
+            pos = _end_of_entry(buffer, pos)
+            continue
+
+        entries = {"type": None, "value": None}
+        pos += 1
+        while True:
+            pos = _skip(buffer, pos)
+            head = buffer[pos:pos + 1]
+            if head == b"}":
+                pos += 1
+                break
+            if head == b"":
+                raise ValueError(f"Unterminated patch '{name}'")
+            m = RE_WORD.match(buffer, pos)
+            if m is None:
+                raise ValueError(f"Malformed patch '{name}'")
+            key = m.group(0)
+            pos = _skip(buffer, m.end())
+            if buffer[pos:pos + 1] == b"{":
+                pos = _skip_block(buffer, pos)
+                continue
+            value, pos = _parse_value(buffer, pos, fmt, label, scalar)
+            if key in (b"type", b"value"):
+                entries[key.decode()] = value
+        boundary[name] = entries
+
+
+def read_field(path):
+    """Campo do arquivo `path` (ou de sua variante `.gz`) como `FoamField`.
+
+    Levanta OSError se o arquivo não puder ser lido e ValueError se o
+    conteúdo não tiver o formato esperado.
+    """
+    buffer = open_buffer(path)
+    try:
+        fmt, cls, label, scalar, pos = read_header(buffer)
+        m = RE_DIMENSIONS.search(buffer, pos, min(len(buffer), pos + 65536))
+        dimensions = m.group(1).decode() if m else ""
+
+        internal = None
+        start = buffer.find(b"internalField", pos)
+        if start >= 0:
+            internal, pos = _parse_value(buffer, start + len(b"internalField"), fmt, label, scalar)
+            if isinstance(internal, str):
+                internal = None
+
+        boundary = {}
+        start = buffer.find(b"boundaryField", pos)
+        if start >= 0:
+            boundary = _parse_boundary(buffer, start + len(b"boundaryField"), fmt, label, scalar)
+    finally:
+        if isinstance(buffer, mmap.mmap):
+            buffer.close()
+    return FoamField(cls, dimensions, internal, boundary)
+
+
+def _nbytes(field):
+    total = field.internal.nbytes if isinstance(field.internal, np.ndarray) else 0
+    for entries in field.boundary.values():
+        if isinstance(entries["value"], np.ndarray):
+            total += entries["value"].nbytes
+    return total
+
+
+class FieldCache:
+    """Campos já lidos, com despejo do menos usado quando o orçamento estoura.
+
+    Seguro para uso a partir de threads de trabalho.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        real = foamdict.resolve_foam_file(path)
+        if real is None:
+            raise FileNotFoundError(path)
+        st = os.stat(real)
+        stamp = (st.st_size, st.st_mtime_ns)
+        with self._lock:
+            cached = self._entries.get(real)
+            if cached is not None and cached[0] == stamp:
+                self._entries.move_to_end(real)
+                return cached[2]
+
+        field = read_field(real)
+        size = _nbytes(field)
+        with self._lock:
+            old = self._entries.pop(real, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[real] = (stamp, size, field)
+            self._bytes += size
+            # O campo recém-lido fica mesmo que sozinho exceda o orçamento.
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+        return field
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+
+def boundary_entry(field, patch_name):
+    """Entrada do `boundaryField` que vale para o patch: nome exato ou expressão regular."""
+    if patch_name in field.boundary:
+        return field.boundary[patch_name]
+    for key, entries in field.boundary.items():
+        if key.startswith('"') and key.endswith('"'):
+            try:
+                if re.fullmatch(key[1:-1], patch_name):
+                    return entries
+            except re.error:
+                continue
+    return None
+
+
+def _expand(value, count):
+    if isinstance(value, Uniform):
+        value = np.asarray(value.value, dtype=np.float64)
+        return np.broadcast_to(value, (count,) + value.shape)
+    return value
+
+
+def patch_face_values(mesh, field, patch, source="patch"):
+    """Valores do campo nas faces de um patch de `polymesh.PolyMesh`.
+
+    Com `source="patch"`, usa o `value` do `boundaryField` e, se o patch não
+    tiver um (`zeroGradient`, `empty`...), cai para o valor da célula dona;
+    com `source="cell"`, usa sempre o `internalField` da célula dona.
+    """
+    start, n_faces = patch["startFace"], patch["nFaces"]
+    if source == "patch":
+        entries = boundary_entry(field, patch["name"])
+        value = entries["value"] if entries else None
+        if isinstance(value, Uniform) or (isinstance(value, np.ndarray) and len(value) == n_faces):
+            return np.asarray(_expand(value, n_faces), dtype=np.float64)
+    if field.internal is None:
+        raise ValueError("Field has no internalField values")
+    if isinstance(field.internal, Uniform):
+        return np.array(_expand(field.internal, n_faces), dtype=np.float64)
+    owners = np.asarray(mesh.owner[start:start + n_faces], dtype=np.int64)
+    return np.asarray(field.internal[owners], dtype=np.float64)
+
+
+def component(values, which="magnitude"):
+    """Escalar por elemento: o próprio valor, a magnitude ou o componente de índice `which`."""
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        return values
+    if which == "magnitude":
+        return np.linalg.norm(values, axis=1)
+    return values[:, int(which)]
@@ -1,59 +1,335 @@
 import os
-from PySide6.QtWidgets import QTreeView, QFileSystemModel, QHeaderView, QFileIconProvider
-from PySide6.QtCore import Qt, QSize, QFileInfo
+from PySide6.QtWidgets import QTreeView, QHeaderView
+from PySide6.QtCore import Qt, QSize, QAbstractItemModel, QModelIndex
 from PySide6.QtGui import QIcon
+from gafoam.foamdict import strip_compressed_suffix
 from gafoam.resources import icon_path
+from gafoam.timeindex import RE_PROCESSOR, time_value
 
+# A partir de quantos diretórios de tempo/`processor*` eles viram um nó agrupado.
+GROUP_THRESHOLD = 10
 
-class FoamFileIconProvider(QFileIconProvider):
-    """Provedor de ícones multiplataforma para o explorador de arquivos OpenFOAM.
-    
-    Garante renderização perfeita em ambientes Linux/Ubuntu/WSL sem dependência de temas XDG.
+
+def icon_name_for(name, is_dir=False):
+    """Nome do ícone do pacote para um arquivo ou diretório, decidido só pelo nome."""
+    if is_dir:
+        return "folder.svg"
+
+    # Arquivos comprimidos (`writeCompression on;`) usam o ícone do original.
+    fname = strip_compressed_suffix(name.lower())
+    suffix = os.path.splitext(fname)[1].lstrip(".")
+
+    if suffix in ("stl", "obj"):
+        return "file_mesh.svg"
+    elif suffix == "pdf":
+        return "file_pdf.svg"
+    elif suffix == "foam":
+        return "file_foam.svg"
+    elif suffix in ("sh", "py") or fname in ("allrun", "allclean", "mesh.sh"):
+        return "file_script.svg"
+    elif fname.endswith("dict") or fname in ("fvschemes", "fvsolution", "controldict", "blockmeshdict"):
+        return "file_dict.svg"
+    elif fname.startswith("log.") or suffix == "log":
+        return "cmd_dollar.svg"
+    return "file_generic.svg"
+
+
+class _Node:
+    """Item da árvore: arquivo, diretório ou grupo virtual de tempos/`processor*`.
+
+    `children` fica None até o diretório ser listado; grupos nascem com os
+    filhos. `key` identifica o item entre os irmãos nas atualizações.
+    """
+
+    __slots__ = ("name", "path", "is_dir", "group", "parent", "children", "mtime", "grouped", "key")
+
+    def __init__(self, name, path, is_dir, group=None):
+        self.name = name
+        self.path = path
+        self.is_dir = is_dir
+        self.group = group
+        self.parent = None
+        self.children = [] if group else None
+        self.mtime = None
+        self.grouped = None
+        self.key = f"\0{group}" if group else name
+
+
+def _list_dir(path):
+    """`(diretórios, arquivos)` de `path` com `os.scandir`, sem `stat` por entrada."""
+    dirs, files = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name.startswith("."):
+                    continue
+                try:
+                    (dirs if entry.is_dir() else files).append(entry.name)
+                except OSError:
+                    files.append(entry.name)
+    except OSError:
+        pass
+    return dirs, files
+
+
+def _dir_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class CaseTreeModel(QAbstractItemModel):
+    """Árvore do caso com carregamento sob demanda e agrupamento de tempos e subdomínios.
+
+    Cada diretório só é listado quando expandido. Diretórios de tempo (menos
+    o primeiro, o das condições iniciais) e `processor*` em número maior que
+    `GROUP_THRESHOLD` viram um nó como `processor0…255 (256)`, em ordem
+    numérica; um diretório que cruza o limite durante a simulação passa a
+    agrupar e não volta atrás. Ícones são escolhidos pelo nome e
+    reaproveitados por tipo.
+
+    Oferece o subconjunto da API do `QFileSystemModel` usado pela janela:
+    `setRootPath`, `rootPath`, `index(caminho)`, `isDir` e `filePath`.
     """
 
-    def __init__(self):
-        super().__init__()
-        self._cache = {}
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._root = None
+        self._icons = {}
+
+    # ── API no estilo do QFileSystemModel ──
+
+    def setRootPath(self, path):
+        self.beginResetModel()
+        self._root = _Node(os.path.basename(path), os.path.normpath(path), True) if path else None
+        if self._root is not None:
+            self._root.children = []
+        self.endResetModel()
+        if self._root is not None:
+            self._populate(self._root)
+        return QModelIndex()
+
+    def rootPath(self):
+        return self._root.path if self._root else ""
+
+    def index(self, row, column=0, parent=QModelIndex()):
+        if isinstance(row, str):
+            node = self._find(row)
+            return self._index_of(node) if node is not None else QModelIndex()
+        node = self._node(parent)
+        if node is None or node.children is None or not 0 <= row < len(node.children) or column != 0:
+            return QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def isDir(self, index):
+        node = self._node(index)
+        return node is not None and node.is_dir
+
+    def filePath(self, index):
+        node = self._node(index)
+        return node.path if node is not None else ""
+
+    def refresh(self, path):
+        """Relista o diretório `path` se ele já tiver sido carregado, inserindo e removendo só o que mudou."""
+        node = self._find(path, fetch=False)
+        if node is not None and node.is_dir and not node.group and node.children is not None:
+            self._populate(node)
+
+    def refresh_if_stale(self, index):
+        """Relista o diretório de `index` se ele mudou desde a última listagem (um único `stat`)."""
+        node = self._node(index)
+        if node is not None and node.is_dir and not node.group and node.children is not None:
+            if _dir_mtime(node.path) != node.mtime:
+                self._populate(node)
+
+    # ── QAbstractItemModel ──
 
-    def _get_icon(self, name):
-        if name not in self._cache:
+    def _node(self, index):
+        return index.internalPointer() if index.isValid() else self._root
+
+    def _index_of(self, node):
+        if node is None or node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.parent.children.index(node), 0, node)
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+        return self._index_of(index.internalPointer().parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        node = self._node(parent)
+        return len(node.children) if node is not None and node.children is not None else 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self._node(parent)
+        if node is None:
+            return False
+        if node.children is None:
+            return node.is_dir
+        return bool(node.children)
+
+    def canFetchMore(self, parent):
+        node = self._node(parent)
+        return node is not None and node.is_dir and node.children is None
+
+    def fetchMore(self, parent):
+        node = self._node(parent)
+        if node is not None and node.children is None:
+            node.children = []
+            self._populate(node)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and section == 0:
+            return "Name"
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == Qt.DisplayRole:
+            return node.name
+        if role == Qt.DecorationRole:
+            return self._icon(icon_name_for(node.name, node.is_dir))
+        if role == Qt.ToolTipRole:
+            return node.path if not node.group else f"{len(node.children)} directories in {node.path}"
+        return None
+
+    def _icon(self, name):
+        icon = self._icons.get(name)
+        if icon is None:
             p = icon_path(name)
-            if os.path.isfile(p):
-                self._cache[name] = QIcon(p)
-            else:
-                self._cache[name] = QIcon()
-        return self._cache[name]
-
-    def icon(self, type_or_info):
-        if isinstance(type_or_info, QFileInfo):
-            info = type_or_info
-            fname = info.fileName().lower()
-            suffix = info.suffix().lower()
-
-            if info.isDir():
-                return self._get_icon("folder.svg")
-
-            if suffix in ("stl", "obj"):
-                return self._get_icon("file_mesh.svg")
-            elif suffix == "pdf":
-                return self._get_icon("file_pdf.svg")
-            elif suffix == "foam":
-                return self._get_icon("file_foam.svg")
-            elif suffix in ("sh", "py") or fname in ("allrun", "allclean", "mesh.sh"):
-                return self._get_icon("file_script.svg")
-            elif fname.endswith("dict") or fname in ("fvschemes", "fvsolution", "controldict", "blockmeshdict"):
-                return self._get_icon("file_dict.svg")
-            elif fname.startswith("log.") or suffix == "log":
-                return self._get_icon("cmd_dollar.svg")
+            icon = QIcon(p) if os.path.isfile(p) else QIcon()
+            self._icons[name] = icon
+        return icon
+
+    # ── Listagem e atualização ──
+
+    def _build_children(self, node):
+        """Filhos desejados de `node`, na ordem de exibição, com os grupos já montados."""
+        dirs, files = _list_dir(node.path)
+        times, processors, others = [], [], []
+        for name in dirs:
+            value = time_value(name)
+            if value is not None:
+                times.append((value, name))
+                continue
+            m = RE_PROCESSOR.match(name)
+            if m:
+                processors.append((int(m.group(1)), name))
             else:
-                return self._get_icon("file_generic.svg")
+                others.append(name)
+        times.sort()
+        processors.sort()
+        # Um diretório passa a agrupar quando cruza o limite e nunca volta a desagrupar,
+        # para a árvore não se reorganizar a cada tempo escrito ou apagado.
+        grouped = node.grouped or {"time": False, "processor": False}
+        node.grouped = {
+            "time": grouped["time"] or len(times) - 1 > GROUP_THRESHOLD,
+            "processor": grouped["processor"] or len(processors) > GROUP_THRESHOLD,
+        }
+
+        def child(name, is_dir=True):
+            return _Node(name, os.path.join(node.path, name), is_dir)
+
+        def group(kind, names, label):
+            grouped = _Node(f"{label} ({len(names)})", node.path, True, group=kind)
+            for name in names:
+                item = child(name)
+                item.parent = grouped
+                grouped.children.append(item)
+            return grouped
 
-        elif isinstance(type_or_info, QFileIconProvider.IconType):
-            if type_or_info in (QFileIconProvider.Folder, QFileIconProvider.Drive):
-                return self._get_icon("folder.svg")
-            return self._get_icon("file_generic.svg")
+        result = [child(name) for _, name in times[:1]]
+        rest = [name for _, name in times[1:]]
+        if node.grouped["time"] and rest:
+            result.append(group("time", rest, f"{rest[0]}…{rest[-1]}"))
+        else:
+            result.extend(child(name) for name in rest)
 
-        return super().icon(type_or_info)
+        # `processor*` entram na posição alfabética de "processor" entre os outros diretórios.
+        keyed = [(name.casefold(), child(name)) for name in others]
+        names = [name for _, name in processors]
+        if node.grouped["processor"] and names:
+            keyed.append(("processor", group("processor", names, f"processor{processors[0][0]}…{processors[-1][0]}")))
+        else:
+            keyed.extend(("processor", child(name)) for name in names)
+        keyed.sort(key=lambda item: item[0])
+        result.extend(item for _, item in keyed)
+        result.extend(child(name, False) for name in sorted(files, key=str.casefold))
+        return result
+
+    def _populate(self, node):
+        node.mtime = _dir_mtime(node.path)
+        self._sync(node, self._build_children(node))
+
+    def _sync(self, node, wanted):
+        """Ajusta os filhos de `node` para `wanted` com inserções e remoções pontuais."""
+        parent_index = self._index_of(node)
+        keys = {item.key for item in wanted}
+        for row in reversed(range(len(node.children))):
+            if node.children[row].key not in keys:
+                self.beginRemoveRows(parent_index, row, row)
+                del node.children[row]
+                self.endRemoveRows()
+
+        present = {item.key: item for item in node.children}
+        for row, fresh in enumerate(wanted):
+            old = present.get(fresh.key)
+            if old is None:
+                self.beginInsertRows(parent_index, row, row)
+                fresh.parent = node
+                node.children.insert(row, fresh)
+                self.endInsertRows()
+            elif fresh.group:
+                for item in fresh.children:
+                    item.parent = None
+                self._sync(old, fresh.children)
+                if old.name != fresh.name:
+                    old.name = fresh.name
+                    index = self._index_of(old)
+                    self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    def _find(self, path, fetch=True):
+        """Nó do caminho `path`, carregando os diretórios do caminho se `fetch`."""
+        if self._root is None or not path:
+            return None
+        rel = os.path.relpath(os.path.normpath(path), self._root.path)
+        if rel == ".":
+            return self._root
+        if rel.startswith(".."):
+            return None
+        node = self._root
+        for part in rel.split(os.sep):
+            if node.children is None:
+                if not fetch:
+                    return None
+                node.children = []
+                self._populate(node)
+            found = None
+            for item in node.children:
+                if item.group:
+                    found = next((c for c in item.children if c.name == part), None)
+                elif item.name == part:
+                    found = item
+                if found is not None:
+                    break
+            if found is None:
+                return None
+            node = found
+        return node
 
 
 class FileBrowser:
@@ -61,14 +337,13 @@ class FileBrowser:
 
     def __init__(self, scale=1.0, parent=None):
         self.scale = scale
-        self.file_model = QFileSystemModel(parent)
-        self.icon_provider = FoamFileIconProvider()
-        self.file_model.setIconProvider(self.icon_provider)
+        self.file_model = CaseTreeModel(parent)
         self.file_model.setRootPath("")
 
         self.file_view = QTreeView(parent)
         self.file_view.setModel(self.file_model)
         self.file_view.setRootIndex(self.file_model.index(""))
+        self.file_view.setUniformRowHeights(True)
 
         self.file_view.setHeaderHidden(False)
         self.file_view.setTextElideMode(Qt.ElideNone)
@@ -79,10 +354,10 @@ class FileBrowser:
         except Exception:
             pass
         self.file_view.setAnimated(True)
-        self.file_view.setSortingEnabled(True)
         self.file_view.setMinimumWidth(int(260 * self.scale))
         self.file_view.setIconSize(QSize(int(18 * self.scale), int(18 * self.scale)))
         self.file_view.clicked.connect(self._on_tree_clicked)
+        self.file_view.expanded.connect(self.file_model.refresh_if_stale)
 
     def _on_tree_clicked(self, index):
         if not index.isValid():
@@ -97,6 +372,8 @@ class FileBrowser:
         self.file_model.setRootPath(path)
         self.file_view.setRootIndex(self.file_model.index(path))
 
+    def refresh(self, path):
+        self.file_model.refresh(path)
+
     def set_click_callback(self, callback):
         self.file_view.clicked.connect(callback)
-
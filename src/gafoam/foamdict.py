@@ -1,12 +1,32 @@
 """Leitura e escrita dos dicionários de um caso OpenFOAM.
 
 Módulo sem dependência de Qt, para que a manipulação dos arquivos do caso
-possa ser testada isoladamente da interface.
+possa ser testada isoladamente da interface. O acesso de baixo nível aos
+arquivos (compressão, escrita atômica, `CaseTransaction`) fica em `foamfile`,
+compartilhado com `foammacro`; os nomes são reexportados aqui.
 """
 
+import concurrent.futures
 import os
 import re
 
+from gafoam import foammacro
+from gafoam.foamfile import (
+    COMPRESSED_SUFFIX,
+    STREAM_CHUNK_SIZE,
+    CaseTransaction,
+    is_compressed,
+    iter_foam_chunks,
+    open_foam_file,
+    read_foam_text,
+    resolve_foam_file,
+    staged_content,
+    strip_comments,
+    strip_compressed_suffix,
+    write_atomic,
+    write_foam_text,
+)
+
 # Subdiretórios obrigatórios de um caso OpenFOAM.
 REQUIRED_CASE_DIRS = ("0", "constant", "system")
 
@@ -25,12 +45,9 @@ CONTROL_DICT_KEYS = (
     "maxCo",
 )
 
-RE_LINE_COMMENT = re.compile(r"//.*")
-RE_BLOCK_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
 RE_RESIDUAL_CONTROL = re.compile(r"residualControl\s*\{")
 RE_DICT_ENTRY = re.compile(r'([a-zA-Z0-9_"\(\)\|\s\-]+)\s+([0-9eE\.\-]+)\s*;')
 
-
 def validate_case_dirs(path):
     """Subdiretórios obrigatórios ausentes no caminho informado."""
     if not path:
@@ -51,9 +68,21 @@ def fv_solution_path(case_path):
     return os.path.join(case_path, "system", "fvSolution")
 
 
-def strip_comments(content):
-    """Remove comentários de linha e de bloco de um dicionário."""
-    return RE_BLOCK_COMMENT.sub("", RE_LINE_COMMENT.sub("", content))
+def read_expanded_text(path):
+    """Texto do dicionário sem comentários e com `#include` e macros `$` resolvidos.
+
+    Os leitores abaixo aplicam suas expressões regulares sobre este texto, de
+    modo que valores vindos de arquivos incluídos ou de `$macros` aparecem já
+    resolvidos. Numa inclusão circular devolve o texto original sem comentários.
+    """
+    try:
+        staged = staged_content(path)
+        if staged is not None:
+            values = foammacro.expand_text(staged, os.path.dirname(os.path.abspath(path)))
+            return foammacro.format_dictionary(values)
+        return foammacro.format_dictionary(foammacro.expand_file(path))
+    except foammacro.IncludeCycleError:
+        return strip_comments(read_foam_text(path))
 
 
 def read_control_dict(case_path):
@@ -65,8 +94,7 @@ def read_control_dict(case_path):
     if not os.path.isfile(dict_path):
         return {}
     try:
-        with open(dict_path, "r", encoding="utf-8") as f:
-            clean = strip_comments(f.read())
+        clean = read_expanded_text(dict_path)
     except OSError:
         return {}
 
@@ -87,15 +115,13 @@ def write_control_dict(case_path, values):
     if not os.path.isfile(dict_path):
         return False
     try:
-        with open(dict_path, "r", encoding="utf-8") as f:
-            content = f.read()
+        content = read_foam_text(dict_path)
 
         for key, val in values.items():
             pattern = rf"(\b{key}\s+)[^;]+(\s*;)"
             content = re.sub(pattern, rf"\g<1>{val}\g<2>", content)
 
-        with open(dict_path, "w", encoding="utf-8") as f:
-            f.write(content)
+        write_foam_text(dict_path, content)
         return True
     except OSError:
         return False
@@ -111,8 +137,7 @@ def parse_residual_controls(case_path):
     if not os.path.isfile(sol_path):
         return {}
     try:
-        with open(sol_path, "r", encoding="utf-8") as f:
-            content = f.read()
+        content = read_expanded_text(sol_path)
     except OSError:
         return {}
 
@@ -168,9 +193,12 @@ def match_residual_target(targets, name, default=1e-5):
     return default
 
 
-def verify_case(case_path):
+def verify_case(case_path, deep=False):
     """Executa uma verificação global da integridade do caso OpenFOAM antes da execução.
-    
+
+    Com `deep=True` executa também as verificações de conteúdo (ver
+    `deep_verify_case`).
+
     Retorna uma tupla (is_valid: bool, issues: list[str], warnings: list[str]).
     """
     issues = []
@@ -200,10 +228,9 @@ def verify_case(case_path):
             
     # 4. Malha (constant/polyMesh)
     poly_mesh_dir = os.path.join(case_path, "constant", "polyMesh")
-    has_poly_mesh = os.path.isdir(poly_mesh_dir) and (
-        os.path.isfile(os.path.join(poly_mesh_dir, "points")) or
-        os.path.isfile(os.path.join(poly_mesh_dir, "faces")) or
-        os.path.isfile(os.path.join(poly_mesh_dir, "boundary"))
+    has_poly_mesh = os.path.isdir(poly_mesh_dir) and any(
+        resolve_foam_file(os.path.join(poly_mesh_dir, name))
+        for name in ("points", "faces", "boundary")
     )
     if not has_poly_mesh:
         issues.append(
@@ -214,8 +241,7 @@ def verify_case(case_path):
     decomp_dict = os.path.join(sys_dir, "decomposeParDict")
     if os.path.isfile(decomp_dict):
         try:
-            with open(decomp_dict, "r", encoding="utf-8", errors="ignore") as f:
-                content = strip_comments(f.read())
+            content = read_expanded_text(decomp_dict)
             m = re.search(r"numberOfSubdomains\s+(\d+)\s*;", content)
             if m:
                 n_sub = int(m.group(1))
@@ -236,9 +262,265 @@ def verify_case(case_path):
     elif os.path.isdir(os.path.join(case_path, "0.orig")):
         warnings.append("'0.orig/' exists but '0/' was not created yet.")
 
+    if deep:
+        deep_issues, deep_warnings = deep_verify_case(case_path)
+        issues.extend(deep_issues)
+        warnings.extend(deep_warnings)
+
     return len(issues) == 0, issues, warnings
 
 
+# Dimensões esperadas dos campos mais comuns, em unidades SI
+# `[kg m s K mol A cd]`. Campos com duas entradas aceitam a forma cinemática
+# (dividida pela densidade) e a forma absoluta.
+KNOWN_FIELD_DIMENSIONS = {
+    "U": ((0, 1, -1, 0, 0, 0, 0),),
+    "p": ((0, 2, -2, 0, 0, 0, 0), (1, -1, -2, 0, 0, 0, 0)),
+    "p_rgh": ((0, 2, -2, 0, 0, 0, 0), (1, -1, -2, 0, 0, 0, 0)),
+    "k": ((0, 2, -2, 0, 0, 0, 0),),
+    "epsilon": ((0, 2, -3, 0, 0, 0, 0),),
+    "omega": ((0, 0, -1, 0, 0, 0, 0),),
+    "nut": ((0, 2, -1, 0, 0, 0, 0),),
+    "nuTilda": ((0, 2, -1, 0, 0, 0, 0),),
+    "T": ((0, 0, 0, 1, 0, 0, 0),),
+    "alphat": ((1, -1, -1, 0, 0, 0, 0),),
+}
+
+# Tipos de patch de restrição: o OpenFOAM os coloca automaticamente num
+# grupo com o nome do tipo, e `setConstraintTypes` define entradas para eles.
+CONSTRAINT_PATCH_TYPES = {
+    "empty", "symmetry", "symmetryPlane", "wedge", "cyclic", "cyclicAMI",
+    "cyclicACMI", "cyclicSlip", "nonConformalCyclic", "processor", "processorCyclic",
+}
+
+# Resultados das verificações profundas: `(nome, entradas) -> (carimbos, resultado)`.
+_CHECK_CACHE = {}
+
+RE_FOAMFILE_BLOCK = re.compile(r"\bFoamFile\s*\{[^}]*\}")
+
+
+def read_mesh_patches(case_path):
+    """Patches declarados em `constant/polyMesh/boundary`, na ordem do arquivo.
+
+    Devolve `{nome: {"type": ..., "nFaces": ..., ...}}`, com os valores como
+    texto, ou um dicionário vazio se o arquivo não existir.
+    """
+    path = resolve_foam_file(os.path.join(case_path, "constant", "polyMesh", "boundary"))
+    if path is None:
+        return {}
+    try:
+        content = RE_FOAMFILE_BLOCK.sub("", strip_comments(read_foam_text(path)))
+    except OSError:
+        return {}
+    start = content.find("(")
+    end = content.rfind(")")
+    if start < 0 or end <= start:
+        return {}
+    entries = foammacro.to_dict(foammacro.parse_text(content[start + 1:end]))
+    return {name: data for name, data in entries.items() if isinstance(data, dict)}
+
+
+def deep_verify_case(case_path):
+    """Verificações de conteúdo do caso, executadas em paralelo.
+
+    - cada campo de `0/` tem entrada em `boundaryField` para todos os patches
+      de `constant/polyMesh/boundary`;
+    - as dimensões dos campos conhecidos são as esperadas;
+    - `numberOfSubdomains` corresponde aos diretórios `processor*` existentes;
+    - as superfícies STL citadas nos dicionários de malha existem.
+
+    Cada verificação é memorizada pelas datas de modificação dos arquivos que
+    lê, então repetir a verificação de um caso inalterado custa só alguns
+    `stat`. Retorna `(issues, warnings)`.
+    """
+    tasks = []
+    zero_dir = os.path.join(case_path, "0")
+    boundary = os.path.join(case_path, "constant", "polyMesh", "boundary")
+    boundary = resolve_foam_file(boundary) or boundary
+    if os.path.isdir(zero_dir):
+        for name in list_field_files(case_path):
+            field = resolve_foam_file(os.path.join(zero_dir, name))
+            if field is None:
+                continue
+            tasks.append(("patches", (field, boundary), lambda f=field: _check_field_patches(case_path, f)))
+            tasks.append(("dimensions", (field,), lambda f=field: _check_field_dimensions(f)))
+    decomp = os.path.join(case_path, "system", "decomposeParDict")
+    decomp = resolve_foam_file(decomp) or decomp
+    tasks.append(("subdomains", (decomp, case_path), lambda: _check_subdomains(case_path)))
+    surface_dicts = tuple(
+        resolve_foam_file(path) or path
+        for path in (
+            os.path.join(case_path, "system", name)
+            for name in ("snappyHexMeshDict", "surfaceFeatureExtractDict", "surfaceFeaturesDict")
+        )
+    )
+    tri_dirs = (
+        os.path.join(case_path, "constant", "triSurface"),
+        os.path.join(case_path, "constant", "geometry"),
+    )
+    tasks.append(("surfaces", surface_dicts + tri_dirs, lambda: _check_surfaces(case_path)))
+
+    issues = []
+    warnings = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(tasks))) as pool:
+        futures = [pool.submit(_cached_check, name, inputs, check) for name, inputs, check in tasks]
+        for future in futures:
+            task_issues, task_warnings = future.result()
+            issues.extend(task_issues)
+            warnings.extend(task_warnings)
+    return issues, warnings
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _cached_check(name, inputs, check):
+    """Resultado de `check()`, reaproveitado enquanto `inputs` e os arquivos que
+    `check()` incluiu (`#include`, registrados por `foammacro`) não mudarem no disco."""
+    cached = _CHECK_CACHE.get((name, inputs))
+    if cached and all(_stamp(p) == stamp for p, stamp in cached[0].items()):
+        return cached[1]
+    stamps = {p: _stamp(p) for p in inputs}
+    with foammacro.recording_dependencies() as deps:
+        try:
+            result = check()
+        except Exception as exc:
+            result = ([], [f"Verification '{name}' failed: {exc}"])
+    stamps.update(deps)
+    _CHECK_CACHE[(name, inputs)] = (stamps, result)
+    return result
+
+
+def _check_field_patches(case_path, field_path):
+    patches = read_mesh_patches(case_path)
+    if not patches:
+        return [], []
+    entries = read_boundary_field(field_path)
+    rel = os.path.relpath(field_path, case_path)
+    if not entries:
+        return [f"Field '{rel}' has no readable boundaryField"], []
+    try:
+        text = _field_text_without_payload(field_path, _field_layout(field_path))
+    except OSError:
+        text = ""
+    uses_constraint_types = "setConstraintTypes" in text
+
+    missing = []
+    for name, data in patches.items():
+        patch_type = data.get("type", "")
+        if uses_constraint_types and patch_type in CONSTRAINT_PATCH_TYPES:
+            continue
+        m = re.search(r"\((.*)\)", data.get("inGroups", ""))
+        groups = set(m.group(1).split()) if m else set()
+        if patch_type in CONSTRAINT_PATCH_TYPES:
+            groups.add(patch_type)
+        if not any(_patch_key_matches(key, name, groups) for key in entries):
+            missing.append(name)
+    if missing:
+        return [f"Field '{rel}' has no boundaryField entry for patch(es): {', '.join(missing)}"], []
+    return [], []
+
+
+def _patch_key_matches(key, patch, groups):
+    if key == patch or key in groups:
+        return True
+    if key.startswith('"') and key.endswith('"'):
+        try:
+            return re.fullmatch(key[1:-1], patch) is not None
+        except re.error:
+            return False
+    return False
+
+
+def _parse_dimensions(text):
+    """Expoentes de `[0 1 -1 0 0 0 0]` como tupla de 7 números (formato de 5 completado)."""
+    try:
+        values = [float(v) for v in text.strip("[] ").split()]
+    except ValueError:
+        return None
+    if len(values) not in (5, 7):
+        return None
+    return tuple(values + [0.0] * (7 - len(values)))
+
+
+def _check_field_dimensions(field_path):
+    name = strip_compressed_suffix(os.path.basename(field_path))
+    expected = KNOWN_FIELD_DIMENSIONS.get(name)
+    if expected is None:
+        return [], []
+    dims = read_field_header(field_path).get("dimensions", "")
+    parsed = _parse_dimensions(dims)
+    if parsed is None:
+        return [], []
+    if any(parsed == tuple(float(v) for v in option) for option in expected):
+        return [], []
+    wanted = " or ".join("[" + " ".join(str(v) for v in option) + "]" for option in expected)
+    return [], [f"Field '0/{name}' has dimensions {dims}, expected {wanted}"]
+
+
+def _check_subdomains(case_path):
+    decomp = resolve_foam_file(os.path.join(case_path, "system", "decomposeParDict"))
+    if decomp is None:
+        return [], []
+    try:
+        m = re.search(r"numberOfSubdomains\s+(\d+)\s*;", read_expanded_text(decomp))
+    except OSError:
+        return [], []
+    if not m:
+        return [], []
+    n_sub = int(m.group(1))
+    n_proc = sum(
+        1 for entry in os.scandir(case_path)
+        if entry.is_dir() and re.fullmatch(r"processor\d+", entry.name)
+    )
+    if n_proc and n_proc != n_sub:
+        return [], [
+            f"numberOfSubdomains is {n_sub} but the case has {n_proc} processor* directories; "
+            "run decomposePar again before a parallel run."
+        ]
+    return [], []
+
+
+def _check_surfaces(case_path):
+    names = set()
+    system = os.path.join(case_path, "system")
+    snappy = resolve_foam_file(os.path.join(system, "snappyHexMeshDict"))
+    if snappy is not None:
+        geometry = foammacro.expand_file(snappy).get("geometry", {})
+        for key, data in geometry.items() if isinstance(geometry, dict) else ():
+            if isinstance(data, dict) and "file" in data:
+                names.add(data["file"].strip('"'))
+            elif isinstance(data, dict) and data.get("type") in ("triSurfaceMesh", "distributedTriSurfaceMesh"):
+                names.add(key.strip('"'))
+    extract = resolve_foam_file(os.path.join(system, "surfaceFeatureExtractDict"))
+    if extract is not None:
+        for key in foammacro.expand_file(extract):
+            if key != "FoamFile":
+                names.add(key.strip('"'))
+    features = resolve_foam_file(os.path.join(system, "surfaceFeaturesDict"))
+    if features is not None:
+        surfaces = foammacro.expand_file(features).get("surfaces", "")
+        if isinstance(surfaces, str):
+            names.update(re.findall(r'"([^"]+)"', surfaces))
+
+    missing = []
+    for name in sorted(names):
+        candidates = (
+            os.path.join(case_path, "constant", "triSurface", name),
+            os.path.join(case_path, "constant", "geometry", name),
+        )
+        if not any(resolve_foam_file(c) for c in candidates):
+            missing.append(name)
+    if missing:
+        return [], [f"Surface file(s) referenced but not found in 'constant/triSurface' or 'constant/geometry': {', '.join(missing)}"]
+    return [], []
+
+
 # ---------------------------------------------------------------------------
 # Boundary Condition parsing (Feature 3)
 # ---------------------------------------------------------------------------
@@ -255,6 +537,7 @@ def list_field_files(case_path):
 
     Returns a sorted list of basenames (e.g. ``['U', 'k', 'omega', 'p']``).
     Skips hidden files, directories, and known non-field entries.
+    Compressed fields (``U.gz``) are reported by their plain name.
     """
     zero_dir = os.path.join(case_path, "0")
     if not os.path.isdir(zero_dir):
@@ -262,83 +545,336 @@ def list_field_files(case_path):
     if not os.path.isdir(zero_dir):
         return []
 
-    fields = []
+    fields = set()
     for name in os.listdir(zero_dir):
         if name.startswith(".") or name in _SKIP_ZERO_FILES:
             continue
         full = os.path.join(zero_dir, name)
         if os.path.isfile(full):
-            fields.append(name)
+            # ``U.gz`` is listed as ``U``; readers resolve the suffix themselves.
+            fields.add(strip_compressed_suffix(name))
     return sorted(fields)
 
 
-def read_boundary_field(file_path):
+def read_boundary_field(file_path, expand=True):
     """Parse the ``boundaryField`` block from a field file.
 
     Returns a dict ``{patch_name: {key: value, ...}}``.  Every patch dict
     always contains at least the ``type`` key.  Additional keys (``value``,
-    ``gradient``, etc.) are preserved as raw strings.
+    ``gradient``, etc.) are preserved as raw strings; nested sub-dicts are
+    returned on a single line.
+
+    With ``expand`` (the default) ``#include`` directives and ``$macro``
+    references such as ``value $internalField;`` are resolved (see
+    :mod:`gafoam.foammacro`); ``expand=False`` returns the entries as written.
+
+    ``file_path`` may name the plain file or its ``.gz`` variant.  Only the
+    header and the ``boundaryField`` section are read: the ``internalField``
+    payload is skipped (see :func:`read_field_header`).
     """
-    if not os.path.isfile(file_path):
+    file_path = resolve_foam_file(file_path)
+    if file_path is None:
         return {}
     try:
-        with open(file_path, "r", encoding="utf-8", errors="replace") as fh:
-            content = fh.read()
+        layout = _field_layout(file_path)
+        if layout["boundary_offset"] is None:
+            return {}
+        text = _field_text_without_payload(file_path, layout)
     except OSError:
         return {}
 
-    block = _extract_braced_block(content, RE_BOUNDARY_FIELD)
-    if block is None:
+    try:
+        if expand:
+            values = foammacro.expand_text(text, os.path.dirname(file_path))
+        else:
+            values = foammacro.to_dict(foammacro.parse_text(text))
+    except (OSError, foammacro.IncludeCycleError):
         return {}
 
-    result = {}
-    # Match patch sub-blocks:  patchName { ... }
-    patch_re = re.compile(r"(\w+)\s*\{")
-    pos = 0
-    while pos < len(block):
-        m = patch_re.search(block, pos)
-        if not m:
-            break
-        patch_name = m.group(1)
-        # Extract braced content after patch name
-        depth = 1
-        start = m.end()
-        idx = start
-        while idx < len(block) and depth > 0:
-            if block[idx] == "{":
-                depth += 1
-            elif block[idx] == "}":
-                depth -= 1
-            idx += 1
-        inner = block[start:idx - 1] if depth == 0 else block[start:]
-
-        # Parse key-value pairs from inner block
-        patch_data = {}
-        for kv in re.finditer(r"(\w+)\s+([^;]+);", inner):
-            patch_data[kv.group(1).strip()] = kv.group(2).strip()
-
-        result[patch_name] = patch_data
-        pos = idx
+    block = values.get("boundaryField")
+    if not isinstance(block, dict):
+        return {}
 
+    result = {}
+    for patch_name, data in block.items():
+        if not isinstance(data, dict):
+            continue
+        result[patch_name] = {
+            key: foammacro.format_inline(val) if isinstance(val, dict) else val
+            for key, val in data.items()
+        }
     return result
 
 
+def _field_text_without_payload(file_path, layout):
+    """Header and ``boundaryField`` text with the internal list replaced by its summary."""
+    head_end = layout["internal_offset"]
+    if head_end is None:
+        head_end = layout["boundary_offset"]
+    with open_foam_file(file_path, "rb") as fh:
+        head = fh.read(head_end)
+    internal = ""
+    if layout["internal_offset"] is not None and layout["internalField"]:
+        internal = f"internalField {layout['internalField']};\n"
+    tail = _read_tail(file_path, layout["boundary_offset"])
+    return head.decode("utf-8", errors="replace") + internal + tail.decode("utf-8", errors="replace")
+
+
+def read_field_header(file_path):
+    """Header summary of a field file without loading its ``internalField``.
+
+    Returns a dict with ``format``, ``class``, ``object``, ``arch``,
+    ``dimensions``, ``internalField`` and ``boundary_offset``.  For a
+    non-uniform field the ``internalField`` entry is a summary such as
+    ``"nonuniform List<vector> 50000000"`` and ``n_values`` holds the count.
+    Returns an empty dict if the file cannot be read.
+    """
+    file_path = resolve_foam_file(file_path)
+    if file_path is None:
+        return {}
+    try:
+        return dict(_field_layout(file_path))
+    except OSError:
+        return {}
+
+
+# Number of components per element of the field list types.
+LIST_COMPONENTS = {
+    "label": 1,
+    "scalar": 1,
+    "vector": 3,
+    "sphericalTensor": 1,
+    "symmTensor": 6,
+    "tensor": 9,
+}
+
+RE_FOAM_FILE_ENTRY = re.compile(rb'\b(format|class|object|arch)\s+(?:"([^"]*)"|([^\s;]+))\s*;')
+RE_STREAM_WORD = re.compile(rb"[^\s(){};]*")
+RE_DIMENSIONS = re.compile(rb"\bdimensions\s+(\[[^\]]*\])\s*;")
+RE_ARCH_SIZE = re.compile(r"\b(label|scalar)=(\d+)")
+
+# Offset index: ``path -> (size, mtime_ns, layout)``.  A field is only
+# scanned again when its size or modification time changes.
+_FIELD_LAYOUT_CACHE = {}
+
+
+def _field_layout(file_path):
+    """Cached layout of a field file (header entries and ``boundaryField`` offset)."""
+    st = os.stat(file_path)
+    cached = _FIELD_LAYOUT_CACHE.get(file_path)
+    if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+        return cached[2]
+    with open_foam_file(file_path, "rb") as fh:
+        layout = _scan_field_layout(_ByteStream(fh))
+    _FIELD_LAYOUT_CACHE[file_path] = (st.st_size, st.st_mtime_ns, layout)
+    return layout
+
+
+def _scan_field_layout(stream):
+    """Walk a field file up to ``boundaryField``, skipping the internal list."""
+    layout = {
+        "format": "ascii",
+        "class": "",
+        "object": "",
+        "dimensions": "",
+        "internalField": "",
+        "n_values": None,
+        "arch": "",
+        "internal_offset": None,
+        "boundary_offset": None,
+    }
+    head = stream.peek(64 * 1024)
+    header_end = head.find(b"internalField")
+    header = head if header_end < 0 else head[:header_end]
+    for m in RE_FOAM_FILE_ENTRY.finditer(header):
+        value = m.group(2) if m.group(2) is not None else m.group(3)
+        layout[m.group(1).decode()] = value.decode("utf-8", errors="replace").strip()
+    m = RE_DIMENSIONS.search(header)
+    if m:
+        layout["dimensions"] = m.group(1).decode()
+
+    if stream.find(b"internalField"):
+        layout["internal_offset"] = stream.tell()
+        stream.advance(len(b"internalField"))
+        kind = stream.read_word()
+        if kind == b"nonuniform":
+            list_type = stream.read_word().decode()
+            count = stream.read_word()
+            elem = list_type[list_type.find("<") + 1:list_type.rfind(">")] if "<" in list_type else "scalar"
+            layout["internalField"] = f"nonuniform {list_type} {count.decode()}"
+            if count.isdigit():
+                layout["n_values"] = int(count)
+                _skip_list_payload(stream, int(count), elem, layout)
+        elif kind:
+            value = (kind + stream.read_until(b";")).rstrip(b";")
+            layout["internalField"] = value.decode("utf-8", errors="replace").strip()
+
+    if stream.find(b"boundaryField"):
+        layout["boundary_offset"] = stream.tell()
+    return layout
+
+
+def _skip_list_payload(stream, count, elem, layout):
+    """Move the stream past ``( ... )`` of a list with ``count`` elements."""
+    stream.skip_whitespace()
+    if stream.peek(1) == b"{":
+        # Compact uniform list: ``N{value}``.
+        stream.read_until(b"}")
+        return
+    if stream.peek(1) != b"(":
+        return
+    stream.advance(1)
+    n_comp = LIST_COMPONENTS.get(elem, 1)
+    if layout["format"] == "binary":
+        sizes = dict(RE_ARCH_SIZE.findall(layout.get("arch", "")))
+        width = int(sizes.get("label" if elem == "label" else "scalar", 32 if elem == "label" else 64)) // 8
+        stream.skip(count * n_comp * width)
+        stream.read_until(b")")
+    else:
+        # Scalars close the list on the first ')'; compound types also close
+        # one ')' per element, so the list ends at the (count + 1)-th one.
+        stream.skip_past(b")", 1 if elem in ("label", "scalar") else count + 1)
+
+
+class _ByteStream:
+    """Sequential byte reader with absolute positions and cheap forward skips."""
+
+    def __init__(self, fh, chunk_size=STREAM_CHUNK_SIZE):
+        self.fh = fh
+        self.chunk_size = chunk_size
+        self.buf = b""
+        self.base = 0
+        self.i = 0
+
+    def _fill(self):
+        chunk = self.fh.read(self.chunk_size)
+        if not chunk:
+            return False
+        self.base += self.i
+        self.buf = self.buf[self.i:] + chunk
+        self.i = 0
+        return True
+
+    def tell(self):
+        return self.base + self.i
+
+    def peek(self, n):
+        while len(self.buf) - self.i < n and self._fill():
+            pass
+        return self.buf[self.i:self.i + n]
+
+    def advance(self, n):
+        self.peek(n)
+        self.i += n
+
+    def find(self, token):
+        """Position the stream at the next ``token``; False if not found."""
+        while True:
+            idx = self.buf.find(token, self.i)
+            if idx >= 0:
+                self.i = idx
+                return True
+            self.i = max(self.i, len(self.buf) - len(token) + 1)
+            if not self._fill():
+                return False
+
+    def skip_whitespace(self):
+        while True:
+            rest = self.buf[self.i:]
+            stripped = rest.lstrip()
+            self.i += len(rest) - len(stripped)
+            if stripped or not self._fill():
+                return
+
+    def read_word(self):
+        """Next whitespace-delimited token, stopping before ``(`` ``{`` or ``;``."""
+        self.skip_whitespace()
+        while True:
+            m = RE_STREAM_WORD.match(self.buf, self.i)
+            if m.end() < len(self.buf) or not self._fill():
+                break
+        self.i = m.end()
+        return m.group(0)
+
+    def read_until(self, token):
+        """Bytes up to and including ``token`` (or to EOF).
+
+        ``_fill`` drops the consumed part of the buffer, so the bytes are
+        collected as they are passed instead of sliced from a saved index.
+        """
+        parts = []
+        while True:
+            idx = self.buf.find(token, self.i)
+            if idx >= 0:
+                parts.append(self.buf[self.i:idx + len(token)])
+                self.i = idx + len(token)
+                return b"".join(parts)
+            # Keep a possible partial ``token`` at the end for the next chunk.
+            keep = max(self.i, len(self.buf) - len(token) + 1)
+            parts.append(self.buf[self.i:keep])
+            self.i = keep
+            if not self._fill():
+                parts.append(self.buf[self.i:])
+                self.i = len(self.buf)
+                return b"".join(parts)
+
+    def skip(self, n):
+        """Skip ``n`` bytes, seeking instead of reading whenever possible."""
+        available = len(self.buf) - self.i
+        if n <= available:
+            self.i += n
+            return
+        n -= available
+        self.base += len(self.buf)
+        self.buf = b""
+        self.i = 0
+        self.fh.seek(n, os.SEEK_CUR)
+        self.base += n
+
+    def skip_past(self, token, occurrences):
+        """Skip past the ``occurrences``-th next ``token``, counting chunk-wise."""
+        while occurrences > 0:
+            n = self.buf.count(token, self.i)
+            if n < occurrences:
+                occurrences -= n
+                self.i = len(self.buf)
+                if not self._fill():
+                    return
+                continue
+            for _ in range(occurrences):
+                self.i = self.buf.index(token, self.i) + len(token)
+            return
+
+
+def _read_tail(file_path, offset):
+    """Raw bytes from ``offset`` to the end of the (decompressed) file."""
+    with open_foam_file(file_path, "rb") as fh:
+        fh.seek(offset)
+        return fh.read()
+
+
 def write_boundary_field(file_path, boundaries):
     """Update the ``boundaryField`` block in a field file.
 
     ``boundaries`` is a dict ``{patch_name: {key: value, ...}}``.
     The function replaces the entire ``boundaryField`` block while keeping
     the rest of the file intact (header, dimensions, internalField, etc.).
+    Compressed files are rewritten compressed.  Everything before
+    ``boundaryField`` is copied as raw bytes, never decoded, so the file is
+    written immediately even inside a :class:`CaseTransaction`.
     """
-    if not os.path.isfile(file_path):
+    file_path = resolve_foam_file(file_path)
+    if file_path is None:
         return False
     try:
-        with open(file_path, "r", encoding="utf-8") as fh:
-            content = fh.read()
+        offset = _field_layout(file_path)["boundary_offset"]
+        if offset is None:
+            return False
+        tail = _read_tail(file_path, offset).decode("utf-8", errors="replace")
     except OSError:
         return False
 
-    m = RE_BOUNDARY_FIELD.search(content)
+    m = RE_BOUNDARY_FIELD.match(tail)
     if not m:
         return False
 
@@ -346,10 +882,10 @@ def write_boundary_field(file_path, boundaries):
     depth = 1
     start = m.end()
     idx = start
-    while idx < len(content) and depth > 0:
-        if content[idx] == "{":
+    while idx < len(tail) and depth > 0:
+        if tail[idx] == "{":
             depth += 1
-        elif content[idx] == "}":
+        elif tail[idx] == "}":
             depth -= 1
         idx += 1
 
@@ -366,16 +902,31 @@ def write_boundary_field(file_path, boundaries):
         lines.append("    }")
     new_block = "\n".join(lines)
 
-    new_content = content[:m.start()] + "boundaryField\n{\n" + new_block + "\n}" + content[idx:]
+    new_tail = "boundaryField\n{\n" + new_block + "\n}" + tail[idx:]
 
     try:
-        with open(file_path, "w", encoding="utf-8") as fh:
-            fh.write(new_content)
+        _rewrite_tail(file_path, offset, new_tail.encode("utf-8"))
         return True
     except OSError:
         return False
 
 
+def _rewrite_tail(file_path, offset, new_tail):
+    """Replace the bytes after ``offset``, copying the prefix raw into a temporary file."""
+    def write(dst):
+        with open_foam_file(file_path, "rb") as src:
+            remaining = offset
+            while remaining > 0:
+                chunk = src.read(min(STREAM_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                dst.write(chunk)
+                remaining -= len(chunk)
+        dst.write(new_tail)
+
+    write_atomic(file_path, write)
+
+
 # ---------------------------------------------------------------------------
 # fvSchemes parsing (Feature 4)
 # ---------------------------------------------------------------------------
@@ -406,12 +957,10 @@ def read_fv_schemes(case_path):
     if not os.path.isfile(fpath):
         return {}
     try:
-        with open(fpath, "r", encoding="utf-8") as fh:
-            content = fh.read()
+        clean = read_expanded_text(fpath)
     except OSError:
         return {}
 
-    clean = strip_comments(content)
     result = {}
     for name, pat in RE_SCHEME_BLOCK.items():
         block = _extract_braced_block(clean, pat)
@@ -432,8 +981,7 @@ def write_fv_schemes(case_path, values):
     if not os.path.isfile(fpath):
         return False
     try:
-        with open(fpath, "r", encoding="utf-8") as fh:
-            content = fh.read()
+        content = read_foam_text(fpath)
     except OSError:
         return False
 
@@ -444,8 +992,7 @@ def write_fv_schemes(case_path, values):
         content = re.sub(pattern, rf"\g<1>{new_val}\2", content, count=1)
 
     try:
-        with open(fpath, "w", encoding="utf-8") as fh:
-            fh.write(content)
+        write_foam_text(fpath, content)
         return True
     except OSError:
         return False
@@ -473,12 +1020,10 @@ def read_fv_solution(case_path):
     if not os.path.isfile(fpath):
         return {}
     try:
-        with open(fpath, "r", encoding="utf-8") as fh:
-            content = fh.read()
+        clean = read_expanded_text(fpath)
     except OSError:
         return {}
 
-    clean = strip_comments(content)
     result = {}
 
     # Detect algorithm type
@@ -532,8 +1077,7 @@ def write_fv_solution_params(case_path, algorithm_params=None, relaxation_fields
     if not os.path.isfile(fpath):
         return False
     try:
-        with open(fpath, "r", encoding="utf-8") as fh:
-            content = fh.read()
+        content = read_foam_text(fpath)
     except OSError:
         return False
 
@@ -553,8 +1097,7 @@ def write_fv_solution_params(case_path, algorithm_params=None, relaxation_fields
             content = re.sub(pattern, rf"\g<1>{factor}\2", content, count=1)
 
     try:
-        with open(fpath, "w", encoding="utf-8") as fh:
-            fh.write(content)
+        write_foam_text(fpath, content)
         return True
     except OSError:
         return False
@@ -574,8 +1117,7 @@ def read_decompose_par_dict(case_path):
     if not os.path.isfile(dpath):
         return {"numberOfSubdomains": "4", "method": "scotch"}
     try:
-        with open(dpath, "r", encoding="utf-8") as f:
-            clean = strip_comments(f.read())
+        clean = read_expanded_text(dpath)
     except OSError:
         return {"numberOfSubdomains": "4", "method": "scotch"}
 
@@ -598,8 +1140,7 @@ def write_decompose_par_dict(case_path, values):
 
     if os.path.isfile(dpath):
         try:
-            with open(dpath, "r", encoding="utf-8") as f:
-                content = f.read()
+            content = read_foam_text(dpath)
 
             if re.search(r"\bnumberOfSubdomains\b", content):
                 content = re.sub(r"(\bnumberOfSubdomains\s+)[0-9]+(\s*;)", rf"\g<1>{num_sub}\g<2>", content)
@@ -611,8 +1152,7 @@ def write_decompose_par_dict(case_path, values):
             else:
                 content += f"\nmethod {method};\n"
 
-            with open(dpath, "w", encoding="utf-8") as f:
-                f.write(content)
+            write_foam_text(dpath, content)
             return True
         except OSError:
             return False
@@ -641,8 +1181,7 @@ method          {method};
 // ************************************************************************* //
 """
         try:
-            with open(dpath, "w", encoding="utf-8") as f:
-                f.write(template)
+            write_foam_text(dpath, template)
             return True
         except OSError:
             return False
@@ -666,8 +1205,7 @@ def read_turbulence_properties(case_path):
     if not os.path.isfile(dpath):
         return {"simulationType": "RAS", "model": "kOmegaSST", "turbulence": "on"}
     try:
-        with open(dpath, "r", encoding="utf-8") as f:
-            clean = strip_comments(f.read())
+        clean = read_expanded_text(dpath)
     except OSError:
         return {"simulationType": "RAS", "model": "kOmegaSST", "turbulence": "on"}
 
@@ -697,8 +1235,7 @@ def write_turbulence_properties(case_path, values):
 
     if os.path.isfile(dpath):
         try:
-            with open(dpath, "r", encoding="utf-8") as f:
-                content = f.read()
+            content = read_foam_text(dpath)
 
             if re.search(r"\bsimulationType\b", content):
                 content = re.sub(r"(\bsimulationType\s+)[a-zA-Z0-9_]+(\s*;)", rf"\g<1>{sim_type}\g<2>", content)
@@ -713,8 +1250,7 @@ def write_turbulence_properties(case_path, values):
             if re.search(r"\bturbulence\b", content):
                 content = re.sub(r"(\bturbulence\s+)[a-zA-Z0-9_]+(\s*;)", rf"\g<1>{turb}\g<2>", content)
 
-            with open(dpath, "w", encoding="utf-8") as f:
-                f.write(content)
+            write_foam_text(dpath, content)
             return True
         except OSError:
             return False
@@ -748,8 +1284,7 @@ RAS
 // ************************************************************************* //
 """
         try:
-            with open(dpath, "w", encoding="utf-8") as f:
-                f.write(template)
+            write_foam_text(dpath, template)
             return True
         except OSError:
             return False
@@ -772,8 +1307,7 @@ def read_transport_properties(case_path):
     if not os.path.isfile(dpath):
         return {"nu": "1e-05", "rho": "1000"}
     try:
-        with open(dpath, "r", encoding="utf-8") as f:
-            clean = strip_comments(f.read())
+        clean = read_expanded_text(dpath)
     except OSError:
         return {"nu": "1e-05", "rho": "1000"}
 
@@ -799,8 +1333,7 @@ def write_transport_properties(case_path, values):
 
     if os.path.isfile(dpath):
         try:
-            with open(dpath, "r", encoding="utf-8") as f:
-                content = f.read()
+            content = read_foam_text(dpath)
 
             if re.search(r"\bnu\b", content):
                 content = re.sub(
@@ -818,8 +1351,7 @@ def write_transport_properties(case_path, values):
                     count=1
                 )
 
-            with open(dpath, "w", encoding="utf-8") as f:
-                f.write(content)
+            write_foam_text(dpath, content)
             return True
         except OSError:
             return False
@@ -850,8 +1382,7 @@ rho             [ 1 -3 0 0 0 0 0 ] {rho_val};
 // ************************************************************************* //
 """
         try:
-            with open(dpath, "w", encoding="utf-8") as f:
-                f.write(template)
+            write_foam_text(dpath, template)
             return True
         except OSError:
             return False
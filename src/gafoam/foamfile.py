@@ -0,0 +1,289 @@
+"""Acesso de baixo nível aos arquivos de um caso OpenFOAM.
+
+Módulo sem dependência de Qt, base de `foamdict` e de `foammacro`: resolve
+e abre arquivos comprimidos (`U.gz`), lê texto respeitando a
+`CaseTransaction` ativa, remove comentários e grava de forma atômica. Os
+nomes continuam disponíveis em `foamdict`, que os usa e reexporta.
+"""
+
+import gzip
+import os
+import stat
+import threading
+
+# Sufixo dos arquivos gravados com `writeCompression on;`.
+COMPRESSED_SUFFIX = ".gz"
+
+# Tamanho dos blocos lidos ao percorrer arquivos grandes (campos e malha).
+STREAM_CHUNK_SIZE = 1 << 20
+
+
+
+def is_compressed(path):
+    """Indica se o caminho aponta para um arquivo comprimido com gzip."""
+    return str(path).endswith(COMPRESSED_SUFFIX)
+
+
+def strip_compressed_suffix(name):
+    """Nome do arquivo sem o sufixo `.gz` (`U.gz` -> `U`)."""
+    return name[: -len(COMPRESSED_SUFFIX)] if is_compressed(name) else name
+
+
+def resolve_foam_file(path):
+    """Caminho existente para `path`, aceitando a variante comprimida `path.gz`.
+
+    O OpenFOAM grava `0/U.gz` quando `writeCompression` está ativo; quem lê o
+    caso continua pedindo `0/U`. Devolve None se nenhuma das duas existir.
+    """
+    if os.path.isfile(path):
+        return path
+    if not is_compressed(path) and os.path.isfile(path + COMPRESSED_SUFFIX):
+        return path + COMPRESSED_SUFFIX
+    return None
+
+
+def open_foam_file(path, mode="r"):
+    """Abre um arquivo do caso, descomprimindo sob demanda se for `.gz`.
+
+    Em modo texto usa UTF-8 com substituição de bytes inválidos. A
+    descompressão é incremental: só o trecho efetivamente lido é inflado.
+    """
+    binary = "b" in mode
+    if is_compressed(path):
+        if binary:
+            return gzip.open(path, mode)
+        return gzip.open(path, mode.replace("t", "") + "t", encoding="utf-8", errors="replace")
+    if binary:
+        return open(path, mode)
+    return open(path, mode, encoding="utf-8", errors="replace")
+
+
+def iter_foam_chunks(path, chunk_size=STREAM_CHUNK_SIZE):
+    """Percorre o conteúdo bruto (já descomprimido) do arquivo em blocos de bytes."""
+    with open_foam_file(path, "rb") as fh:
+        while True:
+            chunk = fh.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def read_foam_text(path):
+    """Conteúdo textual de um arquivo do caso, comprimido ou não.
+
+    Dentro de uma `CaseTransaction` devolve o conteúdo ainda não gravado, se
+    houver. Levanta OSError se o arquivo não puder ser lido (inclusive gzip
+    truncado).
+    """
+    staged = staged_content(path)
+    if staged is not None:
+        return staged
+    try:
+        with open_foam_file(path, "r") as fh:
+            return fh.read()
+    except EOFError as exc:
+        raise OSError(f"Truncated compressed file: {path}") from exc
+
+
+def write_foam_text(path, content):
+    """Grava o conteúdo no arquivo, recomprimindo se o destino for `.gz`.
+
+    A gravação é atômica: o texto vai para um temporário no mesmo diretório,
+    sincronizado com o disco e renomeado sobre o original, de modo que um
+    solver relendo o arquivo nunca encontra o conteúdo pela metade. Dentro de
+    uma `CaseTransaction` o conteúdo apenas é registrado.
+    """
+    transaction = _active_transaction()
+    if transaction is not None:
+        transaction.stage(path, content)
+        return
+    data = content.encode("utf-8")
+    write_atomic(path, lambda dst: dst.write(data))
+
+
+def write_atomic(path, write):
+    """Grava `path` por um temporário preenchido por `write(stream)` e renomeado.
+
+    `stream` é binário (comprimido se `path` terminar em `.gz`). O temporário
+    é sincronizado com o disco e recebe as permissões do original; o arquivo
+    só é substituído quando o novo conteúdo está completo.
+    """
+    tmp_path = _write_temp(path, write)
+    _replace(tmp_path, path)
+    _fsync_dir(os.path.dirname(path))
+
+
+def _create_temp(dir_path):
+    """Cria um temporário exclusivo em `dir_path` e devolve `(fd, caminho)`.
+
+    O modo pedido é 0o666, sujeito à umask do processo, como num
+    `open(path, "w")` comum; a umask não precisa ser lida nem alterada.
+    """
+    for _ in range(100):
+        tmp_path = os.path.join(dir_path, f".gafoam-{os.urandom(6).hex()}")
+        try:
+            flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+            return os.open(tmp_path, flags, 0o666), tmp_path
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"No usable temporary name in {dir_path}")
+
+
+def _write_temp(path, write):
+    """Temporário ao lado de `path`, preenchido por `write(stream)` e sincronizado.
+
+    O temporário recebe as permissões do original; um arquivo novo fica com
+    as de um `open(path, "w")` comum. Devolve o caminho do temporário.
+    """
+    fd, tmp_path = _create_temp(os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            if is_compressed(path):
+                with gzip.GzipFile(filename="", mode="wb", fileobj=raw) as dst:
+                    write(dst)
+            else:
+                write(raw)
+            raw.flush()
+            os.fsync(raw.fileno())
+        try:
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return tmp_path
+
+
+def _replace(tmp_path, path):
+    try:
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _fsync_dir(dir_path):
+    """Sincroniza a entrada de diretório após um rename (sem efeito no Windows)."""
+    try:
+        fd = os.open(dir_path or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+_TRANSACTIONS = threading.local()
+
+
+def _active_transaction():
+    stack = getattr(_TRANSACTIONS, "stack", None)
+    return stack[-1] if stack else None
+
+
+def staged_content(path):
+    """Conteúdo registrado para `path` na `CaseTransaction` ativa, ou None."""
+    transaction = _active_transaction()
+    return transaction.staged(path) if transaction is not None else None
+
+
+class CaseTransaction:
+    """Agrupa as gravações de vários dicionários do caso numa única aplicação.
+
+    Dentro do bloco `with`, `write_foam_text` (e portanto as funções
+    `write_*` de dicionários que passam por ele) só registra o novo conteúdo,
+    e `read_foam_text` devolve o que já foi registrado, de modo que várias
+    funções podem editar o mesmo arquivo em sequência. Arquivos de campo são
+    exceção: `write_boundary_field` copia os bytes do `internalField` sem
+    decodificá-los e grava no disco na hora, mesmo dentro da transação. Na saída sem exceção cada arquivo é gravado
+    num temporário sincronizado e todos são renomeados de uma vez sobre os
+    originais: cada arquivo muda no disco uma única vez por transação. Se o
+    bloco levantar exceção, nada é gravado.
+    """
+
+    def __init__(self):
+        self.pending = {}
+        self.committed = []
+
+    def __enter__(self):
+        if getattr(_TRANSACTIONS, "stack", None) is None:
+            _TRANSACTIONS.stack = []
+        _TRANSACTIONS.stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _TRANSACTIONS.stack.remove(self)
+        if exc_type is None:
+            self.commit()
+        else:
+            self.pending.clear()
+        return False
+
+    def stage(self, path, content):
+        self.pending[os.path.abspath(path)] = content
+
+    def staged(self, path):
+        return self.pending.get(os.path.abspath(path))
+
+    def commit(self):
+        """Grava os arquivos registrados e devolve a lista de caminhos alterados."""
+        temps = []
+        try:
+            for path, content in self.pending.items():
+                data = content.encode("utf-8")
+                temps.append((_write_temp(path, lambda dst: dst.write(data)), path))
+        except BaseException:
+            for tmp_path, _ in temps:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            raise
+        for tmp_path, path in temps:
+            _replace(tmp_path, path)
+        for dir_path in {os.path.dirname(path) for _, path in temps}:
+            _fsync_dir(dir_path)
+        self.committed = [path for _, path in temps]
+        self.pending = {}
+        return self.committed
+
+
+def strip_comments(text):
+    """Remove comentários `//` e `/* */` sem tocar no conteúdo de strings."""
+    out = []
+    i = 0
+    n = len(text)
+    while i < n:
+        c = text[i]
+        if c == '"':
+            j = string_end(text, i)
+            out.append(text[i:j])
+            i = j
+        elif text.startswith("//", i):
+            j = text.find("\n", i)
+            i = n if j < 0 else j
+        elif text.startswith("/*", i):
+            j = text.find("*/", i + 2)
+            out.append(" ")
+            i = n if j < 0 else j + 2
+        else:
+            out.append(c)
+            i += 1
+    return "".join(out)
+
+
+def string_end(text, start):
+    """Posição logo após a aspa que fecha a string iniciada em `start`."""
+    i = start + 1
+    while i < len(text):
+        if text[i] == "\\":
+            i += 2
+            continue
+        if text[i] == '"':
+            return i + 1
+        i += 1
+    return len(text)
@@ -0,0 +1,541 @@
+"""Expansão de `#include` e macros `$` em dicionários do OpenFOAM.
+
+Módulo sem dependência de Qt. O texto do dicionário é convertido numa árvore
+de entradas (`parse_text`), que depois é expandida na ordem em que aparece no
+arquivo, como faz o próprio OpenFOAM:
+
+- `#include`, `#includeIfPresent` e `#includeEtc` inserem as entradas do
+  arquivo incluído no ponto da diretiva;
+- `$nome`, `$:a.b`, `$..nome` e `${a.b}` são substituídos pelo valor já
+  definido no escopo correspondente;
+- `$nome;` sozinho dentro de um bloco mescla o subdicionário referenciado;
+- `#remove` apaga entradas já definidas.
+
+A árvore de cada arquivo é memorizada por caminho, tamanho e data de
+modificação, de modo que um arquivo incluído dezenas de vezes é lido e
+analisado uma única vez. Inclusões circulares levantam `IncludeCycleError`.
+"""
+
+import contextlib
+import copy
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from gafoam.foamfile import read_foam_text, resolve_foam_file, string_end, strip_comments
+
+INCLUDE_DIRECTIVES = ("#include", "#includeIfPresent", "#includeEtc")
+
+# Diretivas que ocupam só o resto da linha e não afetam os valores lidos.
+IGNORED_DIRECTIVES = ("#includeFunc", "#includeModel", "#inputMode")
+
+RE_DIRECTIVE = re.compile(r"#\w+")
+RE_MACRO = re.compile(r"\$(\{[^}]*\}|[:.]*[A-Za-z_][\w:.]*)")
+RE_ENV = re.compile(r"\$(\{[^}]*\}|[A-Za-z_]\w*)")
+
+# Número máximo de arquivos memorizados em cada cache.
+CACHE_SIZE = 256
+
+
+class _LRUCache:
+    """Mapa limitado a `max_entries`, com despejo do menos usado; seguro entre threads."""
+
+    def __init__(self, max_entries=CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Árvores já analisadas: `caminho real -> (tamanho, mtime_ns, entradas)`.
+_PARSE_CACHE = _LRUCache()
+
+# Dicionários expandidos: `caminho real -> (carimbos das dependências, dicionário)`.
+_EXPAND_CACHE = _LRUCache()
+
+# Arquivos consultados pelas expansões da thread atual (ver `recording_dependencies`).
+_RECORDER = threading.local()
+
+
+class IncludeCycleError(ValueError):
+    """Um arquivo inclui a si mesmo, direta ou indiretamente."""
+
+
+# ---------------------------------------------------------------------------
+# Análise
+# ---------------------------------------------------------------------------
+
+def parse_text(text):
+    """Árvore de entradas de um dicionário.
+
+    Cada entrada é uma tupla `(chave, valor)`. O valor é o texto bruto da
+    entrada, uma lista de entradas (subdicionário) ou, nas diretivas, o
+    argumento da diretiva. Uma referência isolada `$nome;` vira `("$nome", None)`.
+    """
+    entries, _ = _parse_entries(strip_comments(text), 0)
+    return entries
+
+
+def _skip_ws(text, pos):
+    while pos < len(text) and text[pos].isspace():
+        pos += 1
+    return pos
+
+
+def _parse_entries(text, pos):
+    entries = []
+    n = len(text)
+    while True:
+        pos = _skip_ws(text, pos)
+        if pos >= n:
+            return entries, pos
+        c = text[pos]
+        if c == "}":
+            return entries, pos + 1
+        if c == ";":
+            pos += 1
+            continue
+        if c == "#" and not text.startswith("#{", pos):
+            pos = _parse_directive(text, pos, entries)
+            continue
+
+        key, pos = _read_key(text, pos)
+        if not key:
+            # Caractere solto que não inicia uma entrada: ignora.
+            pos += 1
+            continue
+        pos = _skip_ws(text, pos)
+        if pos < n and text[pos] == "{":
+            sub, pos = _parse_entries(text, pos + 1)
+            entries.append((key, sub))
+        elif key.startswith("$") and (pos >= n or text[pos] in ";}"):
+            entries.append((key, None))
+        else:
+            value, pos = _read_value(text, pos)
+            entries.append((key, value))
+
+
+def _parse_directive(text, pos, entries):
+    m = RE_DIRECTIVE.match(text, pos)
+    name = m.group(0) if m else "#"
+    pos = m.end() if m else pos + 1
+    if name in INCLUDE_DIRECTIVES:
+        pos = _skip_ws(text, pos)
+        if pos < len(text) and text[pos] == '"':
+            end = string_end(text, pos)
+            arg = text[pos + 1:end - 1]
+        else:
+            end = pos
+            while end < len(text) and not text[end].isspace() and text[end] != ";":
+                end += 1
+            arg = text[pos:end].strip("<>")
+        entries.append((name, arg))
+        return end
+    if name == "#remove":
+        value, end = _read_value(text, _skip_ws(text, pos), stop_at_newline=True)
+        entries.append((name, value.strip("()").split()))
+        return end
+    # `#includeFunc`, `#inputMode` e desconhecidas: ignora o resto da linha.
+    end = text.find("\n", pos)
+    return len(text) if end < 0 else end
+
+
+def _read_key(text, pos):
+    """Lê uma chave, que pode ser uma string ou conter parênteses (`div(phi,U)`)."""
+    if text[pos] == '"':
+        end = string_end(text, pos)
+        return text[pos:end], end
+    depth = 0
+    start = pos
+    while pos < len(text):
+        c = text[pos]
+        if c == "(":
+            depth += 1
+        elif c == ")":
+            if depth == 0:
+                break
+            depth -= 1
+        elif depth == 0 and (c.isspace() or c in "{};"):
+            break
+        pos += 1
+    return text[start:pos], pos
+
+
+def _read_value(text, pos, stop_at_newline=False):
+    """Texto bruto até o `;` que encerra a entrada, respeitando parênteses e strings."""
+    start = pos
+    depth = 0
+    n = len(text)
+    while pos < n:
+        c = text[pos]
+        if c == '"':
+            pos = string_end(text, pos)
+            continue
+        if text.startswith("#{", pos):
+            end = text.find("#}", pos + 2)
+            pos = n if end < 0 else end + 2
+            continue
+        if c in "([{":
+            depth += 1
+        elif c in ")]}":
+            if depth == 0:
+                # Bloco que fecha sem `;`: a entrada termina aqui.
+                return text[start:pos].strip(), pos
+            depth -= 1
+        elif c == ";" and depth == 0:
+            return text[start:pos].strip(), pos + 1
+        elif c == "\n" and stop_at_newline and depth == 0:
+            return text[start:pos].strip(), pos
+        pos += 1
+    return text[start:pos].strip(), pos
+
+
+def parse_file(path):
+    """Árvore de entradas de um arquivo, memorizada por tamanho e data de modificação."""
+    key = os.path.realpath(path)
+    st = os.stat(key)
+    cached = _PARSE_CACHE.get(key)
+    if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+        return cached[2]
+    entries = parse_text(read_foam_text(key))
+    _PARSE_CACHE.put(key, (st.st_size, st.st_mtime_ns, entries))
+    return entries
+
+
+# ---------------------------------------------------------------------------
+# Expansão
+# ---------------------------------------------------------------------------
+
+class _Context:
+    """Estado de uma expansão: pilha de inclusões e arquivos consultados."""
+
+    def __init__(self, case_dir):
+        self.case_dir = case_dir
+        self.stack = []
+        self.stamps = {}
+
+    def stamp(self, path):
+        try:
+            st = os.stat(path)
+            self.stamps[path] = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            self.stamps[path] = None
+
+
+def find_case_dir(path):
+    """Diretório do caso que contém `path` (o primeiro ancestral com `system/`)."""
+    d = os.path.dirname(os.path.abspath(path))
+    while True:
+        if os.path.isdir(os.path.join(d, "system")):
+            return d
+        parent = os.path.dirname(d)
+        if parent == d:
+            return os.path.dirname(os.path.dirname(os.path.abspath(path)))
+        d = parent
+
+
+def expand_file(path):
+    """Dicionário expandido de um arquivo, com includes e macros resolvidos.
+
+    Subdicionários viram `dict` e os demais valores continuam como texto. O
+    resultado é memorizado e só é recalculado quando algum dos arquivos
+    envolvidos (incluindo os `#includeIfPresent` ausentes) muda.
+    """
+    key = os.path.realpath(path)
+    cached = _EXPAND_CACHE.get(key)
+    if cached and _stamps_valid(cached[0]):
+        _record(cached[0])
+        return copy.deepcopy(cached[1])
+
+    ctx = _Context(find_case_dir(key))
+    result = {}
+    try:
+        _include(result, key, [], ctx)
+    finally:
+        _record(ctx.stamps)
+    _EXPAND_CACHE.put(key, (dict(ctx.stamps), result))
+    return copy.deepcopy(result)
+
+
+def expand_text(text, base_dir, case_dir=None):
+    """Expande um texto que não está salvo como arquivo próprio.
+
+    `base_dir` é usado para resolver os `#include` relativos.
+    """
+    ctx = _Context(case_dir or find_case_dir(os.path.join(base_dir, "_")))
+    result = {}
+    try:
+        _expand_into(result, parse_text(text), [], base_dir, ctx)
+    finally:
+        _record(ctx.stamps)
+    return result
+
+
+@contextlib.contextmanager
+def recording_dependencies():
+    """Registra os arquivos consultados pelas expansões feitas no bloco, nesta thread.
+
+    Produz um dicionário `caminho -> (tamanho, mtime_ns)` (None para os
+    `#includeIfPresent` ausentes), preenchido à medida que `expand_file` e
+    `expand_text` são chamados, inclusive quando o resultado vem do cache.
+    """
+    deps = {}
+    outer = getattr(_RECORDER, "deps", None)
+    _RECORDER.deps = deps
+    try:
+        yield deps
+    finally:
+        _RECORDER.deps = outer
+        if outer is not None:
+            outer.update(deps)
+
+
+def _record(stamps):
+    deps = getattr(_RECORDER, "deps", None)
+    if deps is not None:
+        deps.update(stamps)
+
+
+def to_dict(entries):
+    """Converte a árvore em dicionário sem resolver includes nem macros."""
+    result = {}
+    for key, value in entries:
+        if key.startswith("#") or value is None:
+            continue
+        result[key] = to_dict(value) if isinstance(value, list) else value
+    return result
+
+
+def _stamps_valid(stamps):
+    for path, stamp in stamps.items():
+        try:
+            st = os.stat(path)
+        except OSError:
+            if stamp is not None:
+                return False
+            continue
+        if stamp != (st.st_size, st.st_mtime_ns):
+            return False
+    return True
+
+
+def _include(result, path, scopes, ctx):
+    if path in ctx.stack:
+        chain = " -> ".join(ctx.stack[ctx.stack.index(path):] + [path])
+        raise IncludeCycleError(f"Inclusão circular: {chain}")
+    ctx.stamp(path)
+    ctx.stack.append(path)
+    try:
+        _expand_into(result, parse_file(path), scopes, os.path.dirname(path), ctx)
+    finally:
+        ctx.stack.pop()
+
+
+def _expand_into(result, entries, scopes, base_dir, ctx):
+    scopes = scopes + [result]
+    for key, value in entries:
+        if key in INCLUDE_DIRECTIVES:
+            path = _resolve_include(key, value, scopes, base_dir, ctx)
+            if path is not None:
+                _include(result, path, scopes[:-1], ctx)
+        elif key == "#remove":
+            for name in value:
+                for existing in [k for k in result if _key_matches(k, name)]:
+                    del result[existing]
+        elif value is None:
+            target = _lookup(key[1:].strip("{}"), scopes)
+            if isinstance(target, dict):
+                _merge(result, copy.deepcopy(target))
+        elif isinstance(value, list):
+            sub = result.get(key)
+            if not isinstance(sub, dict):
+                sub = {}
+            # O subdicionário entra no escopo antes de ser preenchido, para
+            # que `$..nome` e as buscas em escopos externos o enxerguem.
+            result[key] = sub
+            _expand_into(sub, value, scopes, base_dir, ctx)
+        else:
+            result[key] = substitute(value, scopes)
+
+
+def _merge(target, source):
+    for key, value in source.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+
+def _key_matches(key, pattern):
+    if key == pattern:
+        return True
+    if pattern.startswith('"') and pattern.endswith('"'):
+        try:
+            return re.fullmatch(pattern[1:-1], key.strip('"')) is not None
+        except re.error:
+            return False
+    return False
+
+
+def _lookup(name, scopes):
+    """Valor de uma macro a partir do escopo mais interno de `scopes`."""
+    if not name or not scopes:
+        return None
+    if name.startswith(":"):
+        node = scopes[0]
+        parts = name[1:].split(".")
+    elif name.startswith(".."):
+        dots = len(name) - len(name.lstrip("."))
+        level = len(scopes) - dots
+        if level < 0:
+            return None
+        node = scopes[level]
+        parts = name[dots:].split(".")
+    else:
+        parts = name.split(".")
+        first = parts[0]
+        for scope in reversed(scopes):
+            if first in scope:
+                node = scope
+                break
+        else:
+            return None
+    for part in parts:
+        if not isinstance(node, dict) or part not in node:
+            return None
+        node = node[part]
+    return node
+
+
+def substitute(value, scopes):
+    """Substitui as macros de um valor pelos textos já definidos em `scopes`.
+
+    Se o valor inteiro é uma única macro que aponta para um subdicionário, o
+    subdicionário é devolvido. Macros sem definição permanecem como estão.
+    Valores `#calc` e `#codeStream` não são tocados.
+    """
+    if "$" not in value or value.startswith("#"):
+        return value
+
+    m = RE_MACRO.fullmatch(value)
+    if m:
+        target = _lookup(m.group(1).strip("{}").rstrip("."), scopes)
+        if isinstance(target, dict):
+            return copy.deepcopy(target)
+
+    def repl(match):
+        name = match.group(1)
+        trailing = ""
+        if not name.startswith("{"):
+            stripped = name.rstrip(".")
+            trailing = name[len(stripped):]
+            name = stripped
+        target = _lookup(name.strip("{}"), scopes)
+        if isinstance(target, str):
+            return target + trailing
+        return match.group(0)
+
+    return RE_MACRO.sub(repl, value)
+
+
+def _resolve_include(directive, arg, scopes, base_dir, ctx):
+    """Caminho do arquivo incluído ou None quando ele não existe."""
+    name = arg
+    for tag, sub in (("<case>", ""), ("<system>", "system"), ("<constant>", "constant")):
+        if name.startswith(tag):
+            name = os.path.join(ctx.case_dir, sub, name[len(tag):].lstrip("/"))
+    name = _expand_env(name, scopes, ctx)
+
+    if directive == "#includeEtc":
+        candidates = [os.path.join(d, name) for d in _etc_dirs()]
+    elif os.path.isabs(name):
+        candidates = [name]
+    else:
+        candidates = [os.path.join(base_dir, name)]
+
+    for candidate in candidates:
+        resolved = resolve_foam_file(candidate)
+        if resolved is not None:
+            return os.path.realpath(resolved)
+        # Um arquivo ausente que passe a existir invalida o cache.
+        ctx.stamp(os.path.realpath(candidate))
+    return None
+
+
+def _expand_env(name, scopes, ctx):
+    def repl(match):
+        var = match.group(1).strip("{}")
+        if var == "FOAM_CASE":
+            return ctx.case_dir
+        value = _lookup(var, scopes)
+        if isinstance(value, str):
+            return value.strip('"')
+        return os.environ.get(var, match.group(0))
+
+    return RE_ENV.sub(repl, name)
+
+
+def _etc_dirs():
+    dirs = []
+    for var in ("FOAM_ETC",):
+        if os.environ.get(var):
+            dirs.append(os.environ[var])
+    if os.environ.get("WM_PROJECT_DIR"):
+        dirs.append(os.path.join(os.environ["WM_PROJECT_DIR"], "etc"))
+    dirs.append(os.path.join(os.path.expanduser("~"), ".OpenFOAM"))
+    return dirs
+
+
+# ---------------------------------------------------------------------------
+# Formatação
+# ---------------------------------------------------------------------------
+
+def format_dictionary(values, indent=0):
+    """Texto no formato do OpenFOAM de um dicionário expandido."""
+    pad = " " * indent
+    lines = []
+    for key, value in values.items():
+        if isinstance(value, dict):
+            lines.append(f"{pad}{key}")
+            lines.append(f"{pad}{{")
+            body = format_dictionary(value, indent + 4)
+            if body:
+                lines.append(body)
+            lines.append(f"{pad}}}")
+        elif value:
+            lines.append(f"{pad}{key} {value};")
+        else:
+            lines.append(f"{pad}{key};")
+    return "\n".join(lines)
+
+
+def format_inline(values):
+    """Subdicionário numa única linha, como `{ type uniform; value 1; }`."""
+    parts = []
+    for key, value in values.items():
+        if isinstance(value, dict):
+            parts.append(f"{key} {format_inline(value)}")
+        else:
+            parts.append(f"{key} {value};" if value else f"{key};")
+    return "{ " + " ".join(parts) + " }"
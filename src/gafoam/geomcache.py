@@ -0,0 +1,119 @@
+"""Cache em disco das geometrias já lidas pelo visualizador.
+
+Módulo sem dependência de Qt nem de VTK. Cada arquivo de superfície tem uma
+entrada `<sha1 do caminho>.npz` em `<caso>/.gafoam/geomcache/`, com os
+vértices unificados, a conectividade no formato de células do VTK, os patches
+do STL e as métricas de qualidade já calculadas. A entrada só vale enquanto o
+tamanho e a data de modificação do arquivo de origem forem os registrados;
+qualquer alteração faz a geometria ser lida de novo.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+CACHE_SUBDIR = os.path.join(".gafoam", "geomcache")
+
+# Incrementar quando o conteúdo gravado mudar de formato.
+FORMAT_VERSION = 2
+
+
+def case_cache_dir(case_path):
+    """Diretório do cache de geometrias de um caso."""
+    return os.path.join(case_path, CACHE_SUBDIR)
+
+
+def entry_path(cache_dir, source):
+    """Arquivo `.npz` correspondente ao arquivo de origem."""
+    digest = hashlib.sha1(os.path.abspath(source).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, digest + ".npz")
+
+
+def _stamp(source):
+    st = os.stat(source)
+    return np.array([FORMAT_VERSION, st.st_size, st.st_mtime_ns], dtype=np.int64)
+
+
+def load(cache_dir, source):
+    """Geometria memorizada de `source` ou None se ausente ou desatualizada.
+
+    Devolve um dicionário com `points`, `faces` (células no formato do VTK),
+    `patch_ids` (ou None), `patch_names` e `metrics`.
+    """
+    path = entry_path(cache_dir, source)
+    try:
+        stamp = _stamp(source)
+        with np.load(path, allow_pickle=False) as data:
+            if not np.array_equal(data["stamp"], stamp):
+                return None
+            patch_ids = data["patch_ids"]
+            return {
+                "points": data["points"],
+                "faces": data["faces"],
+                "patch_ids": patch_ids if patch_ids.size else None,
+                "patch_names": [str(name) for name in data["patch_names"]],
+                "metrics": json.loads(str(data["metrics"])),
+            }
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def store(cache_dir, source, points, faces, patch_ids=None, patch_names=(), metrics=None):
+    """Grava a geometria de `source` no cache. Devolve False se não foi possível.
+
+    A gravação passa por um temporário renomeado, então leitores concorrentes
+    nunca veem uma entrada incompleta.
+    """
+    try:
+        stamp = _stamp(source)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".npz", dir=cache_dir)
+    except OSError:
+        return False
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            np.savez(
+                fh,
+                stamp=stamp,
+                points=np.asarray(points),
+                faces=np.asarray(faces),
+                patch_ids=np.asarray(patch_ids if patch_ids is not None else [], dtype=np.int32),
+                patch_names=np.asarray(list(patch_names), dtype=str),
+                metrics=np.asarray(json.dumps(metrics or {}, default=_to_builtin)),
+            )
+        os.replace(tmp_path, entry_path(cache_dir, source))
+        return True
+    except (OSError, TypeError, ValueError):
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+
+def prune(cache_dir, sources):
+    """Remove as entradas que não correspondem a nenhum dos arquivos em `sources`."""
+    keep = {os.path.basename(entry_path(cache_dir, s)) for s in sources}
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return
+    for name in names:
+        # Temporários (`.tmp-*`) pertencem a gravações em andamento.
+        if name.endswith(".npz") and not name.startswith(".") and name not in keep:
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
+
+
+def _to_builtin(value):
+    """Converte escalares e arrays do numpy para tipos aceitos pelo JSON."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, tuple):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
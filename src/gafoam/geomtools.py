@@ -0,0 +1,103 @@
+"""Operações em lote sobre superfícies trianguladas.
+
+Módulo sem dependência de Qt nem de VTK: as superfícies são arrays numpy
+(`points` (N, 3), `faces` (M, 3)), no mesmo formato de `stlio.STLSurface`.
+Cobre o que se faz antes de levar geometrias de CAD para o snappyHexMesh:
+conversão de unidades, translação e rotação (na ordem do
+`surfaceTransformPoints`: escala, rotação, translação), caixa envolvente
+conjunta e fusão de várias superfícies num único STL com um `solid` por
+patch.
+"""
+
+import numpy as np
+
+from gafoam.stlio import STLSurface
+
+# Fatores de conversão para metros, usados pelo painel de geometria.
+UNIT_SCALES = {
+    "mm": 1e-3,
+    "cm": 1e-2,
+    "in": 0.0254,
+    "ft": 0.3048,
+    "m": 1.0,
+}
+
+
+def rotation_matrix(angles_deg):
+    """Matriz de rotação para ângulos em graus em torno de X, depois Y, depois Z."""
+    ax, ay, az = np.radians(np.asarray(angles_deg, dtype=np.float64))
+    cx, sx = np.cos(ax), np.sin(ax)
+    cy, sy = np.cos(ay), np.sin(ay)
+    cz, sz = np.cos(az), np.sin(az)
+    rx = np.array([[1, 0, 0], [0, cx, -sx], [0, sx, cx]])
+    ry = np.array([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]])
+    rz = np.array([[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]])
+    return rz @ ry @ rx
+
+
+def transform_points(points, scale=1.0, rotate=(0.0, 0.0, 0.0), translate=(0.0, 0.0, 0.0)):
+    """Pontos escalados, rotacionados (graus) e transladados, nessa ordem.
+
+    Devolve um novo array no mesmo tipo de ponto flutuante de `points`.
+    """
+    points = np.asarray(points)
+    dtype = points.dtype if np.issubdtype(points.dtype, np.floating) else np.float64
+    matrix = rotation_matrix(rotate) * float(scale)
+    result = points.astype(np.float64) @ matrix.T
+    result += np.asarray(translate, dtype=np.float64)
+    return result.astype(dtype, copy=False)
+
+
+def combined_bounds(point_arrays):
+    """Caixa envolvente `(xmin, xmax, ymin, ymax, zmin, zmax)` de vários conjuntos de pontos.
+
+    Devolve None se não houver pontos.
+    """
+    lows, highs = [], []
+    for points in point_arrays:
+        points = np.asarray(points)
+        if len(points):
+            lows.append(points.min(axis=0))
+            highs.append(points.max(axis=0))
+    if not lows:
+        return None
+    low = np.min(lows, axis=0)
+    high = np.max(highs, axis=0)
+    return (float(low[0]), float(high[0]), float(low[1]), float(high[1]), float(low[2]), float(high[2]))
+
+
+def merge_surfaces(surfaces):
+    """Funde várias `STLSurface` numa só, preservando os patches de cada uma.
+
+    Nomes de patch repetidos entre superfícies recebem os sufixos `_1`,
+    `_2`... para que cada `solid` do STL final continue distinguível no
+    `snappyHexMeshDict`.
+    """
+    points, faces, patch_ids, names = [], [], [], []
+    seen = set()
+    n_points = 0
+    for surface in surfaces:
+        surface_faces = np.asarray(surface.faces, dtype=np.int64)
+        ids = surface.patch_ids
+        if ids is None or len(ids) != len(surface_faces):
+            ids = np.zeros(len(surface_faces), dtype=np.int32)
+        local_names = list(surface.patch_names) or [f"patch{len(names)}"]
+
+        remap = np.empty(len(local_names), dtype=np.int32)
+        for i, name in enumerate(local_names):
+            unique, n = name, 0
+            while unique in seen:
+                n += 1
+                unique = f"{name}_{n}"
+            seen.add(unique)
+            remap[i] = len(names)
+            names.append(unique)
+
+        points.append(np.asarray(surface.points, dtype=np.float64))
+        faces.append(surface_faces + n_points)
+        patch_ids.append(remap[np.asarray(ids)])
+        n_points += len(surface.points)
+
+    if not points:
+        return STLSurface(np.empty((0, 3)), np.empty((0, 3), dtype=np.int64), np.empty(0, dtype=np.int32), [])
+    return STLSurface(np.concatenate(points), np.concatenate(faces), np.concatenate(patch_ids), names)
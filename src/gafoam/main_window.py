@@ -32,9 +32,11 @@ from PySide6.QtWidgets import (
 from PySide6.QtGui import QAction, QIcon, QFont, QKeySequence, QPalette, QColor, QTextCursor, QPixmap
 from PySide6.QtCore import QProcess, QProcessEnvironment, Qt, QSize, QTimer, QFileSystemWatcher
 
-from gafoam import foamdict, logparse
+from gafoam import casewatcher, foamdict, logparse
 from gafoam.bc_editor import BoundaryConditionEditor
+from gafoam.casewatcher import CaseWatcher
 from gafoam.editor import EditorContainerWidget, SimpleHighlighter
+from gafoam.fieldbrowser import FieldBrowserWidget
 from gafoam.filebrowser import FileBrowser
 from gafoam.handlers import make_stdout_handler, make_stderr_handler, make_finished_handler
 from gafoam.menus import setup_menus
@@ -47,7 +49,8 @@ from gafoam.panels import (
 from gafoam.report import ReportGenerator
 from gafoam.residuals import ResidualsWidget
 from gafoam.resources import icon_path, load_application_fonts
-from gafoam.stl_viewer import CaseGeometryWidget
+from gafoam.stl_viewer import CaseGeometryWidget, is_geometry_dir
+from gafoam.storagepanel import StorageWidget
 
 
 
@@ -147,7 +150,10 @@ class MainWindow(QMainWindow):
 
         self.file_watcher = QFileSystemWatcher(self)
         self.file_watcher.fileChanged.connect(self._on_external_file_changed)
-        self.file_watcher.directoryChanged.connect(self._on_external_directory_changed)
+
+        # Diretórios do caso: poucos observados, eventos coalescidos e tipados.
+        self.case_watcher = CaseWatcher(self)
+        self.case_watcher.subscribe(self._on_case_event)
 
         self.current_case = None
 
@@ -203,6 +209,15 @@ class MainWindow(QMainWindow):
         self.bc_editor = BoundaryConditionEditor(parent=self)
         self.tab_widget.addTab(self.bc_editor, "Boundary Conditions")
 
+        # 4. Campos por diretório de tempo (ordem numérica, inclusive processor*/)
+        self.field_browser = FieldBrowserWidget(parent=self)
+        self.field_browser.field_activated.connect(self.open_case_file)
+        self.tab_widget.addTab(self.field_browser, "Fields")
+
+        # 5. Ocupação em disco por tempo, campo e processador
+        self.storage_panel = StorageWidget(parent=self)
+        self.tab_widget.addTab(self.storage_panel, "Storage")
+
         self.residuals_view = ResidualsWidget(parent=self)
 
         self.top_splitter = QSplitter(Qt.Horizontal)
@@ -220,15 +235,15 @@ class MainWindow(QMainWindow):
 
         setup_menus(self)
 
-        # 4. Dock Widget para controlDict (Parâmetros do Caso)
+        # 6. Dock Widget para controlDict (Parâmetros do Caso)
         self.control_dock = ControlDictDockWidget(self)
         self.addDockWidget(Qt.RightDockWidgetArea, self.control_dock)
 
-        # 5. Dock Widget para fvSchemes (Esquemas Numéricos)
+        # 7. Dock Widget para fvSchemes (Esquemas Numéricos)
         self.fv_schemes_dock = FvSchemesDockWidget(self)
         self.addDockWidget(Qt.RightDockWidgetArea, self.fv_schemes_dock)
 
-        # 6. Dock Widget para fvSolution (Algoritmo e Relaxação)
+        # 8. Dock Widget para fvSolution (Algoritmo e Relaxação)
         self.fv_solution_dock = FvSolutionDockWidget(self)
         self.addDockWidget(Qt.RightDockWidgetArea, self.fv_solution_dock)
         
@@ -512,36 +527,17 @@ class MainWindow(QMainWindow):
             return QIcon.fromTheme(fallback_theme)
         return QIcon()
 
-    def _watch_case_directories(self, root_path):
-        """Monitora recursivamente pastas do caso para atualizar árvore e geometrias."""
-        if not root_path or not os.path.isdir(root_path):
+    def _on_case_event(self, event):
+        """Despacha as mudanças externas no caso para os painéis interessados."""
+        if not self.current_case:
             return
-        for d in list(self.file_watcher.directories()):
-            self.file_watcher.removePath(d)
-        dirs_to_watch = [root_path]
-        try:
-            for root, dirs, _ in os.walk(root_path):
-                for d in dirs:
-                    if not d.startswith('.'):
-                        dirs_to_watch.append(os.path.join(root, d))
-        except Exception:
-            pass
-        for d in dirs_to_watch:
-            if os.path.isdir(d) and d not in self.file_watcher.directories():
-                self.file_watcher.addPath(d)
-
-    def _on_external_directory_changed(self, dir_path):
-        """Trata inclusões/exclusões externas de arquivos e pastas no caso."""
-        if self.current_case:
-            self.geom_view.refresh_scan()
-            try:
-                for root, dirs, _ in os.walk(dir_path):
-                    for d in dirs:
-                        full_d = os.path.join(root, d)
-                        if os.path.isdir(full_d) and full_d not in self.file_watcher.directories():
-                            self.file_watcher.addPath(full_d)
-            except Exception:
-                pass
+        self.file_browser.refresh(event.path)
+        if event.kind == casewatcher.GEOMETRY_CHANGED:
+            if is_geometry_dir(self.current_case, event.path):
+                self.geom_view.refresh_scan()
+        elif event.kind in (casewatcher.TIMES_CHANGED, casewatcher.FIELDS_CHANGED):
+            self.field_browser.on_directory_changed(event.path)
+            self.storage_panel.mark_stale()
 
     def _on_external_file_changed(self, file_path):
         """Recarrega arquivos editados ou marca arquivos excluídos externamente."""
@@ -566,8 +562,7 @@ class MainWindow(QMainWindow):
             self.file_watcher.addPath(file_path)
 
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                new_content = f.read()
+            new_content = foamdict.read_foam_text(file_path)
         except Exception:
             try:
                 with open(file_path, 'r', encoding='latin1', errors='replace') as f:
@@ -621,7 +616,7 @@ class MainWindow(QMainWindow):
         self.file_browser.set_root(dir_path)
         self.current_case = dir_path
         self.geom_scanned_case = None
-        self._watch_case_directories(dir_path)
+        self.case_watcher.watch(dir_path)
 
         self.editor_stack.setCurrentWidget(self.editor_tabs)
         self.control_dock.show()
@@ -629,6 +624,8 @@ class MainWindow(QMainWindow):
         self.fv_schemes_dock.load_case(dir_path)
         self.fv_solution_dock.load_case(dir_path)
         self.bc_editor.load_case(dir_path)
+        self.field_browser.load_case(dir_path)
+        self.storage_panel.load_case(dir_path)
         self.convergence_monitor.load_case(dir_path)
         self.tab_widget.show()
         # Sempre abre e exibe o módulo Geometry como aba permanente
@@ -642,16 +639,17 @@ class MainWindow(QMainWindow):
             return
         if self.file_browser.file_model.isDir(index):
             return
-        file_path = self.file_browser.file_model.filePath(index)
+        self.open_case_file(self.file_browser.file_model.filePath(index))
 
+    def open_case_file(self, file_path):
+        """Abre um arquivo do caso: malhas no visualizador 3D, o resto no editor."""
         # Se for malha STL/OBJ, abre e destaca diretamente no visualizador 3D
         if file_path.lower().endswith(('.stl', '.obj')):
             self.show_geometry(file_path)
             return
 
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                text = f.read()
+            text = foamdict.read_foam_text(file_path)
         except Exception as e:
             try:
                 with open(file_path, 'r', encoding='latin1', errors='replace') as f:
@@ -771,8 +769,7 @@ class MainWindow(QMainWindow):
         self._saving_files.add(path)
         try:
             content = editor.toPlainText()
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            foamdict.write_foam_text(path, content)
             self.file_clean_content[path] = content
             if os.path.isfile(path) and path not in self.file_watcher.files():
                 self.file_watcher.addPath(path)
@@ -1532,7 +1529,7 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Warning", "No case opened. Please select a case before verifying.")
             return
 
-        is_valid, issues, warnings = foamdict.verify_case(case)
+        is_valid, issues, warnings = foamdict.verify_case(case, deep=True)
         
         report_lines = ["\n" + "="*50, " [PRE-FLIGHT CASE VERIFICATION REPORT]", "="*50]
         if is_valid:
@@ -1591,7 +1588,7 @@ class MainWindow(QMainWindow):
         self._previous_residuals = {}
 
         # Verificação global antes de iniciar a simulação (Pre-flight check)
-        is_valid, issues, warnings = foamdict.verify_case(case)
+        is_valid, issues, warnings = foamdict.verify_case(case, deep=True)
 
         if not is_valid:
             issues_str = "\n• " + "\n• ".join(issues)
@@ -1876,3 +1873,8 @@ class MainWindow(QMainWindow):
             )
         else:
             QMessageBox.critical(self, "Error", "Failed to generate PDF report.")
+
+    def closeEvent(self, event):
+        # Painéis embutidos não recebem closeEvent sozinhos; fechá-los encerra seus pools.
+        self.geom_view.close()
+        super().closeEvent(event)
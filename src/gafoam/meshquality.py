@@ -0,0 +1,249 @@
+"""Métricas de qualidade da malha de volume, no estilo do `checkMesh`.
+
+Módulo sem dependência de Qt nem de VTK. Trabalha sobre os arrays de
+`polymesh.PolyMesh` e reproduz as fórmulas do `primitiveMeshTools` do
+OpenFOAM:
+
+- centros e áreas das faces por decomposição em triângulos em torno do ponto
+  médio da face;
+- centros e volumes das células por decomposição em pirâmides em torno do
+  centro estimado (média dos centros das faces);
+- não-ortogonalidade e assimetria (`skewness`) por face, razão de aspecto por
+  célula e volume das pirâmides de cada face.
+
+Tudo é vetorizado sobre as listas de faces, `owner` e `neighbour`. As etapas
+que expandem um valor por vértice de face (centros/áreas e assimetria) são
+feitas em blocos de `FACE_CHUNK` faces, o que limita os temporários a alguns
+vetores desse tamanho mesmo em malhas com dezenas de milhões de faces.
+"""
+
+import numpy as np
+
+# Faces processadas por bloco nas etapas que expandem um valor por vértice.
+FACE_CHUNK = 1_000_000
+
+# Limites a partir dos quais o `checkMesh` aponta problemas.
+NON_ORTHO_THRESHOLD = 70.0
+SKEW_THRESHOLD = 4.0
+ASPECT_RATIO_THRESHOLD = 1000.0
+
+# Mesma proteção contra divisão por zero usada pelo OpenFOAM (`ROOTVSMALL`).
+_ROOTVSMALL = 1e-150
+
+
+def _dot(a, b):
+    return np.einsum("ij,ij->i", a, b)
+
+
+def _face_chunks(n_faces, chunk_size):
+    for start in range(0, n_faces, max(int(chunk_size), 1)):
+        yield start, min(start + chunk_size, n_faces)
+
+
+def _chunk_vertices(points, offsets, labels, start, end):
+    """Vértices das faces `start:end`, com o vizinho seguinte de cada um.
+
+    Devolve `(pontos, próximos, face local de cada vértice, início de cada
+    face no bloco, número de vértices por face)`.
+    """
+    offs = np.asarray(offsets[start:end + 1], dtype=np.int64)
+    sizes = np.diff(offs)
+    if np.any(sizes < 3):
+        raise ValueError("Faces must have at least three vertices")
+    first = offs[:-1] - offs[0]
+    local = np.asarray(labels[offs[0]:offs[-1]], dtype=np.int64)
+    face_of = np.repeat(np.arange(len(sizes)), sizes)
+
+    nxt = np.arange(1, len(local) + 1)
+    nxt[first + sizes - 1] = first
+    pts = np.asarray(points[local], dtype=np.float64)
+    return pts, pts[nxt], face_of, first, sizes
+
+
+def face_geometry(points, offsets, labels, chunk_size=FACE_CHUNK):
+    """Centros `(F, 3)` e vetores de área `(F, 3)` das faces.
+
+    Cada face é dividida em triângulos (aresta, ponto médio da face); o centro
+    é a média dos centróides dos triângulos ponderada pelas áreas, como em
+    `primitiveMeshTools::makeFaceCentresAndAreas`.
+    """
+    n_faces = len(offsets) - 1
+    centres = np.empty((n_faces, 3))
+    areas = np.empty((n_faces, 3))
+    for start, end in _face_chunks(n_faces, chunk_size):
+        pts, nxt, face_of, first, sizes = _chunk_vertices(points, offsets, labels, start, end)
+        estimate = np.add.reduceat(pts, first, axis=0) / sizes[:, None]
+        apex = estimate[face_of]
+
+        normal = np.cross(nxt - pts, apex - pts)
+        mag = np.linalg.norm(normal, axis=1)
+        sum_n = np.add.reduceat(normal, first, axis=0)
+        sum_a = np.add.reduceat(mag, first)
+        sum_ac = np.add.reduceat((pts + nxt + apex) * mag[:, None], first, axis=0)
+
+        # Faces de área nula ficam com o ponto médio como centro.
+        valid = sum_a > _ROOTVSMALL
+        centres[start:end] = estimate
+        centres[start:end][valid] = sum_ac[valid] / (3.0 * sum_a[valid, None])
+        areas[start:end] = 0.5 * sum_n
+    return centres, areas
+
+
+def cell_geometry(face_centres, face_areas, owner, neighbour, n_cells):
+    """Centros `(C, 3)` e volumes `(C,)` das células.
+
+    Cada face forma uma pirâmide com o centro estimado da célula; o volume é
+    a soma dos volumes das pirâmides e o centro é a média dos seus centróides,
+    como em `primitiveMeshTools::makeCellCentresAndVols`.
+    """
+    n_internal = len(neighbour)
+    internal_centres = face_centres[:n_internal]
+
+    counts = np.bincount(owner, minlength=n_cells) + np.bincount(neighbour, minlength=n_cells)
+    estimate = np.column_stack([
+        np.bincount(owner, face_centres[:, k], n_cells) + np.bincount(neighbour, internal_centres[:, k], n_cells)
+        for k in range(3)
+    ]) / np.maximum(counts, 1)[:, None]
+
+    own_vol = _dot(face_areas, face_centres - estimate[owner])
+    nei_vol = _dot(face_areas[:n_internal], estimate[neighbour] - internal_centres)
+    own_ctr = 0.75 * face_centres + 0.25 * estimate[owner]
+    nei_ctr = 0.75 * internal_centres + 0.25 * estimate[neighbour]
+
+    volumes3 = np.bincount(owner, own_vol, n_cells) + np.bincount(neighbour, nei_vol, n_cells)
+    moments = np.column_stack([
+        np.bincount(owner, own_vol * own_ctr[:, k], n_cells) + np.bincount(neighbour, nei_vol * nei_ctr[:, k], n_cells)
+        for k in range(3)
+    ])
+
+    # Células de volume desprezível ficam com o centro estimado.
+    valid = np.abs(volumes3) > _ROOTVSMALL
+    centres = estimate.copy()
+    centres[valid] = moments[valid] / volumes3[valid, None]
+    return centres, volumes3 / 3.0
+
+
+def non_orthogonality(cell_centres, face_areas, owner, neighbour):
+    """Ângulo (graus) entre o vetor que liga os centros das células e a normal de cada face interna."""
+    n_internal = len(neighbour)
+    d = cell_centres[neighbour] - cell_centres[owner[:n_internal]]
+    sf = face_areas[:n_internal]
+    cosine = _dot(d, sf) / (np.linalg.norm(d, axis=1) * np.linalg.norm(sf, axis=1) + _ROOTVSMALL)
+    return np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
+
+
+def skewness(points, offsets, labels, face_centres, face_areas, cell_centres, owner, neighbour,
+             chunk_size=FACE_CHUNK):
+    """Assimetria de cada face, como em `primitiveMeshTools::faceSkewness`.
+
+    É a distância entre o centro da face e o ponto em que a reta entre os
+    centros das células a cruza, normalizada pela extensão da face nessa
+    direção. Nas faces de contorno, o centro vizinho é a projeção do centro
+    da célula na normal da face.
+    """
+    n_faces = len(face_centres)
+    n_internal = len(neighbour)
+    cpf = face_centres - cell_centres[owner]
+
+    d = np.empty((n_faces, 3))
+    d[:n_internal] = cell_centres[neighbour] - cell_centres[owner[:n_internal]]
+    boundary_areas = face_areas[n_internal:]
+    normal = boundary_areas / (np.linalg.norm(boundary_areas, axis=1)[:, None] + _ROOTVSMALL)
+    d[n_internal:] = normal * _dot(normal, cpf[n_internal:])[:, None]
+
+    ratio = _dot(face_areas, cpf) / (_dot(face_areas, d) + _ROOTVSMALL)
+    sv = cpf - ratio[:, None] * d
+    sv_mag = np.linalg.norm(sv, axis=1)
+    sv_hat = sv / (sv_mag[:, None] + _ROOTVSMALL)
+
+    reach = np.linalg.norm(d, axis=1)
+    reach[:n_internal] *= 0.2
+    reach[n_internal:] *= 0.4
+    reach += _ROOTVSMALL
+    for start, end in _face_chunks(n_faces, chunk_size):
+        pts, _, face_of, first, _ = _chunk_vertices(points, offsets, labels, start, end)
+        extent = np.abs(_dot(sv_hat[start:end][face_of], pts - face_centres[start:end][face_of]))
+        np.maximum(reach[start:end], np.maximum.reduceat(extent, first), out=reach[start:end])
+    return sv_mag / reach
+
+
+def aspect_ratio(face_areas, cell_volumes, owner, neighbour, n_cells):
+    """Razão de aspecto de cada célula, como em `primitiveMeshTools::cellClosedness`.
+
+    O maior entre a razão das projeções da área das faces nos eixos e a razão
+    entre a área total e a de um cubo de mesmo volume.
+    """
+    n_internal = len(neighbour)
+    mag_areas = np.abs(face_areas)
+    summed = np.column_stack([
+        np.bincount(owner, mag_areas[:, k], n_cells) + np.bincount(neighbour, mag_areas[:n_internal, k], n_cells)
+        for k in range(3)
+    ])
+    ratio = summed.max(axis=1) / (summed.min(axis=1) + _ROOTVSMALL)
+    volumes = np.maximum(cell_volumes, _ROOTVSMALL)
+    return np.maximum(ratio, summed.sum(axis=1) / (6.0 * volumes ** (2.0 / 3.0)))
+
+
+def face_pyramids(face_centres, face_areas, cell_centres, owner, neighbour):
+    """Menor volume das pirâmides (face, centro da célula) de cada face.
+
+    Valores negativos indicam faces com orientação errada em relação a uma
+    das células, o erro `face pyramids` do `checkMesh`.
+    """
+    n_internal = len(neighbour)
+    pyramids = _dot(face_areas, face_centres - cell_centres[owner]) / 3.0
+    neighbour_pyr = _dot(face_areas[:n_internal], cell_centres[neighbour] - face_centres[:n_internal]) / 3.0
+    np.minimum(pyramids[:n_internal], neighbour_pyr, out=pyramids[:n_internal])
+    return pyramids
+
+
+def mesh_quality(mesh, chunk_size=FACE_CHUNK):
+    """Métricas de qualidade de uma `polymesh.PolyMesh`.
+
+    Devolve um dicionário com os arrays por face/célula (`cell_volumes`,
+    `non_orthogonality`, `skewness`, `aspect_ratio`, `face_pyramids`) e, em
+    `summary`, os mesmos números que o `checkMesh` resume.
+    """
+    owner = np.asarray(mesh.owner, dtype=np.int64)
+    neighbour = np.asarray(mesh.neighbour, dtype=np.int64)
+    n_faces = len(mesh.face_offsets) - 1
+    if len(owner) != n_faces:
+        raise ValueError(f"owner has {len(owner)} entries for {n_faces} faces")
+    n_cells = int(max(owner.max(initial=-1), neighbour.max(initial=-1))) + 1
+
+    face_centres, face_areas = face_geometry(mesh.points, mesh.face_offsets, mesh.face_labels, chunk_size)
+    cell_centres, cell_volumes = cell_geometry(face_centres, face_areas, owner, neighbour, n_cells)
+    non_ortho = non_orthogonality(cell_centres, face_areas, owner, neighbour)
+    skew = skewness(mesh.points, mesh.face_offsets, mesh.face_labels, face_centres, face_areas,
+                    cell_centres, owner, neighbour, chunk_size)
+    aspect = aspect_ratio(face_areas, cell_volumes, owner, neighbour, n_cells)
+    pyramids = face_pyramids(face_centres, face_areas, cell_centres, owner, neighbour)
+
+    def peak(values):
+        return float(values.max()) if len(values) else 0.0
+
+    summary = {
+        "cells": n_cells,
+        "faces": n_faces,
+        "internal_faces": len(neighbour),
+        "min_volume": float(cell_volumes.min()) if n_cells else 0.0,
+        "max_volume": peak(cell_volumes),
+        "total_volume": float(cell_volumes.sum()),
+        "negative_volumes": int(np.count_nonzero(cell_volumes <= 0.0)),
+        "max_non_orthogonality": peak(non_ortho),
+        "avg_non_orthogonality": float(non_ortho.mean()) if len(non_ortho) else 0.0,
+        "severely_non_orthogonal": int(np.count_nonzero(non_ortho > NON_ORTHO_THRESHOLD)),
+        "max_skewness": peak(skew),
+        "highly_skewed": int(np.count_nonzero(skew > SKEW_THRESHOLD)),
+        "max_aspect_ratio": peak(aspect),
+        "high_aspect_ratio": int(np.count_nonzero(aspect > ASPECT_RATIO_THRESHOLD)),
+        "incorrect_pyramids": int(np.count_nonzero(pyramids < 0.0)),
+    }
+    return {
+        "cell_volumes": cell_volumes,
+        "non_orthogonality": non_ortho,
+        "skewness": skew,
+        "aspect_ratio": aspect,
+        "face_pyramids": pyramids,
+        "summary": summary,
+    }
@@ -0,0 +1,251 @@
+"""Conjuntos e zonas da malha de volume (`constant/polyMesh/sets`, `*Zones`).
+
+Módulo sem dependência de Qt nem de VTK. Lê os `cellSet`/`faceSet`/
+`pointSet` de `constant/polyMesh/sets/` e as zonas de `cellZones`,
+`faceZones` e `pointZones`, em ASCII ou binário, para arrays numpy de rótulos
+ordenados e sem repetição. Com os rótulos ordenados, pertinência é uma busca
+binária (`np.searchsorted`) e interseção é um `np.intersect1d` sem nova
+ordenação, o que mantém as consultas rápidas mesmo em zonas de MRF ou meios
+porosos com milhões de células.
+
+As seleções de células são levadas para o visualizador pela superfície que
+as envolve: as faces com exatamente um dos lados dentro da seleção.
+"""
+
+import os
+import re
+from collections import namedtuple
+
+import numpy as np
+
+from gafoam import foamdict, polymesh
+from gafoam.polymesh import list_start, open_buffer, read_flat, read_header
+
+# `kind` é "cell", "face" ou "point"; `source` é "set", "zone" ou "query"
+# (resultado de `intersect`).
+MeshSelection = namedtuple("MeshSelection", ["name", "kind", "source", "labels"])
+
+SET_CLASSES = {"cellSet": "cell", "faceSet": "face", "pointSet": "point"}
+ZONE_FILES = {"cellZones": "cell", "faceZones": "face", "pointZones": "point"}
+
+RE_ZONE_NAME = re.compile(rb"\s*([^\s{}()]+)\s*\{")
+RE_ZONE_ENTRY = re.compile(rb"\s*(\w+)\s+")
+RE_TYPED_LIST = re.compile(rb"List<(\w+)>\s*(\d+)\s*([({])")
+
+
+def selection_key(selection):
+    """Identificador estável de uma seleção, p. ex. `cellZone:rotor`."""
+    return f"{selection.kind}{selection.source.capitalize()}:{selection.name}"
+
+
+def _sorted_labels(labels):
+    labels = np.asarray(labels, dtype=np.int64)
+    if len(labels) > 1 and not np.all(labels[1:] > labels[:-1]):
+        labels = np.unique(labels)
+    return labels
+
+
+def read_set(path):
+    """`(kind, rótulos ordenados)` de um arquivo de `polyMesh/sets/`.
+
+    Levanta ValueError se a classe do arquivo não for um conjunto conhecido.
+    """
+    buffer = open_buffer(path)
+    fmt, cls, label, _, pos = read_header(buffer)
+    if cls not in SET_CLASSES:
+        raise ValueError(f"Unsupported set class '{cls}' in {path}")
+    count, start = list_start(buffer, pos)
+    return SET_CLASSES[cls], _sorted_labels(read_flat(buffer, fmt, label, count, start)[0])
+
+
+def _read_typed_list(buffer, fmt, label, scalar, type_name, count, opener, start):
+    """Lista `List<T>` a partir do delimitador de abertura. Devolve `(array, fim)`."""
+    if opener == b"{":
+        # Lista uniforme: `N{valor}`.
+        end = buffer.find(b"}", start)
+        value = bytes(buffer[start:end]).strip()
+        return np.full(count, int(value) if type_name in (b"label", b"bool") else float(value)), end + 1
+    if type_name == b"label":
+        dtype = label
+    elif type_name == b"bool":
+        dtype = np.dtype("u1")
+    else:
+        dtype = scalar
+    return read_flat(buffer, fmt, dtype, count, start)
+
+
+def read_zones(path):
+    """Zonas de um arquivo `cellZones`/`faceZones`/`pointZones`: `{nome: rótulos ordenados}`.
+
+    Entradas que não são listas (`type`, por exemplo) e listas auxiliares
+    como o `flipMap` das zonas de faces são lidas e descartadas; só a lista
+    de rótulos de cada zona é mantida.
+    """
+    buffer = open_buffer(path)
+    fmt, _, label, scalar, pos = read_header(buffer)
+    n_zones, pos = list_start(buffer, pos)
+    zones = {}
+    for _ in range(n_zones):
+        m = RE_ZONE_NAME.match(buffer, pos)
+        if m is None:
+            raise ValueError(f"Malformed zone list in {path}")
+        name, pos = m.group(1).decode(), m.end()
+        labels = np.empty(0, dtype=np.int64)
+        while True:
+            while pos < len(buffer) and buffer[pos:pos + 1].isspace():
+                pos += 1
+            if buffer[pos:pos + 1] == b"}":
+                pos += 1
+                break
+            entry = RE_ZONE_ENTRY.match(buffer, pos)
+            if entry is None:
+                raise ValueError(f"Malformed zone '{name}' in {path}")
+            pos = entry.end()
+            typed = RE_TYPED_LIST.match(buffer, pos)
+            if typed is None or typed.group(1) not in (b"label", b"bool", b"scalar"):
+                # Entradas simples (`type cellZone;`) e listas de palavras (`inGroups`).
+                pos = buffer.find(b";", pos) + 1
+                if pos == 0:
+                    raise ValueError(f"Malformed zone '{name}' in {path}")
+                continue
+            values, pos = _read_typed_list(
+                buffer, fmt, label, scalar, typed.group(1), int(typed.group(2)), typed.group(3), typed.end()
+            )
+            pos = buffer.find(b";", pos) + 1
+            if entry.group(1).endswith(b"Labels"):
+                labels = _sorted_labels(values)
+        zones[name] = labels
+    return zones
+
+
+def read_selections(case_path):
+    """Todos os conjuntos e zonas do caso, zonas primeiro e em ordem alfabética.
+
+    Arquivos ilegíveis ou com formato inesperado são ignorados.
+    """
+    directory = polymesh.polymesh_dir(case_path)
+    selections = []
+    for filename, kind in ZONE_FILES.items():
+        path = os.path.join(directory, filename)
+        if foamdict.resolve_foam_file(path) is None:
+            continue
+        try:
+            zones = read_zones(path)
+        except (OSError, ValueError):
+            continue
+        selections.extend(MeshSelection(name, kind, "zone", labels) for name, labels in sorted(zones.items()))
+
+    sets_dir = os.path.join(directory, "sets")
+    try:
+        names = sorted(os.listdir(sets_dir))
+    except OSError:
+        names = []
+    for filename in names:
+        name = filename[:-3] if filename.endswith(".gz") else filename
+        if name.startswith(".") or name.endswith("~"):
+            continue
+        try:
+            kind, labels = read_set(os.path.join(sets_dir, name))
+        except (OSError, ValueError):
+            continue
+        selections.append(MeshSelection(name, kind, "set", labels))
+    return selections
+
+
+def contains(labels, query):
+    """Máscara booleana de quais rótulos de `query` estão em `labels` (ordenado)."""
+    query = np.asarray(query, dtype=np.int64)
+    if not len(labels):
+        return np.zeros(len(query), dtype=bool)
+    idx = np.minimum(np.searchsorted(labels, query), len(labels) - 1)
+    return labels[idx] == query
+
+
+def intersect(first, second):
+    """Interseção de duas seleções do mesmo tipo, como nova seleção.
+
+    Levanta ValueError se uma for de células e a outra de faces, por exemplo.
+    """
+    if first.kind != second.kind:
+        raise ValueError(f"Cannot intersect a {first.kind} selection with a {second.kind} selection")
+    labels = np.intersect1d(first.labels, second.labels, assume_unique=True)
+    return MeshSelection(f"{first.name} & {second.name}", first.kind, "query", labels)
+
+
+def _cell_mask(mesh, labels):
+    n_cells = int(max(np.max(mesh.owner, initial=-1), np.max(mesh.neighbour, initial=-1))) + 1
+    mask = np.zeros(n_cells, dtype=bool)
+    mask[labels[labels < n_cells]] = True
+    return mask
+
+
+def selection_faces(mesh, selection):
+    """Faces que representam a seleção no visualizador.
+
+    Para células, as faces com exatamente um lado dentro da seleção (as de
+    contorno contam se o dono estiver dentro); para faces, as próprias.
+    Seleções de pontos não têm faces.
+    """
+    if selection.kind == "face":
+        return selection.labels[selection.labels < len(mesh.face_offsets) - 1]
+    if selection.kind != "cell":
+        return np.empty(0, dtype=np.int64)
+    mask = _cell_mask(mesh, selection.labels)
+    inside = mask[mesh.owner]
+    n_internal = len(mesh.neighbour)
+    inside[:n_internal] ^= mask[mesh.neighbour]
+    return np.flatnonzero(inside)
+
+
+def _gather_faces(mesh, face_ids):
+    """Rótulos de vértice das faces `face_ids` em sequência, com o tamanho e o início de cada face."""
+    offsets = np.asarray(mesh.face_offsets, dtype=np.int64)
+    starts = offsets[face_ids]
+    sizes = offsets[face_ids + 1] - starts
+    first = np.cumsum(sizes) - sizes
+    gather = np.repeat(starts - first, sizes) + np.arange(int(sizes.sum()))
+    return np.asarray(mesh.face_labels, dtype=np.int64)[gather], sizes, first
+
+
+def faces_surface(mesh, face_ids):
+    """Superfície de um conjunto qualquer de faces: `(pontos, células no formato do VTK)`."""
+    face_ids = np.asarray(face_ids, dtype=np.int64)
+    if not len(face_ids):
+        return np.empty((0, 3)), np.empty(0, dtype=np.int64)
+    labels, sizes, first = _gather_faces(mesh, face_ids)
+    used, local = np.unique(labels, return_inverse=True)
+
+    count_pos = first + np.arange(len(face_ids))
+    cells = np.empty(len(labels) + len(face_ids), dtype=np.int64)
+    is_label = np.ones(len(cells), dtype=bool)
+    is_label[count_pos] = False
+    cells[count_pos] = sizes
+    cells[is_label] = local
+    return np.asarray(mesh.points[used], dtype=np.float64), cells
+
+
+def selection_points(mesh, selection):
+    """Rótulos ordenados dos pontos usados pela seleção."""
+    if selection.kind == "point":
+        return selection.labels[selection.labels < len(mesh.points)]
+    if selection.kind == "face":
+        face_ids = selection_faces(mesh, selection)
+    else:
+        # Todas as faces de alguma célula da seleção, não só as do envelope.
+        mask = _cell_mask(mesh, selection.labels)
+        touched = mask[mesh.owner]
+        touched[:len(mesh.neighbour)] |= mask[mesh.neighbour]
+        face_ids = np.flatnonzero(touched)
+    if not len(face_ids):
+        return np.empty(0, dtype=np.int64)
+    return np.unique(_gather_faces(mesh, face_ids)[0])
+
+
+def bounding_box(mesh, selection):
+    """Caixa envolvente `(xmin, xmax, ymin, ymax, zmin, zmax)` da seleção, ou None se vazia."""
+    point_ids = selection_points(mesh, selection)
+    if not len(point_ids):
+        return None
+    points = np.asarray(mesh.points[point_ids], dtype=np.float64)
+    low, high = points.min(axis=0), points.max(axis=0)
+    return (float(low[0]), float(high[0]), float(low[1]), float(high[1]), float(low[2]), float(high[2]))
@@ -447,59 +447,66 @@ class ControlDictDockWidget(QDockWidget):
         if not self.current_case_path:
             return
 
-        # 1. Salva controlDict
-        values = {}
-        fields = {
-            "startFrom": self.input_start_from.text().strip(),
-            "startTime": self.input_start_time.text().strip(),
-            "stopAt": self.input_stop_at.text().strip(),
-            "endTime": self.input_end_time.text().strip(),
-            "deltaT": self.input_delta_t.text().strip(),
-            "writeControl": self.input_write_control.text().strip(),
-            "writeInterval": self.input_write_interval.text().strip(),
-            "purgeWrite": self.input_purge_write.text().strip(),
-            "adjustTimeStep": self.input_adjust_time_step.text().strip(),
-            "maxCo": self.input_max_co.text().strip(),
-        }
-        for k, v in fields.items():
-            if v != "":
-                values[k] = v
-        foamdict.write_control_dict(self.current_case_path, values)
-
-        # 2. Salva decomposeParDict
-        par_vals = {
-            "numberOfSubdomains": self.input_subdomains.text().strip() or "4",
-            "method": self.combo_decomp_method.currentData() or "scotch",
-        }
-        foamdict.write_decompose_par_dict(self.current_case_path, par_vals)
-
-        # 3. Salva turbulenceProperties
-        turb_vals = {
-            "simulationType": self.combo_sim_type.currentData() or "RAS",
-            "model": self.combo_turb_model.currentText().strip() or "kOmegaSST",
-            "turbulence": "on" if self.chk_turbulence.isChecked() else "off",
-        }
-        foamdict.write_turbulence_properties(self.current_case_path, turb_vals)
-
-        # 4. Salva transportProperties
-        trans_vals = {
-            "nu": self.input_nu.text().strip() or "1e-05",
-            "rho": self.input_rho.text().strip() or "1000",
-        }
-        foamdict.write_transport_properties(self.current_case_path, trans_vals)
-
-        # 5. Salva fvSolution
-        p_val = self.input_relax_p.text().strip()
-        u_val = self.input_relax_u.text().strip()
-        relax_f = {}
-        if p_val:
-            try: relax_f["p"] = float(p_val)
-            except ValueError: pass
-        if u_val:
-            try: relax_f["U"] = float(u_val)
-            except ValueError: pass
-        if relax_f:
-            foamdict.write_fv_solution_params(self.current_case_path, relaxation_fields=relax_f)
+        # Todos os dicionários são gravados juntos no fim do bloco: cada arquivo
+        # é substituído atomicamente uma única vez por salvamento.
+        try:
+            with foamdict.CaseTransaction():
+                # 1. Salva controlDict
+                values = {}
+                fields = {
+                    "startFrom": self.input_start_from.text().strip(),
+                    "startTime": self.input_start_time.text().strip(),
+                    "stopAt": self.input_stop_at.text().strip(),
+                    "endTime": self.input_end_time.text().strip(),
+                    "deltaT": self.input_delta_t.text().strip(),
+                    "writeControl": self.input_write_control.text().strip(),
+                    "writeInterval": self.input_write_interval.text().strip(),
+                    "purgeWrite": self.input_purge_write.text().strip(),
+                    "adjustTimeStep": self.input_adjust_time_step.text().strip(),
+                    "maxCo": self.input_max_co.text().strip(),
+                }
+                for k, v in fields.items():
+                    if v != "":
+                        values[k] = v
+                foamdict.write_control_dict(self.current_case_path, values)
+
+                # 2. Salva decomposeParDict
+                par_vals = {
+                    "numberOfSubdomains": self.input_subdomains.text().strip() or "4",
+                    "method": self.combo_decomp_method.currentData() or "scotch",
+                }
+                foamdict.write_decompose_par_dict(self.current_case_path, par_vals)
+
+                # 3. Salva turbulenceProperties
+                turb_vals = {
+                    "simulationType": self.combo_sim_type.currentData() or "RAS",
+                    "model": self.combo_turb_model.currentText().strip() or "kOmegaSST",
+                    "turbulence": "on" if self.chk_turbulence.isChecked() else "off",
+                }
+                foamdict.write_turbulence_properties(self.current_case_path, turb_vals)
+
+                # 4. Salva transportProperties
+                trans_vals = {
+                    "nu": self.input_nu.text().strip() or "1e-05",
+                    "rho": self.input_rho.text().strip() or "1000",
+                }
+                foamdict.write_transport_properties(self.current_case_path, trans_vals)
+
+                # 5. Salva fvSolution
+                p_val = self.input_relax_p.text().strip()
+                u_val = self.input_relax_u.text().strip()
+                relax_f = {}
+                if p_val:
+                    try: relax_f["p"] = float(p_val)
+                    except ValueError: pass
+                if u_val:
+                    try: relax_f["U"] = float(u_val)
+                    except ValueError: pass
+                if relax_f:
+                    foamdict.write_fv_solution_params(self.current_case_path, relaxation_fields=relax_f)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to save case settings: {e}")
+            return
 
         QMessageBox.information(self, "Success", "All case settings saved successfully!")
         if hasattr(self.main_window, "log"):
@@ -518,13 +525,19 @@ class ControlDictDockWidget(QDockWidget):
             editor = editors.get(dpath)
             if editor is not None and os.path.isfile(dpath):
                 try:
-                    with open(dpath, "r", encoding="utf-8") as f:
-                        content = f.read()
+                    content = foamdict.read_foam_text(dpath)
                     editor.blockSignals(True)
                     editor.setPlainText(content)
                     editor.blockSignals(False)
                 except OSError:
-                    pass
+                    continue
+                clean = getattr(self.main_window, "file_clean_content", None)
+                if clean is not None:
+                    clean[dpath] = content
+                # A troca atômica cria um novo inode: o watcher precisa do caminho de novo.
+                watcher = getattr(self.main_window, "file_watcher", None)
+                if watcher is not None and dpath not in watcher.files():
+                    watcher.addPath(dpath)
 
 
 
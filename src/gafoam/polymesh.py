@@ -0,0 +1,191 @@
+"""Leitura da malha de volume do OpenFOAM (`constant/polyMesh`).
+
+Módulo sem dependência de Qt nem de VTK. Lê `points`, `faces`, `owner`,
+`neighbour` e `boundary` para arrays numpy, nos formatos ASCII e binário
+(e comprimidos com gzip):
+
+- os arquivos sem compressão são mapeados em memória; no formato binário os
+  arrays são visões diretas sobre o mapeamento, sem cópia;
+- no ASCII, os parênteses são removidos e os números convertidos de uma vez;
+- `faces` é aceito como `faceCompactList` (o padrão atual, com os vetores de
+  deslocamentos e de rótulos) ou como `faceList` ASCII (`4(0 1 2 3)`).
+
+`patch_surface` monta a superfície de um patch no formato de células do VTK,
+pronta para o visualizador. Os leitores de baixo nível (`open_buffer`,
+`read_header`, `list_start`, `read_flat`) também servem a `meshsets` e a
+`fieldio`.
+"""
+
+import gzip
+import mmap
+import os
+import re
+from collections import namedtuple
+
+import numpy as np
+
+from gafoam import foamdict
+
+# Malha poliédrica: `points` (N, 3); as faces em formato compacto, com os
+# vértices da face i em `face_labels[face_offsets[i]:face_offsets[i + 1]]`;
+# `owner`/`neighbour` por face; `patches` na ordem de `boundary`.
+PolyMesh = namedtuple(
+    "PolyMesh", ["points", "face_offsets", "face_labels", "owner", "neighbour", "patches"]
+)
+
+RE_HEADER = re.compile(rb"\bFoamFile\s*\{([^}]*)\}")
+RE_HEADER_ENTRY = re.compile(rb'\b(format|class|arch)\s+(?:"([^"]*)"|([^;\s]*))\s*;')
+RE_LIST_START = re.compile(rb"^[ \t]*(\d+)\s*\(", re.MULTILINE)
+RE_SIZED_LIST = re.compile(rb"(\d+)\s*\(")
+RE_ARCH_SIZE = re.compile(rb"\b(label|scalar)=(\d+)")
+
+
+def polymesh_dir(case_path):
+    return os.path.join(case_path, "constant", "polyMesh")
+
+
+def has_polymesh(case_path):
+    """Indica se o caso tem uma malha de volume gerada."""
+    directory = polymesh_dir(case_path)
+    return all(
+        foamdict.resolve_foam_file(os.path.join(directory, name)) is not None
+        for name in ("points", "faces", "owner", "boundary")
+    )
+
+
+def open_buffer(path):
+    """Conteúdo do arquivo como mapeamento em memória (ou bytes, se `.gz`)."""
+    real = foamdict.resolve_foam_file(path)
+    if real is None:
+        raise FileNotFoundError(path)
+    if foamdict.is_compressed(real):
+        with gzip.open(real, "rb") as fh:
+            return fh.read()
+    with open(real, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def read_header(buffer):
+    """`(formato, classe, dtype de rótulo, dtype de escalar, fim do cabeçalho)`."""
+    m = RE_HEADER.search(buffer, 0, min(len(buffer), 65536))
+    if m is None:
+        raise ValueError("Missing FoamFile header")
+    entries = {
+        key.decode(): (quoted or plain).strip()
+        for key, quoted, plain in RE_HEADER_ENTRY.findall(m.group(1))
+    }
+    sizes = {key.decode(): int(size) for key, size in RE_ARCH_SIZE.findall(entries.get("arch", b""))}
+    order = ">" if entries.get("arch", b"").startswith(b"MSB") else "<"
+    label = np.dtype(f"{order}i{sizes.get('label', 32) // 8}")
+    scalar = np.dtype(f"{order}f{sizes.get('scalar', 64) // 8}")
+    return entries.get("format", b"ascii").decode(), entries.get("class", b"").decode(), label, scalar, m.end()
+
+
+def list_start(buffer, pos):
+    """`(tamanho, início)` da próxima lista `N(` a partir de `pos`."""
+    m = RE_LIST_START.search(buffer, pos)
+    if m is None:
+        raise ValueError("List not found")
+    return int(m.group(1)), m.end()
+
+
+def read_flat(buffer, fmt, dtype, count, start):
+    """Lista plana de `count` valores a partir de `start`. Devolve `(array, fim)`."""
+    if fmt == "binary":
+        array = np.frombuffer(buffer, dtype=dtype, count=count, offset=start)
+        return array, start + count * dtype.itemsize + 1
+    end = buffer.find(b")", start)
+    kind = np.int64 if dtype.kind == "i" else np.float64
+    text = bytes(buffer[start:end])
+    array = np.fromstring(text, dtype=kind, sep=" ") if text.strip() else np.empty(0, dtype=kind)
+    if len(array) != count:
+        raise ValueError(f"Expected {count} values, found {len(array)}")
+    return array, end + 1
+
+
+def read_points(path):
+    """Coordenadas dos pontos, `(N, 3)`."""
+    buffer = open_buffer(path)
+    fmt, _, _, scalar, pos = read_header(buffer)
+    count, start = list_start(buffer, pos)
+    if fmt == "binary":
+        return np.frombuffer(buffer, dtype=scalar, count=3 * count, offset=start).reshape(count, 3)
+    end = buffer.rfind(b")")
+    values = np.fromstring(bytes(buffer[start:end]).translate(None, b"()"), dtype=np.float64, sep=" ")
+    if len(values) != 3 * count:
+        raise ValueError(f"Expected {count} points in {path}")
+    return values.reshape(count, 3)
+
+
+def read_labels(path):
+    """Lista de rótulos (`owner`, `neighbour`). Arquivo ausente vira lista vazia."""
+    if foamdict.resolve_foam_file(path) is None:
+        return np.empty(0, dtype=np.int64)
+    buffer = open_buffer(path)
+    fmt, _, label, _, pos = read_header(buffer)
+    count, start = list_start(buffer, pos)
+    return read_flat(buffer, fmt, label, count, start)[0]
+
+
+def read_faces(path):
+    """Faces em formato compacto: `(deslocamentos, rótulos)`."""
+    buffer = open_buffer(path)
+    fmt, cls, label, _, pos = read_header(buffer)
+    count, start = list_start(buffer, pos)
+    if cls == "faceCompactList":
+        offsets, end = read_flat(buffer, fmt, label, count, start)
+        n_labels, start = list_start(buffer, end)
+        labels, _ = read_flat(buffer, fmt, label, n_labels, start)
+        return offsets, labels
+    if fmt == "binary":
+        raise ValueError(f"Unsupported binary face list class '{cls}' in {path}")
+    body = bytes(buffer[start:buffer.rfind(b")")])
+    sizes = np.array(RE_SIZED_LIST.findall(body), dtype=np.int64)
+    labels = np.fromstring(RE_SIZED_LIST.sub(b" ", body).replace(b")", b" "), dtype=np.int64, sep=" ")
+    if len(sizes) != count or len(labels) != sizes.sum():
+        raise ValueError(f"Malformed face list in {path}")
+    return np.concatenate(([0], np.cumsum(sizes))), labels
+
+
+def read_polymesh(case_path):
+    """Malha de volume do caso. Levanta OSError/ValueError se não puder ser lida."""
+    directory = polymesh_dir(case_path)
+    points = read_points(os.path.join(directory, "points"))
+    offsets, labels = read_faces(os.path.join(directory, "faces"))
+    owner = read_labels(os.path.join(directory, "owner"))
+    neighbour = read_labels(os.path.join(directory, "neighbour"))
+    patches = [
+        {
+            "name": name,
+            "type": data.get("type", "patch"),
+            "startFace": int(data.get("startFace", 0)),
+            "nFaces": int(data.get("nFaces", 0)),
+        }
+        for name, data in foamdict.read_mesh_patches(case_path).items()
+    ]
+    return PolyMesh(points, offsets, labels, owner, neighbour, patches)
+
+
+def patch_surface(mesh, patch):
+    """Superfície de um patch: `(pontos, células no formato do VTK)`.
+
+    Só os pontos usados pelo patch são copiados; os rótulos são renumerados
+    para esse subconjunto.
+    """
+    start, n_faces = patch["startFace"], patch["nFaces"]
+    offsets = np.asarray(mesh.face_offsets[start:start + n_faces + 1], dtype=np.int64)
+    if n_faces == 0 or len(offsets) < 2:
+        return np.empty((0, 3)), np.empty(0, dtype=np.int64)
+    labels = np.asarray(mesh.face_labels[offsets[0]:offsets[-1]], dtype=np.int64)
+    used, local = np.unique(labels, return_inverse=True)
+
+    sizes = np.diff(offsets)
+    count_pos = (offsets[:-1] - offsets[0]) + np.arange(n_faces)
+    cells = np.empty(len(labels) + n_faces, dtype=np.int64)
+    is_label = np.ones(len(cells), dtype=bool)
+    is_label[count_pos] = False
+    cells[count_pos] = sizes
+    cells[is_label] = local
+    return np.asarray(mesh.points[used], dtype=np.float64), cells
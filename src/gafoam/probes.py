@@ -0,0 +1,139 @@
+"""Sondas de pontos e linhas sobre os campos gravados em disco.
+
+Módulo sem dependência de Qt nem de VTK. Cada sonda é associada à célula de
+centro mais próximo, localizada por uma árvore k-d sobre os centros das
+células (`KDTree`), construída uma vez por malha e guardada em `CellProbe`.
+Com as células conhecidas, amostrar um tempo é só indexar o `internalField`,
+sem `sampleDict` nem `postProcess`; a varredura de todos os tempos fica a
+cargo de quem chama (um item por tempo num pool de threads).
+"""
+
+import numpy as np
+
+from gafoam import fieldio, meshquality
+
+# Pontos por folha da árvore: abaixo disso a busca bruta vetorizada é mais barata.
+LEAF_SIZE = 32
+
+
+class KDTree:
+    """Árvore k-d sobre pontos `(N, 3)`, guardada em arrays.
+
+    Cada nó cobre uma faixa de `index`; os nós internos dividem a faixa pela
+    mediana do eixo de maior extensão. Só a busca do vizinho mais próximo é
+    oferecida, que é o que as sondas usam.
+    """
+
+    def __init__(self, points, leaf_size=LEAF_SIZE):
+        self.points = np.asarray(points, dtype=np.float64)
+        n = len(self.points)
+        self.index = np.arange(n, dtype=np.int64)
+        start, end, dim, split, left, right = [0], [n], [0], [0.0], [-1], [-1]
+
+        stack = [0] if n else []
+        while stack:
+            node = stack.pop()
+            s, e = start[node], end[node]
+            if e - s <= leaf_size:
+                continue
+            ids = self.index[s:e]
+            pts = self.points[ids]
+            axis = int(np.argmax(pts.max(axis=0) - pts.min(axis=0)))
+            mid = (e - s) // 2
+            order = np.argpartition(pts[:, axis], mid)
+            self.index[s:e] = ids[order]
+            dim[node], split[node] = axis, float(pts[order[mid], axis])
+            for child_start, child_end in ((s, s + mid), (s + mid, e)):
+                start.append(child_start)
+                end.append(child_end)
+                dim.append(0)
+                split.append(0.0)
+                left.append(-1)
+                right.append(-1)
+            left[node], right[node] = len(start) - 2, len(start) - 1
+            stack += [left[node], right[node]]
+
+        self._start, self._end = np.array(start), np.array(end)
+        self._dim, self._split = np.array(dim), np.array(split)
+        self._left, self._right = np.array(left), np.array(right)
+
+    def __len__(self):
+        return len(self.points)
+
+    def query(self, points):
+        """`(distâncias, índices)` do ponto mais próximo de cada consulta."""
+        queries = np.atleast_2d(np.asarray(points, dtype=np.float64))
+        distances = np.full(len(queries), np.inf)
+        indices = np.full(len(queries), -1, dtype=np.int64)
+        if not len(self.points):
+            return distances, indices
+        start, end, dim, split = self._start, self._end, self._dim, self._split
+        left, right = self._left, self._right
+
+        for i, p in enumerate(queries):
+            best, best_id = np.inf, -1
+            # Pilha de (nó, limite inferior da distância²).
+            stack = [(0, 0.0)]
+            while stack:
+                node, bound = stack.pop()
+                if bound >= best:
+                    continue
+                if left[node] < 0:
+                    ids = self.index[start[node]:end[node]]
+                    d2 = ((self.points[ids] - p) ** 2).sum(axis=1)
+                    k = int(np.argmin(d2))
+                    if d2[k] < best:
+                        best, best_id = float(d2[k]), int(ids[k])
+                    continue
+                diff = p[dim[node]] - split[node]
+                near, far = (left[node], right[node]) if diff < 0 else (right[node], left[node])
+                stack.append((far, max(bound, diff * diff)))
+                stack.append((near, bound))
+            distances[i], indices[i] = np.sqrt(best), best_id
+        return distances, indices
+
+
+def cell_centres(mesh):
+    """Centros `(C, 3)` das células de um `polymesh.PolyMesh`."""
+    owner = np.asarray(mesh.owner, dtype=np.int64)
+    neighbour = np.asarray(mesh.neighbour, dtype=np.int64)
+    n_cells = int(max(np.max(owner, initial=-1), np.max(neighbour, initial=-1))) + 1
+    face_centres, face_areas = meshquality.face_geometry(mesh.points, mesh.face_offsets, mesh.face_labels)
+    return meshquality.cell_geometry(face_centres, face_areas, owner, neighbour, n_cells)[0]
+
+
+class CellProbe:
+    """Localizador de células de uma malha: a árvore k-d é construída uma vez só."""
+
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self.tree = KDTree(cell_centres(mesh))
+
+    def locate(self, points):
+        """`(células, distâncias ao centro)` de cada ponto."""
+        distances, cells = self.tree.query(points)
+        return cells, distances
+
+
+def line_points(start, end, count):
+    """`count` pontos igualmente espaçados de `start` a `end` e a distância de cada um a `start`."""
+    start = np.asarray(start, dtype=np.float64)
+    end = np.asarray(end, dtype=np.float64)
+    t = np.linspace(0.0, 1.0, max(int(count), 2))
+    return start + t[:, None] * (end - start), t * float(np.linalg.norm(end - start))
+
+
+def sample_cells(field, cells, which="magnitude"):
+    """Escalar do `internalField` nas células `cells` (ver `fieldio.component`).
+
+    Levanta ValueError se o campo não tiver valores internos.
+    """
+    cells = np.asarray(cells, dtype=np.int64)
+    if field.internal is None:
+        raise ValueError("Field has no internalField values")
+    if isinstance(field.internal, fieldio.Uniform):
+        value = np.asarray(field.internal.value, dtype=np.float64)
+        return fieldio.component(np.broadcast_to(value, (len(cells),) + value.shape), which)
+    if len(cells) and cells.max() >= len(field.internal):
+        raise ValueError(f"Field has {len(field.internal)} cells, the mesh has more")
+    return fieldio.component(field.internal[cells], which)
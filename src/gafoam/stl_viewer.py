@@ -6,99 +6,77 @@ plano de corte interativo, ferramenta de medição tridimensional e personaliza
 
 import math
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pyvista as pv
 from pyvistaqt import QtInteractor
+from vtkmodules.vtkCommonCore import reference as vtk_reference
+from vtkmodules.vtkCommonDataModel import vtkCellLocator
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QComboBox, 
     QPushButton, QLabel, QScrollArea, QCheckBox, 
     QListWidget, QListWidgetItem, QSlider, QGroupBox, 
     QFormLayout, QFileDialog, QMessageBox, QTableWidget,
     QTableWidgetItem, QHeaderView, QDialog, QDialogButtonBox,
-    QSizePolicy
+    QSizePolicy, QProgressBar, QLineEdit, QAbstractItemView, QSpinBox
 )
-from PySide6.QtCore import Qt, QPoint
-from PySide6.QtGui import QPainter, QPen, QColor, QPixmap, QIcon, QFont, QImage
+from PySide6.QtCore import Qt, QPoint, QObject, QRect, QTimer, Signal
+from PySide6.QtGui import QPainter, QPen, QColor, QPixmap, QIcon, QFont, QImage, QGuiApplication
+
+from gafoam import decomposed, fieldio, geomcache, geomtools, meshquality, meshsets, polymesh, probes, stlio, surfcheck
+from gafoam.timeindex import TimeIndex, time_value
+
+try:
+    from PySide6.QtCharts import QChart, QChartView, QAreaSeries, QLineSeries, QValueAxis
+    QTCHARTS_AVAILABLE = True
+except ImportError:
+    QTCHARTS_AVAILABLE = False
 
 
 def check_mesh_quality(mesh):
-    """Calcula métricas avançadas de qualidade e estanqueidade (watertight) para CFD."""
+    """Calcula métricas avançadas de qualidade e estanqueidade (watertight) para CFD.
+
+    O diagnóstico é feito por `surfcheck` sobre a triangulação da superfície;
+    além das arestas abertas, cobre arestas não-manifold, normais
+    inconsistentes, faces duplicadas ou degeneradas e candidatos a
+    auto-interseção.
+    """
     if mesh is None or not hasattr(mesh, 'n_points') or mesh.n_points == 0:
         return None
-    
-    n_pts = mesh.n_points
-    n_cells = mesh.n_cells
-    is_all_tri = getattr(mesh, 'is_all_triangles', True)
-    
-    # Detecção de arestas abertas (boundary edges)
-    n_open_edges = 0
+
+    surface = mesh if isinstance(mesh, pv.PolyData) else mesh.extract_surface()
+    is_all_tri = bool(getattr(surface, 'is_all_triangles', True))
+    if not is_all_tri:
+        surface = surface.triangulate()
     try:
-        feature_edges = mesh.extract_feature_edges(
-            boundary_edges=True, 
-            feature_edges=False, 
-            manifold_edges=False,
-            non_manifold_edges=True
-        )
-        n_open_edges = feature_edges.n_cells
+        faces = surface.regular_faces
     except Exception:
-        n_open_edges = 0
+        return None
 
-    is_watertight = (n_open_edges == 0 and n_cells > 0)
-    area = float(getattr(mesh, 'area', 0.0))
-    
-    volume = None
-    if is_watertight:
-        try:
-            volume = float(mesh.volume)
-        except Exception:
-            volume = None
-
-    bounds = mesh.bounds # (xmin, xmax, ymin, ymax, zmin, zmax)
-    dx = bounds[1] - bounds[0]
-    dy = bounds[3] - bounds[2]
-    dz = bounds[5] - bounds[4]
-
-    return {
-        "points": n_pts,
-        "cells": n_cells,
-        "is_all_triangles": is_all_tri,
-        "open_edges": n_open_edges,
-        "is_watertight": is_watertight,
-        "area": area,
-        "volume": volume,
-        "bounds": bounds,
-        "dimensions": (dx, dy, dz)
-    }
+    metrics = surfcheck.surface_diagnostics(surface.points, faces)
+    metrics["points"] = mesh.n_points
+    metrics["cells"] = mesh.n_cells
+    metrics["is_all_triangles"] = is_all_tri
+    return metrics
 
 
 def detect_stl_patches(file_path):
-    """Varre arquivo STL em busca de múltiplos patches/sólidos (para snappyHexMesh)."""
+    """Varre arquivo STL em busca de múltiplos patches/sólidos (para snappyHexMesh).
+
+    Devolve `[{name, faces, start, end}]` com a contagem exata de faces e o
+    intervalo de bytes de cada sólido (ver `stlio.scan_stl_patches`).
+    """
     patches = []
     if not file_path or not os.path.isfile(file_path):
         return patches
 
-    try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines(100000)
-        
-        current_solid = None
-        face_count = 0
-        for line in lines:
-            l = line.strip()
-            if l.lower().startswith("solid"):
-                parts = l.split(maxsplit=1)
-                name = parts[1] if len(parts) > 1 else "default"
-                current_solid = name
-                face_count = 0
-            elif l.lower().startswith("endsolid"):
-                if current_solid:
-                    patches.append({"name": current_solid, "faces": face_count})
-                    current_solid = None
-            elif l.lower().startswith("facet"):
-                face_count += 1
-    except Exception:
-        pass
+    if file_path.lower().endswith((".stl", ".stlb")):
+        try:
+            patches = stlio.scan_stl_patches(file_path)
+        except OSError:
+            patches = []
 
     if not patches:
         base_name = os.path.splitext(os.path.basename(file_path))[0]
@@ -106,19 +84,399 @@ def detect_stl_patches(file_path):
     return patches
 
 
+def surface_to_polydata(surface):
+    """PolyData de uma superfície lida por `stlio.read_stl`."""
+    return pv.PolyData.from_regular_faces(surface.points, surface.faces)
+
+
+def read_geometry(full_path, cache_dir=None):
+    """Lê uma geometria do disco sem tocar na cena, podendo rodar fora da thread da interface.
+
+    Devolve `(mesh, patches, metrics)`: `patches` é `(patch_ids, nomes)` para
+    STL e None para os demais formatos; `metrics` é o resultado de
+    `check_mesh_quality`. Com `cache_dir`, a geometria unificada e as métricas
+    são reaproveitadas de `geomcache` enquanto o arquivo não mudar no disco.
+    `mesh` é None se nada pôde ser lido.
+    """
+    if cache_dir:
+        cached = geomcache.load(cache_dir, full_path)
+        if cached is not None:
+            mesh = pv.PolyData(cached["points"], cached["faces"])
+            patches = None
+            if cached["patch_ids"] is not None:
+                patches = (cached["patch_ids"], cached["patch_names"])
+            return mesh, patches, cached["metrics"] or None
+
+    mesh, patches = None, None
+    if full_path.lower().endswith((".stl", ".stlb")):
+        try:
+            surface = stlio.read_stl(full_path)
+            if len(surface.faces):
+                mesh = surface_to_polydata(surface)
+                patches = (surface.patch_ids, surface.patch_names)
+        except (OSError, ValueError):
+            mesh = None
+    if mesh is None:
+        try:
+            mesh = pv.read(full_path)
+        except Exception:
+            return None, None, None
+        if mesh is None or mesh.n_points == 0:
+            return None, None, None
+        if isinstance(mesh, pv.PolyData):
+            mesh = mesh.clean()
+
+    metrics = check_mesh_quality(mesh)
+    if cache_dir and isinstance(mesh, pv.PolyData):
+        patch_ids, patch_names = patches if patches is not None else (None, ())
+        geomcache.store(cache_dir, full_path, mesh.points, mesh.faces, patch_ids, patch_names, metrics)
+    return mesh, patches, metrics
+
+
+# Número de faces dos proxies usados durante a interação com a câmera.
+LOD_TARGET_FACES = 100_000
+
+
+def build_lod_proxy(mesh, target_faces=LOD_TARGET_FACES):
+    """Versão simplificada da malha para exibir enquanto a câmera se move.
+
+    Usa decimação quadrática até cerca de `target_faces` triângulos. Devolve
+    None se a malha já for pequena o bastante para dispensar o proxy.
+    """
+    if mesh is None or mesh.n_cells <= target_faces:
+        return None
+    surface = mesh if mesh.is_all_triangles else mesh.triangulate()
+    proxy = surface.decimate(1.0 - target_faces / surface.n_cells)
+    return proxy if proxy.n_cells else None
+
+
+def build_cell_locator(mesh):
+    """Índice espacial das células da malha para interseção com raios."""
+    locator = vtkCellLocator()
+    locator.SetDataSet(mesh)
+    locator.BuildLocator()
+    return locator
+
+
+def intersect_ray(locator, start, end, tolerance=1e-9):
+    """Primeira interseção do segmento `start`-`end` com a superfície indexada.
+
+    Devolve `(t, ponto)`, com `t` em [0, 1] medido a partir de `start`, ou None
+    se o segmento não toca a superfície.
+    """
+    t = vtk_reference(0.0)
+    point = [0.0, 0.0, 0.0]
+    pcoords = [0.0, 0.0, 0.0]
+    sub_id = vtk_reference(0)
+    cell_id = vtk_reference(0)
+    if not locator.IntersectWithLine(list(start), list(end), tolerance, t, point, pcoords, sub_id, cell_id):
+        return None
+    return float(t), point
+
+
+# Diretórios que não guardam geometria de entrada do caso.
+_NON_GEOMETRY_DIRS = {"polyMesh", "postProcessing", "dynamicCode"}
+
+
+def _skip_geometry_dir(name):
+    """Indica se a varredura de geometrias deve ignorar o diretório `name`.
+
+    Além dos diretórios de malha e pós-processamento, ignora os ocultos, os
+    `processor*` e os diretórios de tempo escritos pelo solver.
+    """
+    if name.startswith(".") or name in _NON_GEOMETRY_DIRS or name.startswith("processor"):
+        return True
+    try:
+        float(name)
+        return True
+    except ValueError:
+        return False
+
+
+def is_geometry_dir(case_path, dir_path):
+    """Indica se mudanças em `dir_path` podem afetar as geometrias do caso."""
+    rel = os.path.relpath(dir_path, case_path)
+    if rel == ".":
+        return True
+    if rel.startswith(".."):
+        return False
+    return not any(_skip_geometry_dir(part) for part in rel.split(os.sep))
+
+
+def find_geometry_files(case_path):
+    """Arquivos STL/OBJ do caso como `[(relativo, completo)]`, em ordem estável.
+
+    Uma única passada pelo caso, sem entrar em diretórios de tempo,
+    `processor*`, `polyMesh` ou `postProcessing`.
+    """
+    found = []
+    for root, dirs, files in os.walk(case_path):
+        dirs[:] = sorted(d for d in dirs if not _skip_geometry_dir(d))
+        for f in sorted(files):
+            if f.lower().endswith(('.stl', '.obj')):
+                full_p = os.path.normpath(os.path.join(root, f))
+                found.append((os.path.relpath(full_p, case_path), full_p))
+    return found
+
+
+def _file_identity(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def diff_geometry_scan(previous_ids, pending, found_meshes):
+    """Compara uma nova varredura com a anterior.
+
+    `previous_ids` mapeia caminho para a identidade (tamanho, mtime) vista na
+    última varredura e `pending` são os caminhos ainda não carregados.
+    Devolve `(removidos, a_carregar, novas_identidades)`.
+    """
+    file_ids = {full_path: _file_identity(full_path) for _, full_path in found_meshes}
+    removed = [path for path in previous_ids if path not in file_ids]
+    to_load = [
+        (rel_path, full_path) for rel_path, full_path in found_meshes
+        if full_path in pending or previous_ids.get(full_path) != file_ids[full_path]
+    ]
+    return removed, to_load, file_ids
+
+
+class GeometryLoader(QObject):
+    """Lê geometrias num pool de threads e entrega cada malha assim que fica pronta.
+
+    Os leitores do VTK e o `stlio` liberam o GIL durante o trabalho pesado, então
+    as leituras avançam em paralelo. O resultado de cada thread é enviado por
+    sinal à thread da interface, onde a malha é adicionada à cena. Cada `start`
+    abre uma nova geração: resultados de gerações canceladas são descartados.
+    """
+
+    mesh_ready = Signal(int, str, str, object, object, object)  # índice, relativo, completo, malha, patches, métricas
+    progress = Signal(int, int)  # concluídas, total
+    finished = Signal(bool)  # True se cancelado
+
+    _done = Signal(int, int, object, object, object)
+
+    def __init__(self, parent=None, max_workers=None):
+        super().__init__(parent)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers or min(8, os.cpu_count() or 2))
+        self._generation = 0
+        self._files = []
+        self._cache_dir = None
+        self._futures = []
+        self._completed = 0
+        self._done.connect(self._on_done)
+
+    def is_running(self):
+        return bool(self._futures)
+
+    def start(self, files_list, cache_dir=None):
+        """Cancela a carga em andamento e começa a ler `files_list` em segundo plano.
+
+        Com `cache_dir`, as geometrias passam pelo cache em disco (`geomcache`).
+        """
+        self.cancel(notify=False)
+        self._generation += 1
+        generation = self._generation
+        self._files = list(files_list)
+        self._cache_dir = cache_dir
+        self._completed = 0
+        self._futures = [
+            self._pool.submit(self._read, generation, idx, full_path)
+            for idx, (_, full_path) in enumerate(self._files)
+        ]
+        if not self._files:
+            self.finished.emit(False)
+
+    def cancel(self, notify=True):
+        """Descarta as leituras pendentes; as que já começaram terminam sem efeito."""
+        if not self._futures:
+            return
+        self._generation += 1
+        for future in self._futures:
+            future.cancel()
+        self._futures = []
+        if notify:
+            self.finished.emit(True)
+
+    def shutdown(self):
+        self.cancel(notify=False)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _read(self, generation, idx, full_path):
+        if generation != self._generation:
+            return
+        try:
+            mesh, patches, metrics = read_geometry(full_path, self._cache_dir)
+        except Exception as e:
+            print(f"Erro ao carregar mesh {full_path}: {e}")
+            mesh, patches, metrics = None, None, None
+        self._done.emit(generation, idx, mesh, patches, metrics)
+
+    def _on_done(self, generation, idx, mesh, patches, metrics):
+        if generation != self._generation:
+            return
+        self._completed += 1
+        rel_path, full_path = self._files[idx]
+        self.mesh_ready.emit(idx, rel_path, full_path, mesh, patches, metrics)
+        self.progress.emit(self._completed, len(self._files))
+        if self._completed == len(self._files):
+            self._futures = []
+            self.finished.emit(False)
+
+
+class BatchRunner(QObject):
+    """Aplica uma função a vários itens num pool de threads e entrega os resultados juntos.
+
+    Usado pelas ferramentas de geometria em lote: cada superfície é
+    processada em paralelo (as operações do numpy liberam o GIL) e
+    `finished` recebe, na thread da interface, a lista de resultados na ordem
+    dos itens. Um item que falhou aparece como a exceção levantada.
+    """
+
+    finished = Signal(object)
+
+    _done = Signal(int)
+
+    def __init__(self, parent=None, max_workers=None):
+        super().__init__(parent)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers or min(8, os.cpu_count() or 2))
+        self._generation = 0
+        self._futures = []
+        self._done.connect(self._on_done)
+
+    def is_running(self):
+        return bool(self._futures)
+
+    def run(self, func, items):
+        self._generation += 1
+        generation = self._generation
+        self._futures = [self._pool.submit(func, item) for item in items]
+        if not self._futures:
+            self.finished.emit([])
+        for future in self._futures:
+            future.add_done_callback(lambda _f, g=generation: self._done.emit(g))
+
+    def shutdown(self):
+        self._futures = []
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _on_done(self, generation):
+        if generation != self._generation or not self._futures:
+            return
+        if not all(future.done() for future in self._futures):
+            return
+        futures, self._futures = self._futures, []
+        self.finished.emit([f.exception() or f.result() for f in futures])
+
+
+class RenderScheduler(QObject):
+    """Agrupa pedidos de renderização no ritmo de atualização da tela.
+
+    Qualquer número de pedidos feitos dentro de um quadro resulta em uma única
+    chamada de `render(escala)`. Durante a interação a escala é
+    `INTERACTIVE_SCALE` (imagem reduzida, mais barata); quando a interação para
+    por `idle_ms`, um último quadro é feito em resolução cheia.
+    """
+
+    INTERACTIVE_SCALE = 0.5
+
+    def __init__(self, render, parent=None, interval_ms=None, idle_ms=150):
+        super().__init__(parent)
+        self._render = render
+        self._interactive = False
+        if interval_ms is None:
+            screen = QGuiApplication.primaryScreen()
+            rate = screen.refreshRate() if screen else 0
+            interval_ms = int(1000 / rate) if rate > 0 else 16
+
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.setInterval(interval_ms)
+        self._frame_timer.timeout.connect(self._on_frame)
+
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(idle_ms)
+        self._idle_timer.timeout.connect(self._on_idle)
+
+    def request(self, interactive=False):
+        """Agenda um quadro; `interactive` indica que o usuário está movendo a câmera."""
+        if interactive:
+            self._interactive = True
+            self._idle_timer.start()
+        if not self._frame_timer.isActive():
+            self._frame_timer.start()
+
+    def flush(self):
+        """Descarta os pedidos pendentes e renderiza já em resolução cheia."""
+        self._frame_timer.stop()
+        self._idle_timer.stop()
+        self._interactive = False
+        self._render(1.0)
+
+    def _on_frame(self):
+        self._render(self.INTERACTIVE_SCALE if self._interactive else 1.0)
+
+    def _on_idle(self):
+        self._interactive = False
+        self._frame_timer.stop()
+        self._render(1.0)
+
+
+class RenderView(QWidget):
+    """Exibe o último quadro do plotter off-screen.
+
+    O quadro fica num QImage persistente, realocado só quando o tamanho muda, e
+    é desenhado esticado sobre o widget: quadros de interação em resolução
+    reduzida ocupam a mesma área dos quadros completos.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._frames = {}
+        self._frame = None
+
+    def frame_buffer(self, width, height):
+        """Array `(altura, largura, 3)` que escreve diretamente no QImage do quadro."""
+        entry = self._frames.get((width, height))
+        if entry is None:
+            # Um buffer por resolução (interação e repouso) evita realocar a
+            # cada alternância entre as duas.
+            if len(self._frames) >= 2:
+                self._frames.clear()
+            image = QImage(width, height, QImage.Format_RGB888)
+            image.fill(Qt.white)
+            rows = np.frombuffer(image.bits(), dtype=np.uint8).reshape(height, image.bytesPerLine())
+            entry = (image, rows[:, :width * 3].reshape(height, width, 3))
+            self._frames[(width, height)] = entry
+        self._frame = entry[0]
+        return entry[1]
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        if self._frame is None:
+            painter.fillRect(self.rect(), Qt.white)
+        else:
+            painter.setRenderHint(QPainter.SmoothPixmapTransform, False)
+            painter.drawImage(QRect(0, 0, self.width(), self.height()), self._frame)
+        painter.end()
+
+
 class STLViewer(QWidget):
+    _mesh_indexed = Signal(str, object, object, object)  # caminho, cópia indexada, proxy, localizador
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(0, 0, 0, 0)
         
-        self.lbl_render = QLabel(self)
-        self.lbl_render.setAlignment(Qt.AlignCenter)
-        self.lbl_render.setStyleSheet("background-color: #ffffff;")
-        self.lbl_render.setFocusPolicy(Qt.ClickFocus)
-        self.lbl_render.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.lbl_render.setMinimumSize(100, 100)
-        self.layout.addWidget(self.lbl_render)
+        self.render_view = RenderView(self)
+        self.render_view.setFocusPolicy(Qt.ClickFocus)
+        self.render_view.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.render_view.setMinimumSize(100, 100)
+        self.layout.addWidget(self.render_view)
 
         self.plotter = pv.Plotter(off_screen=True, window_size=(800, 600))
         self.plotter.set_background("white")
@@ -127,6 +485,14 @@ class STLViewer(QWidget):
         self.actors = {}
         self.meshes = {} # Armazena os objetos pyvista.PolyData originais
         self.mesh_props = {}
+        self.mesh_patches = {} # (patch_ids por face, nomes dos solids) dos STL
+        self.mesh_metrics = {} # Métricas de check_mesh_quality calculadas na carga
+        self.lod_proxies = {} # Malhas decimadas exibidas durante a interação
+        self._lod_swapped = {} # Entradas originais dos mappers trocadas pelo proxy
+        self.locators = {} # Localizadores de células para a seleção de pontos
+        self._indexing = {} # Cópia rasa da malha em indexação, por caminho
+        self._index_pool = ThreadPoolExecutor(max_workers=1)
+        self._mesh_indexed.connect(self._on_mesh_indexed)
         
         # Paleta de cores vibrantes e contrastantes (IBM Carbon)
         self._mesh_colors = [
@@ -145,44 +511,144 @@ class STLViewer(QWidget):
         self.measurement_points = []
         self.on_measure_callback = None
         self.measuring_active = False
+        self.probe_points = []
+        self.on_probe_callback = None
+        self.probing_active = False
         self.clip_active = False
         self._last_pos = QPoint()
 
+        self.render_scheduler = RenderScheduler(self._render_frame, self)
+
     def update_render(self):
-        """Renderiza a cena tridimensional e atualiza o buffer gráfico."""
+        """Renderiza a cena tridimensional em resolução cheia e atualiza o quadro exibido."""
+        self.render_scheduler.flush()
+
+    def request_render(self, interactive=False):
+        """Agenda uma renderização, agrupando pedidos feitos no mesmo quadro."""
+        self.render_scheduler.request(interactive)
+
+    def _view_size(self):
+        """Tamanho em pixels da imagem de resolução cheia."""
+        return (max(100, self.render_view.width(), self.width()),
+                max(100, self.render_view.height(), self.height()))
+
+    def _render_frame(self, scale=1.0):
         if not self.plotter:
             return
-        w = max(100, self.lbl_render.width(), self.width())
-        h = max(100, self.lbl_render.height(), self.height())
+        # Quadros de interação usam os proxies decimados; o quadro final de
+        # repouso volta às malhas completas.
+        self._swap_lod(scale < 1.0 and not self.clip_active)
+        w, h = self._view_size()
+        w, h = max(1, int(w * scale)), max(1, int(h * scale))
         self.plotter.window_size = (w, h)
         try:
             img = self.plotter.screenshot(return_img=True)
             if img is not None and len(img.shape) == 3:
-                ih, iw, ic = img.shape
-                bytes_per_line = ic * iw
-                img_c = np.ascontiguousarray(img)
-                qimg = QImage(img_c.data, iw, ih, bytes_per_line, QImage.Format_RGB888).copy()
-                self.lbl_render.setPixmap(QPixmap.fromImage(qimg))
+                ih, iw = img.shape[:2]
+                buffer = self.render_view.frame_buffer(iw, ih)
+                buffer[...] = img[:, :, :3]
+                self.render_view.update()
         except Exception as e:
             print(f"Error in update_render: {e}")
 
+    def _swap_lod(self, active):
+        """Troca a entrada dos mappers entre a malha completa e o proxy decimado."""
+        for full_path, name in self.actors.items():
+            actor = self.plotter.actors.get(name)
+            proxy = self.lod_proxies.get(full_path)
+            # O proxy decimado não carrega os valores de campo por face.
+            if actor is None or proxy is None or self.mesh_props.get(full_path, {}).get("scalars"):
+                continue
+            mapper = actor.GetMapper()
+            if active and full_path not in self._lod_swapped:
+                self._lod_swapped[full_path] = mapper.GetInput()
+                mapper.SetInputData(proxy)
+            elif not active and full_path in self._lod_swapped:
+                original = self._lod_swapped.pop(full_path)
+                # O ator pode ter sido recriado (estilo, corte) durante a interação.
+                if mapper.GetInput() is proxy:
+                    mapper.SetInputData(original)
+        if not active:
+            self._lod_swapped.clear()
+
+    def _schedule_indexing(self, full_path, mesh):
+        # Proxy e localizador são construídos sobre uma cópia rasa: a malha
+        # original continua ligada ao pipeline de renderização da thread da
+        # interface.
+        source = pv.PolyData()
+        source.shallow_copy(mesh)
+        self._indexing[full_path] = source
+        self._index_pool.submit(self._build_indexes, full_path, source)
+
+    def _build_indexes(self, full_path, source):
+        proxy = locator = None
+        try:
+            proxy = build_lod_proxy(source, LOD_TARGET_FACES)
+            locator = build_cell_locator(source)
+        except Exception as e:
+            print(f"Erro ao indexar mesh {full_path}: {e}")
+        self._mesh_indexed.emit(full_path, source, proxy, locator)
+
+    def _on_mesh_indexed(self, full_path, source, proxy, locator):
+        # Descarta resultados de malhas removidas, recarregadas ou
+        # transformadas nesse meio tempo.
+        if self._indexing.get(full_path) is not source:
+            return
+        del self._indexing[full_path]
+        if proxy is not None:
+            self.lod_proxies[full_path] = proxy
+        if locator is not None:
+            self.locators.setdefault(full_path, locator)
+
     def showEvent(self, event):
         super().showEvent(event)
-        self.update_render()
+        self.request_render()
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        self.update_render()
+        self.request_render(interactive=True)
 
     def mousePressEvent(self, event):
         self._last_pos = event.pos()
         if self.measuring_active:
-            # Captura ponto estimado via ray picking no bounding box central
-            if self.meshes:
-                first_mesh = list(self.meshes.values())[0]
-                b = first_mesh.bounds
-                center = [(b[0] + b[1]) * 0.5, (b[2] + b[3]) * 0.5, (b[4] + b[5]) * 0.5]
-                self._on_point_picked(center)
+            point = self.pick_point(self.render_view.mapFrom(self, event.pos()))
+            if point is not None:
+                self._on_point_picked(point)
+        elif self.probing_active:
+            point = self.pick_point(self.render_view.mapFrom(self, event.pos()))
+            if point is not None:
+                self._on_probe_picked(point)
+
+    def view_ray(self, pos):
+        """Segmento da câmera até o plano de fundo que passa pelo pixel `pos` da vista."""
+        view_w, view_h = self._view_size()
+        win_w, win_h = self.plotter.window_size
+        x = (pos.x() + 0.5) * win_w / view_w
+        y = (view_h - pos.y() - 0.5) * win_h / view_h
+        renderer = self.plotter.renderer
+        ends = []
+        for depth in (0.0, 1.0):
+            renderer.SetDisplayPoint(x, y, depth)
+            renderer.DisplayToWorld()
+            wx, wy, wz, ww = renderer.GetWorldPoint()
+            ends.append(np.array([wx, wy, wz]) / (ww or 1.0))
+        return ends[0], ends[1]
+
+    def pick_point(self, pos):
+        """Ponto da superfície visível mais próximo da câmera sob o pixel `pos`, ou None."""
+        start, end = self.view_ray(pos)
+        best = None
+        for full_path, mesh in self.meshes.items():
+            if not self.mesh_props.get(full_path, {}).get("visible", True):
+                continue
+            locator = self.locators.get(full_path)
+            if locator is None:
+                # Malha ainda não indexada em segundo plano: indexa agora e guarda.
+                locator = self.locators[full_path] = build_cell_locator(mesh)
+            hit = intersect_ray(locator, start, end)
+            if hit is not None and (best is None or hit[0] < best[0]):
+                best = hit
+        return best[1] if best else None
 
     def mouseMoveEvent(self, event):
         dx = event.x() - self._last_pos.x()
@@ -193,7 +659,7 @@ class STLViewer(QWidget):
             # Rotação orbital
             self.plotter.camera.Azimuth(-dx * 0.5)
             self.plotter.camera.Elevation(dy * 0.5)
-            self.update_render()
+            self.request_render(interactive=True)
         elif event.buttons() & Qt.RightButton or event.buttons() & Qt.MiddleButton:
             # Pan (translação)
             cam = self.plotter.camera
@@ -215,7 +681,7 @@ class STLViewer(QWidget):
             shift = (-dx * right + dy * true_up) * pan_scale
             cam.position = tuple(pos + shift)
             cam.focal_point = tuple(foc + shift)
-            self.update_render()
+            self.request_render(interactive=True)
 
     def wheelEvent(self, event):
         delta = event.angleDelta().y()
@@ -223,82 +689,73 @@ class STLViewer(QWidget):
             self.plotter.camera.zoom(1.1)
         else:
             self.plotter.camera.zoom(0.9)
-        self.update_render()
+        self.request_render(interactive=True)
 
-    def load_meshes(self, files_list):
-        """Carrega e renderiza simultaneamente todas as malhas listadas com cores distintas e superfícies lisas."""
+    def clear_meshes(self):
+        """Remove todas as malhas da cena."""
         self.plotter.clear()
         self.plotter.add_axes()
         self.actors = {}
         self.meshes = {}
         self.mesh_props = {}
+        self.mesh_patches = {}
+        self.mesh_metrics = {}
+        self.lod_proxies = {}
+        self._lod_swapped = {}
+        self.locators = {}
+        self._indexing = {}
         self.measurement_points = []
+
+    def add_loaded_mesh(self, idx, rel_path, full_path, mesh, patches=None, metrics=None):
+        """Adiciona à cena uma malha já lida, com a cor da posição `idx` na paleta."""
+        if mesh is None or mesh.n_points == 0:
+            return False
+        color_hex = self._mesh_colors[idx % len(self._mesh_colors)]
+        qcol = QColor(color_hex)
+        rgb = (qcol.redF(), qcol.greenF(), qcol.blueF())
+        
+        try:
+            mesh.clear_data()
+        except Exception:
+            pass
+
+        # Paredes externas têm leve transparência para revelar partes internas
+        is_outer_wall = any(w in rel_path.lower() for w in ["wall", "parede", "outer", "domain", "box"])
+        mesh_opacity = 0.40 if is_outer_wall else 0.85
+
+        self.plotter.add_mesh(
+            mesh,
+            color=rgb,
+            show_edges=False,
+            edge_color="#161616",
+            opacity=mesh_opacity,
+            name=rel_path,
+            reset_camera=False
+        )
+        self.actors[full_path] = rel_path
+        self.meshes[full_path] = mesh
+        if patches is not None:
+            self.mesh_patches[full_path] = patches
+        if metrics is not None:
+            self.mesh_metrics[full_path] = metrics
+        self.mesh_props[full_path] = {
+            "rgb": rgb,
+            "opacity": mesh_opacity,
+            "style": "surface",
+            "show_edges": False,
+            "visible": True
+        }
+        self._schedule_indexing(full_path, mesh)
+        return True
+
+    def load_meshes(self, files_list):
+        """Carrega e renderiza simultaneamente todas as malhas listadas com cores distintas e superfícies lisas."""
+        self.clear_meshes()
         
         for idx, (rel_path, full_path) in enumerate(files_list):
             try:
-                mesh = None
-                try:
-                    mesh = pv.read(full_path)
-                    if mesh.n_points == 0:
-                        mesh = None
-                except Exception:
-                    mesh = None
-
-                if mesh is None:
-                    vertices = []
-                    with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        for line in f:
-                            line = line.strip().lower()
-                            if line.startswith('vertex'):
-                                parts = line.split()
-                                if len(parts) >= 4:
-                                    try:
-                                        v = [float(x) for x in parts[1:4]]
-                                        vertices.append(v)
-                                    except ValueError:
-                                        continue
-                    if vertices:
-                        v_np = np.array(vertices)
-                        n_faces = len(vertices) // 3
-                        if n_faces > 0:
-                            faces = np.column_stack([
-                                np.full(n_faces, 3), 
-                                np.arange(0, n_faces * 3).reshape(-1, 3)
-                            ]).flatten()
-                            mesh = pv.PolyData(v_np, faces)
-
-                if mesh and mesh.n_points > 0:
-                    color_hex = self._mesh_colors[idx % len(self._mesh_colors)]
-                    qcol = QColor(color_hex)
-                    rgb = (qcol.redF(), qcol.greenF(), qcol.blueF())
-                    
-                    try:
-                        mesh.clear_data()
-                    except Exception:
-                        pass
-
-                    # Paredes externas têm leve transparência para revelar partes internas
-                    is_outer_wall = any(w in rel_path.lower() for w in ["wall", "parede", "outer", "domain", "box"])
-                    mesh_opacity = 0.40 if is_outer_wall else 0.85
-
-                    self.plotter.add_mesh(
-                        mesh,
-                        color=rgb,
-                        show_edges=False,
-                        edge_color="#161616",
-                        opacity=mesh_opacity,
-                        name=rel_path,
-                        reset_camera=False
-                    )
-                    self.actors[full_path] = rel_path
-                    self.meshes[full_path] = mesh
-                    self.mesh_props[full_path] = {
-                        "rgb": rgb,
-                        "opacity": mesh_opacity,
-                        "style": "surface",
-                        "show_edges": False,
-                        "visible": True
-                    }
+                mesh, patches, metrics = read_geometry(full_path)
+                self.add_loaded_mesh(idx, rel_path, full_path, mesh, patches, metrics)
             except Exception as e:
                 print(f"Erro ao carregar mesh {rel_path}: {e}")
 
@@ -307,6 +764,89 @@ class STLViewer(QWidget):
             self.plotter.reset_camera()
             self.update_render()
 
+    def remove_mesh(self, file_path):
+        """Retira da cena a malha de um arquivo, se estiver carregada."""
+        name = self.actors.pop(file_path, None)
+        if name:
+            self.plotter.remove_actor(name)
+        for store in (self.meshes, self.mesh_props, self.mesh_patches, self.mesh_metrics,
+                      self.lod_proxies, self._lod_swapped, self.locators, self._indexing):
+            store.pop(file_path, None)
+
+    def update_mesh_points(self, file_path, points, metrics=None):
+        """Substitui as coordenadas de uma malha carregada (após uma transformação).
+
+        Proxy e localizador da geometria antiga são descartados e refeitos em
+        segundo plano.
+        """
+        mesh = self.meshes.get(file_path)
+        if mesh is None:
+            return
+        mesh.points = points
+        for store in (self.lod_proxies, self._lod_swapped, self.locators):
+            store.pop(file_path, None)
+        if metrics is not None:
+            self.mesh_metrics[file_path] = metrics
+        self._schedule_indexing(file_path, mesh)
+
+    def show_actor(self, file_path, mesh=None):
+        """(Re)cria o ator de uma malha com as propriedades guardadas em `mesh_props`.
+
+        `mesh` substitui a malha exibida (uma versão cortada, por exemplo).
+        Malhas coloridas por campo usam o mapa de cores e a faixa registrados
+        por `set_mesh_scalars`.
+        """
+        prop = self.mesh_props[file_path]
+        mesh = self.meshes[file_path] if mesh is None else mesh
+        kwargs = {"color": prop["rgb"]}
+        if prop.get("scalars"):
+            kwargs = {
+                "scalars": prop["scalars"],
+                "preference": "cell",
+                "cmap": "coolwarm",
+                "clim": prop["clim"],
+                "scalar_bar_args": {"title": prop["scalars"]},
+            }
+        self.plotter.add_mesh(
+            mesh,
+            opacity=prop["opacity"],
+            style=prop["style"],
+            show_edges=prop["show_edges"],
+            edge_color="#161616",
+            name=self.actors[file_path],
+            reset_camera=False,
+            **kwargs
+        )
+
+    def set_mesh_scalars(self, file_path, values, clim, title):
+        """Colore uma malha pelos valores por face `values`, na faixa `clim`."""
+        mesh = self.meshes.get(file_path)
+        if mesh is None or len(values) != mesh.n_cells:
+            return False
+        mesh.cell_data[title] = np.asarray(values)
+        prop = self.mesh_props[file_path]
+        prop["scalars"] = title
+        prop["clim"] = (float(clim[0]), float(clim[1]))
+        if prop["visible"]:
+            self.show_actor(file_path)
+        return True
+
+    def clear_mesh_scalars(self, file_path):
+        """Volta a malha à cor sólida da paleta."""
+        prop = self.mesh_props.get(file_path)
+        if not prop or not prop.get("scalars"):
+            return
+        title = prop.pop("scalars")
+        prop.pop("clim", None)
+        self.meshes[file_path].cell_data.pop(title, None)
+        if prop["visible"]:
+            self.show_actor(file_path)
+        if not any(p.get("scalars") == title for p in self.mesh_props.values()):
+            try:
+                self.plotter.remove_scalar_bar(title)
+            except (KeyError, StopIteration):
+                pass
+
     def set_mesh_visibility(self, file_path, visible):
         """Controla a visibilidade em tempo real de uma malha específica."""
         if file_path in self.mesh_props:
@@ -315,17 +855,7 @@ class STLViewer(QWidget):
             if not visible and name:
                 self.plotter.remove_actor(name)
             elif visible and file_path in self.meshes:
-                mesh = self.meshes[file_path]
-                prop = self.mesh_props[file_path]
-                self.plotter.add_mesh(
-                    mesh,
-                    color=prop["rgb"],
-                    opacity=prop["opacity"],
-                    style=prop["style"],
-                    show_edges=prop["show_edges"],
-                    name=name,
-                    reset_camera=False
-                )
+                self.show_actor(file_path)
             self.update_render()
 
     def apply_clip_plane(self, enabled=False, normal=(1, 0, 0), origin=(0, 0, 0), invert=False):
@@ -348,15 +878,7 @@ class STLViewer(QWidget):
                 except Exception:
                     pass
 
-            self.plotter.add_mesh(
-                target_mesh,
-                color=prop["rgb"],
-                opacity=prop["opacity"],
-                style=prop["style"],
-                show_edges=prop["show_edges"],
-                name=name,
-                reset_camera=False
-            )
+            self.show_actor(full_path, target_mesh)
         self.update_render()
 
     def start_measuring(self, callback=None):
@@ -395,12 +917,275 @@ class STLViewer(QWidget):
             pass
         self.update_render()
 
+    def start_probing(self, callback=None):
+        """Ativa a escolha de pontos de sonda; cada clique acrescenta um ponto."""
+        self.on_probe_callback = callback
+        self.probing_active = True
+
+    def stop_probing(self):
+        self.probing_active = False
+
+    def _on_probe_picked(self, point):
+        self.probe_points.append(list(point))
+        markers = pv.PolyData(np.asarray(self.probe_points, dtype=float))
+        self.plotter.add_mesh(markers, color="#ff832b", point_size=10, render_points_as_spheres=True,
+                              name="__probe_points__", reset_camera=False, pickable=False)
+        if len(self.probe_points) >= 2:
+            path = pv.lines_from_points(np.asarray(self.probe_points, dtype=float))
+            self.plotter.add_mesh(path, color="#ff832b", line_width=2, name="__probe_path__",
+                                  reset_camera=False, pickable=False)
+        self.update_render()
+        if self.on_probe_callback:
+            self.on_probe_callback(self.probe_points)
+
+    def clear_probes(self):
+        """Remove os pontos de sonda da cena e desativa a escolha de pontos."""
+        self.probe_points = []
+        self.probing_active = False
+        for name in ("__probe_points__", "__probe_path__"):
+            try:
+                self.plotter.remove_actor(name)
+            except Exception:
+                pass
+        self.update_render()
+
     def closeEvent(self, event):
+        self._index_pool.shutdown(wait=False, cancel_futures=True)
         if self.plotter:
             self.plotter.close()
         super().closeEvent(event)
 
 
+class MeshQualityDialog(QDialog):
+    """Histogramas das métricas de `meshquality.mesh_quality` e o resumo no estilo do `checkMesh`."""
+
+    HISTOGRAM_BINS = 40
+
+    # (chave do resultado, rótulo, o que é contado no histograma)
+    METRICS = [
+        ("non_orthogonality", "Non-orthogonality (deg)", "Faces"),
+        ("skewness", "Skewness", "Faces"),
+        ("aspect_ratio", "Aspect ratio", "Cells"),
+        ("cell_volumes", "Cell volume (m³)", "Cells"),
+        ("face_pyramids", "Face pyramid volume (m³)", "Faces"),
+    ]
+
+    def __init__(self, quality, parent=None):
+        super().__init__(parent)
+        self.quality = quality
+        self.setWindowTitle("polyMesh Quality")
+        self.resize(820, 520)
+        layout = QHBoxLayout(self)
+
+        chart_layout = QVBoxLayout()
+        self.combo_metric = QComboBox()
+        for key, label, counted in self.METRICS:
+            self.combo_metric.addItem(label, (key, counted))
+        chart_layout.addWidget(self.combo_metric)
+
+        if QTCHARTS_AVAILABLE:
+            self.chart = QChart()
+            self.chart.setAnimationOptions(QChart.NoAnimation)
+            self.chart.legend().setVisible(False)
+            self.chart_view = QChartView(self.chart, self)
+            self.chart_view.setRenderHint(QPainter.Antialiasing)
+            chart_layout.addWidget(self.chart_view, 1)
+        else:
+            self.chart = None
+            chart_layout.addWidget(QLabel("Módulo PySide6.QtCharts não disponível no ambiente."), 1)
+        layout.addLayout(chart_layout, 3)
+
+        side = QVBoxLayout()
+        table = QTableWidget(self)
+        table.setColumnCount(2)
+        table.setHorizontalHeaderLabels(["Metric", "Value"])
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        rows = self._summary_rows(quality["summary"])
+        table.setRowCount(len(rows))
+        for r_idx, (k, v) in enumerate(rows):
+            table.setItem(r_idx, 0, QTableWidgetItem(k))
+            table.setItem(r_idx, 1, QTableWidgetItem(v))
+        side.addWidget(table)
+        btn_box = QDialogButtonBox(QDialogButtonBox.Ok)
+        btn_box.accepted.connect(self.accept)
+        side.addWidget(btn_box)
+        layout.addLayout(side, 2)
+
+        self.combo_metric.currentIndexChanged.connect(self.show_metric)
+        self.show_metric()
+
+    @staticmethod
+    def _summary_rows(summary):
+        return [
+            ("Cells", f"{summary['cells']:,}"),
+            ("Faces (internal)", f"{summary['faces']:,} ({summary['internal_faces']:,})"),
+            ("Total Volume", f"{summary['total_volume']:.6e} m³"),
+            ("Min / Max Cell Volume", f"{summary['min_volume']:.3e} / {summary['max_volume']:.3e} m³"),
+            ("Non-positive Volumes", f"{summary['negative_volumes']}"),
+            ("Max / Avg Non-orthogonality", f"{summary['max_non_orthogonality']:.2f}° / {summary['avg_non_orthogonality']:.2f}°"),
+            (f"Faces > {meshquality.NON_ORTHO_THRESHOLD:g}°", f"{summary['severely_non_orthogonal']}"),
+            ("Max Skewness", f"{summary['max_skewness']:.4f}"),
+            (f"Faces with Skewness > {meshquality.SKEW_THRESHOLD:g}", f"{summary['highly_skewed']}"),
+            ("Max Aspect Ratio", f"{summary['max_aspect_ratio']:.2f}"),
+            (f"Cells with Aspect Ratio > {meshquality.ASPECT_RATIO_THRESHOLD:g}", f"{summary['high_aspect_ratio']}"),
+            ("Incorrectly Oriented Faces (pyramids)", f"{summary['incorrect_pyramids']}"),
+        ]
+
+    def histogram(self, key):
+        """`(contagens, bordas)` da métrica `key`, ignorando valores não finitos."""
+        values = np.asarray(self.quality[key])
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return np.zeros(1, dtype=np.int64), np.array([0.0, 1.0])
+        return np.histogram(values, bins=self.HISTOGRAM_BINS)
+
+    def show_metric(self):
+        if self.chart is None:
+            return
+        key, counted = self.combo_metric.currentData()
+        label = self.combo_metric.currentText()
+        counts, edges = self.histogram(key)
+
+        # Histograma em degraus: uma área sob a linha que sobe e desce em cada borda.
+        upper = QLineSeries()
+        lower = QLineSeries()
+        for count, left, right in zip(counts, edges[:-1], edges[1:]):
+            upper.append(float(left), float(count))
+            upper.append(float(right), float(count))
+        lower.append(float(edges[0]), 0.0)
+        lower.append(float(edges[-1]), 0.0)
+        area = QAreaSeries(upper, lower)
+        area.setColor(QColor("#0f62fe"))
+        area.setBorderColor(QColor("#002d9c"))
+
+        self.chart.removeAllSeries()
+        for axis in self.chart.axes():
+            self.chart.removeAxis(axis)
+        self.chart.addSeries(area)
+        self.chart.setTitle(label)
+
+        axis_x = QValueAxis()
+        axis_x.setTitleText(label)
+        axis_x.setRange(float(edges[0]), float(edges[-1]) if edges[-1] > edges[0] else float(edges[0]) + 1.0)
+        axis_y = QValueAxis()
+        axis_y.setTitleText(counted)
+        axis_y.setRange(0.0, max(float(counts.max()), 1.0) * 1.05)
+        axis_y.setLabelFormat("%d")
+        self.chart.addAxis(axis_x, Qt.AlignBottom)
+        self.chart.addAxis(axis_y, Qt.AlignLeft)
+        area.attachAxis(axis_x)
+        area.attachAxis(axis_y)
+
+
+class ProbeDialog(QDialog):
+    """Perfil das sondas num tempo e, na varredura, a evolução ao longo dos tempos."""
+
+    # Acima disso o histórico de sondas pontuais mostra só as primeiras.
+    MAX_HISTORY_SERIES = 8
+
+    def __init__(self, title, times, positions, values, line=False, parent=None):
+        super().__init__(parent)
+        self.title = title
+        self.times = times
+        self.positions = np.asarray(positions, dtype=float)
+        self.values = np.asarray(values, dtype=float)
+        self.line = line
+        self.setWindowTitle(f"Probes: {title}")
+        self.resize(820, 560)
+        layout = QVBoxLayout(self)
+
+        self.combo_time = QComboBox()
+        for name, _ in times:
+            self.combo_time.addItem(f"t = {name}")
+        self.combo_time.setCurrentIndex(len(times) - 1)
+        self.combo_time.setVisible(len(times) > 1)
+        layout.addWidget(self.combo_time)
+
+        if QTCHARTS_AVAILABLE:
+            self.profile_chart = self._chart_view(layout)
+            self.history_chart = self._chart_view(layout) if len(times) > 1 else None
+        else:
+            self.profile_chart = self.history_chart = None
+            layout.addWidget(QLabel("Módulo PySide6.QtCharts não disponível no ambiente."), 1)
+
+        btn_box = QDialogButtonBox(QDialogButtonBox.Save | QDialogButtonBox.Close)
+        btn_box.accepted.connect(self.save_csv)
+        btn_box.rejected.connect(self.reject)
+        layout.addWidget(btn_box)
+
+        self.combo_time.currentIndexChanged.connect(self.show_profile)
+        self.show_profile()
+        self.show_history()
+
+    def _chart_view(self, layout):
+        chart = QChart()
+        chart.setAnimationOptions(QChart.NoAnimation)
+        view = QChartView(chart, self)
+        view.setRenderHint(QPainter.Antialiasing)
+        layout.addWidget(view, 1)
+        return chart
+
+    @staticmethod
+    def _plot(chart, series_list, x_label, y_label, title):
+        chart.removeAllSeries()
+        for axis in chart.axes():
+            chart.removeAxis(axis)
+        chart.setTitle(title)
+        axis_x, axis_y = QValueAxis(), QValueAxis()
+        axis_x.setTitleText(x_label)
+        axis_y.setTitleText(y_label)
+        chart.addAxis(axis_x, Qt.AlignBottom)
+        chart.addAxis(axis_y, Qt.AlignLeft)
+        xs, ys = [], []
+        for name, x, y in series_list:
+            series = QLineSeries()
+            series.setName(name)
+            for a, b in zip(x, y):
+                if np.isfinite(b):
+                    series.append(float(a), float(b))
+                    xs.append(a)
+                    ys.append(b)
+            chart.addSeries(series)
+            series.attachAxis(axis_x)
+            series.attachAxis(axis_y)
+        if xs:
+            low, high = float(min(ys)), float(max(ys))
+            pad = (high - low) * 0.05 or max(abs(low) * 0.05, 1e-12)
+            axis_x.setRange(float(min(xs)), float(max(xs)) if max(xs) > min(xs) else float(min(xs)) + 1.0)
+            axis_y.setRange(low - pad, high + pad)
+        chart.legend().setVisible(len(series_list) > 1)
+
+    def show_profile(self):
+        if self.profile_chart is None:
+            return
+        row = self.combo_time.currentIndex()
+        x_label = "Distance along line (m)" if self.line else "Probe"
+        self._plot(self.profile_chart, [(self.title, self.positions, self.values[row])],
+                   x_label, self.title, f"{self.title} at t = {self.times[row][0]}")
+
+    def show_history(self):
+        if self.history_chart is None:
+            return
+        t = [value for _, value in self.times]
+        if self.line:
+            with np.errstate(all="ignore"):
+                series = [("min", t, np.nanmin(self.values, axis=1)),
+                          ("mean", t, np.nanmean(self.values, axis=1)),
+                          ("max", t, np.nanmax(self.values, axis=1))]
+        else:
+            series = [(f"Probe {i}", t, self.values[:, i])
+                      for i in range(min(self.values.shape[1], self.MAX_HISTORY_SERIES))]
+        self._plot(self.history_chart, series, "Time", self.title, f"{self.title} over time")
+
+    def save_csv(self):
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save Probe Samples", "probes.csv", "CSV (*.csv)")
+        if not file_path:
+            return
+        header = "time," + ",".join(f"{p:g}" for p in self.positions)
+        rows = np.column_stack([[value for _, value in self.times], self.values])
+        np.savetxt(file_path, rows, delimiter=",", header=header, comments="", fmt="%.10g")
+
+
 class NoScrollComboBox(QComboBox):
     """QComboBox que ignora a rolagem do mouse quando fechado para evitar alterações acidentais de valor."""
 
@@ -430,9 +1215,31 @@ class CaseGeometryWidget(QWidget):
         left_layout.setContentsMargins(6, 6, 6, 6)
         
         self.mesh_list = QListWidget(self)
+        self.mesh_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.mesh_list.itemChanged.connect(self.on_mesh_item_changed)
         self.mesh_list.currentItemChanged.connect(self.on_mesh_selection_changed)
         left_layout.addWidget(self.mesh_list, 1)
+
+        # Progresso da carga em segundo plano (oculto quando ocioso)
+        self.load_progress = QProgressBar(self)
+        self.load_progress.setFixedHeight(14)
+        self.load_progress.setTextVisible(True)
+        self.load_progress.setFormat("%v / %m")
+        self.load_progress.setStyleSheet(
+            "QProgressBar { background-color: #e0e0e0; border: none; border-radius: 0; color: #161616; font-size: 10px; text-align: center; }"
+            "QProgressBar::chunk { background-color: #0f62fe; }"
+        )
+        self.load_progress.setVisible(False)
+        left_layout.addWidget(self.load_progress)
+
+        self.btn_cancel_load = QPushButton("Cancel Loading", self)
+        self.btn_cancel_load.setStyleSheet(
+            "QPushButton { background-color: #ffffff; color: #161616; border: 1px solid #8d8d8d; font-size: 11px; padding: 3px 6px; border-radius: 0; }"
+            "QPushButton:hover { background-color: #e0e0e0; border-color: #161616; }"
+        )
+        self.btn_cancel_load.setVisible(False)
+        self.btn_cancel_load.clicked.connect(self.cancel_loading)
+        left_layout.addWidget(self.btn_cancel_load)
         main_layout.addWidget(self.sidebar_left)
         
         # 2. Visualizador 3D (Centro)
@@ -584,10 +1391,179 @@ class CaseGeometryWidget(QWidget):
         self.list_patches = QListWidget()
         self.list_patches.setFixedHeight(75)
         patch_layout.addWidget(self.list_patches)
+
+        self.btn_polymesh_patches = QPushButton("Show polyMesh Patches")
+        self.btn_polymesh_patches.setToolTip("Display the boundary patches of constant/polyMesh")
+        self.btn_polymesh_patches.clicked.connect(self.show_polymesh_patches)
+        patch_layout.addWidget(self.btn_polymesh_patches)
+
+        self.chk_decomposed = QCheckBox("Read processor* (no reconstructPar)")
+        self.chk_decomposed.setToolTip("Read the decomposed mesh and fields in parallel and stitch the patches in memory")
+        self.chk_decomposed.setEnabled(False)
+        self.chk_decomposed.toggled.connect(self.refresh_field_times)
+        patch_layout.addWidget(self.chk_decomposed)
+
+        self.btn_polymesh_quality = QPushButton("polyMesh Quality Histograms")
+        self.btn_polymesh_quality.setToolTip("Compute checkMesh-style quality metrics of constant/polyMesh")
+        self.btn_polymesh_quality.clicked.connect(self.show_polymesh_quality)
+        patch_layout.addWidget(self.btn_polymesh_quality)
         
         right_layout.addWidget(self.group_patches)
+
+        # ── Grupo 6: polyMesh Sets & Zones ──
+        self.group_zones = QGroupBox("polyMesh Sets && Zones", self.sidebar_content)
+        zones_layout = QVBoxLayout(self.group_zones)
+        zones_layout.setContentsMargins(4, 8, 4, 4)
+        zones_layout.setSpacing(6)
+
+        self.btn_scan_zones = QPushButton("Scan Sets && Zones")
+        self.btn_scan_zones.setToolTip("Read constant/polyMesh/sets and the cell/face/point zones")
+        self.btn_scan_zones.clicked.connect(self.scan_zones)
+        zones_layout.addWidget(self.btn_scan_zones)
+
+        self.list_zones = QListWidget()
+        self.list_zones.setFixedHeight(100)
+        self.list_zones.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        zones_layout.addWidget(self.list_zones)
+
+        zone_buttons = QHBoxLayout()
+        self.btn_show_zones = QPushButton("Show Selected")
+        self.btn_show_zones.clicked.connect(self.show_selected_zones)
+        zone_buttons.addWidget(self.btn_show_zones)
+        self.btn_intersect_zones = QPushButton("Intersect")
+        self.btn_intersect_zones.setToolTip("Intersect the two selected sets/zones")
+        self.btn_intersect_zones.clicked.connect(self.intersect_selected_zones)
+        zone_buttons.addWidget(self.btn_intersect_zones)
+        zones_layout.addLayout(zone_buttons)
+
+        self.lbl_zone_info = QLabel("-")
+        self.lbl_zone_info.setWordWrap(True)
+        zones_layout.addWidget(self.lbl_zone_info)
+
+        right_layout.addWidget(self.group_zones)
+
+        # ── Grupo 7: Field Coloring on polyMesh Patches ──
+        self.group_field = QGroupBox("Field Coloring (polyMesh Patches)", self.sidebar_content)
+        field_layout = QFormLayout(self.group_field)
+        field_layout.setContentsMargins(4, 8, 4, 4)
+        field_layout.setSpacing(6)
+
+        self.combo_field_time = NoScrollComboBox()
+        self.combo_field_time.currentIndexChanged.connect(self._on_field_time_changed)
+        field_layout.addRow("Time:", self.combo_field_time)
+
+        self.combo_field_name = NoScrollComboBox()
+        field_layout.addRow("Field:", self.combo_field_name)
+
+        self.combo_field_source = NoScrollComboBox()
+        self.combo_field_source.addItem("Patch values (boundaryField)", "patch")
+        self.combo_field_source.addItem("Owner-cell values", "cell")
+        field_layout.addRow("Values:", self.combo_field_source)
+
+        self.combo_field_component = NoScrollComboBox()
+        self.combo_field_component.addItem("Magnitude", "magnitude")
+        for i, axis in enumerate("XYZ"):
+            self.combo_field_component.addItem(axis, i)
+        field_layout.addRow("Component:", self.combo_field_component)
+
+        field_buttons = QHBoxLayout()
+        self.btn_refresh_times = QPushButton("Refresh Times")
+        self.btn_refresh_times.clicked.connect(self.refresh_field_times)
+        field_buttons.addWidget(self.btn_refresh_times)
+        self.btn_apply_field = QPushButton("Color Patches")
+        self.btn_apply_field.clicked.connect(self.apply_field_coloring)
+        field_buttons.addWidget(self.btn_apply_field)
+        self.btn_clear_field = QPushButton("Clear")
+        self.btn_clear_field.clicked.connect(self.clear_field_coloring)
+        field_buttons.addWidget(self.btn_clear_field)
+        field_layout.addRow(field_buttons)
+
+        self.lbl_field_range = QLabel("-")
+        self.lbl_field_range.setWordWrap(True)
+        field_layout.addRow(self.lbl_field_range)
+
+        right_layout.addWidget(self.group_field)
+
+        # ── Grupo 8: Probes (Cell Sampling) ──
+        self.group_probe = QGroupBox("Probes (Cell Sampling)", self.sidebar_content)
+        probe_layout = QFormLayout(self.group_probe)
+        probe_layout.setContentsMargins(4, 8, 4, 4)
+        probe_layout.setSpacing(6)
+
+        self.btn_probe_pick = QPushButton("Pick Probe Points")
+        self.btn_probe_pick.setCheckable(True)
+        self.btn_probe_pick.setToolTip("Click points on the geometry; samples use the field chosen under Field Coloring")
+        self.btn_probe_pick.toggled.connect(self.toggle_probe_mode)
+        probe_layout.addRow(self.btn_probe_pick)
+
+        self.combo_probe_mode = NoScrollComboBox()
+        self.combo_probe_mode.addItem("Picked points", "points")
+        self.combo_probe_mode.addItem("Line (first to last point)", "line")
+        probe_layout.addRow("Mode:", self.combo_probe_mode)
+
+        self.spin_probe_samples = QSpinBox()
+        self.spin_probe_samples.setRange(2, 10000)
+        self.spin_probe_samples.setValue(100)
+        probe_layout.addRow("Line samples:", self.spin_probe_samples)
+
+        probe_buttons = QHBoxLayout()
+        self.btn_probe_time = QPushButton("Sample Time")
+        self.btn_probe_time.clicked.connect(lambda: self.sample_probes(sweep=False))
+        probe_buttons.addWidget(self.btn_probe_time)
+        self.btn_probe_sweep = QPushButton("All Times")
+        self.btn_probe_sweep.setToolTip("Sample every time directory of the case in parallel")
+        self.btn_probe_sweep.clicked.connect(lambda: self.sample_probes(sweep=True))
+        probe_buttons.addWidget(self.btn_probe_sweep)
+        self.btn_probe_clear = QPushButton("Clear")
+        self.btn_probe_clear.clicked.connect(self.clear_probes)
+        probe_buttons.addWidget(self.btn_probe_clear)
+        probe_layout.addRow(probe_buttons)
+
+        self.lbl_probe_info = QLabel("No probe points.")
+        self.lbl_probe_info.setWordWrap(True)
+        probe_layout.addRow(self.lbl_probe_info)
+
+        right_layout.addWidget(self.group_probe)
         
-        # ── Grupo 6: Camera & Export ──
+        # ── Grupo 9: Batch Geometry Tools ──
+        self.group_batch = QGroupBox("Batch Geometry Tools", self.sidebar_content)
+        batch_layout = QFormLayout(self.group_batch)
+        batch_layout.setContentsMargins(4, 8, 4, 4)
+        batch_layout.setSpacing(6)
+
+        lbl_batch_hint = QLabel("Applies to the selected geometries (Ctrl/Shift + click).")
+        lbl_batch_hint.setWordWrap(True)
+        lbl_batch_hint.setStyleSheet("color: #525252;")
+        batch_layout.addRow(lbl_batch_hint)
+
+        self.combo_units = NoScrollComboBox()
+        self.combo_units.addItem("No scaling", 1.0)
+        for unit in ("mm", "cm", "in", "ft"):
+            self.combo_units.addItem(f"{unit} → m", geomtools.UNIT_SCALES[unit])
+        batch_layout.addRow("Scale:", self.combo_units)
+
+        self.edit_translate = self._vector_row(batch_layout, "Translate (m):")
+        self.edit_rotate = self._vector_row(batch_layout, "Rotate (deg):")
+
+        self.btn_apply_transform = QPushButton("Apply Transform")
+        self.btn_apply_transform.clicked.connect(self.apply_batch_transform)
+        batch_layout.addRow(self.btn_apply_transform)
+
+        self.btn_combined_bounds = QPushButton("Combined Bounds")
+        self.btn_combined_bounds.clicked.connect(self.show_combined_bounds)
+        batch_layout.addRow(self.btn_combined_bounds)
+
+        self.btn_export_multisolid = QPushButton("Merge && Export Multi-solid STL...")
+        self.btn_export_multisolid.clicked.connect(self.export_multisolid_stl)
+        batch_layout.addRow(self.btn_export_multisolid)
+
+        self.lbl_batch_status = QLabel("-")
+        self.lbl_batch_status.setWordWrap(True)
+        batch_layout.addRow(self.lbl_batch_status)
+
+        right_layout.addWidget(self.group_batch)
+
+        # ── Grupo 10: Camera & Export ──
         self.group_cam = QGroupBox("Camera & Export", self.sidebar_content)
         cam_layout = QVBoxLayout(self.group_cam)
         cam_layout.setContentsMargins(4, 8, 4, 4)
@@ -616,72 +1592,191 @@ class CaseGeometryWidget(QWidget):
         self.scroll_right.setWidget(self.sidebar_content)
         main_layout.addWidget(self.scroll_right)
         
+        self.loader = GeometryLoader(self)
+        self.loader.mesh_ready.connect(self._on_mesh_loaded)
+        self.loader.progress.connect(self._on_load_progress)
+        self.loader.finished.connect(self._on_load_finished)
+        self._loaded_count = 0
+        self._file_ids = {}
+        self._pending = set()
+        self._next_color = 0
+        self._initial_load = False
+
+        self.batch = BatchRunner(self)
+        self.batch.finished.connect(self._on_batch_finished)
+        self._batch_handler = None
+        self._polymesh = None
+        self._decomposed = None
+        self._selections = {}
+        self.time_index = TimeIndex()
+        self.field_cache = fieldio.FieldCache()
+        self._cell_probe = None
+
         self.current_case_path = None
         self.scan_case(None)
 
     def scan_case(self, case_path):
-        """Varre o projeto, popula a lista exibindo apenas os nomes dos arquivos .stl e renderiza as malhas."""
+        """Varre o projeto do zero, popula a lista com os arquivos de superfície e carrega as malhas."""
         self.current_case_path = case_path
-        
-        found_meshes = []
-        if case_path and os.path.exists(case_path):
-            dirs_to_check = [
-                os.path.join(case_path, "constant", "geometry"),
-                os.path.join(case_path, "constant", "triSurface"),
-                os.path.join(case_path, "constant"),
-                case_path
-            ]
-            
-            seen_files = set()
-            for d in dirs_to_check:
-                if os.path.exists(d):
-                    try:
-                        for root, _, files in os.walk(d):
-                            for f in files:
-                                if f.lower().endswith(('.stl', '.obj')):
-                                    full_p = os.path.normpath(os.path.join(root, f))
-                                    if full_p not in seen_files:
-                                        seen_files.add(full_p)
-                                        rel_p = os.path.relpath(full_p, case_path)
-                                        found_meshes.append((rel_p, full_p))
-                    except Exception:
-                        pass
-        
+        self.loader.cancel(notify=False)
+        self.viewer.clear_meshes()
+        self._loaded_count = 0
+        self._file_ids = {}
+        self._pending = set()
+        self._next_color = 0
+        self._initial_load = True
+        self._polymesh = None
+        self._decomposed = None
+        self._selections = {}
+        self.list_zones.clear()
+        self.lbl_zone_info.setText("-")
+        self.field_cache.clear()
+        self.lbl_field_range.setText("-")
+        self._cell_probe = None
+        self.clear_probes()
+        is_decomposed = decomposed.is_decomposed(case_path)
+        self.chk_decomposed.blockSignals(True)
+        self.chk_decomposed.setEnabled(is_decomposed)
+        self.chk_decomposed.setChecked(is_decomposed and not polymesh.has_polymesh(case_path))
+        self.chk_decomposed.blockSignals(False)
+        self.refresh_field_times()
+
         self.mesh_list.blockSignals(True)
         self.mesh_list.clear()
-        
-        if found_meshes:
-            self.viewer.load_meshes(found_meshes)
-            for idx, (rel_path, full_path) in enumerate(found_meshes):
-                file_name = os.path.basename(full_path)
-                item = QListWidgetItem(file_name)
-                item.setToolTip(rel_path)
-                item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
-                item.setCheckState(Qt.Checked)
-                item.setData(Qt.UserRole, full_path)
-                
-                color_hex = self.viewer._mesh_colors[idx % len(self.viewer._mesh_colors)]
-                item.setIcon(self.create_mesh_icon(color_hex))
-                self.mesh_list.addItem(item)
-            self.mesh_list.blockSignals(False)
-            
+        self.mesh_list.blockSignals(False)
+
+        self.refresh_scan()
+        if self.mesh_list.count() > 0:
             self.group_cam.setEnabled(True)
-            if self.mesh_list.count() > 0:
-                self.mesh_list.setCurrentRow(0)
-        else:
+            self.mesh_list.setCurrentRow(0)
+
+    def refresh_scan(self):
+        """Reaplica a varredura alterando apenas o que mudou no disco.
+
+        Arquivos novos são carregados, arquivos removidos saem da cena e da
+        lista, e arquivos cujo tamanho ou data de modificação mudaram são
+        recarregados. Os demais permanecem intocados, sem nova renderização.
+        """
+        if not self.current_case_path or not os.path.exists(self.current_case_path):
+            self.load_progress.setVisible(False)
+            self.btn_cancel_load.setVisible(False)
+            self.viewer.update_render()
+            return
+
+        found_meshes = find_geometry_files(self.current_case_path)
+        removed, to_load, file_ids = diff_geometry_scan(self._file_ids, self._pending, found_meshes)
+        self._file_ids = file_ids
+        if not removed and not to_load:
+            return
+
+        self.mesh_list.blockSignals(True)
+        for full_path in removed:
+            item = self._item_for_path(full_path)
+            if item is not None:
+                self.mesh_list.takeItem(self.mesh_list.row(item))
+            self.viewer.remove_mesh(full_path)
+            self._pending.discard(full_path)
+
+        # Itens novos entram na lista de imediato e ficam desabilitados até a
+        # malha correspondente chegar do carregador em segundo plano.
+        for rel_path, full_path in to_load:
+            item = self._item_for_path(full_path) or self._add_mesh_item(full_path, os.path.basename(full_path))
+            item.setToolTip(f"{rel_path} (loading...)")
+        self.mesh_list.blockSignals(False)
+
+        if removed:
+            self.viewer.update_render()
+        if not to_load:
+            return
+
+        self._pending = {full_path for _, full_path in to_load}
+        self.load_progress.setRange(0, len(to_load))
+        self.load_progress.setValue(0)
+        self.load_progress.setVisible(True)
+        self.btn_cancel_load.setVisible(True)
+        cache_dir = geomcache.case_cache_dir(self.current_case_path)
+        geomcache.prune(cache_dir, list(file_ids))
+        self.loader.start(to_load, cache_dir)
+
+    def _add_mesh_item(self, full_path, text):
+        """Item desabilitado na lista, com a próxima cor da paleta."""
+        color_idx = self._next_color
+        self._next_color += 1
+        item = QListWidgetItem(text)
+        item.setFlags((item.flags() | Qt.ItemIsUserCheckable) & ~Qt.ItemIsEnabled)
+        item.setCheckState(Qt.Checked)
+        item.setData(Qt.UserRole, full_path)
+        item.setData(Qt.UserRole + 1, color_idx)
+        color_hex = self.viewer._mesh_colors[color_idx % len(self.viewer._mesh_colors)]
+        item.setIcon(self.create_mesh_icon(color_hex))
+        self.mesh_list.addItem(item)
+        return item
+
+    def _item_for_path(self, full_path):
+        for row in range(self.mesh_list.count()):
+            item = self.mesh_list.item(row)
+            if item.data(Qt.UserRole) == full_path:
+                return item
+        return None
+
+    def cancel_loading(self):
+        """Interrompe a carga das geometrias; as já exibidas permanecem na cena."""
+        self.loader.cancel()
+
+    def _on_mesh_loaded(self, idx, rel_path, full_path, mesh, patches, metrics):
+        self._pending.discard(full_path)
+        item = self._item_for_path(full_path)
+        color_idx = item.data(Qt.UserRole + 1) if item is not None else idx
+        # Recarga de um arquivo alterado: a malha antiga sai antes da nova entrar.
+        self.viewer.remove_mesh(full_path)
+        added = self.viewer.add_loaded_mesh(color_idx, rel_path, full_path, mesh, patches, metrics)
+        if item is not None:
+            self.mesh_list.blockSignals(True)
+            item.setFlags(item.flags() | Qt.ItemIsEnabled)
+            item.setToolTip(rel_path if added else f"{rel_path} (could not be read)")
+            if not added:
+                item.setCheckState(Qt.Unchecked)
+            self.mesh_list.blockSignals(False)
+        if not added:
+            return
+        if item is not None and item.checkState() != Qt.Checked:
+            self.viewer.set_mesh_visibility(full_path, False)
+        self._loaded_count += 1
+        if self._loaded_count == 1:
+            self.viewer.plotter.view_isometric()
+            self.viewer.plotter.reset_camera()
+        self.viewer.request_render()
+        current = self.mesh_list.currentItem()
+        if current is not None and current.data(Qt.UserRole) == full_path:
+            self.on_mesh_selection_changed(current, None)
+
+    def _on_load_progress(self, done, total):
+        self.load_progress.setRange(0, total)
+        self.load_progress.setValue(done)
+
+    def _on_load_finished(self, cancelled):
+        self.load_progress.setVisible(False)
+        self.btn_cancel_load.setVisible(False)
+        if cancelled:
+            # Os arquivos pendentes continuam em `_pending` e voltam na próxima varredura.
+            self.mesh_list.blockSignals(True)
+            for full_path in self._pending:
+                item = self._item_for_path(full_path)
+                if item is not None:
+                    item.setToolTip(f"{item.toolTip().replace(' (loading...)', '')} (loading cancelled)")
             self.mesh_list.blockSignals(False)
-            if self.viewer.plotter:
-                self.viewer.plotter.clear()
+        elif self._initial_load and self._loaded_count > 1:
+            # Enquadra a cena completa depois que todas as malhas da abertura chegaram.
+            self.viewer.plotter.reset_camera()
+            self.viewer.update_render()
+        if not cancelled:
+            self._initial_load = False
 
     def showEvent(self, event):
         super().showEvent(event)
         if self.viewer:
             self.viewer.update_render()
 
-    def refresh_scan(self):
-        if self.current_case_path:
-            self.scan_case(self.current_case_path)
-
     def select_mesh(self, file_path):
         """Seleciona na lista a malha correspondente ao caminho informado."""
         if not file_path:
@@ -720,12 +1815,23 @@ class CaseGeometryWidget(QWidget):
             self.lbl_bound_z.setText(f"[{b[4]:.3f}, {b[5]:.3f}] m")
             
             try:
-                feature_edges = mesh.extract_feature_edges(boundary_edges=True, feature_edges=False, manifold_edges=False)
-                is_wt = (feature_edges.n_cells == 0 and mesh.n_cells > 0)
+                metrics = self.viewer.mesh_metrics.get(full_path)
+                if metrics is not None:
+                    is_wt = bool(metrics["is_watertight"])
+                else:
+                    feature_edges = mesh.extract_feature_edges(boundary_edges=True, feature_edges=False, manifold_edges=False)
+                    is_wt = (feature_edges.n_cells == 0 and mesh.n_cells > 0)
                 self.lbl_watertight.setText("Yes" if is_wt else "No (Open edges)")
                 self.lbl_watertight.setStyleSheet("color: #198038;" if is_wt else "color: #da1e28;")
             except Exception:
                 self.lbl_watertight.setText("Unknown")
+        elif self.loader.is_running():
+            self.lbl_points.setText("Loading...")
+            self.lbl_cells.setText("Loading...")
+            self.lbl_bound_x.setText("-")
+            self.lbl_bound_y.setText("-")
+            self.lbl_bound_z.setText("-")
+            self.lbl_watertight.setText("-")
         else:
             self.lbl_points.setText("Erro")
             self.lbl_cells.setText("Erro")
@@ -761,17 +1867,7 @@ class CaseGeometryWidget(QWidget):
                 prop["style"] = style
                 prop["show_edges"] = show_edges
                 if prop["visible"] and full_path in self.viewer.meshes:
-                    mesh = self.viewer.meshes[full_path]
-                    name = self.viewer.actors.get(full_path)
-                    self.viewer.plotter.add_mesh(
-                        mesh,
-                        color=prop["rgb"],
-                        opacity=prop["opacity"],
-                        style=prop["style"],
-                        show_edges=prop["show_edges"],
-                        name=name,
-                        reset_camera=False
-                    )
+                    self.viewer.show_actor(full_path)
         self.viewer.update_render()
 
     def change_opacity(self, val):
@@ -785,17 +1881,7 @@ class CaseGeometryWidget(QWidget):
             if scope == "all" or (self.mesh_list.currentItem() and self.mesh_list.currentItem().data(Qt.UserRole) == full_path):
                 prop["opacity"] = opacity
                 if prop["visible"] and full_path in self.viewer.meshes:
-                    mesh = self.viewer.meshes[full_path]
-                    name = self.viewer.actors.get(full_path)
-                    self.viewer.plotter.add_mesh(
-                        mesh,
-                        color=prop["rgb"],
-                        opacity=prop["opacity"],
-                        style=prop["style"],
-                        show_edges=prop["show_edges"],
-                        name=name,
-                        reset_camera=False
-                    )
+                    self.viewer.show_actor(full_path)
         self.viewer.update_render()
 
     def on_clip_changed(self):
@@ -861,6 +1947,7 @@ class CaseGeometryWidget(QWidget):
 
     def toggle_measurement_mode(self, active):
         if active:
+            self.btn_probe_pick.setChecked(False)
             self.btn_measure.setStyleSheet("background-color: #0f62fe; color: white;")
             self.lbl_measure_dist.setText("Click Point 1, then Point 2 on geometry...")
             self.viewer.start_measuring(self._on_measurement_result)
@@ -894,14 +1981,18 @@ class CaseGeometryWidget(QWidget):
             QMessageBox.warning(self, "Quality Check", "No mesh selected.")
             return
 
-        diag = check_mesh_quality(mesh)
+        diag = self.viewer.mesh_metrics.get(full_path)
+        if not diag:
+            diag = check_mesh_quality(mesh)
+            if diag:
+                self.viewer.mesh_metrics[full_path] = diag
         if not diag:
             QMessageBox.warning(self, "Quality Check", "Unable to compute metrics.")
             return
 
         dlg = QDialog(self)
         dlg.setWindowTitle("Mesh Quality & Watertight Diagnostic")
-        dlg.resize(400, 350)
+        dlg.resize(420, 480)
         layout = QVBoxLayout(dlg)
         
         table = QTableWidget(dlg)
@@ -912,6 +2003,11 @@ class CaseGeometryWidget(QWidget):
         rows = [
             ("Watertight (Snappy-ready)", "YES" if diag["is_watertight"] else "NO (Holes / Open edges)"),
             ("Open Boundary Edges", f"{diag['open_edges']}"),
+            ("Non-manifold Edges", f"{diag.get('non_manifold_edges', 'N/A')}"),
+            ("Inconsistent Normals (edges)", f"{diag.get('inconsistent_normals', 'N/A')}"),
+            ("Duplicate Faces", f"{diag.get('duplicate_faces', 'N/A')}"),
+            ("Degenerate Faces", f"{diag.get('degenerate_faces', 'N/A')}"),
+            ("Self-intersection Candidates", f"{diag.get('self_intersection_candidates', 'N/A')}"),
             ("All Faces Triangulated", "Yes" if diag["is_all_triangles"] else "No"),
             ("Total Points", f"{diag['points']:,}"),
             ("Total Faces / Cells", f"{diag['cells']:,}"),
@@ -944,6 +2040,578 @@ class CaseGeometryWidget(QWidget):
             faces_info = f" ({p['faces']} faces)" if p.get('faces') != 'all' else ""
             self.list_patches.addItem(f"{p['name']}{faces_info}")
 
+    def show_polymesh_patches(self):
+        """Exibe os patches da malha de volume (`constant/polyMesh`) como superfícies."""
+        case_path = self.current_case_path
+        if self._use_decomposed():
+            stitched = self._decomposed
+
+            def read_stitched(case_path):
+                mesh = stitched if stitched is not None else decomposed.read_decomposed_mesh(case_path)
+                surfaces = []
+                for patch, points, cells in mesh.surfaces:
+                    surface = pv.PolyData(points, cells)
+                    surfaces.append((patch, surface, check_mesh_quality(surface)))
+                return mesh, surfaces
+
+            self._start_batch(read_stitched, [case_path], self._on_decomposed_patches, "Reading processor directories...")
+            return
+        if not case_path or not polymesh.has_polymesh(case_path):
+            QMessageBox.warning(self, "polyMesh Patches", "No mesh found in constant/polyMesh. Run blockMesh or snappyHexMesh first.")
+            return
+
+        def read_patches(case_path):
+            mesh = polymesh.read_polymesh(case_path)
+            surfaces = []
+            for patch in mesh.patches:
+                points, cells = polymesh.patch_surface(mesh, patch)
+                if len(points):
+                    surface = pv.PolyData(points, cells)
+                    surfaces.append((patch, surface, check_mesh_quality(surface)))
+            return surfaces
+
+        self._start_batch(read_patches, [case_path], self._on_polymesh_patches, "Reading polyMesh...")
+
+    def _on_decomposed_patches(self, results):
+        self._decomposed, surfaces = results[0]
+        self._on_polymesh_patches([surfaces])
+
+    def _on_polymesh_patches(self, results):
+        surfaces = results[0]
+        prefix = os.path.join(polymesh.polymesh_dir(self.current_case_path), "boundary") + ":"
+        self.mesh_list.blockSignals(True)
+        for row in reversed(range(self.mesh_list.count())):
+            full_path = self.mesh_list.item(row).data(Qt.UserRole)
+            if full_path.startswith(prefix):
+                self.mesh_list.takeItem(row)
+                self.viewer.remove_mesh(full_path)
+
+        for patch, surface, metrics in surfaces:
+            key = prefix + patch["name"]
+            item = self._add_mesh_item(key, f"{patch['name']} (polyMesh)")
+            self.viewer.add_loaded_mesh(item.data(Qt.UserRole + 1), f"polyMesh/{patch['name']}", key, surface, None, metrics)
+            item.setFlags(item.flags() | Qt.ItemIsEnabled)
+            item.setToolTip(f"polyMesh patch {patch['name']} ({patch['type']}, {patch['nFaces']:,} faces)")
+        self.mesh_list.blockSignals(False)
+
+        self.group_cam.setEnabled(True)
+        self.viewer.plotter.reset_camera()
+        self.viewer.update_render()
+        self.lbl_batch_status.setText(f"Loaded {len(surfaces)} polyMesh patches.")
+
+    def show_polymesh_quality(self):
+        """Calcula as métricas de qualidade da malha de volume fora da thread da interface."""
+        case_path = self.current_case_path
+        if not case_path or not polymesh.has_polymesh(case_path):
+            QMessageBox.warning(self, "polyMesh Quality", "No mesh found in constant/polyMesh. Run blockMesh or snappyHexMesh first.")
+            return
+
+        def compute(case_path):
+            return meshquality.mesh_quality(polymesh.read_polymesh(case_path))
+
+        self._start_batch(compute, [case_path], self._on_polymesh_quality, "Computing polyMesh quality...")
+
+    def _on_polymesh_quality(self, results):
+        quality = results[0]
+        summary = quality["summary"]
+        self.lbl_batch_status.setText(
+            f"polyMesh: {summary['cells']:,} cells, max non-orthogonality {summary['max_non_orthogonality']:.1f}°."
+        )
+        MeshQualityDialog(quality, self).exec()
+
+    def scan_zones(self):
+        """Lê a malha de volume e seus conjuntos e zonas, fora da thread da interface."""
+        case_path = self.current_case_path
+        if not case_path or not polymesh.has_polymesh(case_path):
+            QMessageBox.warning(self, "Sets & Zones", "No mesh found in constant/polyMesh. Run blockMesh or snappyHexMesh first.")
+            return
+
+        def read_all(case_path):
+            return polymesh.read_polymesh(case_path), meshsets.read_selections(case_path)
+
+        self._start_batch(read_all, [case_path], self._on_zones_scanned, "Reading polyMesh sets and zones...")
+
+    def _on_zones_scanned(self, results):
+        self._polymesh, selections = results[0]
+        self._selections = {}
+        self.list_zones.clear()
+        for selection in selections:
+            self._add_zone_item(selection)
+        self.lbl_zone_info.setText(f"{len(selections)} sets/zones found." if selections else "No sets or zones in constant/polyMesh.")
+        self.lbl_batch_status.setText("polyMesh sets and zones loaded.")
+
+    def _add_zone_item(self, selection):
+        key = meshsets.selection_key(selection)
+        self._selections[key] = selection
+        item = QListWidgetItem(f"{selection.name} ({selection.kind}{selection.source.capitalize()}, {len(selection.labels):,})")
+        item.setData(Qt.UserRole, key)
+        self.list_zones.addItem(item)
+        return item
+
+    def _selected_zones(self):
+        return [self._selections[item.data(Qt.UserRole)] for item in self.list_zones.selectedItems()]
+
+    @staticmethod
+    def _format_bounds(bounds):
+        if bounds is None:
+            return "empty"
+        return "x [{:.4g}, {:.4g}]  y [{:.4g}, {:.4g}]  z [{:.4g}, {:.4g}]".format(*bounds)
+
+    def show_selected_zones(self):
+        """Exibe as seleções marcadas: células pela superfície que as envolve, faces e pontos diretamente."""
+        mesh = self._polymesh
+        selections = self._selected_zones()
+        if mesh is None or not selections:
+            QMessageBox.warning(self, "Sets & Zones", "Scan and select at least one set or zone.")
+            return
+
+        def build(selection):
+            if selection.kind == "point":
+                points = np.asarray(mesh.points[meshsets.selection_points(mesh, selection)], dtype=np.float64)
+                surface = pv.PolyData(points) if len(points) else None
+            else:
+                points, cells = meshsets.faces_surface(mesh, meshsets.selection_faces(mesh, selection))
+                surface = pv.PolyData(points, cells) if len(points) else None
+            return selection, surface, meshsets.bounding_box(mesh, selection)
+
+        self._start_batch(build, selections, self._on_zones_built, f"Building {len(selections)} sets/zones...")
+
+    def _on_zones_built(self, results):
+        prefix = os.path.join(polymesh.polymesh_dir(self.current_case_path), "sets") + ":"
+        lines = []
+        self.mesh_list.blockSignals(True)
+        for selection, surface, bounds in results:
+            key = prefix + meshsets.selection_key(selection)
+            previous = self._item_for_path(key)
+            if previous is not None:
+                self.mesh_list.takeItem(self.mesh_list.row(previous))
+                self.viewer.remove_mesh(key)
+            lines.append(f"{selection.name}: {len(selection.labels):,} {selection.kind}s, {self._format_bounds(bounds)}")
+            if surface is None:
+                continue
+            item = self._add_mesh_item(key, f"{selection.name} ({selection.kind}{selection.source.capitalize()})")
+            metrics = check_mesh_quality(surface) if selection.kind != "point" else None
+            self.viewer.add_loaded_mesh(item.data(Qt.UserRole + 1), f"sets/{meshsets.selection_key(selection)}", key, surface, None, metrics)
+            item.setFlags(item.flags() | Qt.ItemIsEnabled)
+            item.setToolTip(lines[-1])
+        self.mesh_list.blockSignals(False)
+
+        self.group_cam.setEnabled(True)
+        self.viewer.update_render()
+        self.lbl_zone_info.setText("\n".join(lines))
+        self.lbl_batch_status.setText(f"Displayed {len(results)} sets/zones.")
+
+    def intersect_selected_zones(self):
+        """Interseção das duas seleções marcadas, adicionada à lista como nova seleção."""
+        mesh = self._polymesh
+        selections = self._selected_zones()
+        if mesh is None or len(selections) != 2:
+            QMessageBox.warning(self, "Sets & Zones", "Select exactly two sets or zones to intersect.")
+            return
+        first, second = selections
+        if first.kind != second.kind:
+            QMessageBox.warning(self, "Sets & Zones", f"Cannot intersect a {first.kind} selection with a {second.kind} selection.")
+            return
+
+        def compute(pair):
+            result = meshsets.intersect(*pair)
+            return result, meshsets.bounding_box(mesh, result)
+
+        self._start_batch(compute, [(first, second)], self._on_zones_intersected, "Intersecting sets/zones...")
+
+    def _on_zones_intersected(self, results):
+        selection, bounds = results[0]
+        item = self._add_zone_item(selection)
+        self.list_zones.clearSelection()
+        item.setSelected(True)
+        self.lbl_zone_info.setText(f"{selection.name}: {len(selection.labels):,} {selection.kind}s, {self._format_bounds(bounds)}")
+        self.lbl_batch_status.setText("Intersection added to the sets/zones list.")
+
+    def _use_decomposed(self):
+        return bool(self.current_case_path) and self.chk_decomposed.isEnabled() and self.chk_decomposed.isChecked()
+
+    def refresh_field_times(self, *_):
+        """Relista os diretórios de tempo do caso.
+
+        Sem a leitura dos subdomínios, só os tempos da raiz (onde está a malha
+        reconstruída) são oferecidos; com ela, os tempos de `processor0`.
+        """
+        current = self.combo_field_time.currentText()
+        if self.current_case_path:
+            self.time_index.scan(self.current_case_path)
+        else:
+            self.time_index = TimeIndex()
+        self.combo_field_time.blockSignals(True)
+        self.combo_field_time.clear()
+        location = self.time_index.processors[0] if self._use_decomposed() and self.time_index.processors else ""
+        for entry in reversed(self.time_index.times()):
+            if location in entry.locations:
+                self.combo_field_time.addItem(entry.name, entry.name)
+        index = self.combo_field_time.findText(current)
+        self.combo_field_time.setCurrentIndex(max(index, 0))
+        self.combo_field_time.blockSignals(False)
+        self._on_field_time_changed()
+
+    def _on_field_time_changed(self, *_):
+        current = self.combo_field_name.currentText()
+        time_name = self.combo_field_time.currentData()
+        self.combo_field_name.clear()
+        if time_name is None:
+            return
+        self.combo_field_name.addItems(self.time_index.fields(time_name))
+        index = self.combo_field_name.findText(current)
+        if index >= 0:
+            self.combo_field_name.setCurrentIndex(index)
+
+    def _polymesh_patch_keys(self):
+        if not self.current_case_path:
+            return {}
+        prefix = os.path.join(polymesh.polymesh_dir(self.current_case_path), "boundary") + ":"
+        return {key[len(prefix):]: key for key in self.viewer.meshes if key.startswith(prefix)}
+
+    def apply_field_coloring(self):
+        """Colore os patches do polyMesh exibidos pelo campo e tempo escolhidos."""
+        time_name = self.combo_field_time.currentData()
+        field_name = self.combo_field_name.currentText()
+        keys = self._polymesh_patch_keys()
+        if not keys:
+            QMessageBox.warning(self, "Field Coloring", "Show the polyMesh patches first.")
+            return
+        paths = self.time_index.field_paths(time_name, field_name) if time_name and field_name else []
+        if not paths:
+            QMessageBox.warning(self, "Field Coloring", "Select a time and a field.")
+            return
+        case_path = self.current_case_path
+        mesh = self._polymesh
+        source = self.combo_field_source.currentData()
+        which = self.combo_field_component.currentData()
+        cache = self.field_cache
+        title = f"{field_name} @ {time_name}"
+
+        if self._use_decomposed():
+            stitched = self._decomposed
+
+            def compute_stitched(case_path):
+                # A costura é lida uma vez por caso; a cada clique só os campos, pelo cache.
+                mesh_data = stitched if stitched is not None else decomposed.read_decomposed_mesh(case_path)
+                face_values = mesh_data.field_values(time_name, field_name, source, which, cache.get)
+                values = {keys[name]: v for name, v in face_values.items() if name in keys}
+                return mesh_data, values
+
+            self._start_batch(compute_stitched, [case_path],
+                              lambda results: self._on_field_values(title, results, stitched=True),
+                              f"Reading {field_name} at t = {time_name} from processor directories...")
+            return
+
+        def compute(path):
+            mesh_data = mesh if mesh is not None else polymesh.read_polymesh(case_path)
+            field = cache.get(path)
+            values = {}
+            for patch in mesh_data.patches:
+                if patch["name"] in keys and patch["nFaces"]:
+                    values[keys[patch["name"]]] = fieldio.component(
+                        fieldio.patch_face_values(mesh_data, field, patch, source), which)
+            return mesh_data, values
+
+        self._start_batch(compute, [paths[0]], lambda results: self._on_field_values(title, results),
+                          f"Reading {field_name} at t = {time_name}...")
+
+    def _on_field_values(self, title, results, stitched=False):
+        mesh, values = results[0]
+        if stitched:
+            self._decomposed = mesh
+        else:
+            self._polymesh = mesh
+        finite = [v[np.isfinite(v)] for v in values.values() if len(v)]
+        finite = [v for v in finite if len(v)]
+        if not finite:
+            self.lbl_field_range.setText("No values to display.")
+            return
+        low = min(float(v.min()) for v in finite)
+        high = max(float(v.max()) for v in finite)
+        if high <= low:
+            high = low + max(abs(low) * 1e-6, 1e-12)
+        for key in list(self.viewer.meshes):
+            self.viewer.clear_mesh_scalars(key)
+        for key, face_values in values.items():
+            self.viewer.set_mesh_scalars(key, face_values, (low, high), title)
+        self.viewer.update_render()
+        self.lbl_field_range.setText(f"{title}: min {low:.6g}, max {high:.6g}")
+        self.lbl_batch_status.setText(f"Colored {len(values)} patches by {title}.")
+
+    def clear_field_coloring(self):
+        for key in list(self.viewer.meshes):
+            self.viewer.clear_mesh_scalars(key)
+        self.viewer.update_render()
+        self.lbl_field_range.setText("-")
+
+    def toggle_probe_mode(self, active):
+        if active:
+            self.btn_measure.setChecked(False)
+            self.btn_probe_pick.setStyleSheet("background-color: #0f62fe; color: white;")
+            self.viewer.start_probing(self._on_probe_points)
+        else:
+            self.btn_probe_pick.setStyleSheet("")
+            self.viewer.stop_probing()
+
+    def _on_probe_points(self, points):
+        last = points[-1]
+        self.lbl_probe_info.setText(
+            f"{len(points)} probe point{'s' if len(points) != 1 else ''}, "
+            f"last ({last[0]:.4g}, {last[1]:.4g}, {last[2]:.4g})"
+        )
+
+    def clear_probes(self):
+        self.btn_probe_pick.setChecked(False)
+        self.viewer.clear_probes()
+        self.lbl_probe_info.setText("No probe points.")
+
+    def _probe_locations(self):
+        """`(pontos, posições no gráfico, é linha)` das sondas escolhidas, ou None se faltarem pontos."""
+        picked = np.asarray(self.viewer.probe_points, dtype=float)
+        if self.combo_probe_mode.currentData() == "line":
+            if len(picked) < 2:
+                return None
+            points, distances = probes.line_points(picked[0], picked[-1], self.spin_probe_samples.value())
+            return points, distances, True
+        if not len(picked):
+            return None
+        return picked, np.arange(len(picked), dtype=float), False
+
+    def sample_probes(self, sweep=False):
+        """Amostra o campo escolhido nas sondas, no tempo atual ou em todos os tempos do caso.
+
+        Só os tempos da raiz do caso são usados, pois a localização das
+        células é feita sobre a malha reconstruída de `constant/polyMesh`.
+        """
+        case_path = self.current_case_path
+        if not case_path or not polymesh.has_polymesh(case_path):
+            QMessageBox.warning(self, "Probes", "Probes need the mesh in constant/polyMesh.")
+            return
+        locations = self._probe_locations()
+        if locations is None:
+            QMessageBox.warning(self, "Probes", "Pick probe points on the geometry first (two for a line).")
+            return
+        field_name = self.combo_field_name.currentText()
+        current = self.combo_field_time.currentData()
+        if not field_name or current is None:
+            QMessageBox.warning(self, "Probes", "Select a time and a field under Field Coloring.")
+            return
+
+        names = [entry.name for entry in self.time_index.times()] if sweep else [current]
+        items = []
+        for name in names:
+            root_path = os.path.join(case_path, name, field_name)
+            for path in self.time_index.field_paths(name, field_name):
+                if path in (root_path, root_path + ".gz"):
+                    items.append((name, path))
+        if not items:
+            QMessageBox.warning(self, "Probes", f"No time directory of the case holds {field_name}.")
+            return
+
+        points, positions, is_line = locations
+        which = self.combo_field_component.currentData()
+        cache = self.field_cache
+        lock = threading.Lock()
+        state = {"probe": self._cell_probe, "mesh": self._polymesh}
+
+        def located():
+            # A árvore k-d é construída uma única vez, pela primeira thread que precisar dela.
+            with lock:
+                if state["probe"] is None:
+                    mesh = state["mesh"] if state["mesh"] is not None else polymesh.read_polymesh(case_path)
+                    state["probe"] = probes.CellProbe(mesh)
+                if "cells" not in state:
+                    state["cells"] = state["probe"].locate(points)[0]
+                return state["probe"], state["cells"]
+
+        def sample(item):
+            name, path = item
+            probe, cells = located()
+            try:
+                return probe, name, probes.sample_cells(cache.get(path), cells, which)
+            except (OSError, ValueError) as exc:
+                # Um tempo ainda sendo escrito pelo solver é pulado, sem derrubar a varredura.
+                return probe, name, exc
+
+        title = field_name if which == "magnitude" else f"{field_name}[{'XYZ'[which]}]"
+        self._start_batch(sample, items,
+                          lambda results: self._on_probe_samples(title, positions, is_line, results),
+                          f"Sampling {field_name} at {len(items)} time{'s' if len(items) != 1 else ''}...")
+
+    def _on_probe_samples(self, title, positions, is_line, results):
+        self._cell_probe = results[0][0]
+        self._polymesh = self._cell_probe.mesh
+        failed = [(name, samples) for _, name, samples in results if isinstance(samples, Exception)]
+        sampled = [(name, samples) for _, name, samples in results if not isinstance(samples, Exception)]
+        if not sampled:
+            self.lbl_batch_status.setText(f"Failed: {failed[0][1]}")
+            QMessageBox.warning(self, "Probes", f"Could not read {title} at {failed[0][0]}: {failed[0][1]}")
+            return
+        times = [(name, time_value(name)) for name, _ in sampled]
+        values = np.vstack([samples for _, samples in sampled])
+        status = f"Sampled {title} at {len(times)} time{'s' if len(times) != 1 else ''}."
+        if failed:
+            status += f" Skipped unreadable: {', '.join(name for name, _ in failed)}."
+        self.lbl_batch_status.setText(status)
+        ProbeDialog(title, times, positions, values, is_line, self).exec()
+
+    def _vector_row(self, form, label):
+        row = QHBoxLayout()
+        row.setSpacing(4)
+        edits = []
+        for axis in "XYZ":
+            edit = QLineEdit()
+            edit.setPlaceholderText(axis)
+            edit.setToolTip(axis)
+            edits.append(edit)
+            row.addWidget(edit)
+        form.addRow(label, row)
+        return edits
+
+    def _vector_value(self, edits):
+        values = []
+        for edit in edits:
+            text = edit.text().strip().replace(",", ".")
+            values.append(float(text) if text else 0.0)
+        return values
+
+    def _batch_selection(self):
+        """Caminhos das geometrias selecionadas já carregadas, na ordem da lista."""
+        selected = []
+        for row in range(self.mesh_list.count()):
+            item = self.mesh_list.item(row)
+            full_path = item.data(Qt.UserRole)
+            if item.isSelected() and full_path in self.viewer.meshes:
+                selected.append(full_path)
+        return selected
+
+    def _start_batch(self, func, items, handler, message):
+        if self.batch.is_running():
+            QMessageBox.information(self, "Batch Geometry Tools", "Another batch operation is still running.")
+            return False
+        if not items:
+            QMessageBox.warning(self, "Batch Geometry Tools", "Select at least one loaded geometry.")
+            return False
+        self._batch_handler = handler
+        self.group_batch.setEnabled(False)
+        self.lbl_batch_status.setText(message)
+        self.batch.run(func, items)
+        return True
+
+    def _on_batch_finished(self, results):
+        handler, self._batch_handler = self._batch_handler, None
+        self.group_batch.setEnabled(True)
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors:
+            self.lbl_batch_status.setText(f"Failed: {errors[0]}")
+            QMessageBox.critical(self, "Batch Geometry Tools", str(errors[0]))
+            return
+        if handler:
+            handler(results)
+
+    def _surface_arrays(self, full_path):
+        """`(points, faces)` triangulados de uma geometria carregada."""
+        mesh = self.viewer.meshes[full_path]
+        tri = mesh if mesh.is_all_triangles else mesh.triangulate()
+        return tri.points, tri.regular_faces
+
+    def apply_batch_transform(self):
+        """Escala, rotaciona e translada as geometrias selecionadas, em paralelo."""
+        try:
+            translate = self._vector_value(self.edit_translate)
+            rotate = self._vector_value(self.edit_rotate)
+        except ValueError:
+            QMessageBox.warning(self, "Batch Geometry Tools", "Translation and rotation must be numbers.")
+            return
+        scale = self.combo_units.currentData()
+
+        items = []
+        for full_path in self._batch_selection():
+            points, faces = self._surface_arrays(full_path)
+            items.append((full_path, points, faces))
+
+        def transform(item):
+            full_path, points, faces = item
+            new_points = geomtools.transform_points(points, scale, rotate, translate)
+            return full_path, new_points, surfcheck.surface_diagnostics(new_points, faces)
+
+        self._start_batch(transform, items, self._on_transform_done,
+                          f"Transforming {len(items)} geometries...")
+
+    def _on_transform_done(self, results):
+        for full_path, points, metrics in results:
+            old = self.viewer.mesh_metrics.get(full_path) or {}
+            metrics["is_all_triangles"] = old.get("is_all_triangles", True)
+            self.viewer.update_mesh_points(full_path, points, metrics)
+            item = self._item_for_path(full_path)
+            if item is not None:
+                rel_path = os.path.relpath(full_path, self.current_case_path) if self.current_case_path else full_path
+                item.setToolTip(f"{rel_path} (transformed, not saved)")
+        if self.chk_enable_clip.isChecked():
+            self.on_clip_changed()
+        self.viewer.plotter.reset_camera()
+        self.viewer.update_render()
+        self.on_mesh_selection_changed(self.mesh_list.currentItem(), None)
+        self.lbl_batch_status.setText(f"Transformed {len(results)} geometries (in memory).")
+
+    def show_combined_bounds(self):
+        """Caixa envolvente conjunta das geometrias selecionadas."""
+        items = [self.viewer.meshes[p].points for p in self._batch_selection()]
+        self._start_batch(lambda points: geomtools.combined_bounds([points]), items,
+                          self._on_bounds_done, "Computing bounds...")
+
+    def _on_bounds_done(self, results):
+        corners = [np.array([[b[0], b[2], b[4]], [b[1], b[3], b[5]]]) for b in results if b]
+        b = geomtools.combined_bounds(corners)
+        if b is None:
+            self.lbl_batch_status.setText("No points.")
+            return
+        self.lbl_batch_status.setText(
+            f"{len(results)} geometries\n"
+            f"X [{b[0]:.4g}, {b[1]:.4g}]  Δ {b[1] - b[0]:.4g} m\n"
+            f"Y [{b[2]:.4g}, {b[3]:.4g}]  Δ {b[3] - b[2]:.4g} m\n"
+            f"Z [{b[4]:.4g}, {b[5]:.4g}]  Δ {b[5] - b[4]:.4g} m"
+        )
+
+    def export_multisolid_stl(self):
+        """Funde as geometrias selecionadas num STL ASCII com um `solid` por patch."""
+        selected = self._batch_selection()
+        if not selected:
+            QMessageBox.warning(self, "Batch Geometry Tools", "Select at least one loaded geometry.")
+            return
+        start_dir = self.current_case_path or ""
+        tri_surface = os.path.join(start_dir, "constant", "triSurface")
+        if os.path.isdir(tri_surface):
+            start_dir = tri_surface
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Multi-solid STL", os.path.join(start_dir, "combined.stl"), "STL Files (*.stl)"
+        )
+        if not path:
+            return
+
+        surfaces = []
+        for full_path in selected:
+            points, faces = self._surface_arrays(full_path)
+            stem = os.path.splitext(os.path.basename(full_path))[0]
+            patch_ids, names = self.viewer.mesh_patches.get(full_path, (None, []))
+            if patch_ids is None or len(patch_ids) != len(faces) or len(names) < 2:
+                patch_ids, names = None, [stem]
+            surfaces.append(stlio.STLSurface(points, faces, patch_ids, names))
+
+        def export(surfaces):
+            merged = geomtools.merge_surfaces(surfaces)
+            stlio.write_ascii_stl(path, merged)
+            return path, merged.patch_names, len(merged.faces)
+
+        self._start_batch(export, [surfaces], self._on_export_done, "Exporting...")
+
+    def _on_export_done(self, results):
+        path, names, n_faces = results[0]
+        self.lbl_batch_status.setText(
+            f"Exported {n_faces:,} faces in {len(names)} solids to {os.path.basename(path)}: {', '.join(names)}"
+        )
+
     def create_mesh_icon(self, color_hex="#0f62fe"):
         pixmap = QPixmap(16, 16)
         pixmap.fill(Qt.transparent)
@@ -969,3 +2637,9 @@ class CaseGeometryWidget(QWidget):
         
         painter.end()
         return QIcon(pixmap)
+
+    def closeEvent(self, event):
+        self.loader.shutdown()
+        self.batch.shutdown()
+        self.viewer.close()
+        super().closeEvent(event)
@@ -0,0 +1,247 @@
+"""Leitura vetorizada de arquivos STL (binário e ASCII).
+
+Módulo sem dependência de Qt nem de VTK: trabalha apenas com numpy, para que
+geometrias grandes sejam carregadas sem laços em Python por linha ou por
+triângulo.
+
+- STL binário: os registros de 50 bytes são lidos com um dtype estruturado
+  sobre um mapeamento em memória do arquivo;
+- STL ASCII: cada bloco `solid ... endsolid` tem as palavras-chave removidas
+  numa única passada e os números são convertidos de uma vez.
+
+Os vértices repetidos (cada triângulo do STL traz suas três cópias) são
+unificados, e o nome de cada `solid` vira um índice de patch por face.
+"""
+
+import os
+import re
+from collections import namedtuple
+
+import numpy as np
+
+from gafoam import foamdict
+
+# Superfície triangulada: `points` (N, 3), `faces` (M, 3) com índices em
+# `points`, `patch_ids` (M,) com índices em `patch_names`.
+STLSurface = namedtuple("STLSurface", ["points", "faces", "patch_ids", "patch_names"])
+
+STL_HEADER_SIZE = 84
+
+# Registro de um triângulo do STL binário (50 bytes, little-endian).
+STL_BINARY_DTYPE = np.dtype([
+    ("normal", "<f4", (3,)),
+    ("vertices", "<f4", (3, 3)),
+    ("attribute", "<u2"),
+])
+
+RE_SOLID_BLOCK = re.compile(
+    rb"^[ \t]*solid[ \t]*([^\r\n]*?)[ \t]*\r?$(.*?)^[ \t]*endsolid\b[^\r\n]*",
+    re.MULTILINE | re.DOTALL | re.IGNORECASE,
+)
+RE_STL_KEYWORDS = re.compile(rb"\b(?:facet|normal|outer|loop|vertex|endloop|endfacet)\b", re.IGNORECASE)
+
+# Números por faceta no ASCII: normal (3) + três vértices (9).
+_ASCII_VALUES_PER_FACET = 12
+
+# Marcas de início e fim de bloco, procuradas sobre o texto já em minúsculas.
+RE_SOLID_MARK = re.compile(rb"^[ \t]*(end)?solid\b[ \t]*([^\r\n]*)", re.MULTILINE)
+
+# Tamanho dos blocos lidos pela varredura de patches.
+SCAN_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def is_binary_stl(path):
+    """Indica se o arquivo é um STL binário.
+
+    O cabeçalho de um STL binário pode começar com `solid`, então a decisão
+    usa o tamanho: 84 bytes de cabeçalho mais 50 bytes por triângulo.
+    """
+    size = os.path.getsize(path)
+    if size < STL_HEADER_SIZE:
+        return False
+    with open(path, "rb") as fh:
+        head = fh.read(STL_HEADER_SIZE)
+    n_faces = int(np.frombuffer(head[80:84], dtype="<u4")[0])
+    if size == STL_HEADER_SIZE + n_faces * STL_BINARY_DTYPE.itemsize:
+        return True
+    return not head.lstrip().lower().startswith(b"solid")
+
+
+def read_stl(path):
+    """Superfície de um arquivo STL, binário ou ASCII, com vértices unificados.
+
+    Levanta ValueError se o conteúdo não for um STL válido.
+    """
+    if is_binary_stl(path):
+        triangles, patch_ids, names = _read_binary(path)
+    else:
+        triangles, patch_ids, names = _read_ascii(path)
+    if not names:
+        names = [os.path.splitext(os.path.basename(path))[0]]
+    points, faces = merge_vertices(triangles)
+    return STLSurface(points, faces, patch_ids, names)
+
+
+def _read_binary(path):
+    data = np.memmap(path, dtype=np.uint8, mode="r")
+    n_faces = int(data[80:84].view("<u4")[0])
+    available = (data.size - STL_HEADER_SIZE) // STL_BINARY_DTYPE.itemsize
+    n_faces = min(n_faces, available)
+    records = np.frombuffer(
+        data, dtype=STL_BINARY_DTYPE, count=n_faces, offset=STL_HEADER_SIZE
+    )
+    triangles = np.array(records["vertices"], dtype=np.float32)
+    del records, data
+    return triangles, np.zeros(n_faces, dtype=np.int32), []
+
+
+def _read_ascii(path):
+    with open(path, "rb") as fh:
+        content = fh.read()
+
+    blocks = [(m.group(1), m.group(2)) for m in RE_SOLID_BLOCK.finditer(content)]
+    if not blocks:
+        # Arquivo sem `endsolid`: tudo após a linha `solid` forma um bloco.
+        first, _, body = content.partition(b"\n")
+        name = first.strip()[5:].strip() if first.strip().lower().startswith(b"solid") else b""
+        blocks = [(name, body)]
+
+    names = []
+    chunks = []
+    ids = []
+    for name, body in blocks:
+        values = np.fromstring(RE_STL_KEYWORDS.sub(b" ", body), dtype=np.float64, sep=" ")
+        if values.size % _ASCII_VALUES_PER_FACET:
+            raise ValueError(f"Malformed ASCII STL block '{name.decode(errors='replace')}' in {path}")
+        facets = values.reshape(-1, _ASCII_VALUES_PER_FACET)[:, 3:].reshape(-1, 3, 3)
+        ids.append(np.full(len(facets), len(names), dtype=np.int32))
+        names.append(name.decode("utf-8", errors="replace") or f"patch{len(names)}")
+        chunks.append(facets)
+
+    triangles = np.concatenate(chunks) if chunks else np.empty((0, 3, 3))
+    patch_ids = np.concatenate(ids) if ids else np.empty(0, dtype=np.int32)
+    return triangles, patch_ids, names
+
+
+def scan_stl_patches(path, chunk_size=SCAN_CHUNK_SIZE):
+    """Patches de um STL sem ler a geometria: `[{name, faces, start, end}]`.
+
+    `start` e `end` delimitam em bytes o bloco `solid ... endsolid` de cada
+    patch. O ASCII é percorrido em blocos de `chunk_size` bytes, procurando
+    só as linhas `solid`/`endsolid` e contando as facetas entre elas; o
+    binário tem um único patch, lido do cabeçalho. Levanta OSError se o
+    arquivo não puder ser lido.
+    """
+    if is_binary_stl(path):
+        size = os.path.getsize(path)
+        with open(path, "rb") as fh:
+            head = fh.read(STL_HEADER_SIZE)
+        n_faces = int(np.frombuffer(head[80:84], dtype="<u4")[0])
+        n_faces = min(n_faces, (size - STL_HEADER_SIZE) // STL_BINARY_DTYPE.itemsize)
+        return [{
+            "name": os.path.splitext(os.path.basename(path))[0],
+            "faces": n_faces,
+            "start": STL_HEADER_SIZE,
+            "end": STL_HEADER_SIZE + n_faces * STL_BINARY_DTYPE.itemsize,
+        }]
+
+    patches = []
+    current = None
+    offset = 0
+    carry = b""
+    with open(path, "rb") as fh:
+        while True:
+            block = fh.read(chunk_size)
+            data = carry + block
+            if block:
+                # Só linhas completas são analisadas; o resto segue para o próximo bloco.
+                cut = data.rfind(b"\n") + 1
+                if cut == 0:
+                    carry = data
+                    continue
+                data, carry = data[:cut], data[cut:]
+            base = offset
+            offset += len(data)
+
+            lowered = data.lower()
+            pos = 0
+            for m in RE_SOLID_MARK.finditer(lowered):
+                if current is not None:
+                    current["faces"] += _count_facets(lowered, pos, m.start())
+                if m.group(1):
+                    if current is not None:
+                        current["end"] = base + m.end()
+                        patches.append(current)
+                        current = None
+                else:
+                    name = data[m.start(2):m.end(2)].strip().decode("utf-8", errors="replace")
+                    current = {"name": name or "default", "faces": 0, "start": base + m.start(), "end": None}
+                pos = m.end()
+            if current is not None:
+                current["faces"] += _count_facets(lowered, pos, len(lowered))
+            if not block:
+                break
+
+    if current is not None:
+        # Bloco sem `endsolid`: vai até o fim do arquivo.
+        current["end"] = offset
+        patches.append(current)
+    return patches
+
+
+def _count_facets(text, start, end):
+    return text.count(b"facet", start, end) - text.count(b"endfacet", start, end)
+
+
+# Texto de uma faceta no STL ASCII; recebe normal e três vértices (12 números).
+_ASCII_FACET = (
+    "  facet normal %.9g %.9g %.9g\n    outer loop\n"
+    "      vertex %.9g %.9g %.9g\n      vertex %.9g %.9g %.9g\n      vertex %.9g %.9g %.9g\n"
+    "    endloop\n  endfacet\n"
+)
+
+# Facetas formatadas por vez na escrita do ASCII.
+_WRITE_BLOCK = 65536
+
+def write_ascii_stl(path, surface):
+    """Grava `surface` como STL ASCII com um `solid` por patch.
+
+    É o formato multi-sólido que o snappyHexMesh entende como regiões de uma
+    mesma geometria. A gravação é atômica (`foamdict.write_atomic`), então um
+    arquivo existente só é substituído quando o novo está completo.
+    """
+    points = np.asarray(surface.points, dtype=np.float64)
+    faces = np.asarray(surface.faces, dtype=np.int64)
+    ids = surface.patch_ids if surface.patch_ids is not None else np.zeros(len(faces), dtype=np.int32)
+    names = list(surface.patch_names) or [os.path.splitext(os.path.basename(path))[0]]
+
+    def write(fh):
+        for patch, name in enumerate(names):
+            fh.write(f"solid {name}\n".encode("ascii"))
+            patch_faces = faces[ids == patch]
+            for start in range(0, len(patch_faces), _WRITE_BLOCK):
+                tri = points[patch_faces[start:start + _WRITE_BLOCK]]
+                normals = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+                lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+                normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+                values = np.hstack((normals, tri.reshape(-1, 9)))
+                fh.write(((_ASCII_FACET * len(values)) % tuple(values.ravel())).encode("ascii"))
+            fh.write(f"endsolid {name}\n".encode("ascii"))
+
+    foamdict.write_atomic(os.path.abspath(path), write)
+
+
+def merge_vertices(triangles):
+    """Unifica os vértices repetidos de um array de triângulos `(M, 3, 3)`.
+
+    Devolve `(points, faces)`. A comparação é exata, byte a byte (com `-0.0`
+    tratado como `0.0`), como faz o leitor de STL do OpenFOAM.
+    """
+    corners = np.ascontiguousarray(triangles.reshape(-1, 3)) + 0.0
+    if corners.size == 0:
+        return np.empty((0, 3), dtype=triangles.dtype), np.empty((0, 3), dtype=np.int64)
+    rows = corners.view(np.dtype((np.void, corners.dtype.itemsize * 3))).ravel()
+    _, first, inverse = np.unique(rows, return_index=True, return_inverse=True)
+    points = corners[first]
+    faces = inverse.reshape(-1, 3)
+    return points, faces
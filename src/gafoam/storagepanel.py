@@ -0,0 +1,227 @@
+"""Painel de ocupação em disco do caso, sobre `diskusage`."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTreeWidget,
+    QTreeWidgetItem, QHeaderView, QComboBox, QSpinBox, QMessageBox, QAbstractItemView,
+)
+
+from gafoam import diskusage, foamdict
+
+NAME_ROLE = Qt.UserRole
+
+
+def format_bytes(size):
+    """Tamanho legível: `1.5 GiB`, `320 KiB`..."""
+    size = float(size)
+    for unit in ("B", "KiB", "MiB", "GiB", "TiB"):
+        if abs(size) < 1024 or unit == "TiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class StorageWidget(QWidget):
+    """Bytes por tempo, por campo e por processador, com limpeza e compressão.
+
+    A varredura e as ações correm numa thread de fundo; o resultado volta à
+    thread da interface por sinal. O caso só é varrido quando o painel é
+    exibido ou o botão é clicado, nunca ao abrir o caso.
+    """
+
+    _finished = Signal(str, object, object)
+
+    GROUPS = [("Time", "time"), ("Field", "field"), ("Processor", "location")]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.case_path = None
+        self.usage = None
+        self.control = {}
+        self._stale = True
+        self._busy = False
+        self._note = ""
+        self._pool = ThreadPoolExecutor(max_workers=1)
+        self._finished.connect(self._on_finished)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(2)
+
+        toolbar = QHBoxLayout()
+        toolbar.setContentsMargins(6, 4, 6, 4)
+        toolbar.addWidget(QLabel("Group by:"))
+        self.combo_group = QComboBox()
+        for label, key in self.GROUPS:
+            self.combo_group.addItem(label, key)
+        self.combo_group.currentIndexChanged.connect(self._fill_tree)
+        toolbar.addWidget(self.combo_group)
+        toolbar.addStretch()
+        self.scan_button = QPushButton("Scan")
+        self.scan_button.clicked.connect(self.scan)
+        toolbar.addWidget(self.scan_button)
+        layout.addLayout(toolbar)
+
+        self.summary_label = QLabel("No case loaded.")
+        self.summary_label.setWordWrap(True)
+        self.summary_label.setContentsMargins(6, 0, 6, 0)
+        layout.addWidget(self.summary_label)
+
+        self.tree = QTreeWidget()
+        self.tree.setColumnCount(3)
+        self.tree.setHeaderLabels(["Name", "Size", "Share"])
+        self.tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.tree.setRootIsDecorated(False)
+        self.tree.setUniformRowHeights(True)
+        self.tree.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        layout.addWidget(self.tree)
+
+        actions = QHBoxLayout()
+        actions.setContentsMargins(6, 4, 6, 4)
+        actions.addWidget(QLabel("Keep latest:"))
+        self.spin_keep = QSpinBox()
+        self.spin_keep.setRange(0, 100000)
+        self.spin_keep.setValue(2)
+        actions.addWidget(self.spin_keep)
+        self.purge_button = QPushButton("Purge Older Times")
+        self.purge_button.setToolTip("Delete every time directory except the first and the latest ones, in all processors")
+        self.purge_button.clicked.connect(self.purge)
+        actions.addWidget(self.purge_button)
+        self.compress_button = QPushButton("Compress Selected Times")
+        self.compress_button.setToolTip("gzip the fields of the selected times, as writeCompression would")
+        self.compress_button.clicked.connect(self.compress_selected)
+        actions.addWidget(self.compress_button)
+        actions.addStretch()
+        layout.addLayout(actions)
+        self._set_busy(False)
+
+    def load_case(self, case_path):
+        self.case_path = case_path
+        self.usage = None
+        self._stale = True
+        self._note = ""
+        self.tree.clear()
+        self._set_busy(self._busy, "Not scanned yet.")
+        if self.isVisible():
+            self.scan()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._stale and self.case_path:
+            self.scan()
+
+    def mark_stale(self):
+        """Marca a medição como desatualizada; a próxima exibição do painel varre de novo."""
+        self._stale = True
+
+    def _set_busy(self, busy, message=None):
+        self._busy = busy
+        enabled = not busy and bool(self.case_path)
+        for button in (self.scan_button, self.purge_button, self.compress_button):
+            button.setEnabled(enabled)
+        if message:
+            self.summary_label.setText(message)
+
+    def _run(self, action, func, *args):
+        self._set_busy(True)
+        case_path = self.case_path
+        future = self._pool.submit(func, *args)
+        future.add_done_callback(lambda f: self._finished.emit(case_path, action, f))
+
+    def scan(self):
+        if not self.case_path or self._busy:
+            return
+        self._stale = False
+        self._set_busy(True, "Scanning time directories...")
+        case_path = self.case_path
+        self._run("scan", lambda: (diskusage.scan_usage(case_path), foamdict.read_control_dict(case_path)))
+
+    def purge(self):
+        if self.usage is None:
+            return
+        names = diskusage.purge_candidates(self.usage, self.spin_keep.value())
+        if not names:
+            QMessageBox.information(self, "Purge Times", "Nothing to purge.")
+            return
+        per_time = diskusage.bytes_per_time(self.usage)
+        size = format_bytes(sum(per_time[name] for name in names))
+        answer = QMessageBox.question(
+            self, "Purge Times",
+            f"Delete {len(names)} time directories ({names[0]} to {names[-1]}, {size}) "
+            f"in the case and in every processor directory?\nThis cannot be undone.",
+        )
+        if answer != QMessageBox.Yes:
+            return
+        self._set_busy(True, f"Deleting {len(names)} time directories...")
+        self._run("purge", diskusage.purge_times, self.case_path, names)
+
+    def compress_selected(self):
+        if self.combo_group.currentData() != "time":
+            QMessageBox.information(self, "Compress Times", "Group by Time and select the times to compress.")
+            return
+        names = [item.data(0, NAME_ROLE) for item in self.tree.selectedItems()]
+        if not names:
+            QMessageBox.information(self, "Compress Times", "Select the times to compress.")
+            return
+        self._set_busy(True, f"Compressing {len(names)} time directories...")
+        self._run("compress", diskusage.compress_times, self.case_path, names)
+
+    def _on_finished(self, case_path, action, future):
+        self._set_busy(False)
+        if case_path != self.case_path:
+            # Outro caso foi aberto enquanto a tarefa corria.
+            if self.isVisible():
+                self.scan()
+            return
+        error = future.exception()
+        if error is not None:
+            QMessageBox.critical(self, "Case Storage", str(error))
+        if action == "scan" and error is None:
+            self.usage, self.control = future.result()
+            self._fill_tree()
+            return
+        if action == "purge" and error is None:
+            self._note = f"Purge freed {format_bytes(future.result())}."
+        elif action == "compress" and error is None:
+            self._note = f"Compression saved {format_bytes(future.result())}."
+        self._stale = True
+        self.scan()
+
+    def _rows(self):
+        group = self.combo_group.currentData()
+        if group == "time":
+            return [(name, name, size) for name, size in diskusage.bytes_per_time(self.usage).items()]
+        if group == "field":
+            return [(name, name, size) for name, size in diskusage.bytes_per_field(self.usage).items()]
+        return [(name or "case", name, size) for name, size in diskusage.bytes_per_location(self.usage).items()]
+
+    def _fill_tree(self, *_):
+        self.tree.clear()
+        if self.usage is None:
+            return
+        total = diskusage.total_bytes(self.usage)
+        for label, name, size in self._rows():
+            share = f"{100.0 * size / total:.1f} %" if total else "-"
+            item = QTreeWidgetItem([label, format_bytes(size), share])
+            item.setData(0, NAME_ROLE, name)
+            item.setTextAlignment(1, Qt.AlignRight | Qt.AlignVCenter)
+            item.setTextAlignment(2, Qt.AlignRight | Qt.AlignVCenter)
+            self.tree.addTopLevelItem(item)
+
+        times = len(diskusage.bytes_per_time(self.usage))
+        summary = f"{format_bytes(total)} in {times} time directories"
+        processors = len(self.usage.other) - 1
+        if processors:
+            summary += f" and {processors} processors"
+        projection = diskusage.project_output(self.usage, self.control)
+        if projection is not None:
+            summary += (
+                f". Projected at endTime: {format_bytes(projection['projected_bytes'])} of time directories "
+                f"({projection['remaining_writes']} more writes of {format_bytes(projection['bytes_per_write'])})"
+            )
+        self.summary_label.setText(summary + "." + (f" {self._note}" if self._note else ""))
+
+    def closeEvent(self, event):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        super().closeEvent(event)
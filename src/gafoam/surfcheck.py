@@ -0,0 +1,181 @@
+"""Diagnóstico vetorizado de superfícies trianguladas.
+
+Módulo sem dependência de Qt nem de VTK. A topologia das arestas é montada uma
+única vez: as três arestas de cada triângulo viram chaves inteiras, que são
+ordenadas e agrupadas. Das multiplicidades saem as arestas abertas (1 face) e
+não-manifold (3 ou mais faces); da orientação das duas ocorrências de cada
+aresta manifold sai a consistência das normais.
+
+Os demais diagnósticos são os que o snappyHexMesh cobra de uma superfície:
+faces duplicadas, triângulos degenerados e candidatos a auto-interseção.
+"""
+
+import numpy as np
+
+# Razão entre o dobro da área e o quadrado da maior aresta abaixo da qual o
+# triângulo é considerado degenerado (colinear ou com vértices coincidentes).
+DEGENERATE_RATIO = 1e-10
+
+# Distância entre centróides, relativa à menor aresta, abaixo da qual duas
+# faces sem vértice comum são suspeitas de auto-interseção.
+OVERLAP_RATIO = 0.1
+
+
+def edge_topology(faces):
+    """Arestas únicas e estatísticas de um array de triângulos `(M, 3)`.
+
+    Devolve `(edges, counts, inconsistent)`: as arestas únicas `(E, 2)` com o
+    menor índice primeiro, quantas faces usam cada uma, e quantas arestas
+    manifold são percorridas no mesmo sentido pelas duas faces vizinhas.
+    """
+    faces = np.asarray(faces, dtype=np.int64)
+    directed = faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    forward = directed[:, 0] < directed[:, 1]
+    low = np.where(forward, directed[:, 0], directed[:, 1])
+    high = np.where(forward, directed[:, 1], directed[:, 0])
+
+    n_points = int(faces.max()) + 1 if faces.size else 0
+    # O sentido vai no bit menos significativo da chave: uma única ordenação,
+    # sem argsort, agrupa as ocorrências de cada aresta.
+    packed = np.sort((low * n_points + high) * 2 + forward)
+    keys = packed >> 1
+    forward = (packed & 1).astype(bool)
+
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if keys.size else np.empty(0, dtype=np.int64)
+    counts = np.diff(np.r_[starts, keys.size])
+    edges = np.column_stack(np.divmod(keys[starts], max(n_points, 1)))
+
+    # Numa superfície orientada, as duas faces de uma aresta a percorrem em
+    # sentidos opostos.
+    pairs = starts[counts == 2]
+    inconsistent = int(np.count_nonzero(forward[pairs] == forward[pairs + 1]))
+    return edges, counts, inconsistent
+
+
+def count_duplicate_faces(faces):
+    """Número de triângulos repetidos (mesmos três vértices, em qualquer ordem)."""
+    if len(faces) == 0:
+        return 0
+    faces = np.asarray(faces, dtype=np.int64)
+    a, b, c = faces[:, 0], faces[:, 1], faces[:, 2]
+    low = np.minimum(np.minimum(a, b), c)
+    high = np.maximum(np.maximum(a, b), c)
+    keys = np.sort(_row_keys(np.column_stack((low, a + b + c - low - high, high))))
+    return int(np.count_nonzero(keys[1:] == keys[:-1]))
+
+
+def _row_keys(rows):
+    """Uma chave por linha de inteiros não negativos `(K, 3)`, comparável com `==`.
+
+    Usa um único int64 quando o intervalo permite e, senão, uma visão `void`.
+    """
+    span = int(rows.max()) + 1 if rows.size else 1
+    if span ** 3 < 2 ** 62:
+        return (rows[:, 0] * span + rows[:, 1]) * span + rows[:, 2]
+    rows = np.ascontiguousarray(rows)
+    return rows.view(np.dtype((np.void, rows.dtype.itemsize * 3))).ravel()
+
+
+def degenerate_faces(points, faces):
+    """Máscara dos triângulos com área nula (vértices repetidos ou colineares)."""
+    tri = points[faces]
+    return _degenerate_mask(faces, tri, np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0]))
+
+
+def _degenerate_mask(faces, tri, cross):
+    twice_area_sq = np.einsum("ij,ij->i", cross, cross)
+    longest_sq = np.zeros(len(tri))
+    for a, b in ((0, 1), (1, 2), (2, 0)):
+        edge = tri[:, b] - tri[:, a]
+        np.maximum(longest_sq, np.einsum("ij,ij->i", edge, edge), out=longest_sq)
+    repeated = (faces[:, 0] == faces[:, 1]) | (faces[:, 1] == faces[:, 2]) | (faces[:, 2] == faces[:, 0])
+    return repeated | (twice_area_sq <= (DEGENERATE_RATIO * longest_sq) ** 2)
+
+
+def self_intersection_candidates(points, faces):
+    """Número de faces que podem cruzar ou sobrepor faces não vizinhas.
+
+    Triagem barata, não um teste exato: os centróides são agrupados numa
+    grade com metade do comprimento médio de aresta, e cada face é comparada
+    à seguinte da mesma célula. O par é suspeito se as faces não compartilham
+    vértice e os centróides estão a menos de `OVERLAP_RATIO` da menor aresta
+    das duas, o que só acontece em superfícies duplicadas, dobradas ou
+    interpenetradas.
+    """
+    if len(faces) < 2:
+        return 0
+    return _self_intersection_candidates(faces, points[faces])
+
+
+def _self_intersection_candidates(faces, tri):
+    spacing = float(np.mean(np.linalg.norm(tri[:, 1] - tri[:, 0], axis=1))) * 0.5
+    if spacing <= 0.0:
+        return 0
+    centroids = tri.mean(axis=1)
+    cells = np.floor(centroids / spacing).astype(np.int64)
+    cells -= cells.min(axis=0)
+    keys = _row_keys(cells)
+    order = np.argsort(keys)
+    keys = keys[order]
+    same_cell = keys[1:] == keys[:-1]
+    first = order[:-1][same_cell]
+    second = order[1:][same_cell]
+
+    a, b = faces[first], faces[second]
+    disjoint = ~(a[:, :, None] == b[:, None, :]).any(axis=(1, 2))
+    first, second = first[disjoint], second[disjoint]
+    size = np.minimum(_shortest_edge(tri[first]), _shortest_edge(tri[second]))
+    gap = np.linalg.norm(centroids[first] - centroids[second], axis=1)
+    close = gap < OVERLAP_RATIO * size
+    return int(len(np.unique(np.concatenate((first[close], second[close])))))
+
+
+def _shortest_edge(tri):
+    return np.sqrt(np.min([np.einsum("ij,ij->i", e, e) for e in (
+        tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 1], tri[:, 0] - tri[:, 2])], axis=0))
+
+
+def surface_diagnostics(points, faces):
+    """Métricas de qualidade e estanqueidade de uma superfície triangulada.
+
+    `points` é `(N, 3)` e `faces` é `(M, 3)` com índices em `points`. O volume
+    só é calculado (pelo teorema da divergência) quando a superfície é
+    fechada e manifold.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+
+    edges, counts, inconsistent = edge_topology(faces)
+    open_edges = int(np.count_nonzero(counts == 1))
+    non_manifold = int(np.count_nonzero(counts > 2))
+    is_watertight = bool(len(faces) > 0 and open_edges == 0 and non_manifold == 0)
+
+    tri = points[faces]
+    cross = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    area = float(0.5 * np.linalg.norm(cross, axis=1).sum())
+    volume = None
+    if is_watertight:
+        volume = float(abs(np.einsum("ij,ij->", tri[:, 0], cross)) / 6.0)
+
+    if len(points):
+        low, high = points.min(axis=0), points.max(axis=0)
+    else:
+        low = high = np.zeros(3)
+    bounds = (float(low[0]), float(high[0]), float(low[1]), float(high[1]), float(low[2]), float(high[2]))
+
+    return {
+        "points": int(len(points)),
+        "cells": int(len(faces)),
+        "edges": int(len(edges)),
+        "open_edges": open_edges,
+        "non_manifold_edges": non_manifold,
+        "inconsistent_normals": inconsistent,
+        "duplicate_faces": count_duplicate_faces(faces),
+        "degenerate_faces": int(np.count_nonzero(_degenerate_mask(faces, tri, cross))),
+        "self_intersection_candidates": _self_intersection_candidates(faces, tri) if len(faces) > 1 else 0,
+        "is_watertight": is_watertight,
+        "area": area,
+        "volume": volume,
+        "bounds": bounds,
+        "dimensions": (bounds[1] - bounds[0], bounds[3] - bounds[2], bounds[5] - bounds[4]),
+    }
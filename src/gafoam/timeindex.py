@@ -0,0 +1,216 @@
+"""Índice dos diretórios de tempo de um caso.
+
+Módulo sem dependência de Qt. Lista os diretórios de tempo do caso (`0`,
+`0.1`, `1e-05`...) e, em casos decompostos, os de cada `processor*`,
+ordenados pelo valor numérico e não pelo nome. O inventário de campos de
+cada diretório de tempo só é lido quando pedido e fica memorizado
+enquanto a data de modificação do diretório não muda; `update` revalida
+apenas o diretório que mudou, para ser chamado a partir dos eventos do
+`CaseWatcher`.
+"""
+
+import os
+import re
+from collections import namedtuple
+
+from gafoam.foamdict import strip_compressed_suffix
+
+RE_TIME_NAME = re.compile(r"^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$")
+RE_PROCESSOR = re.compile(r"^processor(\d+)$")
+
+# `name` é o nome do diretório; `locations` lista onde ele existe: "" para a
+# raiz do caso e "processorN" para cada subdomínio.
+TimeEntry = namedtuple("TimeEntry", ["value", "name", "locations"])
+
+
+def time_value(name):
+    """Valor numérico de um nome de diretório de tempo, ou None se não for um."""
+    if not RE_TIME_NAME.match(name):
+        return None
+    return float(name)
+
+
+def _subdirs(path):
+    try:
+        with os.scandir(path) as it:
+            return [e.name for e in it if not e.name.startswith(".") and e.is_dir()]
+    except OSError:
+        return []
+
+
+def _time_names(path):
+    """`{nome: valor}` dos diretórios de tempo em `path`."""
+    names = {}
+    for name in _subdirs(path):
+        value = time_value(name)
+        if value is not None:
+            names[name] = value
+    return names
+
+
+def field_inventory(time_dir):
+    """Nomes dos campos de um diretório de tempo, em ordem alfabética.
+
+    Arquivos comprimidos (`U.gz`) aparecem pelo nome original; subdiretórios
+    (`uniform`, `polyMesh`) e arquivos ocultos são ignorados.
+    """
+    fields = set()
+    try:
+        with os.scandir(time_dir) as it:
+            for entry in it:
+                if not entry.name.startswith(".") and entry.is_file():
+                    fields.add(strip_compressed_suffix(entry.name))
+    except OSError:
+        return []
+    return sorted(fields)
+
+
+def _mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class TimeIndex:
+    """Diretórios de tempo de um caso e o inventário de campos de cada um."""
+
+    def __init__(self, case_path=None):
+        self.case_path = None
+        self.processors = []
+        self._times = {}
+        self._inventory = {}
+        if case_path:
+            self.scan(case_path)
+
+    def scan(self, case_path):
+        """Relista tudo a partir de `case_path`, descartando os inventários memorizados."""
+        self.case_path = case_path
+        self._inventory = {}
+        self._list_root()
+
+    def _location_path(self, location):
+        return os.path.join(self.case_path, location) if location else self.case_path
+
+    def _list_root(self):
+        root_dirs = _subdirs(self.case_path) if self.case_path else []
+        self.processors = sorted(
+            (name for name in root_dirs if RE_PROCESSOR.match(name)),
+            key=lambda name: int(RE_PROCESSOR.match(name).group(1)),
+        )
+        self._times = {}
+        self._add_location("")
+        for processor in self.processors:
+            self._add_location(processor)
+
+    def _add_location(self, location):
+        for name, value in _time_names(self._location_path(location)).items():
+            self._times.setdefault(name, (value, []))[1].append(location)
+
+    def _drop_location(self, location):
+        for name in list(self._times):
+            locations = self._times[name][1]
+            if location in locations:
+                locations.remove(location)
+                if not locations:
+                    del self._times[name]
+
+    def times(self):
+        """`TimeEntry` de todos os tempos, em ordem numérica crescente."""
+        entries = [TimeEntry(value, name, self._sorted_locations(locations))
+                   for name, (value, locations) in self._times.items()]
+        entries.sort(key=lambda entry: (entry.value, entry.name))
+        return entries
+
+    def _sorted_locations(self, locations):
+        order = {name: i for i, name in enumerate([""] + self.processors)}
+        return sorted(locations, key=lambda location: order.get(location, len(order)))
+
+    def latest_time(self):
+        entries = self.times()
+        return entries[-1] if entries else None
+
+    def time_dirs(self, name):
+        """Caminhos do diretório de tempo `name` na raiz e em cada subdomínio."""
+        if name not in self._times:
+            return []
+        return [os.path.join(self._location_path(location), name)
+                for location in self._sorted_locations(self._times[name][1])]
+
+    def _inventory_of(self, time_dir):
+        # Um `stat` por leitura: o tempo que o solver ainda escreve não é observado.
+        mtime = _mtime_ns(time_dir)
+        cached = self._inventory.get(time_dir)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, field_inventory(time_dir))
+            self._inventory[time_dir] = cached
+        return cached[1]
+
+    def fields(self, name):
+        """Campos presentes no tempo `name`, em qualquer um dos locais."""
+        fields = set()
+        for time_dir in self.time_dirs(name):
+            fields.update(self._inventory_of(time_dir))
+        return sorted(fields)
+
+    def field_paths(self, name, field):
+        """Arquivos do campo `field` no tempo `name`, na raiz primeiro."""
+        paths = []
+        for time_dir in self.time_dirs(name):
+            if field in self._inventory_of(time_dir):
+                path = os.path.join(time_dir, field)
+                paths.append(path if os.path.exists(path) else path + ".gz")
+        return paths
+
+    def update(self, dir_path):
+        """Revalida o índice após uma mudança em `dir_path`.
+
+        Só o diretório afetado é relido: a raiz do caso tem seus tempos
+        relistados, e uma mudança em um `processor*` relista os tempos de
+        todos os subdomínios; um diretório de tempo tem o inventário
+        descartado se a data de modificação mudou. Devolve `(tempos_mudaram,
+        nomes)`: se a lista de tempos mudou e quais tempos tiveram o
+        inventário revalidado.
+        """
+        if not self.case_path:
+            return False, set()
+        rel = os.path.relpath(os.path.abspath(dir_path), os.path.abspath(self.case_path))
+        if rel.startswith(".."):
+            return False, set()
+        parts = [] if rel == "." else rel.split(os.sep)
+
+        if not parts:
+            before = set(self._times), list(self.processors)
+            self._list_root()
+            self._forget_missing()
+            return (set(self._times), self.processors) != before, set()
+
+        location = parts[0] if RE_PROCESSOR.match(parts[0]) else ""
+        parts = parts[1:] if location else parts
+        if not parts:
+            # Só `processor0` costuma ser observado, mas os subdomínios escrevem
+            # os mesmos tempos: a mudança em um deles relista todos.
+            before = {name: list(locations) for name, (_, locations) in self._times.items()}
+            for processor in self.processors:
+                self._drop_location(processor)
+                self._add_location(processor)
+            self._forget_missing()
+            after = {name: locations for name, (_, locations) in self._times.items()}
+            return after != before, set()
+
+        # Só o próprio diretório de tempo guarda os campos; `uniform/` e afins
+        # não alteram o inventário.
+        name = parts[0]
+        if len(parts) != 1 or name not in self._times:
+            return False, set()
+        time_dir = os.path.join(self._location_path(location), name)
+        cached = self._inventory.get(time_dir)
+        if cached is not None and cached[0] != _mtime_ns(time_dir):
+            del self._inventory[time_dir]
+        return False, {name}
+
+    def _forget_missing(self):
+        valid = {path for name in self._times for path in self.time_dirs(name)}
+        for time_dir in list(self._inventory):
+            if time_dir not in valid:
+                del self._inventory[time_dir]
@@ -1,11 +1,13 @@
 """Configuração comum dos testes.
 
 O Qt roda em modo offscreen para que os testes de interface não exijam
-servidor gráfico.
+servidor gráfico. `cabecalho` e `fileira_de_hexaedros` são compartilhados
+pelos testes dos leitores de malha e de campos (`from conftest import ...`).
 """
 
 import os
 
+import numpy as np
 import pytest
 
 os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
@@ -99,6 +101,35 @@ relaxationFactors
 """
 
 
+def cabecalho(classe, formato="ascii"):
+    """Cabeçalho `FoamFile` de um arquivo de malha ou de campo, em bytes."""
+    return (
+        f'FoamFile\n{{\n    format {formato};\n    arch "LSB;label=32;scalar=64";\n'
+        f"    class {classe};\n    object x;\n}}\n// * * * * * * //\n\n"
+    ).encode()
+
+
+def fileira_de_hexaedros(n):
+    """`n` células unitárias em fila ao longo de x, com todas as faces de contorno no fim."""
+    from gafoam import polymesh
+
+    pontos = np.array([(x, y, z) for x in range(n + 1) for y, z in ((0, 0), (1, 0), (1, 1), (0, 1))], dtype=float)
+    faces, donos, vizinhos = [], [], []
+    for celula in range(n - 1):
+        b = 4 * (celula + 1)
+        faces.append([b, b + 1, b + 2, b + 3])
+        donos.append(celula)
+        vizinhos.append(celula + 1)
+    faces += [[0, 3, 2, 1], [4 * n, 4 * n + 1, 4 * n + 2, 4 * n + 3]]
+    donos += [0, n - 1]
+    for celula in range(n):
+        a, b = 4 * celula, 4 * (celula + 1)
+        faces += [[a, b, b + 3, a + 3], [a + 1, a + 2, b + 2, b + 1], [a, a + 1, b + 1, b], [a + 3, b + 3, b + 2, a + 2]]
+        donos += [celula] * 4
+    offsets = np.arange(0, 4 * len(faces) + 1, 4)
+    return polymesh.PolyMesh(pontos, offsets, np.ravel(faces), np.array(donos), np.array(vizinhos), [])
+
+
 @pytest.fixture
 def case_dir(tmp_path):
     """Caso OpenFOAM mínimo, com controlDict e fvSolution preenchidos."""
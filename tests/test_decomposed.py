@@ -0,0 +1,143 @@
+"""Testes da leitura de casos decompostos com costura em memória."""
+
+import numpy as np
+import pytest
+
+from gafoam import decomposed
+
+# Dois hexaedros em fileira (x de 0 a 2), um por subdomínio. Numeração global
+# dos pontos: i + 3*j + 6*k para o ponto (i, j, k); faces globais: 0 interna
+# (x=1), 1 entrada, 2 saída, 3-6 paredes da célula 1, 7-10 paredes da célula 0.
+PONTOS = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)]
+X0, X1 = (0, 4, 7, 3), (1, 2, 6, 5)
+PAREDES = [(0, 1, 5, 4), (3, 7, 6, 2), (0, 3, 2, 1), (4, 5, 6, 7)]
+
+BOUNDARY = """\
+FoamFile {{ format ascii; class polyBoundaryMesh; object boundary; }}
+4
+(
+    inlet  {{ type patch; nFaces {n_in}; startFace 0; }}
+    outlet {{ type patch; nFaces {n_out}; startFace {n_in}; }}
+    walls  {{ type wall; nFaces 4; startFace 1; }}
+    {proc} {{ type processor; nFaces 1; startFace 5; myProcNo {me}; neighbProcNo {other}; }}
+)
+"""
+
+CAMPO = """\
+FoamFile {{ format ascii; class volScalarField; object p; }}
+dimensions [0 2 -2 0 0 0 0];
+internalField uniform {interno};
+boundaryField
+{{
+    inlet {{ type fixedValue; value uniform 5; }}
+    outlet {{ type zeroGradient; }}
+    walls {{ type zeroGradient; }}
+    "procBoundary.*" {{ type processor; value uniform {interno}; }}
+}}
+"""
+
+
+def _lista(valores):
+    return f"FoamFile {{ format ascii; class labelList; object x; }}\n{len(valores)}\n(\n{' '.join(map(str, valores))}\n)\n"
+
+
+def _escreve_subdominio(caso, me):
+    proc = caso / f"processor{me}"
+    malha = proc / "constant" / "polyMesh"
+    malha.mkdir(parents=True)
+    pontos = np.array(PONTOS, dtype=float) + [me, 0, 0]
+    (malha / "points").write_text(
+        "FoamFile { format ascii; class vectorField; object points; }\n8\n(\n"
+        + "".join(f"({x} {y} {z})\n" for x, y, z in pontos) + ")\n")
+    # Local: contorno real (entrada ou saída), paredes e a face entre subdomínios.
+    faces = [X0 if me == 0 else X1] + PAREDES + [X1 if me == 0 else X0]
+    (malha / "faces").write_text(
+        "FoamFile { format ascii; class faceList; object faces; }\n6\n(\n"
+        + "".join(f"4({a} {b} {c} {d})\n" for a, b, c, d in faces) + ")\n")
+    (malha / "owner").write_text(_lista([0] * 6))
+    (malha / "neighbour").write_text(_lista([]))
+    (malha / "boundary").write_text(BOUNDARY.format(
+        n_in=1 - me, n_out=me, proc=f"procBoundary{me}to{1 - me}", me=me, other=1 - me))
+    # 1-based e com sinal: a face interna aponta para fora da célula 1, ao contrário da global.
+    paredes = [8, 9, 10, 11] if me == 0 else [4, 5, 6, 7]
+    (malha / "faceProcAddressing").write_text(_lista([2 if me == 0 else 3] + paredes + [1 if me == 0 else -1]))
+    globais = [int(x) + 3 * int(y) + 6 * int(z) for x, y, z in pontos]
+    (malha / "pointProcAddressing").write_text(_lista(globais))
+
+    tempo = proc / "0.5"
+    tempo.mkdir()
+    (tempo / "p").write_text(CAMPO.format(interno=me + 1))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_costura_patches_e_campo_de_subdominios(tmp_path, workers):
+    for me in (1, 0):
+        _escreve_subdominio(tmp_path, me)
+    (tmp_path / "processor10").mkdir()
+
+    assert [p.rsplit("/", 1)[1] for p in decomposed.processor_dirs(str(tmp_path))] == [
+        "processor0", "processor1", "processor10"]
+    assert not decomposed.is_decomposed(str(tmp_path))
+    (tmp_path / "processor10").rmdir()
+    assert decomposed.is_decomposed(str(tmp_path))
+
+    costurado = decomposed.read_decomposed_patches(str(tmp_path), "0.5", "p", max_workers=workers)
+
+    assert [(p["name"], p["type"], p["startFace"], p["nFaces"]) for p, *_ in costurado] == [
+        ("inlet", "patch", 1, 1), ("outlet", "patch", 2, 1), ("walls", "wall", 3, 8)]
+    por_nome = {p["name"]: (pontos, celulas, valores) for p, pontos, celulas, valores in costurado}
+
+    pontos, celulas, valores = por_nome["walls"]
+    # Os pontos em x=1 são compartilhados pelos dois subdomínios e aparecem uma vez só.
+    assert len(pontos) == 12
+    assert sorted(map(tuple, pontos)) == sorted({(x, y, z) for x in (0, 1, 2) for y in (0, 1) for z in (0, 1)})
+    faces = celulas.reshape(-1, 5)
+    assert (faces[:, 0] == 4).all()
+    centros_x = pontos[faces[:, 1:]].mean(axis=1)[:, 0]
+    # Ordem global: paredes da célula 1 (subdomínio 1) antes das da célula 0.
+    assert centros_x.tolist() == [1.5] * 4 + [0.5] * 4
+    assert valores.tolist() == [2] * 4 + [1] * 4
+
+    pontos, _, valores = por_nome["inlet"]
+    assert (pontos[:, 0] == 0).all() and valores.tolist() == [5]
+    pontos, _, valores = por_nome["outlet"]
+    assert (pontos[:, 0] == 2).all() and valores.tolist() == [2]
+
+
+def test_costura_guardada_e_campos_pelo_cache(tmp_path):
+    from gafoam import fieldio
+
+    for me in (0, 1):
+        _escreve_subdominio(tmp_path, me)
+    malha = decomposed.read_decomposed_mesh(str(tmp_path), max_workers=1)
+    cache = fieldio.FieldCache()
+
+    valores = malha.field_values("0.5", "p", source="cell", read_field=cache.get)
+    assert valores["walls"].tolist() == [2] * 4 + [1] * 4 and len(cache) == 2
+
+    # Só os arquivos do campo são relidos; a malha costurada continua valendo.
+    (tmp_path / "processor1" / "0.5" / "p").write_text(CAMPO.format(interno=17))
+    valores = malha.field_values("0.5", "p", source="cell", read_field=cache.get)
+    assert valores["walls"].tolist() == [17] * 4 + [1] * 4 and valores["outlet"].tolist() == [17]
+
+
+def test_campos_dos_subdominios_lidos_em_paralelo(tmp_path):
+    import threading
+
+    from gafoam import fieldio
+
+    for me in (0, 1):
+        _escreve_subdominio(tmp_path, me)
+    malha = decomposed.read_decomposed_mesh(str(tmp_path), max_workers=1)
+    barreira = threading.Barrier(2, timeout=5)
+    lidos = []
+
+    def le(caminho):
+        # Só passa da barreira se os dois subdomínios estiverem sendo lidos ao mesmo tempo.
+        barreira.wait()
+        lidos.append(caminho)
+        return fieldio.read_field(caminho)
+
+    valores = malha.field_values("0.5", "p", source="cell", read_field=le, max_workers=2)
+    assert valores["walls"].tolist() == [2] * 4 + [1] * 4
+    assert sorted(c.rsplit("/", 3)[1] for c in lidos) == ["processor0", "processor1"]
@@ -0,0 +1,74 @@
+"""Testes da medição de ocupação em disco, da projeção e da limpeza."""
+
+import gzip
+
+import pytest
+
+from gafoam import diskusage
+
+
+def _escreve(caminho, tamanho):
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    caminho.write_bytes(b"1 " * (tamanho // 2))
+
+
+@pytest.fixture
+def caso(tmp_path):
+    _escreve(tmp_path / "constant" / "polyMesh" / "points", 1000)
+    _escreve(tmp_path / "0" / "U", 100)
+    for tempo in ("0.1", "0.2", "0.3"):
+        _escreve(tmp_path / tempo / "U", 8000)
+        _escreve(tmp_path / tempo / "p", 4000)
+        _escreve(tmp_path / tempo / "uniform" / "time", 200)
+    for proc in ("processor0", "processor1"):
+        _escreve(tmp_path / proc / "constant" / "polyMesh" / "points", 600)
+        _escreve(tmp_path / proc / "0.3" / "U", 5000)
+    (tmp_path / "0.3" / "phi.gz").write_bytes(gzip.compress(b"0 " * 50))
+    return tmp_path
+
+
+def test_ocupacao_por_tempo_campo_e_processador(caso):
+    uso = diskusage.scan_usage(str(caso))
+
+    assert [(t.name, t.location) for t in uso.times] == [
+        ("0", ""), ("0.1", ""), ("0.2", ""), ("0.3", ""), ("0.3", "processor0"), ("0.3", "processor1")]
+    por_tempo = diskusage.bytes_per_time(uso)
+    fase = (caso / "0.3" / "phi.gz").stat().st_size
+    assert por_tempo == {"0": 100, "0.1": 12200, "0.2": 12200, "0.3": 12200 + fase + 10000}
+    por_campo = diskusage.bytes_per_field(uso)
+    assert list(por_campo)[:2] == ["U", "p"] and por_campo["U"] == 100 + 3 * 8000 + 10000
+    assert por_campo["uniform/"] == 600 and por_campo["phi"] == fase
+    assert diskusage.bytes_per_location(uso) == {"": 1000 + 100 + 3 * 12200 + fase, "processor0": 5600, "processor1": 5600}
+    assert diskusage.total_bytes(uso) == sum(por_tempo.values()) + 2200
+
+
+def test_projecao_da_saida(caso):
+    uso = diskusage.scan_usage(str(caso))
+    ultimo = diskusage.bytes_per_time(uso)["0.3"]
+
+    projecao = diskusage.project_output(uso, {"writeControl": "timeStep", "writeInterval": "10",
+                                               "deltaT": "0.01", "endTime": "1"})
+    assert projecao["interval"] == pytest.approx(0.1)
+    assert projecao["remaining_writes"] == 7 and projecao["bytes_per_write"] == ultimo
+    assert projecao["projected_bytes"] == 100 + 2 * 12200 + ultimo + 7 * ultimo
+
+    limitado = diskusage.project_output(uso, {"writeControl": "runTime", "writeInterval": "0.1",
+                                              "endTime": "1", "purgeWrite": "2"})
+    assert limitado["projected_bytes"] == 100 + 2 * ultimo
+    assert diskusage.project_output(uso, {"writeControl": "clockTime", "writeInterval": "60", "endTime": "1"}) is None
+
+
+def test_limpeza_e_compressao(caso):
+    uso = diskusage.scan_usage(str(caso))
+    assert diskusage.purge_candidates(uso, 1) == ["0.1", "0.2"]
+    assert diskusage.purge_candidates(uso, 5) == []
+
+    assert diskusage.purge_times(str(caso), ["0.1"]) == 12200
+    assert not (caso / "0.1").exists() and (caso / "0").exists()
+
+    economia = diskusage.compress_times(str(caso), ["0.3"])
+    assert economia > 0
+    # Campos pequenos demais e os já comprimidos ficam como estão.
+    assert sorted(p.name for p in (caso / "0.3").iterdir()) == ["U.gz", "p", "phi.gz", "uniform"]
+    assert not (caso / "processor0" / "0.3" / "U").exists()
+    assert gzip.decompress((caso / "0.3" / "U.gz").read_bytes()) == b"1 " * 4000
@@ -0,0 +1,107 @@
+"""Testes da leitura de campos e do cache LRU."""
+
+import gzip
+
+import numpy as np
+import pytest
+
+from gafoam import fieldio, polymesh
+from conftest import cabecalho
+
+DIMENSOES = b"dimensions [0 1 -1 0 0 0 0];\n\n"
+
+
+def _lista(tipo, valores, formato):
+    valores = np.asarray(valores, dtype=float)
+    n = len(valores)
+    if formato == "binary":
+        return f"nonuniform List<{tipo}> {n}(".encode() + valores.astype("<f8").tobytes() + b")"
+    if valores.ndim == 1:
+        corpo = " ".join(map(str, valores))
+    else:
+        corpo = " ".join("(" + " ".join(map(str, v)) + ")" for v in valores)
+    return f"nonuniform List<{tipo}> {n}\n(\n{corpo}\n)\n".encode()
+
+
+def _campo_vetorial(formato):
+    interno = [[1, 0, 0], [0, 2, 0], [3, 4, 0]]
+    return (
+        cabecalho("volVectorField", formato) + DIMENSOES + b"internalField " + _lista("vector", interno, formato) + b";\n\n"
+        b"boundaryField\n{\n"
+        b"    inlet\n    {\n        type fixedValue;\n        value uniform (5 0 0);\n    }\n"
+        b"    outlet\n    {\n        type inletOutlet;\n        inletValue uniform (0 0 0);\n"
+        b"        value " + _lista("vector", [[0, 0, 7], [0, 0, 8]], formato) + b";\n    }\n"
+        b"    // comentario\n"
+        b'    "(wall.*)"\n    {\n        type zeroGradient;\n        coded { code "#{ x; #}"; }\n    }\n'
+        b"}\n"
+    )
+
+
+@pytest.mark.parametrize("formato", ["ascii", "binary"])
+def test_leitura_de_campo_vetorial(tmp_path, formato):
+    caminho = tmp_path / "U"
+    caminho.write_bytes(_campo_vetorial(formato))
+
+    campo = fieldio.read_field(str(caminho))
+
+    assert campo.cls == "volVectorField" and campo.dimensions == "[0 1 -1 0 0 0 0]"
+    assert campo.internal.shape == (3, 3) and campo.internal[2].tolist() == [3, 4, 0]
+    assert campo.boundary["inlet"]["value"] == fieldio.Uniform(pytest.approx([5, 0, 0]))
+    assert campo.boundary["outlet"]["value"][:, 2].tolist() == [7, 8]
+    assert campo.boundary['"(wall.*)"']["type"] == "zeroGradient"
+    assert fieldio.boundary_entry(campo, "wallTop") is campo.boundary['"(wall.*)"']
+
+
+def test_valores_nas_faces_do_patch_com_recurso_a_celula_dona(tmp_path):
+    caminho = tmp_path / "U.gz"
+    caminho.write_bytes(gzip.compress(_campo_vetorial("ascii")))
+    campo = fieldio.read_field(str(tmp_path / "U"))
+    malha = polymesh.PolyMesh(np.zeros((0, 3)), np.array([0]), np.array([]), np.array([0, 1, 2, 2]), np.array([]), [])
+    patches = [
+        {"name": "inlet", "startFace": 0, "nFaces": 1},
+        {"name": "outlet", "startFace": 1, "nFaces": 2},
+        {"name": "wallTop", "startFace": 3, "nFaces": 1},
+    ]
+
+    entrada, saida, parede = (fieldio.patch_face_values(malha, campo, p) for p in patches)
+
+    assert entrada.tolist() == [[5, 0, 0]]
+    assert fieldio.component(saida, 2).tolist() == [7, 8]
+    # Sem `value`, a parede usa a célula dona (a terceira).
+    assert fieldio.component(parede).tolist() == [5.0]
+    assert fieldio.patch_face_values(malha, campo, patches[1], source="cell")[:, 1].tolist() == [2, 4]
+
+
+def test_cache_despeja_o_menos_usado(tmp_path):
+    caminhos = []
+    for nome in ("a", "b", "c"):
+        caminho = tmp_path / nome
+        caminho.write_bytes(
+            cabecalho("volScalarField") + DIMENSOES + b"internalField " + _lista("scalar", np.arange(100), "ascii")
+            + b";\nboundaryField\n{\n}\n"
+        )
+        caminhos.append(str(caminho))
+    cache = fieldio.FieldCache(max_bytes=2 * 800)
+
+    a = cache.get(caminhos[0])
+    cache.get(caminhos[1])
+    assert cache.get(caminhos[0]) is a
+    cache.get(caminhos[2])
+
+    assert len(cache) == 2 and cache.nbytes == 1600
+    # `b` foi o menos usado e saiu; `a` continua memorizado.
+    assert cache.get(caminhos[0]) is a
+
+
+def test_campo_binario_sobrevive_a_reescrita_do_arquivo(tmp_path):
+    caminho = tmp_path / "p"
+    caminho.write_bytes(
+        cabecalho("volScalarField", "binary") + DIMENSOES + b"internalField " + _lista("scalar", np.arange(1000), "binary")
+        + b";\nboundaryField\n{\n    inlet { type fixedValue; value " + _lista("scalar", [7, 8], "binary") + b"; }\n}\n"
+    )
+    campo = fieldio.FieldCache().get(str(caminho))
+
+    # O solver reescreve o campo: o arquivo é truncado antes do novo conteúdo.
+    caminho.write_bytes(b"")
+    assert campo.internal.sum() == sum(range(1000))
+    assert campo.boundary["inlet"]["value"].tolist() == [7, 8]
@@ -1,5 +1,9 @@
 """Testes de leitura e escrita dos dicionários do caso."""
 
+import gzip
+import os
+import stat
+
 import pytest
 
 from gafoam import foamdict
@@ -319,3 +323,299 @@ def test_transport_properties_read_and_write(tmp_path):
     assert float(data_up["rho"]) == pytest.approx(1.2)
 
 
+def test_campos_comprimidos_sao_listados_sem_sufixo(case_dir):
+    import gzip
+
+    with gzip.open(case_dir / "0" / "U.gz", "wt", encoding="utf-8") as fh:
+        fh.write("/* U */")
+    (case_dir / "0" / "p").write_text("/* p */", encoding="utf-8")
+
+    assert foamdict.list_field_files(str(case_dir)) == ["U", "p"]
+
+
+def test_boundary_field_comprimido_le_e_grava(tmp_path):
+    import gzip
+
+    conteudo = """FoamFile
+{
+    format      ascii;
+    class       volScalarField;
+    object      p;
+}
+dimensions      [0 2 -2 0 0 0 0];
+internalField   nonuniform List<scalar> 3 (1 2 3);
+
+boundaryField
+{
+    outlet
+    {
+        type            fixedValue;
+        value           uniform 0;
+    }
+}
+"""
+    gz_file = tmp_path / "p.gz"
+    with gzip.open(gz_file, "wt", encoding="utf-8") as fh:
+        fh.write(conteudo)
+
+    # O leitor aceita o nome sem sufixo, como o OpenFOAM.
+    bcs = foamdict.read_boundary_field(str(tmp_path / "p"))
+    assert bcs == {"outlet": {"type": "fixedValue", "value": "uniform 0"}}
+
+    bcs["outlet"]["value"] = "uniform 5"
+    assert foamdict.write_boundary_field(str(tmp_path / "p"), bcs)
+
+    assert not (tmp_path / "p").exists()
+    with gzip.open(gz_file, "rt", encoding="utf-8") as fh:
+        regravado = fh.read()
+    assert "nonuniform List<scalar> 3 (1 2 3);" in regravado
+    assert foamdict.read_boundary_field(str(gz_file))["outlet"]["value"] == "uniform 5"
+
+
+def test_verify_case_aceita_malha_comprimida(case_dir):
+    import gzip
+
+    (case_dir / "system" / "fvSchemes").write_text("/* fvSchemes */", encoding="utf-8")
+    poly_mesh = case_dir / "constant" / "polyMesh"
+    poly_mesh.mkdir(parents=True)
+    with gzip.open(poly_mesh / "points.gz", "wt", encoding="utf-8") as fh:
+        fh.write("/* points */")
+
+    is_valid, issues, _ = foamdict.verify_case(str(case_dir))
+    assert is_valid is True
+    assert issues == []
+
+
+def test_cabecalho_do_campo_pula_lista_ascii(tmp_path):
+    n = 5000
+    valores = "(1 2 3)\n" * n
+    (tmp_path / "U").write_text(
+        "FoamFile\n{\n    format ascii;\n    class volVectorField;\n    object U;\n}\n"
+        "dimensions [0 1 -1 0 0 0 0];\n\n"
+        f"internalField nonuniform List<vector>\n{n}\n(\n{valores})\n;\n\n"
+        "boundaryField\n{\n    inlet\n    {\n        type fixedValue;\n"
+        "        value uniform (1 0 0);\n    }\n}\n",
+        encoding="utf-8",
+    )
+
+    header = foamdict.read_field_header(str(tmp_path / "U"))
+
+    assert header["class"] == "volVectorField"
+    assert header["dimensions"] == "[0 1 -1 0 0 0 0]"
+    assert header["internalField"] == f"nonuniform List<vector> {n}"
+    assert header["n_values"] == n
+    assert foamdict.read_boundary_field(str(tmp_path / "U")) == {
+        "inlet": {"type": "fixedValue", "value": "uniform (1 0 0)"}
+    }
+
+
+@pytest.mark.parametrize("enchimento", range(0, 32, 5))
+def test_valor_uniforme_cruzando_fronteira_de_bloco(tmp_path, enchimento):
+    import io
+
+    conteudo = (
+        "FoamFile\n{\n    format ascii;\n    class volVectorField;\n    object U;\n}\n"
+        + "// " + "x" * (70000 + enchimento) + "\n"
+        "internalField   uniform (1.5 -2.25 3.125e-07);\n\nboundaryField\n{\n}\n"
+    ).encode()
+
+    # O cabeçalho passa dos 64 KiB lidos de uma vez e os blocos são pequenos:
+    # o valor atravessa várias fronteiras de leitura.
+    layout = foamdict._scan_field_layout(foamdict._ByteStream(io.BytesIO(conteudo), chunk_size=16))
+    assert layout["internalField"] == "uniform (1.5 -2.25 3.125e-07)"
+    assert layout["boundary_offset"] == conteudo.index(b"boundaryField")
+
+    (tmp_path / "U").write_bytes(conteudo)
+    assert foamdict.read_field_header(str(tmp_path / "U"))["internalField"] == "uniform (1.5 -2.25 3.125e-07)"
+
+
+def test_lista_binaria_e_pulada_pelo_tamanho(tmp_path):
+    import struct
+
+    # O payload binário contém a palavra-chave de propósito: o leitor deve
+    # pular os bytes pela contagem, e não procurar texto dentro deles.
+    payload = b"boundaryField{ }".ljust(24, b"\0")
+    conteudo = (
+        b'FoamFile\n{\n    format binary;\n    class volScalarField;\n'
+        b'    arch "LSB;label=32;scalar=64";\n    object p;\n}\n'
+        b"internalField nonuniform List<scalar> 3\n(" + payload + b")\n;\n"
+        b"boundaryField\n{\n    outlet\n    {\n        type zeroGradient;\n    }\n}\n"
+    )
+    assert len(payload) == 3 * struct.calcsize("d")
+    (tmp_path / "p").write_bytes(conteudo)
+
+    header = foamdict.read_field_header(str(tmp_path / "p"))
+    assert header["format"] == "binary"
+    assert header["arch"] == "LSB;label=32;scalar=64"
+    assert foamdict.read_boundary_field(str(tmp_path / "p")) == {"outlet": {"type": "zeroGradient"}}
+
+    assert foamdict.write_boundary_field(str(tmp_path / "p"), {"outlet": {"type": "fixedValue", "value": "uniform 1"}})
+    regravado = (tmp_path / "p").read_bytes()
+    assert regravado.startswith(conteudo[: conteudo.index(b"boundaryField\n")])
+    assert foamdict.read_boundary_field(str(tmp_path / "p"))["outlet"]["value"] == "uniform 1"
+
+
+def test_gravacao_atomica_preserva_permissoes_sem_temporarios(case_dir):
+    dict_path = case_dir / "system" / "controlDict"
+    os.chmod(dict_path, 0o640)
+
+    assert foamdict.write_control_dict(str(case_dir), {"endTime": "900"})
+
+    assert stat.S_IMODE(os.stat(dict_path).st_mode) == 0o640
+    assert sorted(os.listdir(case_dir / "system")) == ["controlDict", "fvSolution"]
+
+    # Um arquivo novo segue a umask do processo, como um `open(path, "w")`.
+    anterior = os.umask(0o027)
+    try:
+        novo = case_dir / "system" / "decomposeParDict"
+        foamdict.write_foam_text(str(novo), "numberOfSubdomains 2;\n")
+    finally:
+        os.umask(anterior)
+    assert stat.S_IMODE(os.stat(novo).st_mode) == 0o640
+
+
+def test_transacao_grava_tudo_apenas_na_saida(case_dir):
+    dict_path = case_dir / "system" / "controlDict"
+    original = dict_path.read_text(encoding="utf-8")
+
+    with foamdict.CaseTransaction() as transacao:
+        foamdict.write_control_dict(str(case_dir), {"endTime": "700"})
+        foamdict.write_control_dict(str(case_dir), {"deltaT": "0.5"})
+        # Leituras dentro da transação enxergam o que já foi registrado.
+        assert foamdict.read_control_dict(str(case_dir))["endTime"] == "700"
+        assert dict_path.read_text(encoding="utf-8") == original
+
+    params = foamdict.read_control_dict(str(case_dir))
+    assert (params["endTime"], params["deltaT"]) == ("700", "0.5")
+    assert transacao.committed == [str(dict_path)]
+
+
+def test_transacao_com_erro_nao_grava_nada(case_dir):
+    dict_path = case_dir / "system" / "controlDict"
+    original = dict_path.read_text(encoding="utf-8")
+
+    with pytest.raises(RuntimeError):
+        with foamdict.CaseTransaction():
+            foamdict.write_control_dict(str(case_dir), {"endTime": "700"})
+            raise RuntimeError("falha no meio do salvamento")
+
+    assert dict_path.read_text(encoding="utf-8") == original
+
+
+BOUNDARY = """\
+FoamFile
+{
+    format      ascii;
+    class       polyBoundaryMesh;
+    object      boundary;
+}
+3
+(
+    inlet
+    {
+        type            patch;
+        nFaces          10;
+        startFace       100;
+    }
+    bottomWall
+    {
+        type            wall;
+        inGroups        1(wall);
+        nFaces          20;
+        startFace       110;
+    }
+    frontAndBack
+    {
+        type            empty;
+        nFaces          40;
+        startFace       130;
+    }
+)
+"""
+
+
+def _caso_com_malha(case_dir):
+    (case_dir / "system" / "fvSchemes").write_text("/* fvSchemes */", encoding="utf-8")
+    poly_mesh = case_dir / "constant" / "polyMesh"
+    poly_mesh.mkdir(parents=True)
+    (poly_mesh / "boundary").write_text(BOUNDARY, encoding="utf-8")
+    return case_dir
+
+
+def test_patches_da_malha(case_dir):
+    patches = foamdict.read_mesh_patches(str(_caso_com_malha(case_dir)))
+
+    assert list(patches) == ["inlet", "bottomWall", "frontAndBack"]
+    assert patches["bottomWall"]["type"] == "wall"
+
+
+def test_verificacao_profunda_aponta_patches_dimensoes_e_stl(case_dir):
+    _caso_com_malha(case_dir)
+    (case_dir / "0" / "U").write_text(
+        "dimensions [0 1 -1 0 0 0 0];\ninternalField uniform (0 0 0);\n"
+        "boundaryField\n{\n    inlet { type fixedValue; value uniform (1 0 0); }\n"
+        "    wall { type noSlip; }\n}\n",
+        encoding="utf-8",
+    )
+    (case_dir / "0" / "p").write_text(
+        "dimensions [0 1 0 0 0 0 0];\ninternalField uniform 0;\n"
+        'boundaryField\n{\n    ".*" { type zeroGradient; }\n}\n',
+        encoding="utf-8",
+    )
+    (case_dir / "system" / "decomposeParDict").write_text("numberOfSubdomains 4;\n", encoding="utf-8")
+    (case_dir / "processor0").mkdir()
+    (case_dir / "processor1").mkdir()
+    (case_dir / "system" / "snappyHexMeshDict").write_text(
+        "geometry\n{\n    carro.stl { type triSurfaceMesh; name carro; }\n}\n", encoding="utf-8"
+    )
+
+    is_valid, issues, warnings = foamdict.verify_case(str(case_dir), deep=True)
+
+    assert not is_valid
+    # O grupo `wall` cobre bottomWall; o patch empty não tem entrada em U.
+    assert issues == ["Field '0/U' has no boundaryField entry for patch(es): frontAndBack"]
+    assert any("'0/p' has dimensions [0 1 0 0 0 0 0]" in w for w in warnings)
+    assert any("numberOfSubdomains is 4" in w for w in warnings)
+    assert any("carro.stl" in w and "'constant/geometry'" in w for w in warnings)
+
+
+def test_verificacao_profunda_reaproveita_resultados(case_dir, monkeypatch):
+    _caso_com_malha(case_dir)
+    (case_dir / "0" / "T").write_text(
+        'dimensions [0 0 0 1 0 0 0];\ninternalField uniform 300;\nboundaryField\n{\n    ".*" { type zeroGradient; }\n}\n',
+        encoding="utf-8",
+    )
+    primeiro = foamdict.deep_verify_case(str(case_dir))
+
+    def falha(*_args, **_kwargs):
+        raise AssertionError("arquivo inalterado não deveria ser relido")
+
+    monkeypatch.setattr(foamdict, "read_boundary_field", falha)
+    monkeypatch.setattr(foamdict, "read_field_header", falha)
+    assert foamdict.deep_verify_case(str(case_dir)) == primeiro == ([], [])
+
+
+def test_verificacao_profunda_acompanha_arquivos_incluidos(case_dir):
+    _caso_com_malha(case_dir)
+    (case_dir / "0" / "include").mkdir()
+    incluido = case_dir / "0" / "include" / "contornos"
+    incluido.write_text("inlet { type fixedValue; value uniform (1 0 0); }\n", encoding="utf-8")
+    (case_dir / "0" / "U").write_text(
+        "dimensions [0 1 -1 0 0 0 0];\ninternalField uniform (0 0 0);\n"
+        'boundaryField\n{\n    #include "include/contornos"\n    wall { type noSlip; }\n}\n',
+        encoding="utf-8",
+    )
+    geometria = case_dir / "system" / "geometria"
+    geometria.write_text("carro.stl { type triSurfaceMesh; name carro; }\n", encoding="utf-8")
+    with gzip.open(case_dir / "system" / "snappyHexMeshDict.gz", "wt", encoding="utf-8") as fh:
+        fh.write('geometry\n{\n    #include "geometria"\n}\n')
+
+    issues, warnings = foamdict.deep_verify_case(str(case_dir))
+    assert issues == ["Field '0/U' has no boundaryField entry for patch(es): frontAndBack"]
+    assert any("carro.stl" in w for w in warnings)
+
+    # Só os arquivos incluídos mudam; o resultado memorizado não pode ser reaproveitado.
+    incluido.write_text(
+        "inlet { type fixedValue; value uniform (1 0 0); }\nfrontAndBack { type empty; }\n", encoding="utf-8")
+    geometria.write_text("", encoding="utf-8")
+    assert foamdict.deep_verify_case(str(case_dir)) == ([], [])
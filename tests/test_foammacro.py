@@ -0,0 +1,113 @@
+"""Testes da expansão de `#include` e macros `$`."""
+
+import os
+
+import pytest
+
+from gafoam import foamdict, foammacro
+
+
+def test_macros_de_escopo_local_externo_e_absoluto():
+    texto = """
+    velocidade  (10 0 0);
+    internalField uniform $velocidade;
+    geral { valor 3; }
+    bloco
+    {
+        local   $valor;
+        pai     $..velocidade;
+        absoluto $:geral.valor;
+        chaves  ${geral.valor};
+    }
+    """
+    valores = foammacro.expand_text(texto, ".")
+
+    assert valores["internalField"] == "uniform (10 0 0)"
+    assert valores["bloco"]["pai"] == "(10 0 0)"
+    assert valores["bloco"]["absoluto"] == "3"
+    assert valores["bloco"]["chaves"] == "3"
+    # Sem definição visível a macro permanece como escrita.
+    assert valores["bloco"]["local"] == "$valor"
+
+
+def test_referencia_isolada_mescla_subdicionario():
+    texto = "parede { type noSlip; } topo { $parede; value uniform 0; }"
+    valores = foammacro.expand_text(texto, ".")
+
+    assert valores["topo"] == {"type": "noSlip", "value": "uniform 0"}
+
+
+def test_include_relativo_e_arquivo_analisado_uma_vez(tmp_path):
+    (tmp_path / "system").mkdir()
+    (tmp_path / "system" / "comum").write_text("nu 1e-05;\n", encoding="utf-8")
+    for nome in ("a", "b"):
+        (tmp_path / "system" / nome).write_text(
+            '#include "comum"\nvalor $nu;\n', encoding="utf-8"
+        )
+
+    assert foammacro.expand_file(str(tmp_path / "system" / "a"))["valor"] == "1e-05"
+    arvore = foammacro.parse_file(str(tmp_path / "system" / "comum"))
+    assert foammacro.expand_file(str(tmp_path / "system" / "b"))["valor"] == "1e-05"
+    assert foammacro.parse_file(str(tmp_path / "system" / "comum")) is arvore
+
+
+def test_cache_de_arvores_despeja_o_menos_usado(tmp_path, monkeypatch):
+    monkeypatch.setattr(foammacro, "_PARSE_CACHE", foammacro._LRUCache(max_entries=2))
+    caminhos = []
+    for nome in ("a", "b", "c"):
+        (tmp_path / nome).write_text(f"{nome} 1;\n", encoding="utf-8")
+        caminhos.append(str(tmp_path / nome))
+
+    arvore_a = foammacro.parse_file(caminhos[0])
+    foammacro.parse_file(caminhos[1])
+    assert foammacro.parse_file(caminhos[0]) is arvore_a
+    foammacro.parse_file(caminhos[2])
+
+    assert len(foammacro._PARSE_CACHE) == 2
+    assert foammacro.parse_file(caminhos[0]) is arvore_a
+    assert foammacro._PARSE_CACHE.get(os.path.realpath(caminhos[1])) is None
+
+
+def test_inclusao_circular_e_detectada(tmp_path):
+    (tmp_path / "a").write_text('#include "b"\n', encoding="utf-8")
+    (tmp_path / "b").write_text('#include "a"\n', encoding="utf-8")
+
+    with pytest.raises(foammacro.IncludeCycleError):
+        foammacro.expand_file(str(tmp_path / "a"))
+
+
+def test_include_if_present_ausente_e_ignorado(tmp_path):
+    (tmp_path / "d").write_text('#includeIfPresent "faltando"\nx 1;\n', encoding="utf-8")
+
+    assert foammacro.expand_file(str(tmp_path / "d")) == {"x": "1"}
+
+
+def test_control_dict_resolve_macros(case_dir):
+    (case_dir / "system" / "controlDict").write_text(
+        "tempoFinal 200;\nendTime $tempoFinal;\ndeltaT 0.5;\n", encoding="utf-8"
+    )
+
+    assert foamdict.read_control_dict(str(case_dir))["endTime"] == "200"
+
+
+def test_boundary_field_resolve_includes_e_macros(case_dir):
+    (case_dir / "0" / "include").mkdir()
+    (case_dir / "0" / "include" / "initialConditions").write_text(
+        "flowVelocity (10 0 0);\n", encoding="utf-8"
+    )
+    (case_dir / "0" / "U").write_text(
+        '#include "include/initialConditions"\n'
+        "dimensions [0 1 -1 0 0 0 0];\n"
+        "internalField uniform $flowVelocity;\n"
+        "boundaryField\n{\n"
+        "    inlet\n    {\n        type fixedValue;\n        value $internalField;\n    }\n"
+        '    ".*Wall"\n    {\n        type noSlip;\n    }\n'
+        "}\n",
+        encoding="utf-8",
+    )
+    caminho = str(case_dir / "0" / "U")
+
+    expandido = foamdict.read_boundary_field(caminho)
+    assert expandido["inlet"]["value"] == "uniform (10 0 0)"
+    assert expandido['".*Wall"'] == {"type": "noSlip"}
+    assert foamdict.read_boundary_field(caminho, expand=False)["inlet"]["value"] == "$internalField"
@@ -0,0 +1,53 @@
+"""Testes do cache em disco de geometrias."""
+
+import os
+
+import numpy as np
+
+from gafoam import geomcache
+
+
+def _fonte(tmp_path, conteudo="solid x\nendsolid x\n"):
+    fonte = tmp_path / "peca.stl"
+    fonte.write_text(conteudo, encoding="utf-8")
+    return str(fonte)
+
+
+def test_entrada_gravada_e_relida(tmp_path):
+    fonte = _fonte(tmp_path)
+    cache = str(tmp_path / "cache")
+    pontos = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]], dtype=np.float32)
+    faces = np.array([3, 0, 1, 2])
+    metricas = {"is_watertight": np.bool_(False), "bounds": (0.0, 1.0, 0.0, 1.0, 0.0, 0.0)}
+
+    assert geomcache.store(cache, fonte, pontos, faces, np.array([0]), ["x"], metricas)
+    entrada = geomcache.load(cache, fonte)
+
+    np.testing.assert_array_equal(entrada["points"], pontos)
+    np.testing.assert_array_equal(entrada["faces"], faces)
+    assert entrada["patch_ids"].tolist() == [0]
+    assert entrada["patch_names"] == ["x"]
+    assert entrada["metrics"] == {"is_watertight": False, "bounds": [0.0, 1.0, 0.0, 1.0, 0.0, 0.0]}
+
+
+def test_entrada_invalida_quando_arquivo_muda(tmp_path):
+    fonte = _fonte(tmp_path)
+    cache = str(tmp_path / "cache")
+    geomcache.store(cache, fonte, np.zeros((1, 3)), np.array([1, 0]))
+
+    st = os.stat(fonte)
+    os.utime(fonte, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert geomcache.load(cache, fonte) is None
+
+
+def test_prune_remove_entradas_de_arquivos_ausentes(tmp_path):
+    fonte = _fonte(tmp_path)
+    cache = str(tmp_path / "cache")
+    geomcache.store(cache, fonte, np.zeros((1, 3)), np.array([1, 0]))
+    geomcache.store(cache, str(tmp_path / "cache" / ".." / "peca.stl"), np.zeros((1, 3)), np.array([1, 0]))
+    (tmp_path / "cache" / "orfa.npz").write_bytes(b"")
+
+    geomcache.prune(cache, [fonte])
+
+    assert os.listdir(cache) == [os.path.basename(geomcache.entry_path(cache, fonte))]
@@ -0,0 +1,49 @@
+"""Testes das operações em lote sobre superfícies."""
+
+import numpy as np
+
+from gafoam import geomtools, stlio
+
+
+def _triangulo(nome, deslocamento=0.0):
+    pontos = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]], dtype=np.float32) + deslocamento
+    return stlio.STLSurface(pontos, np.array([[0, 1, 2]]), None, [nome])
+
+
+def test_transformacao_escala_rotaciona_e_translada_nessa_ordem():
+    pontos = np.array([[1000.0, 0.0, 0.0]], dtype=np.float32)
+
+    resultado = geomtools.transform_points(pontos, scale=geomtools.UNIT_SCALES["mm"],
+                                           rotate=(0, 0, 90), translate=(0, 0, 2))
+
+    assert resultado.dtype == np.float32
+    np.testing.assert_allclose(resultado, [[0.0, 1.0, 2.0]], atol=1e-6)
+
+
+def test_caixa_envolvente_conjunta():
+    caixa = geomtools.combined_bounds([
+        np.array([[0, 0, 0], [1, 2, 3]]),
+        np.empty((0, 3)),
+        np.array([[-1, 5, 0]]),
+    ])
+
+    assert caixa == (-1.0, 1.0, 0.0, 5.0, 0.0, 3.0)
+    assert geomtools.combined_bounds([]) is None
+
+
+def test_fusao_gera_stl_multisolido_com_nomes_unicos(tmp_path):
+    fundida = geomtools.merge_surfaces([_triangulo("asa"), _triangulo("asa", 2.0), _triangulo("leme", 4.0)])
+
+    assert fundida.patch_names == ["asa", "asa_1", "leme"]
+    assert fundida.faces.tolist() == [[0, 1, 2], [3, 4, 5], [6, 7, 8]]
+
+    caminho = tmp_path / "combinada.stl"
+    stlio.write_ascii_stl(str(caminho), fundida)
+    relida = stlio.read_stl(str(caminho))
+
+    assert [(p["name"], p["faces"]) for p in stlio.scan_stl_patches(str(caminho))] == [
+        ("asa", 1), ("asa_1", 1), ("leme", 1)
+    ]
+    assert relida.patch_ids.tolist() == [0, 1, 2]
+    np.testing.assert_allclose(relida.points.max(axis=0), [5, 5, 4])
+    assert [p.name for p in tmp_path.iterdir()] == ["combinada.stl"]
@@ -5,6 +5,8 @@ pyvistaqt exige um servidor X real e derruba o processo em ambientes
 headless. O que se testa aqui é a lógica da janela, não a renderização.
 """
 
+import os
+
 import pytest
 
 pytest.importorskip("PySide6.QtWidgets")
@@ -33,6 +35,9 @@ class _GeometryStub(QWidget):
     def scan_case(self, case_path):
         self.scanned.append(case_path)
 
+    def refresh_scan(self):
+        pass
+
     def select_mesh(self, file_path):
         self.selected.append(file_path)
         return file_path in self.available
@@ -128,8 +133,8 @@ def test_arquivo_de_malha_nao_abre_no_editor(window, tmp_path):
     stl = tmp_path / "peca.stl"
     stl.write_text("solid vazio\nendsolid vazio\n", encoding="utf-8")
 
-    index = window.file_browser.file_model.index(str(stl))
     window.file_browser.file_model.setRootPath(str(tmp_path))
+    index = window.file_browser.file_model.index(str(stl))
     if index.isValid():
         window.on_file_clicked(index)
         assert str(stl) not in window.path_to_editor
@@ -224,6 +229,343 @@ def test_deteccao_de_patches_stl(tmp_path):
     assert patches[1]["faces"] == 1
 
 
+STL_TRIANGULO = (
+    "solid {nome}\nfacet normal 0 0 1\nouter loop\nvertex 0 0 0\nvertex 1 0 0\n"
+    "vertex 1 1 0\nendloop\nendfacet\nendsolid {nome}\n"
+)
+
+
+def _aguarda(qapp, condicao, limite=10.0):
+    import time
+
+    fim = time.monotonic() + limite
+    while not condicao() and time.monotonic() < fim:
+        qapp.processEvents()
+        time.sleep(0.01)
+    return condicao()
+
+
+def test_carregador_entrega_malhas_em_segundo_plano(qapp, tmp_path):
+    from gafoam.stl_viewer import GeometryLoader
+
+    arquivos = []
+    for nome in ("asa", "fuselagem", "leme"):
+        caminho = tmp_path / f"{nome}.stl"
+        caminho.write_text(STL_TRIANGULO.format(nome=nome), encoding="utf-8")
+        arquivos.append((caminho.name, str(caminho)))
+
+    loader = GeometryLoader(max_workers=2)
+    prontas, progresso, fim = {}, [], []
+    loader.mesh_ready.connect(lambda idx, rel, full, mesh, patches, metricas: prontas.__setitem__(idx, (mesh, patches)))
+    loader.progress.connect(lambda feitas, total: progresso.append((feitas, total)))
+    loader.finished.connect(fim.append)
+
+    loader.start(arquivos)
+    assert _aguarda(qapp, lambda: fim)
+
+    assert fim == [False]
+    assert sorted(prontas) == [0, 1, 2]
+    assert prontas[1][0].n_cells == 1
+    assert prontas[1][1][1] == ["fuselagem"]
+    assert progresso[-1] == (3, 3)
+    loader.shutdown()
+
+
+def test_carregador_cancelado_descarta_resultados(qapp, tmp_path):
+    from gafoam.stl_viewer import GeometryLoader
+
+    caminho = tmp_path / "peca.stl"
+    caminho.write_text(STL_TRIANGULO.format(nome="peca"), encoding="utf-8")
+
+    loader = GeometryLoader(max_workers=1)
+    prontas, fim = [], []
+    loader.mesh_ready.connect(lambda *args: prontas.append(args))
+    loader.finished.connect(fim.append)
+
+    loader.start([(caminho.name, str(caminho))] * 4)
+    loader.cancel()
+    _aguarda(qapp, lambda: False, limite=0.3)
+
+    assert fim == [True]
+    assert prontas == []
+    assert not loader.is_running()
+    loader.shutdown()
+
+
+def test_geometria_relida_do_cache_com_metricas(tmp_path, monkeypatch):
+    from gafoam import stl_viewer
+
+    caminho = tmp_path / "asa.stl"
+    caminho.write_text(STL_TRIANGULO.format(nome="asa"), encoding="utf-8")
+    cache = str(tmp_path / ".gafoam" / "geomcache")
+
+    mesh, patches, metricas = stl_viewer.read_geometry(str(caminho), cache)
+    assert metricas["is_watertight"] is False
+
+    def falha(*_args):
+        raise AssertionError("geometria inalterada não deveria ser relida")
+
+    monkeypatch.setattr(stl_viewer.stlio, "read_stl", falha)
+    mesh2, patches2, metricas2 = stl_viewer.read_geometry(str(caminho), cache)
+
+    assert mesh2.n_points == mesh.n_points == 3
+    assert patches2[1] == ["asa"]
+    assert metricas2["open_edges"] == metricas["open_edges"]
+
+
+def test_varredura_ignora_diretorios_de_tempo_e_de_malha(tmp_path):
+    from gafoam.stl_viewer import find_geometry_files, is_geometry_dir
+
+    for rel in ("constant/triSurface/asa.stl", "0.5/lixo.stl", "processor0/constant/asa.stl",
+                "constant/polyMesh/x.stl", ".gafoam/geomcache/y.stl", "leme.obj"):
+        caminho = tmp_path / rel
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        caminho.write_text(STL_TRIANGULO.format(nome="s"), encoding="utf-8")
+
+    encontrados = [rel for rel, _ in find_geometry_files(str(tmp_path))]
+
+    assert encontrados == ["leme.obj", os.path.join("constant", "triSurface", "asa.stl")]
+    assert is_geometry_dir(str(tmp_path), str(tmp_path / "constant" / "triSurface"))
+    assert not is_geometry_dir(str(tmp_path), str(tmp_path / "0.5"))
+    assert not is_geometry_dir(str(tmp_path), str(tmp_path / "processor0" / "constant"))
+
+
+def test_varredura_incremental_so_recarrega_o_que_mudou(tmp_path):
+    from gafoam.stl_viewer import diff_geometry_scan, find_geometry_files
+
+    for nome in ("asa", "leme"):
+        (tmp_path / f"{nome}.stl").write_text(STL_TRIANGULO.format(nome=nome), encoding="utf-8")
+    removidos, carregar, ids = diff_geometry_scan({}, set(), find_geometry_files(str(tmp_path)))
+    assert removidos == [] and [rel for rel, _ in carregar] == ["asa.stl", "leme.stl"]
+
+    assert diff_geometry_scan(ids, set(), find_geometry_files(str(tmp_path)))[:2] == ([], [])
+
+    (tmp_path / "leme.stl").unlink()
+    (tmp_path / "asa.stl").write_text(STL_TRIANGULO.format(nome="asa_nova"), encoding="utf-8")
+    (tmp_path / "deriva.stl").write_text(STL_TRIANGULO.format(nome="deriva"), encoding="utf-8")
+    removidos, carregar, _ = diff_geometry_scan(ids, set(), find_geometry_files(str(tmp_path)))
+
+    assert removidos == [str(tmp_path / "leme.stl")]
+    assert [rel for rel, _ in carregar] == ["asa.stl", "deriva.stl"]
+
+
+def test_agendador_agrupa_pedidos_e_finaliza_em_resolucao_cheia(qapp):
+    from gafoam.stl_viewer import RenderScheduler
+
+    escalas = []
+    agendador = RenderScheduler(escalas.append, interval_ms=5, idle_ms=60)
+    for _ in range(20):
+        agendador.request(interactive=True)
+    _aguarda(qapp, lambda: len(escalas) >= 2, limite=2.0)
+
+    assert escalas == [RenderScheduler.INTERACTIVE_SCALE, 1.0]
+
+    agendador.request()
+    agendador.request()
+    _aguarda(qapp, lambda: len(escalas) >= 3, limite=2.0)
+    _aguarda(qapp, lambda: False, limite=0.1)
+    assert escalas[2:] == [1.0]
+
+
+def test_proxy_de_nivel_de_detalhe_so_para_malhas_grandes():
+    import pyvista as pv
+
+    from gafoam.stl_viewer import build_lod_proxy
+
+    esfera = pv.Sphere(theta_resolution=60, phi_resolution=60)
+    proxy = build_lod_proxy(esfera, target_faces=500)
+
+    assert proxy.is_all_triangles
+    assert proxy.n_cells <= 550
+    assert build_lod_proxy(esfera, target_faces=esfera.n_cells) is None
+
+
+def test_raio_encontra_a_superficie_mais_proxima():
+    import pyvista as pv
+
+    from gafoam.stl_viewer import build_cell_locator, intersect_ray
+
+    localizador = build_cell_locator(pv.Sphere(radius=1.0, theta_resolution=40, phi_resolution=40))
+
+    t, ponto = intersect_ray(localizador, (0, 0, 5), (0, 0, -5))
+    assert ponto[2] == pytest.approx(1.0, abs=1e-2)
+    assert t == pytest.approx(0.4, abs=1e-3)
+    assert intersect_ray(localizador, (3, 3, 5), (3, 3, -5)) is None
+
+
+def test_lote_entrega_resultados_na_ordem_dos_itens(qapp):
+    from gafoam.stl_viewer import BatchRunner
+
+    lote = BatchRunner(max_workers=3)
+    resultados = []
+    lote.finished.connect(resultados.append)
+
+    lote.run(lambda x: 1 / x if x else 1 / 0, [4, 2, 1, 0])
+    assert _aguarda(qapp, lambda: resultados)
+
+    assert resultados[0][:3] == [0.25, 0.5, 1.0]
+    assert isinstance(resultados[0][3], ZeroDivisionError)
+    assert not lote.is_running()
+    lote.shutdown()
+
+
+def test_histogramas_de_qualidade_da_malha(qapp):
+    import numpy as np
+    from gafoam.stl_viewer import MeshQualityDialog
+
+    qualidade = {
+        "non_orthogonality": np.array([0.0, 10.0, 75.0]),
+        "skewness": np.array([0.1, 0.2, 0.3]),
+        "aspect_ratio": np.array([1.0, 2.0]),
+        "cell_volumes": np.array([1.0, np.nan]),
+        "face_pyramids": np.array([0.3, 0.3, -0.1]),
+        "summary": {
+            "cells": 2, "faces": 3, "internal_faces": 1, "min_volume": 1.0, "max_volume": 1.0,
+            "total_volume": 2.0, "negative_volumes": 0, "max_non_orthogonality": 75.0,
+            "avg_non_orthogonality": 28.3, "severely_non_orthogonal": 1, "max_skewness": 0.3,
+            "highly_skewed": 0, "max_aspect_ratio": 2.0, "high_aspect_ratio": 0, "incorrect_pyramids": 1,
+        },
+    }
+    dialogo = MeshQualityDialog(qualidade)
+
+    contagens, bordas = dialogo.histogram("non_orthogonality")
+    assert contagens.sum() == 3 and bordas[-1] == 75.0
+    # Valores não finitos ficam fora do histograma.
+    assert dialogo.histogram("cell_volumes")[0].sum() == 1
+    for indice in range(dialogo.combo_metric.count()):
+        dialogo.combo_metric.setCurrentIndex(indice)
+    dialogo.close()
+
+
+def test_dialogo_de_sondas_salva_csv(qapp, tmp_path, monkeypatch):
+    import numpy as np
+    from gafoam import stl_viewer
+    from gafoam.stl_viewer import ProbeDialog
+
+    tempos = [("0", 0.0), ("0.5", 0.5), ("2", 2.0)]
+    valores = np.array([[1.0, 2.0, np.nan], [2.0, 3.0, 4.0], [3.0, 4.0, 5.0]])
+    dialogo = ProbeDialog("p", tempos, [0.0, 0.5, 1.0], valores, line=True)
+    assert dialogo.combo_time.currentIndex() == 2
+    dialogo.combo_time.setCurrentIndex(0)
+
+    destino = tmp_path / "sondas.csv"
+    monkeypatch.setattr(stl_viewer.QFileDialog, "getSaveFileName", lambda *a, **k: (str(destino), ""))
+    dialogo.save_csv()
+    linhas = destino.read_text().splitlines()
+    assert linhas[0] == "time,0,0.5,1"
+    assert linhas[2] == "0.5,2,3,4"
+
+    pontual = ProbeDialog("U[X]", tempos[:1], [0.0, 1.0], valores[:1, :2])
+    assert not pontual.combo_time.isVisibleTo(pontual)
+    dialogo.close()
+    pontual.close()
+
+
+def test_painel_de_armazenamento_agrupa_e_limpa(window, tmp_path, monkeypatch):
+    import time
+
+    from PySide6.QtWidgets import QApplication, QMessageBox
+
+    for tempo in ("0", "1", "2", "10"):
+        (tmp_path / tempo).mkdir()
+        (tmp_path / tempo / "U").write_bytes(b"0" * 5000)
+    (tmp_path / "processor0" / "10").mkdir(parents=True)
+    (tmp_path / "processor0" / "10" / "p").write_bytes(b"0" * 100)
+    painel = window.storage_panel
+    assert "Storage" in _titulos(window.tab_widget)
+
+    def espera():
+        limite = time.time() + 10
+        while (painel._busy or painel.usage is None) and time.time() < limite:
+            QApplication.processEvents()
+            time.sleep(0.01)
+
+    painel.load_case(str(tmp_path))
+    painel.scan()
+    espera()
+    arvore = painel.tree
+    assert [arvore.topLevelItem(i).text(0) for i in range(arvore.topLevelItemCount())] == ["0", "1", "2", "10"]
+    painel.combo_group.setCurrentIndex(2)
+    assert [arvore.topLevelItem(i).text(0) for i in range(arvore.topLevelItemCount())] == ["case", "processor0"]
+
+    monkeypatch.setattr(QMessageBox, "question", lambda *a, **k: QMessageBox.Yes)
+    painel.spin_keep.setValue(1)
+    painel.purge()
+    painel.usage = None
+    espera()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["0", "10", "processor0"]
+    assert "freed" in painel.summary_label.text()
+
+
+def test_observador_do_caso_com_poucos_diretorios(qapp, tmp_path):
+    from gafoam import casewatcher
+    from gafoam.casewatcher import CaseWatcher
+
+    for rel in ("0", "constant/triSurface", "system", "processor0/0", "processor1/0"):
+        (tmp_path / rel).mkdir(parents=True)
+    for tempo in range(1, 200):
+        (tmp_path / str(tempo / 10)).mkdir()
+    observador = CaseWatcher(debounce_ms=10_000)
+    recebidos, lotes = [], []
+    observador.subscribe(recebidos.append, [casewatcher.TIMES_CHANGED, casewatcher.GEOMETRY_CHANGED])
+    observador.events.connect(lotes.append)
+    observador.watch(str(tmp_path))
+
+    assert [os.path.relpath(p, tmp_path) for p in observador.watched()] == [
+        ".", "0", "constant", "constant/triSurface", "processor0", "system"]
+
+    # Uma rajada de mudanças vira um único lote, sem eventos repetidos.
+    (tmp_path / "20").mkdir()
+    (tmp_path / "0" / "U").write_text("x", encoding="utf-8")
+    (tmp_path / "constant" / "polyMesh").mkdir()
+    for caminho in ("", "0", "0", "constant/triSurface", "constant/polyMesh", "system", ""):
+        observador.notify(str(tmp_path / caminho))
+    observador.flush()
+
+    raiz = os.path.normpath(str(tmp_path))
+    assert [e.kind for e in lotes[0]] == ["times", "fields", "mesh", "geometry", "case"]
+    assert recebidos == [(casewatcher.TIMES_CHANGED, raiz),
+                         (casewatcher.GEOMETRY_CHANGED, os.path.join(raiz, "constant", "triSurface"))]
+    assert os.path.join(raiz, "constant", "polyMesh") in observador.watched()
+
+    # Sem mudança real na raiz, nada é despachado.
+    observador.notify(str(tmp_path))
+    observador.flush()
+    assert len(lotes) == 1
+
+
+def test_navegador_de_campos_em_ordem_numerica(window, tmp_path):
+    for tempo in ("0", "10", "2", "0.5"):
+        (tmp_path / tempo).mkdir()
+    (tmp_path / "2" / "U").write_text("x", encoding="utf-8")
+    window.current_case = str(tmp_path)
+    window.case_watcher.watch(str(tmp_path))
+    navegador = window.field_browser
+    navegador.load_case(str(tmp_path))
+
+    arvore = navegador.tree
+    assert [arvore.topLevelItem(i).text(0) for i in range(arvore.topLevelItemCount())] == ["0", "0.5", "2", "10"]
+    item = arvore.topLevelItem(2)
+    assert item.childCount() == 0
+    item.setExpanded(True)
+    assert item.child(0).text(0) == "U"
+
+    # Um novo tempo entra na posição numérica sem reconstruir os demais.
+    (tmp_path / "5").mkdir()
+    window.case_watcher.notify(str(tmp_path))
+    window.case_watcher.flush()
+    assert arvore.topLevelItem(3).text(0) == "5"
+    assert arvore.topLevelItem(2) is item
+
+    # O tempo expandido não é observado; o próximo tempo escrito revalida seus campos.
+    (tmp_path / "2" / "p").write_text("x", encoding="utf-8")
+    os.utime(tmp_path / "2", ns=(1, 1))
+    (tmp_path / "7").mkdir()
+    window.case_watcher.notify(str(tmp_path))
+    window.case_watcher.flush()
+    assert [item.child(i).text(0) for i in range(item.childCount())] == ["U", "p"]
+
+
 def test_recarregamento_arquivo_externo(window, tmp_path):
     file_path = tmp_path / "system" / "controlDict"
     file_path.parent.mkdir(parents=True)
@@ -278,3 +620,66 @@ def test_clique_pasta_alterna_expansao(qapp, tmp_path):
     assert not browser.file_view.isExpanded(idx)
 
 
+def test_arvore_do_caso_agrupa_tempos_e_processadores(qapp, tmp_path):
+    from gafoam.filebrowser import FileBrowser
+
+    for tempo in ["0"] + [str(i) for i in range(1, 21)]:
+        (tmp_path / tempo).mkdir()
+    for proc in range(12):
+        (tmp_path / f"processor{proc}" / "0").mkdir(parents=True)
+    (tmp_path / "system").mkdir()
+    (tmp_path / "system" / "controlDict").write_text("application simpleFoam;\n", encoding="utf-8")
+    (tmp_path / "caso.foam").write_text("", encoding="utf-8")
+
+    browser = FileBrowser(parent=None)
+    browser.set_root(str(tmp_path))
+    modelo = browser.file_model
+    raiz = browser.file_view.rootIndex()
+
+    nomes = [modelo.index(linha, 0, raiz).data() for linha in range(modelo.rowCount(raiz))]
+    assert nomes == ["0", "1…20 (20)", "processor0…11 (12)", "system", "caso.foam"]
+
+    # Os subdiretórios só são listados quando pedidos.
+    grupo = modelo.index(2, 0, raiz)
+    assert modelo.isDir(grupo) and modelo.filePath(grupo) == str(tmp_path)
+    assert [modelo.index(i, 0, grupo).data() for i in range(3)] == ["processor0", "processor1", "processor2"]
+    proc = modelo.index(str(tmp_path / "processor10"))
+    assert proc.parent() == grupo and proc.data() == "processor10"
+    system = modelo.index(str(tmp_path / "system"))
+    assert modelo.canFetchMore(system) and modelo.rowCount(system) == 0
+    arquivo = modelo.index(str(tmp_path / "system" / "controlDict"))
+    assert not modelo.isDir(arquivo) and modelo.filePath(arquivo) == str(tmp_path / "system" / "controlDict")
+
+    # Um tempo novo entra no grupo existente sem recriar a árvore.
+    (tmp_path / "21").mkdir()
+    browser.refresh(str(tmp_path))
+    assert modelo.index(1, 0, raiz).data() == "1…21 (21)"
+    assert modelo.index(str(tmp_path / "21")).parent() == modelo.index(1, 0, raiz)
+    assert modelo.index(str(tmp_path / "processor10")) == proc
+
+
+def test_arvore_do_caso_agrupa_tempos_escritos_depois(qapp, tmp_path):
+    from gafoam.filebrowser import GROUP_THRESHOLD, FileBrowser
+
+    (tmp_path / "0").mkdir()
+    (tmp_path / "1").mkdir()
+    browser = FileBrowser(parent=None)
+    browser.set_root(str(tmp_path))
+    modelo = browser.file_model
+    raiz = browser.file_view.rootIndex()
+    assert modelo.rowCount(raiz) == 2
+
+    # A simulação passa do limite: os tempos viram um grupo.
+    for tempo in range(2, GROUP_THRESHOLD + 3):
+        (tmp_path / str(tempo)).mkdir()
+    browser.refresh(str(tmp_path))
+    assert [modelo.index(i, 0, raiz).data() for i in range(modelo.rowCount(raiz))] == [
+        "0", f"1…{GROUP_THRESHOLD + 2} ({GROUP_THRESHOLD + 2})"]
+
+    # E continua agrupado mesmo se os tempos forem apagados.
+    for tempo in range(3, GROUP_THRESHOLD + 3):
+        (tmp_path / str(tempo)).rmdir()
+    browser.refresh(str(tmp_path))
+    assert [modelo.index(i, 0, raiz).data() for i in range(modelo.rowCount(raiz))] == ["0", "1…2 (2)"]
+
+
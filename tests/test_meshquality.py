@@ -0,0 +1,69 @@
+"""Testes das métricas de qualidade da malha de volume."""
+
+import numpy as np
+import pytest
+
+from gafoam import meshquality, polymesh
+
+
+def _dois_hexaedros(deslocamento_y=0.0):
+    """Duas células unitárias lado a lado em x; a face x=2 pode ser deslocada em y."""
+    pontos = []
+    for x in (0.0, 1.0, 2.0):
+        dy = deslocamento_y if x == 2.0 else 0.0
+        pontos += [(x, dy, 0), (x, 1 + dy, 0), (x, 1 + dy, 1), (x, dy, 1)]
+    pontos = np.array(pontos, dtype=float)
+
+    def quad(x, a, b, c, d):
+        return [4 * x + a, 4 * x + b, 4 * x + c, 4 * x + d]
+
+    # Face interna primeiro (x=1, normal +x), depois o contorno.
+    faces = [quad(1, 0, 1, 2, 3), quad(0, 0, 3, 2, 1), quad(2, 0, 1, 2, 3)]
+    donos = [0, 0, 1]
+    for celula in (0, 1):
+        a, b = 4 * celula, 4 * (celula + 1)
+        faces += [
+            [a + 0, b + 0, b + 3, a + 3],  # y=0
+            [a + 1, a + 2, b + 2, b + 1],  # y=1
+            [a + 0, a + 1, b + 1, b + 0],  # z=0
+            [a + 3, b + 3, b + 2, a + 2],  # z=1
+        ]
+        donos += [celula] * 4
+    offsets = np.arange(0, 4 * len(faces) + 1, 4)
+    return polymesh.PolyMesh(pontos, offsets, np.ravel(faces), np.array(donos), np.array([1]), [])
+
+
+def test_malha_ortogonal_tem_metricas_ideais():
+    qualidade = meshquality.mesh_quality(_dois_hexaedros())
+    resumo = qualidade["summary"]
+
+    assert qualidade["cell_volumes"] == pytest.approx([1.0, 1.0])
+    assert resumo["total_volume"] == pytest.approx(2.0)
+    assert resumo["max_non_orthogonality"] == pytest.approx(0.0, abs=1e-6)
+    assert resumo["max_skewness"] == pytest.approx(0.0, abs=1e-9)
+    assert qualidade["aspect_ratio"] == pytest.approx([1.0, 1.0])
+    assert resumo["incorrect_pyramids"] == resumo["negative_volumes"] == 0
+    assert (resumo["cells"], resumo["faces"], resumo["internal_faces"]) == (2, 11, 1)
+
+
+def test_cisalhamento_e_face_invertida_sao_detectados():
+    cisalhada = meshquality.mesh_quality(_dois_hexaedros(deslocamento_y=0.5))
+    # O centro da segunda célula sobe 0,25: a face interna fica inclinada em atan(0,25).
+    assert cisalhada["non_orthogonality"][0] == pytest.approx(np.degrees(np.arctan(0.25)))
+    assert cisalhada["summary"]["total_volume"] == pytest.approx(2.0)
+    assert cisalhada["summary"]["max_skewness"] > 0.0
+
+    malha = _dois_hexaedros()
+    rotulos = malha.face_labels.copy()
+    rotulos[4:8] = rotulos[4:8][::-1]
+    invertida = meshquality.mesh_quality(malha._replace(face_labels=rotulos))
+    assert invertida["summary"]["incorrect_pyramids"] == 1
+
+
+def test_blocos_pequenos_dao_o_mesmo_resultado():
+    malha = _dois_hexaedros(deslocamento_y=0.3)
+    inteira = meshquality.mesh_quality(malha)
+    em_blocos = meshquality.mesh_quality(malha, chunk_size=2)
+
+    for chave in ("cell_volumes", "non_orthogonality", "skewness", "aspect_ratio", "face_pyramids"):
+        assert em_blocos[chave] == pytest.approx(inteira[chave])
@@ -0,0 +1,62 @@
+"""Testes dos conjuntos e zonas da malha de volume."""
+
+import numpy as np
+import pytest
+
+from gafoam import meshsets
+from conftest import cabecalho, fileira_de_hexaedros
+
+
+def _lista(valores, formato, dtype="<i4"):
+    valores = np.asarray(valores)
+    if formato == "binary":
+        return f"{len(valores)}\n(".encode() + valores.astype(dtype).tobytes() + b")"
+    return f"{len(valores)}\n(\n".encode() + " ".join(map(str, valores)).encode() + b"\n)"
+
+
+@pytest.mark.parametrize("formato", ["ascii", "binary"])
+def test_leitura_de_zonas_e_conjuntos(tmp_path, formato):
+    malha = tmp_path / "constant" / "polyMesh"
+    (malha / "sets").mkdir(parents=True)
+    (malha / "cellZones").write_bytes(
+        cabecalho("regIOobject", formato) + b"2\n(\nrotor\n{\n    type cellZone;\n    cellLabels List<label> "
+        + _lista([3, 1, 2], formato) + b";\n}\n\nvazia\n{\n    type cellZone;\n    cellLabels List<label> 0();\n}\n)\n"
+    )
+    (malha / "faceZones").write_bytes(
+        cabecalho("regIOobject", formato) + b"1\n(\ninterface\n{\n    type faceZone;\n    inGroups List<word> 1(mrf);\n"
+        b"    faceLabels List<label> " + _lista([4, 0], formato) + b";\n    flipMap List<bool> "
+        + _lista([1, 0], formato, "u1") + b";\n}\n)\n"
+    )
+    (malha / "sets" / "porous").write_bytes(cabecalho("cellSet", formato) + _lista([2, 0], formato) + b"\n")
+    (malha / "sets" / "nada.txt").write_text("lixo", encoding="utf-8")
+
+    selecoes = {meshsets.selection_key(s): s for s in meshsets.read_selections(str(tmp_path))}
+
+    assert sorted(selecoes) == ["cellSet:porous", "cellZone:rotor", "cellZone:vazia", "faceZone:interface"]
+    assert selecoes["cellZone:rotor"].labels.tolist() == [1, 2, 3]
+    assert selecoes["cellZone:vazia"].labels.size == 0
+    assert selecoes["faceZone:interface"].labels.tolist() == [0, 4]
+    assert selecoes["cellSet:porous"].labels.tolist() == [0, 2]
+
+
+def test_consultas_de_pertinencia_e_intersecao():
+    rotor = meshsets.MeshSelection("rotor", "cell", "zone", np.array([1, 2, 3]))
+    porous = meshsets.MeshSelection("porous", "cell", "set", np.array([0, 2, 3]))
+
+    assert meshsets.contains(rotor.labels, [0, 1, 3, 9]).tolist() == [False, True, True, False]
+    comum = meshsets.intersect(rotor, porous)
+    assert comum.labels.tolist() == [2, 3] and comum.kind == "cell"
+    with pytest.raises(ValueError):
+        meshsets.intersect(rotor, meshsets.MeshSelection("f", "face", "set", np.array([0])))
+
+
+def test_superficie_e_caixa_de_uma_selecao_de_celulas():
+    malha = fileira_de_hexaedros(4)
+    meio = meshsets.MeshSelection("meio", "cell", "zone", np.array([1, 2]))
+
+    faces = meshsets.selection_faces(malha, meio)
+    # Duas faces internas nas pontas do bloco e quatro paredes por célula.
+    assert len(faces) == 2 + 8
+    pontos, celulas = meshsets.faces_surface(malha, faces)
+    assert len(pontos) == 12 and len(celulas) == 5 * len(faces)
+    assert meshsets.bounding_box(malha, meio) == (1.0, 3.0, 0.0, 1.0, 0.0, 1.0)
@@ -7,12 +7,14 @@ import pytest
 
 from gafoam import resources
 
-MODULOS_SEM_GUI = ["gafoam", "gafoam.foamdict", "gafoam.foamlint", "gafoam.logparse", "gafoam.resources"]
+MODULOS_SEM_GUI = ["gafoam", "gafoam.decomposed", "gafoam.diskusage", "gafoam.fieldio", "gafoam.foamdict", "gafoam.foamfile", "gafoam.foamlint", "gafoam.foammacro", "gafoam.geomcache", "gafoam.geomtools", "gafoam.logparse", "gafoam.meshquality", "gafoam.meshsets", "gafoam.polymesh", "gafoam.probes", "gafoam.resources", "gafoam.stlio", "gafoam.surfcheck", "gafoam.timeindex"]
 
 MODULOS_COM_GUI = [
     "gafoam.app",
     "gafoam.bc_editor",
+    "gafoam.casewatcher",
     "gafoam.editor",
+    "gafoam.fieldbrowser",
     "gafoam.filebrowser",
     "gafoam.handlers",
     "gafoam.main_window",
@@ -21,6 +23,7 @@ MODULOS_COM_GUI = [
     "gafoam.report",
     "gafoam.residuals",
     "gafoam.stl_viewer",
+    "gafoam.storagepanel",
     "gafoam.terminal",
 ]
 
@@ -0,0 +1,94 @@
+"""Testes do leitor de `constant/polyMesh`."""
+
+import gzip
+
+import numpy as np
+import pytest
+
+from gafoam import polymesh
+from conftest import cabecalho
+
+# Um único hexaedro unitário: 8 pontos, 6 faces, todas de contorno.
+PONTOS = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)]
+FACES = [
+    (0, 4, 7, 3), (1, 2, 6, 5),  # entrada (x=0), saída (x=1)
+    (0, 1, 5, 4), (3, 7, 6, 2), (0, 3, 2, 1), (4, 5, 6, 7),  # paredes
+]
+
+BOUNDARY = """\
+FoamFile { format ascii; class polyBoundaryMesh; object boundary; }
+3
+(
+    inlet  { type patch; nFaces 1; startFace 0; }
+    outlet { type patch; nFaces 1; startFace 1; }
+    walls  { type wall; inGroups List<word> 1(wall); nFaces 4; startFace 2; }
+)
+"""
+
+
+def _escreve_malha(case_dir, formato, classe_faces="faceCompactList"):
+    malha = case_dir / "constant" / "polyMesh"
+    malha.mkdir(parents=True)
+    (malha / "boundary").write_text(BOUNDARY, encoding="utf-8")
+    offsets = np.arange(0, 4 * len(FACES) + 1, 4)
+    rotulos = np.array(FACES).ravel()
+    dono = np.zeros(len(FACES), dtype=np.int64)
+
+    def lista(valores, dtype):
+        valores = np.asarray(valores)
+        if formato == "binary":
+            return f"{len(valores)}\n(".encode() + valores.astype(dtype).tobytes() + b")\n"
+        return f"{len(valores)}\n(\n".encode() + "\n".join(map(str, valores)).encode() + b"\n)\n"
+
+    if formato == "binary":
+        pontos = f"{len(PONTOS)}\n(".encode() + np.array(PONTOS, dtype="<f8").tobytes() + b")\n"
+    else:
+        pontos = f"{len(PONTOS)}\n(\n".encode() + "".join(f"({x} {y} {z})\n" for x, y, z in PONTOS).encode() + b")\n"
+    (malha / "points").write_bytes(cabecalho("vectorField", formato) + pontos)
+
+    if classe_faces == "faceList":
+        corpo = f"{len(FACES)}\n(\n".encode() + "".join(f"4({a} {b} {c} {d})\n" for a, b, c, d in FACES).encode() + b")\n"
+    else:
+        corpo = lista(offsets, "<i4") + b"\n" + lista(rotulos, "<i4")
+    (malha / "faces").write_bytes(cabecalho(classe_faces, formato) + corpo)
+    (malha / "owner").write_bytes(cabecalho("labelList", formato) + lista(dono, "<i4"))
+    (malha / "neighbour").write_bytes(cabecalho("labelList", formato) + lista([], "<i4"))
+    return malha
+
+
+@pytest.mark.parametrize("formato, classe", [
+    ("ascii", "faceCompactList"), ("ascii", "faceList"), ("binary", "faceCompactList"),
+])
+def test_le_malha_nos_formatos_ascii_e_binario(tmp_path, formato, classe):
+    _escreve_malha(tmp_path, formato, classe)
+
+    assert polymesh.has_polymesh(str(tmp_path))
+    malha = polymesh.read_polymesh(str(tmp_path))
+
+    np.testing.assert_allclose(malha.points, PONTOS)
+    assert malha.face_offsets.tolist() == [0, 4, 8, 12, 16, 20, 24]
+    assert malha.face_labels.tolist() == list(np.array(FACES).ravel())
+    assert malha.owner.tolist() == [0] * 6
+    assert len(malha.neighbour) == 0
+    assert [(p["name"], p["type"], p["startFace"], p["nFaces"]) for p in malha.patches] == [
+        ("inlet", "patch", 0, 1), ("outlet", "patch", 1, 1), ("walls", "wall", 2, 4),
+    ]
+
+
+def test_superficie_do_patch_renumera_os_pontos(tmp_path):
+    malha_dir = _escreve_malha(tmp_path, "ascii")
+    # Arquivos comprimidos (writeCompression on) são lidos do mesmo jeito.
+    conteudo = (malha_dir / "points").read_bytes()
+    (malha_dir / "points").unlink()
+    with gzip.open(malha_dir / "points.gz", "wb") as fh:
+        fh.write(conteudo)
+
+    malha = polymesh.read_polymesh(str(tmp_path))
+    pontos, celulas = polymesh.patch_surface(malha, malha.patches[0])
+
+    np.testing.assert_allclose(pontos, [PONTOS[i] for i in (0, 3, 4, 7)])
+    assert celulas.tolist() == [4, 0, 2, 3, 1]
+
+    pontos, celulas = polymesh.patch_surface(malha, malha.patches[2])
+    assert len(pontos) == 8
+    assert celulas.reshape(4, 5)[:, 0].tolist() == [4, 4, 4, 4]
@@ -0,0 +1,46 @@
+"""Testes das sondas: árvore k-d sobre os centros das células e amostragem."""
+
+import numpy as np
+import pytest
+
+from gafoam import fieldio, probes
+from conftest import fileira_de_hexaedros
+
+
+@pytest.mark.parametrize("folha", [1, 4, probes.LEAF_SIZE])
+def test_arvore_kd_acha_o_mesmo_vizinho_da_busca_bruta(folha):
+    rng = np.random.default_rng(7)
+    pontos = rng.random((500, 3)) * [10, 1, 0.1]
+    consultas = np.vstack([rng.random((50, 3)) * [12, 1.5, 0.5] - 1, pontos[:3]])
+
+    distancias, indices = probes.KDTree(pontos, folha).query(consultas)
+
+    todas = np.linalg.norm(consultas[:, None, :] - pontos[None, :, :], axis=2)
+    np.testing.assert_allclose(distancias, todas.min(axis=1))
+    assert (indices == todas.argmin(axis=1)).all()
+    assert distancias[-3:].tolist() == [0, 0, 0]
+    assert probes.KDTree(np.empty((0, 3))).query([0, 0, 0])[1].tolist() == [-1]
+
+
+def test_sonda_em_linha_amostra_as_celulas(tmp_path):
+    sonda = probes.CellProbe(fileira_de_hexaedros(4))
+    np.testing.assert_allclose(sonda.tree.points[:, 0], [0.5, 1.5, 2.5, 3.5])
+
+    pontos, distancias = probes.line_points((0.1, 0.5, 0.5), (3.9, 0.5, 0.5), 4)
+    assert distancias.tolist() == pytest.approx([0, 3.8 / 3, 7.6 / 3, 3.8])
+    celulas, _ = sonda.locate(pontos)
+    assert celulas.tolist() == [0, 1, 2, 3]
+
+    caminho = tmp_path / "U"
+    caminho.write_text(
+        "FoamFile { format ascii; class volVectorField; object U; }\n"
+        "internalField nonuniform List<vector> 4((1 0 0) (2 0 0) (3 4 0) (4 0 0));\n"
+        "boundaryField { }\n"
+    )
+    campo = fieldio.read_field(str(caminho))
+    assert probes.sample_cells(campo, celulas).tolist() == [1, 2, 5, 4]
+    assert probes.sample_cells(campo, celulas, 1).tolist() == [0, 0, 4, 0]
+    uniforme = campo._replace(internal=fieldio.Uniform(2.0))
+    assert probes.sample_cells(uniforme, celulas).tolist() == [2] * 4
+    with pytest.raises(ValueError):
+        probes.sample_cells(campo._replace(internal=np.zeros(2)), celulas)
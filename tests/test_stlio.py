@@ -0,0 +1,106 @@
+"""Testes do leitor vetorizado de STL."""
+
+import struct
+
+import numpy as np
+import pytest
+
+from gafoam import stlio
+
+ASCII_DOIS_SOLIDS = """\
+solid entrada
+  facet normal 0 0 1
+    outer loop
+      vertex 0 0 0
+      vertex 1 0 0
+      vertex 1 1 0
+    endloop
+  endfacet
+  facet normal 0 0 1
+    outer loop
+      vertex 0 0 0
+      vertex 1 1 0
+      vertex 0 1 0
+    endloop
+  endfacet
+endsolid entrada
+SOLID saida
+  FACET NORMAL 0 0 -1
+    OUTER LOOP
+      VERTEX 0 0 0
+      VERTEX 1.0e+00 0 -0
+      VERTEX 0 0 1
+    ENDLOOP
+  ENDFACET
+ENDSOLID saida
+"""
+
+
+def _stl_binario(caminho, triangulos, cabecalho=b"solid exportado pelo CAD"):
+    with open(caminho, "wb") as fh:
+        fh.write(cabecalho.ljust(80, b" "))
+        fh.write(struct.pack("<I", len(triangulos)))
+        for tri in triangulos:
+            fh.write(struct.pack("<3f", 0, 0, 1))
+            for v in tri:
+                fh.write(struct.pack("<3f", *v))
+            fh.write(struct.pack("<H", 0))
+
+
+def test_ascii_com_solids_vira_patches_por_face(tmp_path):
+    caminho = tmp_path / "duto.stl"
+    caminho.write_text(ASCII_DOIS_SOLIDS, encoding="utf-8")
+
+    superficie = stlio.read_stl(str(caminho))
+
+    assert superficie.patch_names == ["entrada", "saida"]
+    assert superficie.patch_ids.tolist() == [0, 0, 1]
+    # 9 cantos de triângulo, 5 vértices distintos (o -0 coincide com 0).
+    assert len(superficie.points) == 5
+    assert superficie.faces.shape == (3, 3)
+    np.testing.assert_allclose(superficie.points[superficie.faces[2]], [[0, 0, 0], [1, 0, 0], [0, 0, 1]])
+
+
+def test_binario_com_cabecalho_solid_e_detectado_pelo_tamanho(tmp_path):
+    caminho = tmp_path / "peca.stl"
+    _stl_binario(caminho, [
+        [(0, 0, 0), (1, 0, 0), (0, 1, 0)],
+        [(1, 0, 0), (1, 1, 0), (0, 1, 0)],
+    ])
+
+    assert stlio.is_binary_stl(str(caminho))
+    superficie = stlio.read_stl(str(caminho))
+
+    assert superficie.points.dtype == np.float32
+    assert len(superficie.points) == 4
+    assert superficie.patch_names == ["peca"]
+    assert superficie.patch_ids.tolist() == [0, 0]
+
+
+def test_ascii_malformado_levanta_value_error(tmp_path):
+    caminho = tmp_path / "ruim.stl"
+    caminho.write_text("solid x\n facet normal 0 0 1\n  vertex 1 2\nendsolid x\n", encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        stlio.read_stl(str(caminho))
+
+
+@pytest.mark.parametrize("bloco", [37, stlio.SCAN_CHUNK_SIZE])
+def test_varredura_de_patches_em_blocos(tmp_path, bloco):
+    caminho = tmp_path / "duto.stl"
+    caminho.write_bytes(ASCII_DOIS_SOLIDS.encode("utf-8"))
+
+    patches = stlio.scan_stl_patches(str(caminho), chunk_size=bloco)
+
+    assert [(p["name"], p["faces"]) for p in patches] == [("entrada", 2), ("saida", 1)]
+    conteudo = caminho.read_bytes()
+    assert conteudo[patches[1]["start"]:patches[1]["end"]] == conteudo[conteudo.index(b"SOLID saida"):].rstrip()
+
+
+def test_varredura_de_patches_binario_pelo_cabecalho(tmp_path):
+    caminho = tmp_path / "peca.stl"
+    _stl_binario(caminho, [[(0, 0, 0), (1, 0, 0), (0, 1, 0)]] * 3)
+
+    assert stlio.scan_stl_patches(str(caminho)) == [
+        {"name": "peca", "faces": 3, "start": 84, "end": 84 + 3 * 50}
+    ]
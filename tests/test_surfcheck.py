@@ -0,0 +1,52 @@
+"""Testes do diagnóstico vetorizado de superfícies."""
+
+import numpy as np
+import pytest
+
+from gafoam import surfcheck
+
+# Tetraedro unitário com as normais para fora.
+TETRA_PONTOS = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=float)
+TETRA_FACES = np.array([[0, 2, 1], [0, 1, 3], [1, 2, 3], [0, 3, 2]])
+
+
+def test_tetraedro_fechado_e_estanque():
+    diag = surfcheck.surface_diagnostics(TETRA_PONTOS, TETRA_FACES)
+
+    assert diag["is_watertight"] is True
+    assert diag["edges"] == 6
+    assert diag["open_edges"] == diag["non_manifold_edges"] == 0
+    assert diag["inconsistent_normals"] == 0
+    assert diag["duplicate_faces"] == diag["degenerate_faces"] == 0
+    assert diag["volume"] == pytest.approx(1 / 6)
+    assert diag["dimensions"] == (1.0, 1.0, 1.0)
+
+
+def test_defeitos_de_topologia_sao_contados():
+    # Uma face removida abre três arestas; uma face invertida desorienta três.
+    aberto = surfcheck.surface_diagnostics(TETRA_PONTOS, TETRA_FACES[:3])
+    invertido = TETRA_FACES.copy()
+    invertido[0] = invertido[0][::-1]
+    desorientado = surfcheck.surface_diagnostics(TETRA_PONTOS, invertido)
+    # Uma face repetida torna suas três arestas não-manifold.
+    duplicado = surfcheck.surface_diagnostics(TETRA_PONTOS, np.vstack([TETRA_FACES, TETRA_FACES[1]]))
+
+    assert aberto["open_edges"] == 3 and aberto["volume"] is None
+    assert desorientado["inconsistent_normals"] == 3
+    assert duplicado["duplicate_faces"] == 1
+    assert duplicado["non_manifold_edges"] == 3
+    assert duplicado["is_watertight"] is False
+
+
+def test_faces_degeneradas_e_sobrepostas():
+    pontos = np.array([
+        [0, 0, 0], [1, 0, 0], [2, 0, 0], [0, 1, 0],
+        [0, 0, 1e-3], [1, 0, 1e-3], [0, 1, 1e-3],
+    ], dtype=float)
+    faces = np.array([[0, 1, 3], [0, 1, 2], [4, 5, 6]])
+
+    diag = surfcheck.surface_diagnostics(pontos, faces)
+
+    assert diag["degenerate_faces"] == 1
+    # As faces 0 e 2 quase coincidem sem compartilhar vértices.
+    assert diag["self_intersection_candidates"] == 2
@@ -0,0 +1,81 @@
+"""Testes do índice de diretórios de tempo."""
+
+import os
+
+from gafoam import timeindex
+
+
+def _caso(tmp_path):
+    for nome in ("0", "0.5", "10", "2", "1e-05", "constant", "0.orig"):
+        (tmp_path / nome).mkdir()
+    (tmp_path / "0" / "U").write_text("x", encoding="utf-8")
+    (tmp_path / "0" / "p").write_text("x", encoding="utf-8")
+    (tmp_path / "2" / "U.gz").write_bytes(b"x")
+    (tmp_path / "2" / "uniform").mkdir()
+    for proc in ("processor10", "processor2"):
+        (tmp_path / proc / "20").mkdir(parents=True)
+        (tmp_path / proc / "20" / "k").write_text("x", encoding="utf-8")
+    return tmp_path
+
+
+def test_tempos_em_ordem_numerica_com_subdominios(tmp_path):
+    indice = timeindex.TimeIndex(str(_caso(tmp_path)))
+
+    assert [t.name for t in indice.times()] == ["0", "1e-05", "0.5", "2", "10", "20"]
+    assert indice.processors == ["processor2", "processor10"]
+    assert indice.latest_time().locations == ["processor2", "processor10"]
+    assert indice.fields("2") == ["U"]
+    assert indice.fields("20") == ["k"]
+    assert indice.field_paths("2", "U") == [os.path.join(str(tmp_path), "2", "U.gz")]
+    assert timeindex.time_value("0.orig") is None and timeindex.time_value("1e-05") == 1e-05
+
+
+def test_atualizacao_incremental(tmp_path):
+    caso = _caso(tmp_path)
+    indice = timeindex.TimeIndex(str(caso))
+    assert indice.fields("0") == ["U", "p"]
+
+    (caso / "30").mkdir()
+    assert indice.update(str(caso)) == (True, set())
+    assert indice.latest_time().name == "30"
+
+    (caso / "0" / "T").write_text("x", encoding="utf-8")
+    os.utime(caso / "0", ns=(1, 1))
+    assert indice.update(str(caso / "0")) == (False, {"0"})
+    assert indice.fields("0") == ["T", "U", "p"]
+
+    # Subdiretórios de um tempo não mudam o inventário.
+    assert indice.update(str(caso / "2" / "uniform")) == (False, set())
+
+    (caso / "processor2" / "25").mkdir()
+    assert indice.update(str(caso / "processor2")) == (True, set())
+    assert indice.time_dirs("25") == [os.path.join(str(caso), "processor2", "25")]
+
+    (caso / "30").rmdir()
+    assert indice.update(str(caso)) == (True, set())
+    assert indice.latest_time().name == "25"
+
+
+def test_mudanca_em_um_subdominio_relista_todos(tmp_path):
+    for proc in ("processor0", "processor1"):
+        (tmp_path / proc / "0").mkdir(parents=True)
+    indice = timeindex.TimeIndex(str(tmp_path))
+
+    # Só `processor0` é observado; os dois ganham o tempo novo.
+    for proc in ("processor0", "processor1"):
+        (tmp_path / proc / "1").mkdir()
+    assert indice.update(str(tmp_path / "processor0")) == (True, set())
+    assert indice.latest_time().locations == ["processor0", "processor1"]
+    assert indice.time_dirs("1") == [os.path.join(str(tmp_path), proc, "1") for proc in ("processor0", "processor1")]
+
+
+def test_inventario_revalidado_pela_data_de_modificacao(tmp_path):
+    caso = _caso(tmp_path)
+    indice = timeindex.TimeIndex(str(caso))
+    assert indice.fields("2") == ["U"]
+
+    # Sem `update`: o diretório de tempo em escrita não é observado.
+    (caso / "2" / "p").write_text("x", encoding="utf-8")
+    os.utime(caso / "2", ns=(1, 1))
+    assert indice.fields("2") == ["U", "p"]
+    assert indice.field_paths("2", "p") == [os.path.join(str(caso), "2", "p")]